@@ -5,180 +5,49 @@ Descrição: Sistema completo de rede social profissional com validações,
 tratamento de exceções e estrutura de menu intuitiva.
 """
 
-import os
-import re
-import json
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Generator
-from pathlib import Path
+import time
+from typing import Dict, List, Optional, Tuple
 
+from linha_do_tempo import Navegador
+from nucleo import ErroDominio, NucleoSPA
+from registros import data_de
+from tela import Tela
 
-class LinkedInSPA:
-    """Classe principal do sistema LinkedIn SPA - VERSÃO OTIMIZADA"""
-    
-    # Constantes de validação
-    REGEX_EMAIL = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    MIN_USERNAME_LEN, MIN_SENHA_LEN, MAX_BIO_LEN = 3, 6, 200
-    MAX_POST_LEN, MIN_POST_LEN, MAX_COMENTARIO = 500, 5, 200
-    PAGINA_SIZE, ENCODING = 5, 'utf-8'
-    
-    # Dados de teste pré-configurados em formato de dicionário
-    DADOS_PRECONFIGURADOS = {
-        'nomes': {
-            0: 'Ana Costa', 1: 'Bruno Martins', 2: 'Carlos Oliveira', 3: 'Diana Ferreira', 4: 'Eduardo Santos',
-            5: 'Fernanda Lima', 6: 'Gustavo Pereira', 7: 'Helena Rocha', 8: 'Igor Mendes', 9: 'Juliana Gomes',
-            10: 'Kevin Alves', 11: 'Larissa Dias', 12: 'Matheus Correia', 13: 'Natalia Souza', 14: 'Otavio Carvalho',
-            15: 'Patricia Ribeiro', 16: 'Quentin Barbosa', 17: 'Rafaela Campos', 18: 'Samuel Costa', 19: 'Tania Monteiro',
-            20: 'Ulisses Rodrigues', 21: 'Vanessa Duarte', 22: 'Wagner Nunes', 23: 'Ximena Lopez', 24: 'Yasmin Azevedo',
-            25: 'Zoe Machado', 26: 'Adriana Teles', 27: 'Bernardo Silva', 28: 'Camila Rosa', 29: 'Daphne Oliveira',
-            30: 'Emerson Costa', 31: 'Fabiana Souza', 32: 'Gilson Pereira', 33: 'Hercules Santos', 34: 'Iris Almeida',
-            35: 'Jeferson Martins', 36: 'Katarina Dias', 37: 'Leonardo Campos', 38: 'Mariana Rocha', 39: 'Norberto Lima',
-            40: 'Octavia Ferreira', 41: 'Pompeia Gomes', 42: 'Quasimodo Vargas', 43: 'Rosangela Pinto', 44: 'Sheila Castro',
-            45: 'Tiago Morais', 46: 'Urania Neves', 47: 'Vicente Barbosa', 48: 'Wanda Ramos', 49: 'Xavier Fontes',
-            50: 'Yara Mendes', 51: 'Zilda Moraes'
-        },
-        'titulos': {
-            0: 'Desenvolvedor Python', 1: 'Designer UX/UI', 2: 'Engenheiro de Software', 3: 'Analista de Dados',
-            4: 'Gerente de Projetos', 5: 'Especialista em Marketing', 6: 'Arquiteto de Sistemas', 7: 'DevOps Engineer',
-            8: 'Data Scientist', 9: 'Front-end Developer', 10: 'Back-end Developer', 11: 'Full Stack Developer',
-            12: 'DBA - Database Administrator', 13: 'Consultor de TI', 14: 'Gestor de Recursos Humanos',
-            15: 'Especialista em Segurança', 16: 'Product Manager', 17: 'Scrum Master', 18: 'QA Engineer',
-            19: 'Ilustrador Digital', 20: 'Redator Técnico', 21: 'Especialista em Cloud', 22: 'Mobile Developer'
-        },
-        'bios': {
-            0: 'Apaixonado por tecnologia e inovação', 1: 'Sempre buscando novos desafios profissionais',
-            2: 'Especialista em soluções criativas', 3: 'Amante de desenvolvimento sustentável',
-            4: 'Focado em qualidade e excelência', 5: 'Colaborador e team player', 6: 'Entusiasta de programação',
-            7: 'Criando o futuro através da tecnologia', 8: 'Dedicado ao aprendizado contínuo',
-            9: 'Profissional versátil e adaptável', 10: 'Transformando ideias em realidade', 11: 'Conectando pessoas e soluções'
-        }
-    }
+
+class LinkedInSPA(NucleoSPA):
+    """Interface de console do LinkedIn SPA sobre o núcleo de domínio"""
     
-    def __init__(self):
+    def __init__(self, modo_armazenamento: Optional[str] = None, estrategia_feed: Optional[str] = None):
         """Inicializa o sistema"""
-        self.usuarios, self.conexoes, self.posts = {}, {}, []
         self.usuario_logado = None
-        self._cache_posts = {}
-        self.arquivo_usuarios = Path('dados_usuarios.json')
-        self.arquivo_conexoes = Path('dados_conexoes.json')
-        self.arquivo_posts = Path('dados_posts.json')
-        self._carregar_dados()
-    
-    def _carregar_dados(self) -> None:
-        """Carrega dados de JSON ou inicializa"""
-        try:
-            if self.arquivo_usuarios.exists():
-                self.usuarios = self._ler_json(self.arquivo_usuarios)
-                self.conexoes = self._ler_json(self.arquivo_conexoes)
-                self.posts = self._ler_json(self.arquivo_posts)
-                print("✅ Dados carregados com sucesso!")
-            else:
-                self._inicializar_dados_teste()
-                self._salvar_dados()
-        except Exception as e:
-            print(f"❌ Erro ao carregar dados: {e}")
-            self._inicializar_dados_teste()
-    
-    def _ler_json(self, arquivo: Path) -> Any:
-        """Lê um arquivo JSON com tratamento eficiente"""
-        with open(arquivo, 'r', encoding=self.ENCODING) as f:
-            return json.load(f)
-    
-    def _salvar_dados(self) -> None:
-        """Salva dados em JSON"""
-        try:
-            self._escrever_json(self.arquivo_usuarios, self.usuarios)
-            self._escrever_json(self.arquivo_conexoes, self.conexoes)
-            self._escrever_json(self.arquivo_posts, self.posts)
-            self._cache_posts.clear()
-        except Exception as e:
-            print(f"❌ Erro ao salvar dados: {e}")
-    
-    def _escrever_json(self, arquivo: Path, dados: Any) -> None:
-        """Escreve dados em JSON"""
-        with open(arquivo, 'w', encoding=self.ENCODING) as f:
-            json.dump(dados, f, ensure_ascii=False, indent=2)
-    
-    def _inicializar_dados_teste(self) -> None:
-        """Inicializa dados de teste"""
-        try:
-            agora = datetime.now().strftime('%d/%m/%Y %H:%M')
-            self.usuarios = {
-                'usuario1': self._criar_usuario('João Silva', 'joao@example.com', '123456', 
-                                               'Desenvolvedor Python', 'Apaixonado por programação', agora),
-                'usuario2': self._criar_usuario('Maria Santos', 'maria@example.com', '123456',
-                                               'Designer UX/UI', 'Criando experiências incríveis', agora)
-            }
-            
-            nomes_dict = self.DADOS_PRECONFIGURADOS['nomes']
-            titulos_dict = self.DADOS_PRECONFIGURADOS['titulos']
-            bios_dict = self.DADOS_PRECONFIGURADOS['bios']
-            
-            for i, nome in enumerate(nomes_dict.values(), 3):
-                username = f'usuario{i}'
-                self.usuarios[username] = self._criar_usuario(
-                    nome, f'{nome.lower().replace(" ", ".")}@example.com', '123456',
-                    titulos_dict[i % len(titulos_dict)], bios_dict[i % len(bios_dict)], agora
-                )
-            
-            self.conexoes = {u: [] for u in self.usuarios}
-            self.conexoes['usuario1'] = ['usuario2']
-            self.conexoes['usuario2'] = ['usuario1']
-            
-            self.posts = [
-                {'id': 1, 'usuario': 'usuario1', 'autor_nome': 'João Silva', 'conteudo': 'Bem-vindo ao LinkedIn SPA! 🚀',
-                 'data': agora, 'likes': [], 'comentarios': []},
-                {'id': 2, 'usuario': 'usuario2', 'autor_nome': 'Maria Santos', 
-                 'conteudo': 'Adorando este novo sistema! 💼', 'data': agora, 'likes': ['usuario1'], 'comentarios': []}
-            ]
-        except Exception as e:
-            print(f"Erro ao inicializar dados: {e}")
-    
-    def _criar_usuario(self, nome: str, email: str, senha: str, titulo: str, bio: str, data: str) -> Dict:
-        """Factory para criar usuário"""
-        return {'nome': nome, 'email': email, 'senha': senha, 'titulo': titulo, 'bio': bio,
-                'data_criacao': data, 'seguidores': [], 'seguindo': []}
-    
-    @staticmethod
-    def _limpar_tela() -> None:
-        """Limpa console"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-    
-    def _validar_email(self, email: str) -> bool:
-        """Valida email"""
-        return bool(re.match(self.REGEX_EMAIL, email.strip()))
-    
-    def _validar_senha(self, senha: str) -> Tuple[bool, str]:
-        """Valida senha"""
-        if len(senha) < self.MIN_SENHA_LEN:
-            return False, f"Mín. {self.MIN_SENHA_LEN} caracteres"
-        if not any(c.isupper() for c in senha):
-            return False, "Requer letra maiúscula"
-        if not any(c.isdigit() for c in senha):
-            return False, "Requer números"
-        return True, "Válida"
-    
-    def _validar_username(self, username: str) -> Tuple[bool, str]:
-        """Valida usuário"""
-        username = username.strip()
-        if len(username) < self.MIN_USERNAME_LEN:
-            return False, f"Mín. {self.MIN_USERNAME_LEN} caracteres"
-        if not re.match(r'^[a-zA-Z0-9_]+$', username):
-            return False, "Apenas letras, números e _"
-        return True, "Válido"
-    
-    def _buscar_usuarios(self, termo: str) -> Generator:
-        """Generator para buscar usuários (otimizado)"""
-        termo_lower = termo.lower()
-        for username, dados in self.usuarios.items():
-            if termo_lower in username or termo_lower in dados['nome'].lower():
-                yield username, dados
-    
-    def _obter_posts_usuario(self, username: str) -> List[Dict]:
-        """Obtém posts com cache"""
-        if username not in self._cache_posts:
-            self._cache_posts[username] = [p for p in self.posts if p['usuario'] == username]
-        return self._cache_posts[username]
+        super().__init__(modo_armazenamento, estrategia_feed)
+        self.tela = Tela(ao_desenhar=self._quadro_desenhado)
+    
+    def _limpar_tela(self) -> None:
+        """Começa uma nova tela (enviada de uma vez na próxima leitura)"""
+        self.tela.limpar()
+    
+    def _quadro_desenhado(self, latencia: float, tamanho: int) -> None:
+        """Latência entre a tecla e o quadro seguinte, nas métricas"""
+        if self.metricas.ativo:
+            self.metricas.observar('spa_quadro_segundos', latencia)
+            self.metricas.incrementar('spa_quadro_bytes_total', tamanho)
+    
+    def _descrever_relacao(self, username: str) -> str:
+        """Grau de separação e conexões em comum em relação ao usuário logado"""
+        grau = self.recomendador.grau(self.usuario_logado, username)
+        em_comum = self.recomendador.em_comum(self.usuario_logado, username)
+        return f"{f'{grau}º grau' if grau else 'Fora da sua rede'} · {em_comum} em comum"
+    
+    def _exibir_sugestoes(self) -> List[str]:
+        """Mostra 'Pessoas que talvez você conheça' e retorna os usernames na ordem exibida"""
+        sugestoes = self.recomendador.sugestoes(self.usuario_logado, self.LIMITE_SUGESTOES)
+        if sugestoes:
+            print("\n💡 Pessoas que talvez você conheça:")
+            for i, (username, em_comum) in enumerate(sugestoes, 1):
+                dados = self.usuarios[username]
+                print(f"  {i}. {dados['nome']} (@{username}) - {dados['titulo']} · {em_comum} em comum")
+        return [username for username, _ in sugestoes]
     
     def registrar_usuario(self) -> None:
         """Registra novo usuário"""
@@ -190,47 +59,47 @@ class LinkedInSPA:
         try:
             # Usuário
             while True:
-                username = input("\n👤 Username: ").strip()
-                valido, msg = self._validar_username(username)
-                if not valido or username in self.usuarios:
-                    print(f"❌ {msg if not valido else 'Já existe'}")
+                username = self.tela.ler("\n👤 Username: ").strip()
+                try:
+                    self.validar_novo_username(username)
+                except ErroDominio as e:
+                    print(f"❌ {e}")
                     continue
                 break
             
             # Email
             while True:
-                email = input("📧 Email: ").strip()
-                if not self._validar_email(email) or any(u['email'] == email for u in self.usuarios.values()):
-                    print("❌ Email inválido ou já existe")
+                email = self.tela.ler("📧 Email: ").strip()
+                try:
+                    self.validar_novo_email(email)
+                except ErroDominio as e:
+                    print(f"❌ {e}")
                     continue
                 break
             
             # Senha
             while True:
-                senha = input("🔒 Senha: ").strip()
-                valido, msg = self._validar_senha(senha)
-                if not valido:
-                    print(f"❌ {msg}")
+                senha = self.tela.ler("🔒 Senha: ").strip()
+                try:
+                    self.validar_nova_senha(senha)
+                except ErroDominio as e:
+                    print(f"❌ {e}")
                     continue
-                if input("   Confirme: ").strip() != senha:
+                if self.tela.ler("   Confirme: ").strip() != senha:
                     print("❌ Senhas não conferem")
                     continue
                 break
             
-            nome = input("✍️  Nome completo: ").strip()
+            nome = self.tela.ler("✍️  Nome completo: ").strip()
             if not nome or len(nome) < 3:
                 print("❌ Nome muito curto")
                 return
             
-            self.usuarios[username] = self._criar_usuario(
-                nome, email, senha, input("💼 Título: ").strip() or "Profissional",
-                input("📝 Bio (máx 200): ").strip()[:self.MAX_BIO_LEN] or "Sem bio",
-                datetime.now().strftime('%d/%m/%Y %H:%M')
-            )
-            self.conexoes[username] = []
-            self._salvar_dados()
+            self.registrar(username, email, senha, nome, self.tela.ler("💼 Título: "), self.tela.ler("📝 Bio (máx 200): "))
             print(f"\n✅ Bem-vindo, {nome}!")
-            input("\n👉 ENTER...")
+            self.tela.ler("\n👉 ENTER...")
+        except ErroDominio as e:
+            print(f"❌ {e}")
         except KeyboardInterrupt:
             print("\n⚠️  Cancelado")
         except Exception as e:
@@ -244,20 +113,22 @@ class LinkedInSPA:
         print("=" * 60)
         
         try:
-            username = input("\n👤 Username: ").strip()
+            username = self.tela.ler("\n👤 Username: ").strip()
             if username not in self.usuarios:
                 print("❌ Usuário não encontrado")
-                input("\n👉 ENTER...")
+                self.tela.ler("\n👉 ENTER...")
                 return False
             
-            if self.usuarios[username]['senha'] != input("🔒 Senha: ").strip():
-                print("❌ Senha incorreta")
-                input("\n👉 ENTER...")
+            try:
+                usuario = self.autenticar(username, self.tela.ler("🔒 Senha: ").strip())
+            except ErroDominio as e:
+                print(f"❌ {e}")
+                self.tela.ler("\n👉 ENTER...")
                 return False
             
             self.usuario_logado = username
-            print(f"\n✅ Bem-vindo, {self.usuarios[username]['nome']}!")
-            input("\n👉 ENTER...")
+            print(f"\n✅ Bem-vindo, {usuario['nome']}!")
+            self.tela.ler("\n👉 ENTER...")
             return True
         except KeyboardInterrupt:
             print("\n⚠️  Cancelado")
@@ -277,7 +148,7 @@ class LinkedInSPA:
             print("2️⃣  - Ver todos")
             print("3️⃣  - Voltar")
             
-            opcao = input("\nOpção: ").strip()
+            opcao = self.tela.ler("\nOpção: ").strip()
             if opcao == '1':
                 self._buscar_usuario_publico()
             elif opcao == '2':
@@ -288,17 +159,17 @@ class LinkedInSPA:
     def _buscar_usuario_publico(self) -> None:
         """Busca usuário"""
         self._limpar_tela()
-        termo = input("=" * 60 + "\n🔍 BUSCAR\n" + "=" * 60 + "\nDigite nome/username: ").strip().lower()
+        termo = self.tela.ler("=" * 60 + "\n🔍 BUSCAR\n" + "=" * 60 + "\nDigite nome/username: ").strip().lower()
         
         if not termo:
             print("⚠️  Vazio")
-            input("\n👉 ENTER...")
+            self.tela.ler("\n👉 ENTER...")
             return
         
-        resultados = list(self._buscar_usuarios(termo))
+        resultados = self.buscar(termo)
         if not resultados:
             print(f"❌ Nenhum usuário encontrado")
-            input("\n👉 ENTER...")
+            self.tela.ler("\n👉 ENTER...")
             return
         
         self._exibir_resultados(resultados)
@@ -320,14 +191,14 @@ class LinkedInSPA:
             print(f"{len(resultados) + 1}. Voltar")
             
             try:
-                opcao = int(input("Escolha: ").strip())
+                opcao = int(self.tela.ler("Escolha: ").strip())
                 if opcao == len(resultados) + 1:
                     return
                 if 1 <= opcao <= len(resultados):
                     self._exibir_perfil_publico(resultados[opcao - 1][0])
             except (ValueError, IndexError):
                 print("❌ Inválido")
-                input("\n👉 ENTER...")
+                self.tela.ler("\n👉 ENTER...")
     
     def _listar_todos_usuarios(self) -> None:
         """Lista usuários com paginação"""
@@ -358,7 +229,7 @@ class LinkedInSPA:
             nav.extend(["N°=Ver", "V=Sair"])
             print(" | ".join(nav))
             
-            opcao = input("\nOpção: ").strip().upper()
+            opcao = self.tela.ler("\nOpção: ").strip().upper()
             
             if opcao == 'A' and pagina > 0:
                 pagina -= 1
@@ -381,7 +252,7 @@ class LinkedInSPA:
                 return
             
             usuario = self.usuarios[username]
-            posts = self._obter_posts_usuario(username)
+            conexoes, seguidores, seguindo, total_posts = self._obter_estatisticas_perfil(username)
             
             print("=" * 60)
             print("👤 PERFIL DO USUÁRIO")
@@ -391,16 +262,16 @@ class LinkedInSPA:
             print(f"💼 {usuario['titulo']}")
             print(f"📝 {usuario['bio']}")
             print(f"📅 {usuario['data_criacao']}")
-            print(f"\n🔗 Conexões: {len(self.conexoes.get(username, []))} | 👥 Seguidores: {len(usuario['seguidores'])} | 📌 Seguindo: {len(usuario['seguindo'])}")
-            print(f"✍️  Posts: {len(posts)}")
+            print(f"\n🔗 Conexões: {conexoes} | 👥 Seguidores: {seguidores} | 📌 Seguindo: {seguindo}")
+            print(f"✍️  Posts: {total_posts}")
             
-            if not posts:
+            if not total_posts:
                 print("\n⚠️  Sem posts")
-                input("\n👉 ENTER...")
+                self.tela.ler("\n👉 ENTER...")
                 return
             
             print("\n1️⃣  - Ver posts | 2️⃣  - Voltar")
-            if input("\nOpção: ").strip() == '1':
+            if self.tela.ler("\nOpção: ").strip() == '1':
                 self._exibir_posts_usuario(username)
             else:
                 return
@@ -410,48 +281,48 @@ class LinkedInSPA:
         posts = self._obter_posts_usuario(username)
         if not posts:
             print("⚠️  Sem posts")
-            input("\n👉 ENTER...")
+            self.tela.ler("\n👉 ENTER...")
             return
         
         usuario = self.usuarios[username]
-        indice = 0
+        navegador = Navegador(posts, self.PAGINA_SIZE)
         
-        while indice < len(posts):
+        while navegador.atual is not None:
             self._limpar_tela()
-            post = posts[indice]
+            post = navegador.atual
             
             print("=" * 60)
             print("📰 POSTS")
             print("=" * 60)
             print(f"\n👤 {usuario['nome']} (@{username})")
             print(f"💼 {usuario['titulo']}")
-            print(f"\nPost {indice + 1}/{len(posts)}")
+            print(f"\nPost {navegador.posicao + 1}/{len(posts)}")
             print("-" * 60)
             print(f"📅 {post['data']}\n{post['conteudo']}\n")
             print("-" * 60)
-            print(f"❤️  {len(post['likes'])} | 💬 {len(post['comentarios'])}")
+            print(f"❤️  {post['total_curtidas']} | 💬 {post['total_comentarios']}")
             
-            if post['comentarios']:
+            if post['total_comentarios']:
                 print("\n💬:")
-                for i, com in enumerate(post['comentarios'][:3], 1):
+                for i, com in enumerate(self.pagina_comentarios(post['id'], limite=3), 1):
                     print(f"  {i}. {com['nome']}: {com['texto'][:40]}...")
-                if len(post['comentarios']) > 3:
-                    print(f"  +{len(post['comentarios']) - 3}")
+                if post['total_comentarios'] > 3:
+                    print(f"  +{post['total_comentarios'] - 3}")
             
             print("\n-" * 30)
             nav = []
-            if indice > 0:
+            if navegador.tem_anterior():
                 nav.append("1=Ant")
-            if indice < len(posts) - 1:
+            if navegador.tem_proximo():
                 nav.append("2=Prox")
             nav.append("3=Sair")
             print(" | ".join(nav))
             
-            opcao = input("\nOpção: ").strip()
-            if opcao == '1' and indice > 0:
-                indice -= 1
-            elif opcao == '2' and indice < len(posts) - 1:
-                indice += 1
+            opcao = self.tela.ler("\nOpção: ").strip()
+            if opcao == '1':
+                navegador.anterior()
+            elif opcao == '2':
+                navegador.proximo()
             elif opcao == '3':
                 return
     
@@ -468,12 +339,19 @@ class LinkedInSPA:
             print(f"💼 {usuario['titulo']}")
             print(f"📝 {usuario['bio']}")
             print(f"📅 {usuario['data_criacao']}")
-            print(f"\n🔗 Conexões: {len(self.conexoes[self.usuario_logado])}")
-            print("\n1️⃣  - Editar | 2️⃣  - Voltar")
+            print(f"\n🔗 Conexões: {len(self.grafo.conexoes(self.usuario_logado))}")
+            sugestoes = self._exibir_sugestoes()
+            print("\n1️⃣  - Editar | 2️⃣  - Conectar com sugestão | 3️⃣  - Voltar")
             
-            if input("\nOpção: ").strip() == '1':
+            opcao = self.tela.ler("\nOpção: ").strip()
+            if opcao == '1':
                 self._editar_perfil()
-            else:
+            elif opcao == '2' and sugestoes:
+                num = self.tela.ler("Nº da sugestão: ").strip()
+                if num.isdigit() and 1 <= int(num) <= len(sugestoes):
+                    self.adicionar_conexao(sugestoes[int(num) - 1])
+                    self.tela.ler("\n👉 ENTER...")
+            elif opcao != '2':
                 return
     
     def _editar_perfil(self) -> None:
@@ -488,36 +366,34 @@ class LinkedInSPA:
         print(f"2️⃣  Bio: {usuario['bio']}")
         print("3️⃣  Voltar")
         
-        opcao = input("\nEditar: ").strip()
-        if opcao == '1':
-            novo = input("\nNovo título: ").strip()
-            if novo:
-                usuario['titulo'] = novo
-                self._salvar_dados()
-                print("✅ Atualizado!")
-        elif opcao == '2':
-            novo = input(f"\nNova bio (máx {self.MAX_BIO_LEN}): ").strip()[:self.MAX_BIO_LEN]
+        opcao = self.tela.ler("\nEditar: ").strip()
+        campo, rotulo = {'1': ('titulo', "\nNovo título: "),
+                         '2': ('bio', f"\nNova bio (máx {self.MAX_BIO_LEN}): ")}.get(opcao, (None, None))
+        if campo:
+            novo = self.tela.ler(rotulo).strip()
             if novo:
-                usuario['bio'] = novo
-                self._salvar_dados()
-                print("✅ Atualizado!")
+                try:
+                    self.editar_perfil(self.usuario_logado, campo, novo)
+                    print("✅ Atualizado!")
+                except ErroDominio as e:
+                    print(f"⚠️  {e}")
         
-        input("\n👉 ENTER...")
+        self.tela.ler("\n👉 ENTER...")
     
     def buscar_usuarios(self) -> None:
         """Busca usuários para conectar"""
         self._limpar_tela()
-        termo = input("=" * 60 + "\n🔍 BUSCAR USUÁRIOS\n" + "=" * 60 + "\nNome/username: ").strip().lower()
+        termo = self.tela.ler("=" * 60 + "\n🔍 BUSCAR USUÁRIOS\n" + "=" * 60 + "\nNome/username: ").strip().lower()
         
         if not termo:
             print("⚠️  Vazio")
-            input("\n👉 ENTER...")
+            self.tela.ler("\n👉 ENTER...")
             return
         
-        resultados = list(self._buscar_usuarios(termo))
+        resultados = self.buscar(termo)
         if not resultados:
             print("❌ Nenhum encontrado")
-            input("\n👉 ENTER...")
+            self.tela.ler("\n👉 ENTER...")
             return
         
         self._limpar_tela()
@@ -528,41 +404,37 @@ class LinkedInSPA:
         for i, (username, dados) in enumerate(resultados, 1):
             print(f"\n{i}. {dados['nome']} (@{username})")
             print(f"   💼 {dados['titulo']}")
+            if username != self.usuario_logado:
+                print(f"   🔗 {self._descrever_relacao(username)}")
+        
+        self._exibir_sugestoes()
         
         if len(resultados) == 1:
             username = resultados[0][0]
             if username != self.usuario_logado:
-                if input("\nAdicionar? (S/N): ").strip().upper() == 'S':
+                caminho = self.recomendador.caminho(self.usuario_logado, username)
+                if caminho and len(caminho) > 2:
+                    print("\n🧭 Como vocês se conectam: " + " → ".join(f"@{u}" for u in caminho))
+                if self.tela.ler("\nAdicionar? (S/N): ").strip().upper() == 'S':
                     self.adicionar_conexao(username)
         
-        input("\n👉 ENTER...")
+        self.tela.ler("\n👉 ENTER...")
     
     def adicionar_conexao(self, username_alvo: str) -> None:
         """Adiciona conexão"""
-        if username_alvo not in self.usuarios or username_alvo == self.usuario_logado:
-            print("❌ Inválido")
-            return
-        
-        if username_alvo in self.conexoes[self.usuario_logado]:
-            print("⚠️  Já conectados")
+        try:
+            if not self.conectar(self.usuario_logado, username_alvo):
+                print("⚠️  Já conectados")
+                return
+        except ErroDominio as e:
+            print(f"❌ {e}")
             return
-        
-        self.conexoes[self.usuario_logado].append(username_alvo)
-        if self.usuario_logado not in self.conexoes[username_alvo]:
-            self.conexoes[username_alvo].append(self.usuario_logado)
-        
-        if username_alvo not in self.usuarios[self.usuario_logado]['seguindo']:
-            self.usuarios[self.usuario_logado]['seguindo'].append(username_alvo)
-        if self.usuario_logado not in self.usuarios[username_alvo]['seguidores']:
-            self.usuarios[username_alvo]['seguidores'].append(self.usuario_logado)
-        
-        self._salvar_dados()
         print("✅ Conectado!")
     
     def listar_conexoes(self) -> None:
         """Lista conexões"""
         self._limpar_tela()
-        conexoes = self.conexoes[self.usuario_logado]
+        conexoes = self.grafo.conexoes(self.usuario_logado)
         
         print("=" * 60)
         print("🔗 MINHAS CONEXÕES")
@@ -576,7 +448,62 @@ class LinkedInSPA:
                 dados = self.usuarios[username]
                 print(f"{i}. {dados['nome']} (@{username}) - {dados['titulo']}")
         
-        input("\n👉 ENTER...")
+        self.tela.ler("\n👉 ENTER...")
+    
+    def em_alta(self) -> None:
+        """Posts em alta por janela de tempo"""
+        janelas = {'1': '1h', '2': '24h', '3': '7d'}
+        janela = '24h'
+        while True:
+            self._limpar_tela()
+            print("=" * 60)
+            print(f"🔥 EM ALTA ({janela})")
+            print("=" * 60)
+            
+            posts = self.posts_em_alta(janela)
+            if not posts:
+                print("\n⚠️  Nenhuma interação na janela")
+            for i, (post, escore) in enumerate(posts, 1):
+                print(f"\n{i}. {post['autor_nome']} (@{post['usuario']}) - 🔥 {escore:.1f}")
+                print(f"   {post['conteudo'][:50]}")
+                print(f"   ❤️  {post['total_curtidas']} | 💬 {post['total_comentarios']}")
+            
+            print("\n" + "-" * 60)
+            print("1=1h | 2=24h | 3=7d | 4=Voltar")
+            opcao = self.tela.ler("\nOpção: ").strip()
+            if opcao not in janelas:
+                return
+            janela = janelas[opcao]
+    
+    def pesquisar_posts(self) -> None:
+        """Busca posts por texto, com filtros opcionais de autor e data"""
+        self._limpar_tela()
+        termo = self.tela.ler("=" * 60 + "\n🔎 BUSCAR POSTS\n" + "=" * 60 + "\nTexto: ").strip()
+        if not termo:
+            print("⚠️  Vazio")
+            self.tela.ler("\n👉 ENTER...")
+            return
+        autor = self.tela.ler("👤 Autor (@username, ENTER = todos): ").strip().lstrip('@') or None
+        desde = self.tela.ler("📅 Desde (dd/mm/aaaa, ENTER = sempre): ").strip()
+        try:
+            inicio = time.mktime(time.strptime(desde, '%d/%m/%Y')) if desde else None
+            resultados = self.buscar_posts(termo, autor, inicio)
+        except ValueError as e:
+            print(f"❌ {e if isinstance(e, ErroDominio) else 'Data inválida'}")
+            self.tela.ler("\n👉 ENTER...")
+            return
+        
+        self._limpar_tela()
+        print("=" * 60)
+        print(f"🔎 POSTS COM \"{termo}\"")
+        print("=" * 60)
+        if not resultados:
+            print("\n❌ Nenhum encontrado")
+        for i, (post, escore) in enumerate(resultados, 1):
+            print(f"\n{i}. {post['autor_nome']} (@{post['usuario']}) - 📅 {post['data']}")
+            print(f"   {post['conteudo'][:50]}")
+            print(f"   ❤️  {post['total_curtidas']} | 💬 {post['total_comentarios']} | 🎯 {escore:.2f}")
+        self.tela.ler("\n👉 ENTER...")
     
     def criar_post(self) -> None:
         """Cria novo post"""
@@ -588,68 +515,64 @@ class LinkedInSPA:
         
         linhas = []
         while True:
-            linha = input()
+            linha = self.tela.ler()
             if linha.strip().upper() == 'SAIR':
                 print("⚠️  Cancelado")
-                input("\n👉 ENTER...")
+                self.tela.ler("\n👉 ENTER...")
                 return
             linhas.append(linha)
             if len('\n'.join(linhas)) >= self.MAX_POST_LEN:
                 break
         
-        conteudo = '\n'.join(linhas).strip()
-        if len(conteudo) < self.MIN_POST_LEN:
-            print(f"❌ Mín {self.MIN_POST_LEN} caracteres")
-            input("\n👉 ENTER...")
+        try:
+            self.publicar(self.usuario_logado, '\n'.join(linhas))
+        except ErroDominio as e:
+            print(f"❌ {e}")
+            self.tela.ler("\n👉 ENTER...")
             return
-        
-        novo_id = max([p['id'] for p in self.posts], default=0) + 1
-        novo_post = {
-            'id': novo_id, 'usuario': self.usuario_logado,
-            'autor_nome': self.usuarios[self.usuario_logado]['nome'],
-            'conteudo': conteudo[:self.MAX_POST_LEN],
-            'data': datetime.now().strftime('%d/%m/%Y %H:%M'),
-            'likes': [], 'comentarios': []
-        }
-        
-        self.posts.insert(0, novo_post)
-        self._salvar_dados()
         print("\n✅ PUBLICADO!")
-        input("\n👉 ENTER...")
+        self.tela.ler("\n👉 ENTER...")
     
-    def feed(self) -> None:
-        """Exibe feed de posts"""
-        if not self.posts:
+    def feed(self, rede: bool = False) -> None:
+        """Exibe feed de posts (paginação por cursor); ``rede`` mostra só a minha rede"""
+        linha = self.linha_feed(self.usuario_logado, rede)
+        if not linha:
             self._limpar_tela()
             print("⚠️  Sem posts")
-            input("\n� ENTER...")
+            self.tela.ler("\n� ENTER...")
             return
         
-        indice = 0
-        while indice < len(self.posts):
-            self._limpar_tela()
-            post = self.posts[indice]
-            
-            print("=" * 60)
-            print("📰 FEED")
-            print("=" * 60)
-            print(f"\nPost {indice + 1}/{len(self.posts)}\n")
-            print("-" * 60)
-            print(f"{post['autor_nome']} (@{post['usuario']})")
-            print(f"📅 {post['data']}\n\n{post['conteudo']}\n")
-            print("-" * 60)
-            print(f"❤️  {len(post['likes'])} | 💬 {len(post['comentarios'])}")
-            
-            if post['comentarios']:
-                print("\n💬:")
-                for i, com in enumerate(post['comentarios'][:2], 1):
-                    print(f"  {i}. {com['nome']}: {com['texto'][:40]}...")
-            
-            print("\n" + "-" * 60)
+        navegador, recargas = Navegador(linha, self.PAGINA_SIZE), self.recargas
+        while navegador.atual is not None:
+            self.atualizar()
+            if self.recargas != recargas:  # outro processo gravou: continua sobre os dados relidos
+                linha, recargas = self.linha_feed(self.usuario_logado, rede), self.recargas
+                navegador.trocar_linha(linha)
+                if navegador.atual is None:
+                    return
+            post = navegador.atual
+            with self.metricas.medir('renderizar_feed'):
+                self._limpar_tela()
+                print("=" * 60)
+                print("📰 FEED DA MINHA REDE" if rede else "📰 FEED")
+                print("=" * 60)
+                print(f"\nPost {navegador.posicao + 1}/{len(linha)}\n")
+                print("-" * 60)
+                print(f"{post['autor_nome']} (@{post['usuario']})")
+                print(f"📅 {post['data']}\n\n{post['conteudo']}\n")
+                print("-" * 60)
+                print(f"❤️  {post['total_curtidas']} | 💬 {post['total_comentarios']}")
+                
+                if post['total_comentarios']:
+                    print("\n💬:")
+                    for i, com in enumerate(self.pagina_comentarios(post['id'], limite=2), 1):
+                        print(f"  {i}. {com['nome']}: {com['texto'][:40]}...")
+                
+                print("\n" + "-" * 60)
             
             if post['usuario'] != self.usuario_logado:
                 print("1=Curtir | 2=Comentar | 3=Sair | ←/→=Nav")
-                opcao = input("\nOpção: ").strip()
+                opcao = self.tela.ler("\nOpção: ").strip()
                 
                 if opcao == '1':
                     self._curtir_post(post)
@@ -658,56 +581,68 @@ class LinkedInSPA:
                 elif opcao == '3':
                     return
                 elif opcao in ['a', '4']:
-                    indice = max(0, indice - 1)
+                    navegador.anterior()
                 else:
-                    indice = min(len(self.posts) - 1, indice + 1)
+                    navegador.proximo()
             else:
                 print("1=Deletar | 2=Sair | ←/→=Nav")
-                opcao = input("\nOpção: ").strip()
+                opcao = self.tela.ler("\nOpção: ").strip()
                 
                 if opcao == '1':
-                    if input("Certeza? (S/N): ").upper() == 'S':
-                        self.posts.pop(indice)
-                        self._salvar_dados()
-                        indice = min(indice, len(self.posts) - 1) if self.posts else 0
+                    if self.tela.ler("Certeza? (S/N): ").upper() == 'S':
+                        try:
+                            self.deletar_post(self.usuario_logado, post['id'])
+                        except ErroDominio as e:
+                            print(f"⚠️  {e}")
+                            self.tela.ler("\n👉 ENTER...")
+                            continue
+                        navegador.descartar_atual()
                 elif opcao == '2':
                     return
                 elif opcao in ['a', '4']:
-                    indice = max(0, indice - 1)
+                    navegador.anterior()
                 else:
-                    indice = min(len(self.posts) - 1, indice + 1)
+                    navegador.proximo()
+    
+    def exibir_notificacoes(self) -> None:
+        """Avisos do usuário, com os novos destacados (passam a contar como lidos)"""
+        self._limpar_tela()
+        print("=" * 60)
+        print("🔔 NOTIFICAÇÕES")
+        print("=" * 60)
+        
+        avisos = self.ler_notificacoes(self.usuario_logado)
+        if not avisos:
+            print("\n⚠️  Nenhuma notificação")
+        icones = {'curtir': '❤️ ', 'comentar': '💬', 'conectar': '🔗', 'post': '📝'}
+        for aviso in avisos:
+            novo = '🆕 ' if not aviso.lida else ''
+            print(f"\n{icones[aviso.tipo]} {novo}{aviso.texto(self.nome_de)}")
+            print(f"   📅 {data_de(aviso.instante)}")
+        self.tela.ler("\n👉 ENTER...")
     
     def _curtir_post(self, post: Dict) -> None:
         """Curte/descurte post"""
-        if self.usuario_logado in post['likes']:
-            post['likes'].remove(self.usuario_logado)
-            print("💔 Removido")
-        else:
-            post['likes'].append(self.usuario_logado)
-            print("❤️  Curtido!")
-        self._salvar_dados()
-        input("\n👉 ENTER...")
+        try:
+            print("❤️  Curtido!" if self.alternar_curtida(self.usuario_logado, post['id']) else "💔 Removido")
+        except ErroDominio as e:
+            print(f"⚠️  {e}")
+        self.tela.ler("\n👉 ENTER...")
     
     def _comentar_post(self, post: Dict) -> None:
         """Adiciona comentário"""
-        com = input("\n📝 Comentário (máx 200): ").strip()[:self.MAX_COMENTARIO]
-        if len(com) < 2:
-            print("⚠️  Muito curto")
+        try:
+            self.comentar(self.usuario_logado, post['id'], self.tela.ler("\n📝 Comentário (máx 200): "))
+        except ErroDominio as e:
+            print(f"⚠️  {e}")
             return
-        
-        post['comentarios'].append({
-            'usuario': self.usuario_logado,
-            'nome': self.usuarios[self.usuario_logado]['nome'],
-            'texto': com,
-            'data': datetime.now().strftime('%d/%m/%Y %H:%M')
-        })
-        self._salvar_dados()
         print("✅ Adicionado!")
-        input("\n👉 ENTER...")
+        self.tela.ler("\n👉 ENTER...")
     
     def menu_principal(self) -> None:
         """Menu principal"""
         while not self.usuario_logado:
+            self.atualizar()
             self._limpar_tela()
             print("=" * 60)
             print("🌐 LINKEDIN SPA")
@@ -717,7 +652,7 @@ class LinkedInSPA:
             print("3️⃣  - Ver perfis (sem login)")
             print("4️⃣  - Sair")
             
-            opcao = input("\nOpção: ").strip()
+            opcao = self.tela.ler("\nOpção: ").strip()
             
             if opcao == '1':
                 self.registrar_usuario()
@@ -733,19 +668,27 @@ class LinkedInSPA:
     def menu_usuario(self) -> None:
         """Menu do usuário logado"""
         while self.usuario_logado:
+            self.atualizar()
             usuario = self.usuarios[self.usuario_logado]
             self._limpar_tela()
             print("=" * 60)
             print(f"🌐 Bem-vindo, {usuario['nome']}")
             print("=" * 60)
+            nao_lidas = self.notificacoes_nao_lidas(self.usuario_logado)
+            if nao_lidas:
+                print(f"\n🔔 {nao_lidas} {'notificação nova' if nao_lidas == 1 else 'notificações novas'}")
             print("\n1️⃣  - Meu perfil")
             print("2️⃣  - Buscar usuários")
             print("3️⃣  - Minhas conexões")
             print("4️⃣  - Feed")
-            print("5️⃣  - Novo post")
-            print("6️⃣  - Logout")
+            print("5️⃣  - Feed da minha rede")
+            print("6️⃣  - Novo post")
+            print("7️⃣  - Em alta")
+            print("8️⃣  - Buscar posts")
+            print(f"9️⃣  - Notificações{f' ({nao_lidas})' if nao_lidas else ''}")
+            print("🔟 - Logout")
             
-            opcao = input("\nOpção: ").strip()
+            opcao = self.tela.ler("\nOpção: ").strip()
             
             if opcao == '1':
                 self.exibir_perfil()
@@ -756,33 +699,44 @@ class LinkedInSPA:
             elif opcao == '4':
                 self.feed()
             elif opcao == '5':
-                self.criar_post()
+                self.feed(rede=True)
             elif opcao == '6':
-                if input("\nSair? (S/N): ").upper() == 'S':
+                self.criar_post()
+            elif opcao == '7':
+                self.em_alta()
+            elif opcao == '8':
+                self.pesquisar_posts()
+            elif opcao == '9':
+                self.exibir_notificacoes()
+            elif opcao == '10':
+                if self.tela.ler("\nSair? (S/N): ").upper() == 'S':
                     print(f"\n👋 Até logo, {usuario['nome']}!")
                     self.usuario_logado = None
-                    input("\n👉 ENTER...")
+                    self.tela.ler("\n👉 ENTER...")
     
     def iniciar(self) -> None:
         """Inicia o sistema"""
         try:
-            self._limpar_tela()
-            print("\n" + "╔" + "=" * 58 + "╗")
-            print("║" + "🌐 BEM-VINDO AO LINKEDIN SPA 🌐".center(58) + "║")
-            print("║" + "Rede Social Profissional".center(58) + "║")
-            print("╚" + "=" * 58 + "╝\n")
-            
-            input("👉 ENTER para começar...")
-            
-            self.menu_principal()
-            self.menu_usuario()
-            
-            print("\n✅ Sistema finalizado!")
+            with self.tela:
+                self._limpar_tela()
+                print("\n" + "╔" + "=" * 58 + "╗")
+                print("║" + "🌐 BEM-VINDO AO LINKEDIN SPA 🌐".center(58) + "║")
+                print("║" + "Rede Social Profissional".center(58) + "║")
+                print("╚" + "=" * 58 + "╝\n")
+                
+                self.tela.ler("👉 ENTER para começar...")
+                
+                self.menu_principal()
+                self.menu_usuario()
+                
+                print("\n✅ Sistema finalizado!")
             
         except KeyboardInterrupt:
             print("\n\n⚠️  Interrompido")
         except Exception as e:
             print(f"\n❌ Erro: {e}")
+        finally:
+            self.fechar()
 
 
 def main():
@@ -0,0 +1,430 @@
+"""
+API HTTP/JSON DO LINKEDIN SPA
+Descrição: Servidor HTTP/1.1 mínimo em asyncio (só biblioteca padrão) que expõe
+as operações do núcleo como endpoints JSON. Um único laço de eventos atende
+milhares de conexões keep-alive e só cuida do HTTP (leitura, rotas, sessões).
+As operações do núcleo rodam em série numa thread própria (NucleoSPA.em_serie):
+a gravação de cada mutação (fsync do diário, reescrita dos JSON, commit do
+SQLite) não trava o laço, e o núcleo segue sem travas porque só essa thread o
+toca. O hash de senha (cadastro e login) vai para o pool de senhas do núcleo;
+a espera não ocupa nem o laço nem a thread do núcleo. O modo de armazenamento
+padrão é o 'diario' (ver ServidorAPI.MODO_ARMAZENAMENTO).
+Uso: python api.py [--host 127.0.0.1] [--porta 8080] [--modo diario] [--metricas metricas.prom]
+
+Endpoints (``Authorization: Bearer <token>`` onde indicado com *):
+    POST   /usuarios                   {username, email, senha, nome, titulo?, bio?}
+    POST   /sessoes                    {username, senha} -> {token}
+    DELETE /sessoes                  *
+    GET    /usuarios?q=termo
+    GET    /usuarios/<username>
+    GET    /usuarios/<username>/posts  ?cursor=&limite=
+    GET    /sugestoes                *
+    POST   /conexoes                 * {alvo}
+    GET    /feed                     * ?rede=1&cursor=&limite=
+    GET    /notificacoes             * ?limite= (marca como lidas; {nao_lidas, notificacoes})
+    GET    /em-alta                    ?janela=24h&limite=
+    GET    /posts?q=termo              &autor=&desde=&ate= (epoch)&limite= (BM25 no conteúdo e comentários)
+    POST   /posts                    * {conteudo}
+    GET    /posts/<id>
+    DELETE /posts/<id>               *
+    POST   /posts/<id>/curtida       * (alterna)
+    GET    /posts/<id>/comentarios     ?cursor=&limite= (do mais antigo; cursor = id do último recebido)
+    POST   /posts/<id>/comentarios   * {texto}
+    GET    /metricas                   ?formato=json (Prometheus por padrão; só com --metricas)
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import secrets
+import time
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from metricas import REGISTRO
+from nucleo import Conflito, ErroDominio, FalhaGravacao, NaoEncontrado, NaoPermitido, NucleoSPA
+from registros import Registro, para_json
+
+
+class ErroHTTP(Exception):
+    """Resposta de erro com status HTTP explícito"""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class Requisicao:
+    """Requisição HTTP já lida do socket"""
+
+    __slots__ = ('metodo', 'caminho', 'query', 'cabecalhos', 'corpo', '_json')
+
+    def __init__(self, metodo: str, alvo: str, cabecalhos: Dict[str, str], corpo: bytes):
+        partes = urlsplit(alvo)
+        self.metodo, self.caminho = metodo, unquote(partes.path)
+        self.query = dict(parse_qsl(partes.query))
+        self.cabecalhos, self.corpo = cabecalhos, corpo
+        self._json: Optional[Dict[str, Any]] = None
+
+    def json(self) -> Dict[str, Any]:
+        """Corpo JSON (objeto) da requisição"""
+        if self._json is not None:
+            return self._json
+        try:
+            dados = json.loads(self.corpo or b'{}')
+        except ValueError:
+            raise ErroHTTP(400, "JSON inválido") from None
+        if not isinstance(dados, dict):
+            raise ErroHTTP(400, "O corpo deve ser um objeto JSON")
+        self._json = dados
+        return dados
+
+    def campo(self, nome: str) -> str:
+        """Campo de texto obrigatório do corpo JSON"""
+        valor = self.json().get(nome)
+        if not isinstance(valor, str):
+            raise ErroHTTP(400, f"Campo obrigatório: {nome}")
+        return valor
+
+    def inteiro(self, nome: str, padrao: Optional[int] = None) -> Optional[int]:
+        """Parâmetro inteiro da query string"""
+        valor = self.query.get(nome)
+        if valor in (None, ''):
+            return padrao
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErroHTTP(400, f"Parâmetro inteiro inválido: {nome}") from None
+
+
+class ServidorAPI:
+    """Roteia requisições HTTP para as operações de um NucleoSPA"""
+
+    TAMANHO_MAX_CABECALHO, TAMANHO_MAX_CORPO = 16 * 1024, 64 * 1024
+    TEMPO_OCIOSO = 60.0          # segundos sem requisição (ou com o cabeçalho incompleto) antes de fechar a conexão
+    TEMPO_CORPO = 10.0           # segundos para o corpo anunciado no Content-Length chegar inteiro
+    DURACAO_SESSAO = 24 * 3600   # validade de um token de login
+    LIMITE_MAX_PAGINA = 100
+    # 'completo' reescreveria todos os JSON a cada mutação; o diário só anexa uma linha (fsync em grupo)
+    MODO_ARMAZENAMENTO = 'diario'
+
+    def __init__(self, nucleo: NucleoSPA):
+        self.nucleo = nucleo
+        self._sessoes: Dict[str, Tuple[str, float]] = {}
+        self._rotas: List[Tuple[str, re.Pattern, Callable, bool]] = [
+            (metodo, re.compile(padrao + r'\Z'), manipulador, autenticada)
+            for metodo, padrao, manipulador, autenticada in (
+                ('POST', r'/usuarios', self._registrar, False),
+                ('POST', r'/sessoes', self._login, False),
+                ('DELETE', r'/sessoes', self._logout, True),
+                ('GET', r'/usuarios', self._buscar, False),
+                ('GET', r'/usuarios/(\w+)', self._perfil, False),
+                ('GET', r'/usuarios/(\w+)/posts', self._posts_do_usuario, False),
+                ('GET', r'/sugestoes', self._sugestoes, True),
+                ('POST', r'/conexoes', self._conectar, True),
+                ('GET', r'/feed', self._feed, True),
+                ('GET', r'/notificacoes', self._notificacoes, True),
+                ('GET', r'/em-alta', self._em_alta, False),
+                ('GET', r'/posts', self._buscar_posts, False),
+                ('POST', r'/posts', self._publicar, True),
+                ('GET', r'/posts/(\d+)', self._post, False),
+                ('DELETE', r'/posts/(\d+)', self._deletar_post, True),
+                ('POST', r'/posts/(\d+)/curtida', self._curtir, True),
+                ('GET', r'/posts/(\d+)/comentarios', self._comentarios, False),
+                ('POST', r'/posts/(\d+)/comentarios', self._comentar, True),
+                ('GET', r'/metricas', self._metricas, False),
+            )
+        ]
+
+    # ----- sessões -----
+
+    def _expirar_sessoes(self) -> None:
+        """Descarta os tokens vencidos. Todos duram DURACAO_SESSAO, então a ordem de criação (a do
+        dict) é a de expiração e só os primeiros são visitados"""
+        agora, vencidos = time.monotonic(), []
+        for token, (_, expira) in self._sessoes.items():
+            if expira >= agora:
+                break
+            vencidos.append(token)
+        for token in vencidos:
+            del self._sessoes[token]
+
+    def _usuario_da_sessao(self, req: Requisicao) -> str:
+        esquema, _, token = req.cabecalhos.get('authorization', '').partition(' ')
+        sessao = self._sessoes.get(token) if esquema.lower() == 'bearer' else None
+        if sessao is None or sessao[1] < time.monotonic():
+            self._sessoes.pop(token, None)
+            raise ErroHTTP(401, "Token ausente, inválido ou expirado")
+        return sessao[0]
+
+    # ----- representações -----
+
+    def _usuario_json(self, username: str) -> Dict[str, Any]:
+        usuario = self.nucleo.usuario(username)
+        conexoes, seguidores, seguindo, posts = self.nucleo._obter_estatisticas_perfil(username)
+        return {'username': username, 'nome': usuario['nome'], 'titulo': usuario['titulo'],
+                'bio': usuario['bio'], 'data_criacao': usuario['data_criacao'],
+                'conexoes': conexoes, 'seguidores': seguidores, 'seguindo': seguindo, 'posts': posts}
+
+    def _post_json(self, post) -> Dict[str, Any]:
+        dados = post.para_json() if isinstance(post, Registro) else dict(post)
+        dados['curtidas'] = post['total_curtidas']
+        return dados
+
+    def _pagina(self, req: Requisicao, linha) -> Dict[str, Any]:
+        limite = min(max(req.inteiro('limite', self.nucleo.PAGINA_SIZE), 1), self.LIMITE_MAX_PAGINA)
+        posts = linha.antes(req.inteiro('cursor'), limite)
+        return {'posts': [self._post_json(p) for p in posts],
+                'proximo_cursor': posts[-1]['id'] if len(posts) == limite else None}
+
+    # ----- manipuladores: (requisição, usuário logado, grupos da rota) -> (status, corpo) -----
+
+    async def _registrar(self, req: Requisicao, usuario: Optional[str]) -> Tuple[int, Any]:
+        dados = req.json()
+        username = req.campo('username')
+        await self.nucleo.registrar_async(username, req.campo('email'), req.campo('senha'), req.campo('nome'),
+                                          str(dados.get('titulo', '')), str(dados.get('bio', '')))
+        return 201, await self.nucleo.em_serie(self._usuario_json, username.strip())
+
+    async def _login(self, req: Requisicao, usuario: Optional[str]) -> Tuple[int, Any]:
+        username = req.campo('username').strip()
+        try:
+            await self.nucleo.autenticar_async(username, req.campo('senha'))
+        except ErroDominio:
+            raise ErroHTTP(401, "Usuário ou senha incorretos") from None
+        self._expirar_sessoes()  # tokens nunca reapresentados não se acumulam
+        token = secrets.token_urlsafe(32)
+        self._sessoes[token] = (username, time.monotonic() + self.DURACAO_SESSAO)
+        return 201, {'token': token, 'username': username, 'expira_em': self.DURACAO_SESSAO}
+
+    async def _logout(self, req: Requisicao, usuario: str) -> Tuple[int, Any]:
+        self._sessoes.pop(req.cabecalhos['authorization'].partition(' ')[2], None)
+        return 204, None
+
+    def _buscar(self, req: Requisicao, usuario: Optional[str]) -> Tuple[int, Any]:
+        return 200, {'usuarios': [self._usuario_json(u) for u, _ in self.nucleo.buscar(req.query.get('q', ''))]}
+
+    def _perfil(self, req: Requisicao, usuario: Optional[str], username: str) -> Tuple[int, Any]:
+        return 200, self._usuario_json(username)
+
+    def _posts_do_usuario(self, req: Requisicao, usuario: Optional[str], username: str) -> Tuple[int, Any]:
+        self.nucleo.usuario(username)
+        return 200, self._pagina(req, self.nucleo.repositorio.posts_do_autor(username))
+
+    def _sugestoes(self, req: Requisicao, username: str) -> Tuple[int, Any]:
+        sugestoes = self.nucleo.recomendador.sugestoes(username, self.nucleo.LIMITE_SUGESTOES)
+        return 200, {'sugestoes': [{**self._usuario_json(u), 'em_comum': n} for u, n in sugestoes]}
+
+    def _conectar(self, req: Requisicao, username: str) -> Tuple[int, Any]:
+        nova = self.nucleo.conectar(username, req.campo('alvo').strip())
+        return (201 if nova else 200), {'conectado': True, 'nova': nova}
+
+    def _feed(self, req: Requisicao, username: str) -> Tuple[int, Any]:
+        rede = req.query.get('rede', '') not in ('', '0', 'false')
+        return 200, self._pagina(req, self.nucleo.linha_feed(username, rede))
+
+    def _notificacoes(self, req: Requisicao, username: str) -> Tuple[int, Any]:
+        limite = min(max(req.inteiro('limite', self.nucleo.NOTIFICACOES_POR_USUARIO), 1), self.LIMITE_MAX_PAGINA)
+        nao_lidas = self.nucleo.notificacoes_nao_lidas(username)
+        avisos = self.nucleo.ler_notificacoes(username, limite)
+        return 200, {'nao_lidas': nao_lidas, 'notificacoes': [{**a.para_json(), 'texto': a.texto(self.nucleo.nome_de)}
+                                                              for a in avisos]}
+
+    def _em_alta(self, req: Requisicao, usuario: Optional[str]) -> Tuple[int, Any]:
+        janela = req.query.get('janela', '24h')
+        if janela not in self.nucleo._ranking_em_alta().janelas:
+            raise ErroHTTP(400, f"Janela inválida: {janela}")
+        limite = min(max(req.inteiro('limite', self.nucleo.LIMITE_EM_ALTA), 1), self.LIMITE_MAX_PAGINA)
+        return 200, {'janela': janela, 'posts': [{**self._post_json(p), 'escore': round(e, 4)}
+                                                 for p, e in self.nucleo.posts_em_alta(janela, limite)]}
+
+    def _buscar_posts(self, req: Requisicao, usuario: Optional[str]) -> Tuple[int, Any]:
+        limite = min(max(req.inteiro('limite', self.nucleo.LIMITE_BUSCA), 1), self.LIMITE_MAX_PAGINA)
+        encontrados = self.nucleo.buscar_posts(req.query.get('q', ''), req.query.get('autor') or None,
+                                               req.inteiro('desde'), req.inteiro('ate'), limite)
+        return 200, {'posts': [{**self._post_json(p), 'escore': round(e, 4)} for p, e in encontrados]}
+
+    def _publicar(self, req: Requisicao, username: str) -> Tuple[int, Any]:
+        return 201, self._post_json(self.nucleo.publicar(username, req.campo('conteudo')))
+
+    def _post(self, req: Requisicao, usuario: Optional[str], post_id: str) -> Tuple[int, Any]:
+        return 200, self._post_json(self.nucleo.post(int(post_id)))
+
+    def _deletar_post(self, req: Requisicao, username: str, post_id: str) -> Tuple[int, Any]:
+        self.nucleo.deletar_post(username, int(post_id))
+        return 204, None
+
+    def _curtir(self, req: Requisicao, username: str, post_id: str) -> Tuple[int, Any]:
+        curtido = self.nucleo.alternar_curtida(username, int(post_id))
+        return 200, {'curtido': curtido, 'curtidas': self.nucleo.post(int(post_id))['total_curtidas']}
+
+    def _comentarios(self, req: Requisicao, usuario: Optional[str], post_id: str) -> Tuple[int, Any]:
+        limite = min(max(req.inteiro('limite', self.nucleo.PAGINA_COMENTARIOS), 1), self.LIMITE_MAX_PAGINA)
+        comentarios = self.nucleo.pagina_comentarios(int(post_id), req.inteiro('cursor'), limite)
+        return 200, {'comentarios': comentarios,
+                     'proximo_cursor': comentarios[-1]['id'] if len(comentarios) == limite else None}
+
+    def _comentar(self, req: Requisicao, username: str, post_id: str) -> Tuple[int, Any]:
+        return 201, self.nucleo.comentar(username, int(post_id), req.campo('texto'))
+
+    def _metricas(self, req: Requisicao, usuario: Optional[str]) -> Tuple[int, Any]:
+        metricas = self.nucleo.metricas
+        if not metricas.ativo:
+            raise ErroHTTP(404, "Métricas desligadas (inicie com --metricas)")
+        return 200, metricas.para_json() if req.query.get('formato') == 'json' else metricas.prometheus()
+
+    # ----- despacho -----
+
+    def _atualizado(self, manipulador: Callable, *args: Any) -> Tuple[int, Any]:
+        """Relê os dados, se outro processo os alterou, e executa o manipulador (na thread do núcleo)"""
+        self.nucleo.atualizar()
+        return manipulador(*args)
+
+    async def despachar(self, req: Requisicao) -> Tuple[int, Any]:
+        """Executa a rota da requisição e converte erros em status HTTP. Manipuladores síncronos rodam
+        na thread do núcleo (``em_serie``), depois de ``atualizar``; os assíncronos (cadastro, login,
+        logout) rodam no laço e passam pela thread do núcleo só onde tocam o estado"""
+        try:
+            metodos_do_caminho = False
+            for metodo, padrao, manipulador, autenticada in self._rotas:
+                casamento = padrao.match(req.caminho)
+                if casamento is None:
+                    continue
+                metodos_do_caminho = True
+                if metodo != req.metodo:
+                    continue
+                usuario = self._usuario_da_sessao(req) if autenticada else None
+                if asyncio.iscoroutinefunction(manipulador):
+                    await self.nucleo.em_serie(self.nucleo.atualizar)
+                    return await manipulador(req, usuario, *casamento.groups())
+                return await self.nucleo.em_serie(self._atualizado, manipulador, req, usuario, *casamento.groups())
+            raise ErroHTTP(405, "Método não permitido") if metodos_do_caminho else ErroHTTP(404, "Rota inexistente")
+        except ErroHTTP as e:
+            return e.status, {'erro': str(e)}
+        except NaoEncontrado as e:
+            return 404, {'erro': str(e)}
+        except NaoPermitido as e:
+            return 403, {'erro': str(e)}
+        except Conflito as e:
+            return 409, {'erro': str(e)}
+        except FalhaGravacao as e:
+            print(f"❌ {e} ({req.metodo} {req.caminho})")
+            return 503, {'erro': "Não foi possível salvar os dados; tente de novo"}
+        except ErroDominio as e:
+            return 400, {'erro': str(e)}
+        except Exception as e:
+            print(f"❌ Erro em {req.metodo} {req.caminho}: {e}")
+            return 500, {'erro': "Erro interno"}
+
+    @staticmethod
+    def _resposta(status: int, corpo: Any, manter: bool) -> bytes:
+        if isinstance(corpo, str):  # texto das métricas no formato do Prometheus
+            dados, tipo = corpo.encode(), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            dados = b'' if corpo is None else json.dumps(corpo, ensure_ascii=False, default=para_json).encode()
+            tipo = 'application/json; charset=utf-8'
+        cabecalho = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                     f"Content-Type: {tipo}\r\n"
+                     f"Content-Length: {len(dados)}\r\n"
+                     f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n")
+        return cabecalho.encode('latin-1') + dados
+
+    async def _ler_requisicao(self, leitor: asyncio.StreamReader) -> Optional[Requisicao]:
+        """Próxima requisição da conexão, ou None quando o cliente fecha ou fica ocioso"""
+        try:
+            bruto = await asyncio.wait_for(leitor.readuntil(b'\r\n\r\n'), self.TEMPO_OCIOSO)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise ErroHTTP(431, "Cabeçalho grande demais") from None
+        linha, *campos = bruto.decode('latin-1').split('\r\n')
+        try:
+            metodo, alvo, versao = linha.split(' ')
+        except ValueError:
+            raise ErroHTTP(400, "Linha de requisição inválida") from None
+        cabecalhos = {}
+        for campo in campos:
+            if campo:
+                nome, _, valor = campo.partition(':')
+                cabecalhos[nome.strip().lower()] = valor.strip()
+        cabecalhos[':versao'] = versao
+        if 'transfer-encoding' in cabecalhos:
+            raise ErroHTTP(501, "Transfer-Encoding não suportado")
+        try:
+            tamanho = int(cabecalhos.get('content-length', 0))
+        except ValueError:
+            raise ErroHTTP(400, "Content-Length inválido") from None
+        if tamanho < 0:
+            raise ErroHTTP(400, "Content-Length inválido")
+        if tamanho > self.TAMANHO_MAX_CORPO:
+            raise ErroHTTP(413, "Corpo grande demais")
+        try:
+            corpo = await asyncio.wait_for(leitor.readexactly(tamanho), self.TEMPO_CORPO) if tamanho else b''
+        except asyncio.TimeoutError:
+            raise ErroHTTP(408, "Tempo esgotado esperando o corpo da requisição") from None
+        return Requisicao(metodo, alvo, cabecalhos, corpo)
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Atende uma conexão, requisição após requisição, enquanto ela for mantida"""
+        try:
+            while True:
+                try:
+                    req = await self._ler_requisicao(leitor)
+                except ErroHTTP as e:
+                    escritor.write(self._resposta(e.status, {'erro': str(e)}, False))
+                    await escritor.drain()
+                    return
+                if req is None:
+                    return
+                conexao = req.cabecalhos.get('connection', '').lower()
+                manter = conexao == 'keep-alive' if req.cabecalhos[':versao'] == 'HTTP/1.0' else conexao != 'close'
+                status, corpo = await self.despachar(req)
+                escritor.write(self._resposta(status, corpo, manter))
+                await escritor.drain()
+                if not manter:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host: str = '127.0.0.1', porta: int = 8080,
+                     pronto: Optional[Callable[[int], None]] = None) -> None:
+        """Serve até ser cancelado; ``pronto(porta)`` é chamado quando o socket está ouvindo"""
+        servidor = await asyncio.start_server(self.atender, host, porta, limit=self.TAMANHO_MAX_CABECALHO,
+                                              backlog=4096)
+        porta = servidor.sockets[0].getsockname()[1]
+        if pronto is not None:
+            pronto(porta)
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='API HTTP/JSON do LinkedIn SPA')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8080)
+    parser.add_argument('--modo', choices=('completo', 'diario', 'segmentado', 'sqlite'),
+                        default=ServidorAPI.MODO_ARMAZENAMENTO, help='modo de armazenamento (padrão: %(default)s)')
+    parser.add_argument('--metricas', metavar='ARQUIVO',
+                        help='ativa as métricas, expostas em GET /metricas e gravadas no ARQUIVO '
+                             'ao encerrar e a cada SIGUSR1')
+    args = parser.parse_args()
+    if args.metricas:
+        REGISTRO.ativar()
+    nucleo = NucleoSPA(args.modo)
+    if args.metricas:
+        nucleo.arquivo_metricas = args.metricas
+    try:
+        asyncio.run(ServidorAPI(nucleo).servir(
+            args.host, args.porta, lambda porta: print(f"🌐 API em http://{args.host}:{porta}")))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado")
+    finally:
+        nucleo.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,748 @@
+"""
+BENCHMARKS DO LINKEDIN SPA
+Descrição: Medições reproduzíveis de desempenho e memória do sistema.
+Uso: python benchmark.py [memoria] [api] [concorrencia] [importacao] [escala] [login] [tela] [codecs]
+                         [notificacoes] [reconstrucao]
+                         [--n 10000 100000]
+                         [--json resultados.json] [--comparar anterior.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from comentarios import Comentarios
+from registros import Post, usuarios_de_json
+
+
+def _memoria_retida(construir: Callable[[], Any]) -> int:
+    """Bytes alocados por ``construir`` que continuam vivos no resultado"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        resultado = construir()
+        gc.collect()
+        total = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return total
+
+
+def _dados_json(n_usuarios: int, n_posts: int, semente: int = 42) -> Dict[str, str]:
+    """Usuários e posts sintéticos serializados como nos arquivos dados_*.json"""
+    rng = random.Random(semente)
+    titulos = ['Desenvolvedor Python', 'Designer UX/UI', 'Analista de Dados', 'Gerente de Projetos']
+    usuarios = {
+        f'usuario{i}': {'nome': f'Nome{i} Sobrenome{i % 97}', 'email': f'u{i}@example.com', 'senha': 'Senha123',
+                        'titulo': rng.choice(titulos), 'bio': f'Bio do usuário {i}',
+                        'data_criacao': '17/11/2025 15:08', 'seguidores': [], 'seguindo': []}
+        for i in range(n_usuarios)
+    }
+    nomes = list(usuarios)
+    posts = []
+    for i in range(1, n_posts + 1):
+        autor = rng.choice(nomes)
+        comentarios = [{'usuario': u, 'nome': usuarios[u]['nome'], 'texto': f'Comentário {i}', 'data': '17/11/2025 15:09'}
+                       for u in rng.sample(nomes, 2)]
+        posts.append({'id': i, 'usuario': autor, 'autor_nome': usuarios[autor]['nome'],
+                      'conteudo': f'Conteúdo do post {i}', 'data': '17/11/2025 15:08',
+                      'likes': [], 'comentarios': comentarios})
+    return {'usuarios': json.dumps(usuarios), 'posts': json.dumps(posts)}
+
+
+def bench_memoria(n: int = 100_000) -> List[Dict[str, Any]]:
+    """Bytes por usuário e por post (com 2 comentários): dicts do json.load x registros"""
+    dados = _dados_json(n, n)
+
+    def usuarios_dict():
+        return json.loads(dados['usuarios'])
+
+    def usuarios_registro():
+        return usuarios_de_json(json.loads(dados['usuarios']))
+
+    usuarios = usuarios_de_json(json.loads(dados['usuarios']))
+
+    def posts_dict():
+        return json.loads(dados['posts'])
+
+    def posts_registro():
+        posts = json.loads(dados['posts'])
+        comentarios = Comentarios()  # os registros guardam os comentários à parte, como os repositórios
+        comentarios.separar(posts, usuarios)
+        return [Post.de_json(p, usuarios) for p in posts], comentarios
+
+    resultados = []
+    for entidade, antes, depois in (('usuario', usuarios_dict, usuarios_registro),
+                                    ('post', posts_dict, posts_registro)):
+        bytes_antes, bytes_depois = _memoria_retida(antes) / n, _memoria_retida(depois) / n
+        resultados.append({'benchmark': 'memoria', 'entidade': entidade, 'n': n,
+                           'bytes_dict': round(bytes_antes), 'bytes_registro': round(bytes_depois),
+                           'reducao': round(1 - bytes_depois / bytes_antes, 3)})
+    return resultados
+
+
+def _servir_api(pasta: str, fila) -> None:
+    """Processo do servidor: núcleo com dados de teste em ``pasta``, porta informada pela fila"""
+    from api import ServidorAPI
+    from nucleo import NucleoSPA
+    os.chdir(pasta)
+    asyncio.run(ServidorAPI(NucleoSPA('diario')).servir('127.0.0.1', 0, fila.put))
+
+
+async def _clientes_api(porta: int, n: int, conexoes: int) -> List[float]:
+    """``conexoes`` clientes keep-alive simultâneos fazendo ``n`` GET /feed no total; latências em s"""
+    async def requisitar(leitor, escritor, bruto: bytes) -> bytes:
+        escritor.write(bruto)
+        cabecalho = await leitor.readuntil(b'\r\n\r\n')
+        tamanho = int(cabecalho.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+        return await leitor.readexactly(tamanho)
+
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    corpo = json.dumps({'username': 'usuario1', 'senha': '123456'}).encode()
+    resposta = await requisitar(leitor, escritor, b'POST /sessoes HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s'
+                                % (len(corpo), corpo))
+    escritor.close()
+    bruto = (f"GET /feed?limite=5 HTTP/1.1\r\nHost: x\r\n"
+             f"Authorization: Bearer {json.loads(resposta)['token']}\r\n\r\n").encode()
+    latencias: List[float] = []
+
+    async def cliente(quantas: int) -> None:
+        leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+        for _ in range(quantas):
+            inicio = time.perf_counter()
+            await requisitar(leitor, escritor, bruto)
+            latencias.append(time.perf_counter() - inicio)
+        escritor.close()
+
+    await asyncio.gather(*(cliente(n // conexoes + (i < n % conexoes)) for i in range(conexoes)))
+    return latencias
+
+
+def bench_api(n: int = 100_000, conexoes: int = 2000) -> List[Dict[str, Any]]:
+    """Requisições/s e latência de GET /feed com milhares de conexões keep-alive abertas ao mesmo tempo"""
+    with tempfile.TemporaryDirectory() as pasta:
+        fila = multiprocessing.Queue()
+        servidor = multiprocessing.Process(target=_servir_api, args=(pasta, fila), daemon=True)
+        servidor.start()
+        try:
+            porta = fila.get(timeout=60)
+            inicio = time.perf_counter()
+            latencias = sorted(asyncio.run(_clientes_api(porta, n, conexoes)))
+            duracao = time.perf_counter() - inicio
+        finally:
+            servidor.terminate()
+            servidor.join()
+    return [{'benchmark': 'api', 'conexoes': conexoes, 'requisicoes': len(latencias),
+             'req_por_s': round(len(latencias) / duracao),
+             'p50_ms': round(latencias[len(latencias) // 2] * 1000, 2),
+             'p99_ms': round(latencias[int(len(latencias) * 0.99)] * 1000, 2)}]
+
+
+def _escritor(pasta: str, indice: int, operacoes: int, largada, fila) -> None:
+    """Processo escritor no modo completo: alterna publicar e curtir/descurtir o post 1"""
+    from nucleo import NucleoSPA
+    os.chdir(pasta)
+    with contextlib.redirect_stdout(io.StringIO()):
+        nucleo = NucleoSPA('completo')
+        username = f'usuario{indice + 1}'
+        largada.wait()
+        ids = []
+        for i in range(operacoes):
+            if i % 2 == 0:
+                ids.append(nucleo.publicar(username, f'Post {i} do escritor {indice}')['id'])
+            else:
+                nucleo.alternar_curtida(username, 1)
+        nucleo.fechar()
+    fila.put(ids)
+
+
+def bench_concorrencia(n: int = 100_000, escritores=(1, 2, 4, 8)) -> List[Dict[str, Any]]:
+    """Operações/s com vários processos gravando na mesma pasta (modo completo) e posts perdidos"""
+    from nucleo import NucleoSPA
+    total = min(n, 400)  # cada gravação reescreve os arquivos inteiros
+    resultados = []
+    for quantos in escritores:
+        with tempfile.TemporaryDirectory() as pasta, contextlib.redirect_stdout(io.StringIO()):
+            anterior = os.getcwd()
+            os.chdir(pasta)
+            try:
+                NucleoSPA('completo').fechar()
+                largada, fila = multiprocessing.Barrier(quantos + 1), multiprocessing.Queue()
+                processos = [multiprocessing.Process(target=_escritor,
+                                                     args=(pasta, i, total // quantos, largada, fila))
+                             for i in range(quantos)]
+                for processo in processos:
+                    processo.start()
+                largada.wait()
+                inicio = time.perf_counter()
+                ids = [i for _ in processos for i in fila.get(timeout=600)]
+                duracao = time.perf_counter() - inicio
+                for processo in processos:
+                    processo.join()
+                nucleo = NucleoSPA('completo')
+                perdidos = sum(1 for i in set(ids) if nucleo.repositorio.post_por_id(i) is None)
+                nucleo.fechar()
+            finally:
+                os.chdir(anterior)
+        resultados.append({'benchmark': 'concorrencia', 'escritores': quantos,
+                           'operacoes': total // quantos * quantos,
+                           'ops_por_s': round(total // quantos * quantos / duracao),
+                           'ids_repetidos': len(ids) - len(set(ids)), 'posts_perdidos': perdidos})
+    return resultados
+
+
+def _escrever_importacao(arquivo: str, n: int, semente: int = 42) -> int:
+    """JSONL com ``n`` usuários, conexões, posts, comentários e curtidas; retorna o nº de linhas"""
+    from senhas import hash_senha
+    rng = random.Random(semente)
+    senha = hash_senha('Senha123')  # já em hash: mede a carga, não o cálculo das senhas
+    linhas = 0
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        def escrever(registro: Dict) -> None:
+            nonlocal linhas
+            f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            linhas += 1
+        for i in range(n):
+            escrever({'tipo': 'usuario', 'username': f'pessoa{i}', 'nome': f'Nome{i} Sobrenome{i % 97}',
+                      'email': f'pessoa{i}@example.com', 'senha': senha, 'titulo': 'Analista de Dados',
+                      'bio': f'Bio do usuário {i}'})
+        for i in range(n):
+            escrever({'tipo': 'conexao', 'origem': f'pessoa{i}', 'alvo': f'pessoa{rng.randrange(n)}'})
+        for i in range(1, n + 1):
+            escrever({'tipo': 'post', 'id': i, 'usuario': f'pessoa{rng.randrange(n)}',
+                      'conteudo': f'Conteúdo do post {i}', 'data': '17/11/2025 15:08'})
+        for tipo, campos in (('comentario', {'texto': 'Muito bom'}), ('curtida', {})):
+            for _ in range(n):
+                escrever({'tipo': tipo, 'post_id': rng.randrange(1, n + 1),
+                          'usuario': f'pessoa{rng.randrange(n)}', **campos})
+    return linhas
+
+
+def bench_importacao(n: int = 100_000, modos=('completo', 'diario', 'segmentado', 'sqlite')) -> List[Dict[str, Any]]:
+    """Registros/s importando um JSONL (``n`` de cada tipo) em uma pasta vazia e exportando-o de volta"""
+    from importacao import Importador, exportar, ler
+    from nucleo import NucleoSPA
+    resultados = []
+    with tempfile.TemporaryDirectory() as base:
+        origem = os.path.join(base, 'entrada.jsonl')
+        linhas = _escrever_importacao(origem, n)
+        for modo in modos:
+            pasta = os.path.join(base, modo)
+            os.mkdir(pasta)
+            anterior = os.getcwd()
+            os.chdir(pasta)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    nucleo = NucleoSPA(modo)
+                    inicio = time.perf_counter()
+                    contagem = Importador(nucleo).importar(ler(origem))
+                    nucleo.fechar()
+                    duracao_importacao = time.perf_counter() - inicio
+                    nucleo = NucleoSPA(modo)
+                    inicio = time.perf_counter()
+                    exportados = sum(exportar(nucleo, 'saida.jsonl').values())
+                    duracao_exportacao = time.perf_counter() - inicio
+                    nucleo.fechar()
+            finally:
+                os.chdir(anterior)
+            resultados.append({'benchmark': 'importacao', 'modo': modo, 'registros': linhas,
+                               'rejeitados': contagem['rejeitados'],
+                               'importacao_por_s': round(linhas / duracao_importacao),
+                               'exportacao_por_s': round(exportados / duracao_exportacao)})
+    return resultados
+
+
+def _medir(operacao: Callable[[int], Any], repeticoes: int) -> List[float]:
+    """Durações em s de ``operacao(i)`` para i em range(repeticoes)"""
+    duracoes = []
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        operacao(i)
+        duracoes.append(time.perf_counter() - inicio)
+    return duracoes
+
+
+def _resumo(duracoes: List[float]) -> Dict[str, Any]:
+    ordenadas = sorted(duracoes)
+    return {'repeticoes': len(ordenadas), 'mediana_ms': round(ordenadas[len(ordenadas) // 2] * 1000, 3),
+            'p99_ms': round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.99))] * 1000, 3),
+            'ops_por_s': round(len(ordenadas) / sum(ordenadas), 1)}
+
+
+def _medir_escala(modo: str, usuarios: int, leituras: int, escritas: int, semente: int) -> Dict[str, List[float]]:
+    """Durações das operações do núcleo sobre a rede da pasta atual"""
+    from nucleo import NucleoSPA
+    rng = random.Random(semente)
+    duracoes: Dict[str, List[float]] = {}
+    duracoes['inicializacao'] = []
+    for _ in range(3):  # diário e segmentado reservam a pasta: fecha antes de abrir de novo
+        inicio = time.perf_counter()
+        nucleo = NucleoSPA(modo)
+        duracoes['inicializacao'].append(time.perf_counter() - inicio)
+        nucleo.fechar()
+    nucleo = NucleoSPA(modo)
+    try:
+        membros = [f'membro{rng.randrange(usuarios)}' for _ in range(leituras)]
+        duracoes['_salvar_dados'] = _medir(lambda _: nucleo._salvar_dados(), 3)
+        duracoes['indice_busca'] = _medir(lambda _: list(nucleo._buscar_usuarios('indice')), 1)
+        termos = [nucleo.usuarios[u]['nome'].split()[rng.randrange(2)][:rng.randint(3, 6)] for u in membros]
+
+        def buscar(i: int) -> None:
+            nucleo._cache_busca.limpar()  # mede a consulta ao índice, não o cache
+            list(nucleo._buscar_usuarios(termos[i]))
+
+        duracoes['_buscar_usuarios'] = _medir(buscar, leituras)
+
+        def posts_usuario(i: int) -> None:
+            nucleo._cache_posts.limpar()
+            nucleo._obter_posts_usuario(membros[i])
+
+        duracoes['_obter_posts_usuario'] = _medir(posts_usuario, leituras)
+
+        def paginar(rede: bool) -> Callable[[int], None]:
+            def operacao(i: int) -> None:
+                cursor = None
+                for _ in range(10):
+                    pagina = nucleo.pagina_feed(membros[i], rede, cursor)
+                    if not pagina:
+                        return
+                    cursor = pagina[-1]['id']
+            return operacao
+
+        duracoes['pagina_feed'] = _medir(paginar(False), leituras)
+        duracoes['pagina_feed_rede'] = _medir(paginar(True), leituras)
+        pares = [(f'membro{rng.randrange(usuarios)}', f'membro{rng.randrange(usuarios)}') for _ in range(escritas)]
+        duracoes['conectar'] = _medir(lambda i: pares[i][0] != pares[i][1] and nucleo.conectar(*pares[i]),
+                                      escritas)
+        duracoes['publicar'] = _medir(lambda i: nucleo.publicar(membros[i], f'Post de benchmark {i}'), escritas)
+    finally:
+        nucleo.fechar()
+    return duracoes
+
+
+def bench_escala(n: int = 100_000, modos=('completo', 'diario', 'segmentado', 'sqlite'),
+                 leituras: int = 200, escritas: int = 20, semente: int = 42) -> List[Dict[str, Any]]:
+    """Latência das operações do núcleo sobre uma rede gerada com ``n`` usuários, em cada modo.
+
+    Operações: inicialização (_carregar_dados), _salvar_dados, montagem do índice e
+    _buscar_usuarios, _obter_posts_usuario, 10 páginas do feed geral e da rede,
+    conectar (adicionar_conexao da CLI) e publicar (criar_post). A rede é gerada e
+    importada uma vez no modo completo; os demais modos migram desses arquivos.
+    """
+    from gerador import GeradorRede
+    from nucleo import NucleoSPA
+    resultados = []
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as base, contextlib.redirect_stdout(io.StringIO()):
+        try:
+            origem = os.path.join(base, 'origem')
+            os.mkdir(origem)
+            os.chdir(origem)
+            nucleo = NucleoSPA('completo')
+            GeradorRede(n, semente).importar(nucleo)
+            nucleo.fechar()
+            for modo in modos:
+                pasta = os.path.join(base, modo)
+                shutil.copytree(origem, pasta, ignore=shutil.ignore_patterns('*.lock'))
+                os.chdir(pasta)
+                NucleoSPA(modo).fechar()  # migração para o modo, fora da medição
+                for operacao, duracoes in _medir_escala(modo, n, leituras, escritas, semente).items():
+                    resultados.append({'benchmark': 'escala', 'modo': modo, 'usuarios': n,
+                                       'operacao': operacao, **_resumo(duracoes)})
+                os.chdir(base)
+                shutil.rmtree(pasta)
+        finally:
+            os.chdir(anterior)
+    return resultados
+
+
+async def _logins(nucleo, quantos: int) -> List[float]:
+    """``quantos`` logins simultâneos de usuario1 no laço de eventos; latências em s"""
+    async def login() -> float:
+        inicio = time.perf_counter()
+        await nucleo.autenticar_async('usuario1', '123456')
+        return time.perf_counter() - inicio
+
+    return list(await asyncio.gather(*(login() for _ in range(quantos))))
+
+
+def bench_login(n: int = 100_000, algoritmos=('scrypt', 'pbkdf2_sha256'),
+                por_trabalhador: int = 20) -> List[Dict[str, Any]]:
+    """Logins/s (total e por núcleo) com o hash no pool de senhas, para 1, 2, 4... trabalhadores.
+
+    Cada configuração faz ``min(n, por_trabalhador * trabalhadores)`` logins
+    simultâneos via autenticar_async; o primeiro login de cada configuração
+    regrava o hash de usuario1 com o novo algoritmo, fora da medição. A última
+    linha de cada algoritmo usa um pool de processos com um trabalhador por núcleo.
+    """
+    from nucleo import NucleoSPA
+    from senhas import ServicoSenhas
+    cpus = os.cpu_count() or 1
+    trabalhadores = sorted({2 ** k for k in range(cpus.bit_length()) if 2 ** k <= cpus} | {cpus})
+    configuracoes = [(t, 'threads') for t in trabalhadores] + [(cpus, 'processos')]
+    resultados = []
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(pasta)
+        nucleo = NucleoSPA('diario')
+        try:
+            for algoritmo in algoritmos:
+                for quantidade, pool in configuracoes:
+                    nucleo.senhas.fechar()
+                    nucleo.senhas = ServicoSenhas(algoritmo, quantidade, pool)
+                    nucleo.autenticar('usuario1', '123456')  # atualiza o hash e aquece o pool
+                    logins = min(n, por_trabalhador * quantidade)
+                    inicio = time.perf_counter()
+                    latencias = asyncio.run(_logins(nucleo, logins))
+                    duracao = time.perf_counter() - inicio
+                    resumo = _resumo(latencias)
+                    resultados.append({'benchmark': 'login', 'algoritmo': algoritmo, 'pool': pool,
+                                       'trabalhadores': quantidade, 'logins': logins,
+                                       'logins_por_s': round(logins / duracao, 1),
+                                       'logins_por_s_por_nucleo': round(logins / duracao / min(quantidade, cpus), 1),
+                                       'mediana_ms': resumo['mediana_ms'], 'p99_ms': resumo['p99_ms']})
+        finally:
+            nucleo.fechar()
+            os.chdir(anterior)
+    return resultados
+
+
+class _Terminal(io.TextIOBase):
+    """Saída que se passa por terminal: cada linha vira um write(2) em /dev/null, como o
+    stdout com buffer de linha; conta escritas e bytes"""
+
+    def __init__(self):
+        self._fd = os.open(os.devnull, os.O_WRONLY)
+        self._linha: List[str] = []
+        self.escritas = self.bytes = 0
+
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, texto: str) -> int:
+        self._linha.append(texto)
+        if '\n' in texto:
+            self.flush()
+        return len(texto)
+
+    def flush(self) -> None:
+        if self._linha:
+            dados = ''.join(self._linha).encode('utf-8')
+            self._linha.clear()
+            self.escritas += 1
+            self.bytes += os.write(self._fd, dados)
+
+    def close(self) -> None:
+        os.close(self._fd)
+        super().close()
+
+
+def _medir_tela(sistema, renderizador: str, tela: str, teclas: List[str]) -> Dict[str, Any]:
+    """Percorre ``tela`` da CLI com as ``teclas``; latência entre cada tecla e o pedido da seguinte
+    (o quadro inteiro já foi escrito), escritas e bytes por quadro"""
+    import builtins
+    from tela import Tela
+    terminal = _Terminal()
+    latencias: List[float] = []
+    fila = iter(teclas)
+    ultima: List[float] = []
+
+    def teclar(prompt: str = '') -> str:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        if ultima:
+            latencias.append(time.perf_counter() - ultima.pop())
+        tecla = next(fila)
+        ultima.append(time.perf_counter())
+        return tecla
+
+    original = builtins.input
+    builtins.input = teclar
+    try:
+        if renderizador == 'ansi':
+            sistema.tela = Tela(terminal)
+            with sistema.tela:
+                getattr(sistema, tela)()
+        else:  # como era antes: um processo de clear por tela e cada linha escrita direto no terminal
+            sistema.tela = Tela()
+            sistema._limpar_tela = lambda: os.system('clear >/dev/null 2>&1')
+            with contextlib.redirect_stdout(terminal):
+                getattr(sistema, tela)()
+            del sistema._limpar_tela
+    finally:
+        builtins.input = original
+        terminal.flush()
+        terminal.close()
+    quadros = len(latencias) + 1
+    return {**_resumo(latencias), 'escritas_por_quadro': round(terminal.escritas / quadros, 1),
+            'bytes_por_quadro': round(terminal.bytes / quadros)}
+
+
+def bench_tela(n: int = 100_000, teclas: int = 200, semente: int = 42) -> List[Dict[str, Any]]:
+    """Latência tecla→quadro da CLI com o renderizador ANSI (tela.py) e com o clear antigo.
+
+    Telas: o feed, avançando um post por tecla (quase todas as linhas mudam), e o
+    menu do usuário redesenhado a cada opção inválida (nenhuma linha muda). O
+    terminal é simulado (100x40, escritas em /dev/null), então a medida é o custo
+    de compor e enviar o quadro. A rede tem min(n, 5000) usuários: o quadro
+    depende da página exibida, não do tamanho da rede. O clear só é medido onde
+    existe o comando.
+    """
+    from gerador import GeradorRede
+    from GS import LinkedInSPA
+    renderizadores = ['ansi'] + (['clear'] if os.name != 'nt' and shutil.which('clear') else [])
+    roteiros = {'feed': [''] * teclas + ['3'], 'menu_usuario': ['x'] * teclas + ['10', 'S', '']}
+    resultados = []
+    anterior, ambiente = os.getcwd(), {k: os.environ.get(k) for k in ('COLUMNS', 'LINES')}
+    os.environ.update(COLUMNS='100', LINES='40')
+    with tempfile.TemporaryDirectory() as pasta:
+        try:
+            os.chdir(pasta)
+            with contextlib.redirect_stdout(io.StringIO()):
+                sistema = LinkedInSPA('completo')
+                GeradorRede(min(n, 5000), semente).importar(sistema)
+            try:
+                for tela, roteiro in roteiros.items():
+                    for renderizador in renderizadores:
+                        sistema.usuario_logado = 'membro0'
+                        resultados.append({'benchmark': 'tela', 'operacao': tela, 'renderizador': renderizador,
+                                           **_medir_tela(sistema, renderizador, tela, roteiro)})
+            finally:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    sistema.fechar()
+        finally:
+            os.chdir(anterior)
+            for chave, valor in ambiente.items():
+                if valor is None:
+                    os.environ.pop(chave, None)
+                else:
+                    os.environ[chave] = valor
+    return resultados
+
+
+def bench_codecs(n: int = 100_000, repeticoes: int = 3, semente: int = 42) -> List[Dict[str, Any]]:
+    """Tamanho e latências de gravação e leitura dos dados_*.json em cada codec (serializacao.py).
+
+    A rede de ``n`` usuários vem do gerador (gerador.py); os dados medidos são
+    os que o modo completo grava (usuários, conexões, posts e comentários, com
+    os registros convertidos na gravação). Cada medida é a mediana de
+    ``repeticoes`` gravações (com fsync) e leituras dos quatro arquivos.
+    """
+    from gerador import GeradorRede
+    from nucleo import NucleoSPA
+    from serializacao import CODECS, gravar, ler
+    resultados = []
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta:
+        try:
+            os.chdir(pasta)
+            with contextlib.redirect_stdout(io.StringIO()):
+                nucleo = NucleoSPA('completo')
+                GeradorRede(n, semente).importar(nucleo)
+                grafo = nucleo.grafo
+                dados = {'usuarios': grafo.usuarios_json(nucleo.usuarios), 'conexoes': grafo.conexoes_json(),
+                         'posts': [grafo.post_json(p) for p in nucleo.posts],
+                         'comentarios': nucleo.comentarios.para_json()}
+                nucleo.fechar()
+            arquivos = {chave: os.path.join(pasta, f'codec_{chave}.json') for chave in dados}
+            base = None
+            for codec in CODECS:
+                def salvar(_):
+                    for chave, arquivo in arquivos.items():
+                        gravar(arquivo, dados[chave], codec)
+
+                def carregar(_):
+                    for arquivo in arquivos.values():
+                        ler(arquivo)
+                salvar_ms = _resumo(_medir(salvar, repeticoes))['mediana_ms']
+                carregar_ms = _resumo(_medir(carregar, repeticoes))['mediana_ms']
+                tamanho = sum(os.path.getsize(a) for a in arquivos.values())
+                base = base or tamanho
+                resultados.append({'benchmark': 'codecs', 'codec': codec, 'usuarios': n, 'bytes': tamanho,
+                                   'bytes_por_usuario': round(tamanho / n, 1),
+                                   'tamanho_relativo': round(tamanho / base, 3),
+                                   'salvar_ms': salvar_ms, 'carregar_ms': carregar_ms})
+        finally:
+            os.chdir(anterior)
+    return resultados
+
+
+def bench_notificacoes(n: int = 100_000, audiencias=(10, 100, 1000, 10_000), publicacoes: int = 20,
+                       semente: int = 42) -> List[Dict[str, Any]]:
+    """Latência de ``publicar`` e tempo até a notificação chegar a toda a audiência, por tamanho da audiência.
+
+    Cada autor recebe uma audiência de conexões com min(tamanho, n - 1) membros de
+    uma rede gerada de ``n`` usuários e publica ``publicacoes`` vezes, esperando a
+    entrega entre uma e outra. Modo diario e feed 'merge', para que a gravação e o
+    fan-out do feed (que tem o próprio benchmark em ``escala``) não entrem na medida.
+    """
+    from gerador import GeradorRede
+    from nucleo import NucleoSPA
+    resultados = []
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta:
+        try:
+            os.chdir(pasta)
+            with contextlib.redirect_stdout(io.StringIO()):
+                nucleo = NucleoSPA('diario', 'merge')
+                gerador = GeradorRede(n, semente)
+                gerador.importar(nucleo)
+            try:
+                membros = [gerador.username(i) for i in range(n)]
+                for k, tamanho in enumerate(audiencias):
+                    autor = membros[-1 - k]
+                    for membro in membros[:min(tamanho, n - 1)]:
+                        if membro != autor:
+                            nucleo.grafo.conectar(autor, membro)  # só em memória: é a audiência que importa
+                    audiencia = len(nucleo._audiencia_de(autor)) - 1
+                    publicar, entregar = [], []
+                    for i in range(publicacoes):
+                        inicio = time.perf_counter()
+                        nucleo.publicar(autor, f'Post {i} para {audiencia} pessoas')
+                        publicado = time.perf_counter()
+                        nucleo.notificacoes.aguardar()
+                        publicar.append(publicado - inicio)
+                        entregar.append(time.perf_counter() - inicio)
+                    resumo = _resumo(publicar)
+                    resultados.append({'benchmark': 'notificacoes', 'seguidores': audiencia,
+                                       'publicar_mediana_ms': resumo['mediana_ms'], 'publicar_p99_ms': resumo['p99_ms'],
+                                       'entrega_mediana_ms': _resumo(entregar)['mediana_ms']})
+            finally:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    nucleo.fechar()
+        finally:
+            os.chdir(anterior)
+    return resultados
+
+
+def bench_reconstrucao(n: int = 100_000, repeticoes: int = 3, semente: int = 42) -> List[Dict[str, Any]]:
+    """Tempo de ``reconstruir_indices`` (busca de usuários e de posts) com 1, 2, 4... processos.
+
+    A rede de ``n`` usuários vem do gerador (gerador.py). ``aceleracao`` é a razão
+    entre a mediana com 1 processo e a mediana da configuração; ``eficiencia``, a
+    aceleração dividida pelos processos. Com menos de reconstrucao.MINIMO_PARALELO
+    itens a montagem é sempre feita no próprio processo.
+    """
+    from gerador import GeradorRede
+    from nucleo import NucleoSPA
+    from reconstrucao import processos_disponiveis
+    cpus = processos_disponiveis()
+    resultados = []
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta:
+        try:
+            os.chdir(pasta)
+            with contextlib.redirect_stdout(io.StringIO()):
+                nucleo = NucleoSPA('diario')
+                GeradorRede(n, semente).importar(nucleo)
+            try:
+                base = None
+                for processos in sorted({2 ** k for k in range(cpus.bit_length()) if 2 ** k <= cpus} | {cpus}):
+                    nucleo.PROCESSOS_RECONSTRUCAO = processos
+                    mediana = _resumo(_medir(lambda _: nucleo.reconstruir_indices(), repeticoes))['mediana_ms']
+                    base = base or mediana
+                    resultados.append({'benchmark': 'reconstrucao', 'usuarios': n, 'processos': processos,
+                                       'posts': len(nucleo.posts), 'mediana_ms': mediana,
+                                       'aceleracao': round(base / mediana, 2),
+                                       'eficiencia': round(base / mediana / processos, 2)})
+            finally:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    nucleo.fechar()
+        finally:
+            os.chdir(anterior)
+    return resultados
+
+
+BENCHMARKS = {'memoria': bench_memoria, 'api': bench_api, 'concorrencia': bench_concorrencia,
+              'importacao': bench_importacao, 'escala': bench_escala, 'login': bench_login,
+              'tela': bench_tela, 'codecs': bench_codecs, 'notificacoes': bench_notificacoes,
+              'reconstrucao': bench_reconstrucao}
+
+# Campos que identificam um resultado ao comparar execuções; os demais numéricos são medidas
+CHAVES = ('benchmark', 'entidade', 'modo', 'operacao', 'n', 'usuarios', 'escritores', 'conexoes', 'registros',
+          'algoritmo', 'pool', 'trabalhadores', 'renderizador', 'codec',
+          'seguidores', 'processos')
+
+
+def _ambiente() -> Dict[str, Any]:
+    """Versão do código e da plataforma, para comparar resultados entre versões"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {'commit': commit or None, 'python': platform.python_version(),
+            'implementacao': platform.python_implementation(), 'plataforma': platform.platform(),
+            'processador': platform.machine(), 'cpus': os.cpu_count(),
+            'data': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def _chave(resultado: Dict[str, Any]) -> tuple:
+    return tuple((k, resultado[k]) for k in CHAVES if k in resultado)
+
+
+def comparar(atuais: List[Dict[str, Any]], anteriores: List[Dict[str, Any]]) -> List[str]:
+    """Linhas com a razão atual/anterior de cada medida dos resultados presentes nas duas execuções"""
+    por_chave = {_chave(r): r for r in anteriores}
+    linhas = []
+    for resultado in atuais:
+        anterior = por_chave.get(_chave(resultado))
+        if anterior is None:
+            continue
+        razoes = [f'{k}={resultado[k] / anterior[k]:.2f}x' for k, v in resultado.items()
+                  if k not in CHAVES and isinstance(v, (int, float)) and isinstance(anterior.get(k), (int, float))
+                  and anterior[k]]
+        linhas.append('  '.join([*(f'{k}={v}' for k, v in _chave(resultado)), *razoes]))
+    return linhas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks do LinkedIn SPA')
+    parser.add_argument('benchmarks', nargs='*', help=f"um ou mais de: {', '.join(BENCHMARKS)} (padrão: todos)")
+    parser.add_argument('--n', type=int, nargs='+', default=[100_000],
+                        help='tamanho da carga; vários valores rodam cada benchmark em cada tamanho')
+    parser.add_argument('--json', metavar='ARQUIVO', help='grava ambiente e resultados em JSON')
+    parser.add_argument('--comparar', metavar='ARQUIVO', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+    for nome in args.benchmarks:
+        if nome not in BENCHMARKS:
+            parser.error(f"benchmark desconhecido: {nome}")
+    args.benchmarks = args.benchmarks or list(BENCHMARKS)
+    anteriores: Optional[List[Dict[str, Any]]] = None
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            anteriores = json.load(f)['resultados']
+    resultados = []
+    for nome in args.benchmarks:
+        for n in args.n:
+            for resultado in BENCHMARKS[nome](n):
+                resultados.append(resultado)
+                print('  '.join(f'{k}={v}' for k, v in resultado.items()), flush=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'ambiente': _ambiente(), 'argumentos': sys.argv[1:], 'resultados': resultados}, f,
+                      ensure_ascii=False, indent=2)
+    if anteriores is not None:
+        print(f"\nComparação com {args.comparar} (atual/anterior):")
+        for linha in comparar(resultados, anteriores):
+            print(linha)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+BUSCA DE POSTS DO LINKEDIN SPA
+Descrição: Índice invertido sobre o conteúdo dos posts e o texto dos seus
+comentários, com ranking BM25 e filtros por autor e período. Os textos viram
+termos sem acentos e em minúsculas, sem as palavras vazias do português e com o
+plural reduzido ao singular ("Projetos" e "projeto" casam). O índice é mantido
+pelos eventos de post, comentário e remoção e gravado em dados_busca.json junto
+com uma marca do estado indexado (posts, maior id, comentários); ao carregar,
+uma marca diferente da atual indica dados alterados sem o índice, que é então
+remontado.
+"""
+
+import heapq
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import serializacao
+from indices import normalizar
+
+PALAVRAS_VAZIAS = frozenset('''
+a o as os um uma uns umas de da do das dos em na no nas nos num numa por pelo pela pelos pelas para pra
+com sem sob e ou mas que se ao aos eu tu ele ela nos vos eles elas me te lhe meu minha seu sua isso isto
+esse essa este esta aquele aquela ja nao sim muito mais como quando onde ser foi sao esta estou tem ha
+'''.split())
+
+_PALAVRA = re.compile(r'[a-z0-9]+')
+
+# Sufixos de plural (já sem acentos) e o que fica no lugar
+_PLURAIS = (('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'), ('ois', 'ol'),
+            ('res', 'r'), ('zes', 'z'), ('ns', 'm'))
+
+Marca = Tuple[int, int, int]
+
+
+def radical(palavra: str) -> str:
+    """Singular aproximado de uma palavra sem acentos ("acoes" -> "acao", "dados" -> "dado")"""
+    if len(palavra) <= 3 or palavra.isdigit():
+        return palavra
+    for sufixo, troca in _PLURAIS:
+        if palavra.endswith(sufixo) and len(palavra) > len(sufixo) + 1:
+            if sufixo in ('res', 'zes') and palavra[-4] not in 'aeiou':
+                break  # "livres", "quartzes": só o s sai
+            return palavra[:-len(sufixo)] + troca
+    if palavra[-1] == 's' and palavra[-2] not in 'sui':
+        return palavra[:-1]
+    return palavra
+
+
+def termos(texto: str) -> List[str]:
+    """Termos indexáveis do texto, na ordem, com repetições"""
+    return [radical(p) for p in _PALAVRA.findall(normalizar(texto))
+            if p not in PALAVRAS_VAZIAS and (len(p) > 1 or p.isdigit())]
+
+
+class IndicePosts:
+    """Postagens termo -> {post_id: frequência} e, por post, autor, instante e comprimento.
+
+    Cada post é um documento com o seu conteúdo e os seus comentários; a
+    busca soma o BM25 dos termos da consulta (qualquer um deles casa).
+    """
+
+    K1, B = 1.2, 0.75
+    VERSAO = 1  # do formato de dados_busca.json
+
+    def __init__(self):
+        self._postagens: Dict[str, Dict[int, int]] = {}
+        self._documentos: Dict[int, List] = {}  # post_id -> [autor, instante, comprimento, termos distintos]
+        self._comprimento_total = 0
+        self.alterado = False  # há mudanças ainda não gravadas
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    @classmethod
+    def montar(cls, posts: Iterable[Dict], comentarios: Iterable[Tuple[int, Dict]]) -> 'IndicePosts':
+        """Índice de todos os posts e pares (post_id, comentário)"""
+        indice = cls()
+        for post in posts:
+            indice.adicionar_post(post)
+        for post_id, comentario in comentarios:
+            indice.adicionar_comentario(post_id, comentario)
+        indice.alterado = True
+        return indice
+
+    @classmethod
+    def mesclar(cls, partes: Iterable['IndicePosts']) -> 'IndicePosts':
+        """Junta índices montados sobre conjuntos disjuntos de posts (cada um com os comentários
+        dos seus posts); as partes são consumidas"""
+        indice = cls()
+        for parte in partes:
+            indice._documentos.update(parte._documentos)
+            indice._comprimento_total += parte._comprimento_total
+            for termo, postagem in parte._postagens.items():
+                atual = indice._postagens.get(termo)
+                if atual is None:
+                    indice._postagens[termo] = postagem
+                else:
+                    atual.update(postagem)
+        indice.alterado = True
+        return indice
+
+    # ----- manutenção -----
+
+    def _indexar(self, post_id: int, documento: List, texto: str) -> None:
+        lista = termos(texto)
+        for termo in lista:
+            postagem = self._postagens.get(termo)
+            if postagem is None:
+                self._postagens[termo] = postagem = {}
+            if post_id not in postagem:
+                postagem[post_id] = 0
+                documento[3].append(termo)
+            postagem[post_id] += 1
+        documento[2] += len(lista)
+        self._comprimento_total += len(lista)
+        self.alterado = True
+
+    def adicionar_post(self, post: Dict) -> None:
+        """Indexa o conteúdo de um post novo"""
+        if post['id'] in self._documentos:
+            return
+        self._documentos[post['id']] = documento = [post['usuario'], post['timestamp'], 0, []]
+        self._indexar(post['id'], documento, post['conteudo'])
+
+    def adicionar_comentario(self, post_id: int, comentario: Dict) -> None:
+        """Acrescenta o texto do comentário ao documento do post"""
+        documento = self._documentos.get(post_id)
+        if documento is not None:
+            self._indexar(post_id, documento, comentario['texto'])
+
+    def remover_post(self, post_id: int) -> None:
+        """Retira o post (e os seus comentários) do índice"""
+        documento = self._documentos.pop(post_id, None)
+        if documento is None:
+            return
+        for termo in documento[3]:
+            postagem = self._postagens[termo]
+            del postagem[post_id]
+            if not postagem:
+                del self._postagens[termo]
+        self._comprimento_total -= documento[2]
+        self.alterado = True
+
+    def aplicar(self, evento: Dict) -> None:
+        """Mantém o índice a partir de um evento de mutação"""
+        if evento['op'] == 'post':
+            self.adicionar_post(evento['post'])
+        elif evento['op'] == 'comentar':
+            self.adicionar_comentario(evento['id'], evento['comentario'])
+        elif evento['op'] == 'deletar_post':
+            self.remover_post(evento['id'])
+
+    # ----- consulta -----
+
+    def buscar(self, consulta: str, limite: int = 20, autor: Optional[str] = None,
+               inicio: Optional[float] = None, fim: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Até ``limite`` pares (post_id, escore BM25), do mais relevante; empates favorecem o mais recente.
+        ``autor`` e o intervalo [inicio, fim] (epoch) filtram os posts"""
+        total = len(self._documentos)
+        if not total:
+            return []
+        media = self._comprimento_total / total or 1.0
+        k1, b = self.K1, self.B
+        escores: Dict[int, float] = {}
+        for termo in set(termos(consulta)):
+            postagem = self._postagens.get(termo)
+            if not postagem:
+                continue
+            idf = math.log(1 + (total - len(postagem) + 0.5) / (len(postagem) + 0.5))
+            for post_id, frequencia in postagem.items():
+                documento = self._documentos[post_id]
+                if autor is not None and documento[0] != autor:
+                    continue
+                if (inicio is not None and documento[1] < inicio) or (fim is not None and documento[1] > fim):
+                    continue
+                escores[post_id] = escores.get(post_id, 0.0) + idf * frequencia * (k1 + 1) / (
+                    frequencia + k1 * (1 - b + b * documento[2] / media))
+        return heapq.nlargest(limite, escores.items(), key=lambda par: (par[1], par[0]))
+
+    # ----- persistência -----
+
+    def gravar(self, arquivo: Path, marca: Marca, encoding: str = 'utf-8', codec: str = 'json') -> None:
+        """Grava o índice com a marca do estado indexado, no ``codec`` (ver serializacao.py)"""
+        dados = {'versao': self.VERSAO, 'marca': list(marca),
+                 'documentos': {str(i): d[:3] for i, d in self._documentos.items()},
+                 'postagens': {t: [v for par in p.items() for v in par] for t, p in self._postagens.items()}}
+        serializacao.gravar(arquivo, dados, codec, encoding)
+        self.alterado = False
+
+    @classmethod
+    def carregar(cls, arquivo: Path, marca: Marca, encoding: str = 'utf-8') -> Optional['IndicePosts']:
+        """Índice gravado, ou None se não existir, estiver corrompido ou tiver outra marca"""
+        try:
+            dados = serializacao.ler(arquivo, encoding)
+            if dados.get('versao') != cls.VERSAO or tuple(dados['marca']) != tuple(marca):
+                return None
+            indice = cls()
+            for post_id, (autor, instante, comprimento) in dados['documentos'].items():
+                indice._documentos[int(post_id)] = [autor, instante, comprimento, []]
+                indice._comprimento_total += comprimento
+            for termo, pares in dados['postagens'].items():
+                indice._postagens[termo] = postagem = dict(zip(pares[::2], pares[1::2]))
+                for post_id in postagem:
+                    indice._documentos[post_id][3].append(termo)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return indice
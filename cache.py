@@ -0,0 +1,56 @@
+"""
+CACHE LRU DO LINKEDIN SPA
+Descrição: Cache limitado com despejo LRU, invalidação por chave e contadores
+de acertos/falhas.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class CacheLRU:
+    """Cache com no máximo ``capacidade`` entradas; a menos usada sai primeiro"""
+
+    def __init__(self, capacidade: int = 1024):
+        """Cria o cache vazio"""
+        self.capacidade = capacidade
+        self.acertos = self.falhas = self.despejos = 0
+        self._dados: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._dados
+
+    def obter(self, chave: Hashable, carregar: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache ou o calcula com ``carregar`` e guarda"""
+        try:
+            valor = self._dados[chave]
+        except KeyError:
+            self.falhas += 1
+            valor = carregar()
+            self._dados[chave] = valor
+            if len(self._dados) > self.capacidade:
+                self._dados.popitem(last=False)
+                self.despejos += 1
+            return valor
+        self.acertos += 1
+        self._dados.move_to_end(chave)
+        return valor
+
+    def invalidar(self, *chaves: Hashable) -> None:
+        """Descarta as chaves informadas"""
+        for chave in chaves:
+            self._dados.pop(chave, None)
+
+    def limpar(self) -> None:
+        """Descarta todas as entradas (mantém os contadores)"""
+        self._dados.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Contadores de uso do cache"""
+        total = self.acertos + self.falhas
+        return {'entradas': len(self._dados), 'capacidade': self.capacidade, 'acertos': self.acertos,
+                'falhas': self.falhas, 'despejos': self.despejos,
+                'taxa_acerto': round(self.acertos / total, 4) if total else 0.0}
@@ -0,0 +1,106 @@
+"""
+COMENTÁRIOS DO LINKEDIN SPA
+Descrição: Guarda os comentários fora dos posts, em listas por id de post, com
+paginação por cursor. Cada comentário recebe um id que cresce dentro do seu
+post, e o cursor é o id do último comentário exibido. Um post popular não
+cresce a cada comentário, e o feed lê só a página de comentários que exibe; os
+totais ficam no próprio post ('total_curtidas', 'total_comentarios').
+"""
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from registros import Comentario
+
+
+class Comentarios:
+    """Comentários por post em memória; o id de cada um é a sua posição no post (a partir de 1).
+
+    Subclasses trocam só onde as listas ficam (ver ``_lista`` e afins), como
+    segmentos.ComentariosSegmentados.
+    """
+
+    def __init__(self):
+        self._por_post: Dict[int, List] = {}
+
+    @classmethod
+    def de_json(cls, dados: Mapping, usuarios: Optional[Mapping] = None) -> 'Comentarios':
+        """Cria a partir do conteúdo de dados_comentarios.json ({post_id: [comentários]}); com
+        ``usuarios`` os dicts viram registros Comentario, senão ficam como lidos"""
+        comentarios = cls()
+        for post_id, lista in dados.items():
+            for c in lista:
+                if usuarios is not None and not isinstance(c, Comentario):
+                    c = Comentario.de_json(c, usuarios)
+                comentarios.adicionar(int(post_id), c)
+        return comentarios
+
+    def para_json(self) -> Dict[str, List]:
+        """Dict no formato de dados_comentarios.json"""
+        return {str(post_id): lista for post_id, lista in self._listas() if lista}
+
+    # ----- onde ficam as listas -----
+
+    def _lista(self, post_id: int) -> Optional[List]:
+        return self._por_post.get(post_id)
+
+    def _lista_para_escrita(self, post_id: int) -> List:
+        lista = self._por_post.get(post_id)
+        if lista is None:
+            self._por_post[post_id] = lista = []
+        return lista
+
+    def _remover_lista(self, post_id: int) -> Optional[List]:
+        return self._por_post.pop(post_id, None)
+
+    def _listas(self) -> Iterator[Tuple[int, List]]:
+        """Pares (post_id, lista) em ordem de post_id"""
+        return ((post_id, self._por_post[post_id]) for post_id in sorted(self._por_post))
+
+    # ----- operações -----
+
+    def adicionar(self, post_id: int, comentario: Comentario) -> None:
+        """Acrescenta o comentário ao fim do post, definindo o seu id"""
+        lista = self._lista_para_escrita(post_id)
+        comentario['id'] = len(lista) + 1
+        lista.append(comentario)
+
+    def total(self, post_id: int) -> int:
+        lista = self._lista(post_id)
+        return len(lista) if lista else 0
+
+    def quantidade(self) -> int:
+        """Total de comentários de todos os posts"""
+        return sum(len(lista) for _, lista in self._listas())
+
+    def pagina(self, post_id: int, cursor: Optional[int] = None, limite: int = 5) -> List[Comentario]:
+        """Até ``limite`` comentários posteriores ao cursor (None = do primeiro), do mais antigo ao mais novo"""
+        lista = self._lista(post_id)
+        inicio = cursor or 0
+        return lista[inicio:inicio + limite] if lista else []
+
+    def do_post(self, post_id: int) -> List[Comentario]:
+        """Todos os comentários do post"""
+        return list(self._lista(post_id) or ())
+
+    def remover_post(self, post_id: int) -> List[Comentario]:
+        """Descarta (e retorna) os comentários de um post apagado"""
+        return self._remover_lista(post_id) or []
+
+    def itens(self) -> Iterator[Tuple[int, Comentario]]:
+        """Pares (post_id, comentário) por post_id e, dentro do post, por id"""
+        for post_id, lista in self._listas():
+            for comentario in lista:
+                yield post_id, comentario
+
+    def separar(self, posts: Iterable[Dict], usuarios: Optional[Mapping] = None) -> bool:
+        """Retira a lista 'comentarios' de posts no formato antigo e a guarda aqui; True se havia alguma"""
+        separou = False
+        for post in posts:
+            lista = post.pop('comentarios', None) if isinstance(post, dict) else None
+            if lista is None:
+                continue
+            separou = True
+            for c in lista:
+                self.adicionar(post['id'], Comentario.de_json(c, usuarios) if usuarios is not None else c)
+            post['total_comentarios'] = self.total(post['id'])
+        return separou
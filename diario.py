@@ -0,0 +1,326 @@
+"""
+DIÁRIO DE ESCRITA (WRITE-AHEAD LOG) DO LINKEDIN SPA
+Descrição: Registra cada mutação como uma linha JSON compacta em um arquivo
+append-only, com fsync em grupo, e compacta o diário em um novo snapshot
+(dados_*.json) em segundo plano.
+"""
+
+import os
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Iterator, Optional
+
+import serializacao
+from comentarios import Comentarios
+from grafo import GrafoSocial
+from metricas import REGISTRO
+from linha_do_tempo import LinhaDoTempo
+from registros import para_json
+
+
+def aplicar_evento(usuarios: Dict, grafo: GrafoSocial, posts: LinhaDoTempo, comentarios: Comentarios,
+                   evento: Dict) -> None:
+    """Aplica um evento do diário sobre usuários, grafo social, posts e comentários.
+
+    Todas as operações são idempotentes, então reaplicar um evento já contido
+    no snapshot não altera o resultado. Listas 'seguidores'/'seguindo'/'likes'
+    de diários antigos são descartadas: o grafo é a fonte dessas relações. Um
+    post novo começa com os totais zerados; as curtidas e os comentários chegam
+    nos eventos seguintes. Um comentário só entra se o seu id vier depois dos
+    que o post já tem.
+    """
+    op = evento['op']
+    if op == 'registrar':
+        usuario = {k: v for k, v in evento['usuario'].items() if k not in ('seguidores', 'seguindo')}
+        usuarios[evento['username']] = usuario
+        grafo.adicionar_usuario(evento['username'])
+    elif op == 'perfil':
+        usuario = usuarios[evento['username']]
+        usuario[evento['campo']] = evento['valor']
+        _versionar(usuario, evento)
+    elif op == 'conectar':
+        grafo.conectar(evento['origem'], evento['alvo'])
+    elif op == 'post':
+        if posts.obter(evento['post']['id']) is None:
+            post = {k: v for k, v in evento['post'].items() if k != 'likes'}
+            post['total_curtidas'] = post['total_comentarios'] = 0
+            comentarios.separar((post,))  # diários antigos: comentários dentro do post
+            posts.publicar(post)
+    elif op == 'deletar_post':
+        posts.remover(evento['id'])
+        grafo.remover_post(evento['id'])
+        comentarios.remover_post(evento['id'])
+    elif op in ('curtir', 'descurtir', 'comentar'):
+        post = posts.obter(evento['id'])
+        if post is None:
+            return
+        if op == 'curtir':
+            if grafo.curtir(evento['id'], evento['usuario']):
+                post['total_curtidas'] = post.get('total_curtidas', 0) + 1
+        elif op == 'descurtir':
+            if grafo.descurtir(evento['id'], evento['usuario']):
+                post['total_curtidas'] = post.get('total_curtidas', 0) - 1
+        elif evento['comentario'].get('id') is None or evento['comentario']['id'] > comentarios.total(evento['id']):
+            comentarios.adicionar(evento['id'], evento['comentario'])
+            post['total_comentarios'] = post.get('total_comentarios', 0) + 1
+        _versionar(post, evento)
+    else:
+        raise ValueError(f"Operação desconhecida no diário: {op}")
+
+
+def _versionar(registro: Dict, evento: Dict) -> None:
+    """Avança a versão do registro alterado; 'versao' do evento é a versão em que ele se baseou"""
+    if 'versao' in evento:
+        registro['versao'] = max(registro.get('versao', 0), evento['versao'] + 1)
+
+
+class Diario:
+    """Diário append-only com fsync em grupo e compactação em segundo plano"""
+
+    JANELA_GRUPO = 0.002  # segundos aguardando outras escritas antes do fsync
+
+    def __init__(self, arquivo: Path, arquivos_snapshot: Dict[str, Path], encoding: str = 'utf-8',
+                 codec: str = 'json'):
+        """Abre o diário; ``arquivos_snapshot`` mapeia usuarios/conexoes/posts/comentarios para seus arquivos,
+        gravados no ``codec`` (ver serializacao.py) a cada compactação"""
+        self.arquivo = Path(arquivo)
+        self.arquivo_selado = self.arquivo.with_suffix('.selado' + self.arquivo.suffix)
+        self.arquivo_marcador = self.arquivo.with_suffix('.seq')
+        self.arquivos_snapshot = arquivos_snapshot
+        self.encoding, self.codec = encoding, codec
+        self.registros_ativos = 0
+        self._seq = self._seq_duravel = 0
+        self._pendentes: List[str] = []
+        self._cond = threading.Condition()
+        self._fechado = False
+        self._erro: Optional[BaseException] = None
+        self._compactador: Optional[threading.Thread] = None
+        self._concluir_compactacao_pendente()
+        for arquivo in (self.arquivo_selado, self.arquivo):
+            self._descartar_cauda_incompleta(arquivo)
+        self._seq_snapshot = self._ler_marcador()['seq']
+        self._seq = self._seq_duravel = max(self._seq_snapshot, self._maior_seq())
+        self._arquivo = open(self.arquivo, 'a', encoding=self.encoding)
+        self._escritor = threading.Thread(target=self._laco_escrita, name='diario-escritor', daemon=True)
+        self._escritor.start()
+
+    # ----- leitura / replay -----
+
+    def _ler_marcador(self) -> Dict:
+        """Lê o marcador com o último seq incluído no snapshot"""
+        try:
+            with open(self.arquivo_marcador, 'r', encoding=self.encoding) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'seq': 0, 'pendentes': []}
+
+    def _escrever_marcador(self, seq: int, pendentes: List[str]) -> None:
+        """Grava o marcador de forma atômica (temp + rename)"""
+        tmp = self.arquivo_marcador.with_suffix('.seq.tmp')
+        with open(tmp, 'w', encoding=self.encoding) as f:
+            json.dump({'seq': seq, 'pendentes': pendentes}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.arquivo_marcador)
+
+    def _concluir_compactacao_pendente(self) -> None:
+        """Conclui (roll-forward) renomeações de uma compactação interrompida"""
+        marcador = self._ler_marcador()
+        if not marcador.get('pendentes'):
+            return
+        for nome in marcador['pendentes']:
+            tmp = Path(nome + '.tmp')
+            if tmp.exists():
+                os.replace(tmp, nome)
+        self._escrever_marcador(marcador['seq'], [])
+
+    def _descartar_cauda_incompleta(self, arquivo: Path) -> None:
+        """Trunca o segmento após o último registro completo, para que os próximos não colem na sobra"""
+        if not arquivo.exists():
+            return
+        with open(arquivo, 'r+b') as f:
+            fim = f.seek(0, os.SEEK_END)
+            corte = fim
+            while corte > 0:
+                inicio = max(0, corte - 4096)
+                f.seek(inicio)
+                quebra = f.read(corte - inicio).rfind(b'\n')
+                if quebra >= 0:
+                    corte = inicio + quebra + 1
+                    break
+                corte = inicio
+            if corte < fim:
+                f.truncate(corte)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _linhas(self, arquivo: Path) -> Iterator[Dict]:
+        """Lê eventos de um segmento, ignorando uma última linha incompleta"""
+        if not arquivo.exists():
+            return
+        with open(arquivo, 'r', encoding=self.encoding) as f:
+            for linha in f:
+                if not linha.endswith('\n'):
+                    break  # escrita interrompida por queda: registro descartado
+                yield json.loads(linha)
+
+    def _maior_seq(self) -> int:
+        """Maior seq presente nos segmentos do diário"""
+        maior = 0
+        for arquivo in (self.arquivo_selado, self.arquivo):
+            for evento in self._linhas(arquivo):
+                maior = max(maior, evento['seq'])
+        return maior
+
+    def eventos(self) -> Iterator[Dict]:
+        """Eventos ainda não incluídos no snapshot, em ordem"""
+        self.registros_ativos = 0
+        for arquivo in (self.arquivo_selado, self.arquivo):
+            for evento in self._linhas(arquivo):
+                if evento['seq'] > self._seq_snapshot:
+                    if arquivo == self.arquivo:
+                        self.registros_ativos += 1
+                    yield evento
+
+    # ----- escrita com commit em grupo -----
+
+    def anexar(self, evento: Dict, aguardar: bool = True) -> int:
+        """Anexa um evento; com ``aguardar`` bloqueia até o fsync do grupo"""
+        with self._cond:
+            if self._erro:
+                raise self._erro
+            self._seq += 1
+            seq = self._seq
+            self._pendentes.append(json.dumps({'seq': seq, **evento}, ensure_ascii=False,
+                                              separators=(',', ':'), default=para_json) + '\n')
+            self.registros_ativos += 1
+            self._cond.notify_all()
+            if aguardar:
+                self._cond.wait_for(lambda: self._seq_duravel >= seq or self._erro is not None)
+                if self._erro:
+                    raise self._erro
+        return seq
+
+    def _laco_escrita(self) -> None:
+        """Thread escritora: junta os registros pendentes em um único write + fsync"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pendentes or self._fechado)
+                if not self._pendentes and self._fechado:
+                    return
+            if self.JANELA_GRUPO:
+                threading.Event().wait(self.JANELA_GRUPO)
+            with self._cond:
+                lote, self._pendentes = self._pendentes, []
+                seq_lote = self._seq
+                try:
+                    inicio, dados = time.perf_counter(), ''.join(lote)
+                    self._arquivo.write(dados)
+                    self._arquivo.flush()
+                    os.fsync(self._arquivo.fileno())
+                    self._seq_duravel = seq_lote
+                    if REGISTRO.ativo:
+                        REGISTRO.registrar_gravacao(self.arquivo, len(dados.encode(self.encoding)),
+                                                    time.perf_counter() - inicio)
+                except OSError as e:
+                    self._erro = e
+                self._cond.notify_all()
+
+    def sincronizar(self) -> None:
+        """Bloqueia até que todos os eventos anexados estejam em disco"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq_duravel >= self._seq or self._erro is not None)
+
+    # ----- snapshot e compactação -----
+
+    def aguardar_compactacao(self) -> None:
+        """Aguarda a compactação em andamento (antes de reescrever o snapshot)"""
+        if self._compactador:
+            self._compactador.join()
+
+    def snapshot_escrito(self) -> None:
+        """Informa que o estado atual foi salvo por completo nos arquivos de snapshot"""
+        self.sincronizar()
+        with self._cond:
+            self._seq_snapshot = self._seq
+            self._escrever_marcador(self._seq, [])
+            self._arquivo.close()
+            self._arquivo = open(self.arquivo, 'w', encoding=self.encoding)
+            if self.arquivo_selado.exists():
+                self.arquivo_selado.unlink()
+            self.registros_ativos = 0
+
+    def compactar(self, aguardar: bool = False) -> bool:
+        """Sela o segmento ativo e o incorpora a um novo snapshot em segundo plano"""
+        if self._compactador and self._compactador.is_alive():
+            return False
+        self.sincronizar()
+        with self._cond:
+            self._arquivo.close()
+            if self.arquivo_selado.exists():  # sobra de compactação interrompida
+                with open(self.arquivo_selado, 'a', encoding=self.encoding) as f:
+                    f.write(self.arquivo.read_text(encoding=self.encoding))
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                os.replace(self.arquivo, self.arquivo_selado)
+            self._arquivo = open(self.arquivo, 'w', encoding=self.encoding)
+            self.registros_ativos = 0
+        self._compactador = threading.Thread(target=self._compactar_selado, name='diario-compactador')
+        self._compactador.start()
+        if aguardar:
+            self._compactador.join()
+        return True
+
+    def _compactar_selado(self) -> None:
+        """Snapshot anterior + segmento selado -> novo snapshot (não toca no estado em memória)"""
+        try:
+            dados = {'comentarios': {}}  # snapshots antigos não têm o arquivo de comentários
+            for chave, arquivo in self.arquivos_snapshot.items():
+                if chave == 'comentarios' and not Path(arquivo).exists():
+                    continue
+                dados[chave] = serializacao.ler(arquivo, self.encoding)
+            comentarios = Comentarios.de_json(dados['comentarios'])
+            comentarios.separar(dados['posts'])
+            grafo = GrafoSocial.de_json(dados['usuarios'], dados['conexoes'], dados['posts'])
+            posts = LinhaDoTempo(dados['posts'])
+            seq = self._seq_snapshot
+            for evento in self._linhas(self.arquivo_selado):
+                if evento['seq'] > seq:
+                    aplicar_evento(dados['usuarios'], grafo, posts, comentarios, evento)
+                    seq = evento['seq']
+            dados['usuarios'] = grafo.usuarios_json(dados['usuarios'])
+            dados['conexoes'] = grafo.conexoes_json()
+            dados['posts'] = [grafo.post_json(p) for p in posts]
+            dados['comentarios'] = comentarios.para_json()
+
+            for chave, arquivo in self.arquivos_snapshot.items():
+                inicio = time.perf_counter()
+                with open(str(arquivo) + '.tmp', 'wb') as f:
+                    serializacao.escrever(f, dados[chave], self.codec, self.encoding)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    tamanho = os.fstat(f.fileno()).st_size
+                if REGISTRO.ativo:
+                    REGISTRO.registrar_gravacao(arquivo, tamanho, time.perf_counter() - inicio)
+            nomes = [str(a) for a in self.arquivos_snapshot.values()]
+            self._escrever_marcador(seq, nomes)
+            for nome in nomes:
+                os.replace(nome + '.tmp', nome)
+            with self._cond:
+                self._seq_snapshot = max(self._seq_snapshot, seq)
+                self._escrever_marcador(self._seq_snapshot, [])
+            self.arquivo_selado.unlink()
+        except Exception as e:
+            print(f"❌ Erro na compactação do diário: {e}")
+
+    def fechar(self) -> None:
+        """Esvazia pendências, aguarda a compactação e fecha o arquivo"""
+        with self._cond:
+            self._fechado = True
+            self._cond.notify_all()
+        self._escritor.join()
+        self.aguardar_compactacao()
+        self._arquivo.close()
@@ -0,0 +1,223 @@
+"""
+POSTS EM ALTA DO LINKEDIN SPA
+Descrição: Ranking de posts por curtidas e comentários com decaimento
+exponencial, mantido incrementalmente a cada interação e consultado em janelas
+deslizantes (1h, 24h, 7d). O decaimento é aplicado na escala do escore (peso x
+2^(instante / meia-vida)), então o escore de um post só muda quando ele recebe
+ou perde interações e a ordem entre posts se mantém com o passar do tempo.
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class _Interacao:
+    """Curtida (com ``usuario``) ou comentário (``usuario`` None) compartilhado entre as janelas"""
+
+    __slots__ = ('instante', 'post_id', 'peso', 'usuario', 'ativa')
+
+    def __init__(self, instante: float, post_id: int, peso: float, usuario: Optional[str] = None):
+        self.instante, self.post_id, self.peso, self.usuario = instante, post_id, peso, usuario
+        self.ativa = True
+
+
+class JanelaEmAlta:
+    """Escores dos posts com interações nos últimos ``duracao`` segundos.
+
+    Os escores ficam num heap de máximo com remoção preguiçosa: cada alteração
+    empurra uma entrada nova e as antigas são descartadas quando aparecem no topo.
+    """
+
+    REBASE = 256  # meias-vidas acumuladas antes de reescalar os escores
+
+    def __init__(self, duracao: float, meia_vida: float):
+        self.duracao, self.meia_vida = duracao, meia_vida
+        self._interacoes: Deque[_Interacao] = deque()
+        self._escores: Dict[int, float] = {}
+        self._contagem: Dict[int, int] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._referencia: Optional[float] = None
+        self._corte = float('-inf')
+
+    def __len__(self) -> int:
+        return len(self._escores)
+
+    def _escala(self, instante: float) -> float:
+        return 2.0 ** ((instante - self._referencia) / self.meia_vida)
+
+    def _somar(self, post_id: int, valor: float, delta: int) -> None:
+        contagem = self._contagem.get(post_id, 0) + delta
+        if contagem <= 0:  # sem interações: descarta o resíduo de ponto flutuante
+            self._contagem.pop(post_id, None)
+            self._escores.pop(post_id, None)
+            return
+        self._contagem[post_id] = contagem
+        self._escores[post_id] = escore = self._escores.get(post_id, 0.0) + valor
+        heapq.heappush(self._heap, (-escore, -post_id))
+        if len(self._heap) > 2 * len(self._escores) + 64:
+            self._refazer_heap()
+
+    def _refazer_heap(self) -> None:
+        self._heap = [(-escore, -post_id) for post_id, escore in self._escores.items()]
+        heapq.heapify(self._heap)
+
+    def _rebase(self, instante: float) -> None:
+        """Move a referência para ``instante`` para os expoentes não estourarem"""
+        fator = 2.0 ** ((self._referencia - instante) / self.meia_vida)  # 1 / escala, sem estourar após longa pausa
+        self._escores = {post_id: escore * fator for post_id, escore in self._escores.items()}
+        self._referencia = instante
+        self._refazer_heap()
+
+    def adicionar(self, interacao: _Interacao) -> None:
+        """Conta uma interação nova"""
+        if interacao.instante < self._corte:
+            return
+        if self._referencia is None:
+            self._referencia = interacao.instante
+        elif (interacao.instante - self._referencia) / self.meia_vida > self.REBASE:
+            self._rebase(interacao.instante)
+        self._interacoes.append(interacao)
+        self._somar(interacao.post_id, interacao.peso * self._escala(interacao.instante), 1)
+
+    def retirar(self, interacao: _Interacao) -> None:
+        """Desconta uma interação ainda ativa (descurtida); a fila a ignora ao expirar"""
+        if interacao.instante >= self._corte:
+            self._somar(interacao.post_id, -interacao.peso * self._escala(interacao.instante), -1)
+
+    def esquecer(self, post_id: int) -> None:
+        """Remove o post do ranking (post apagado)"""
+        self._escores.pop(post_id, None)
+        self._contagem.pop(post_id, None)
+
+    def expirar(self, agora: float) -> List[_Interacao]:
+        """Desconta as interações que saíram da janela e as devolve"""
+        self._corte = corte = agora - self.duracao
+        expiradas = []
+        while self._interacoes and self._interacoes[0].instante < corte:
+            interacao = self._interacoes.popleft()
+            if interacao.ativa and interacao.post_id in self._contagem:
+                self._somar(interacao.post_id, -interacao.peso * self._escala(interacao.instante), -1)
+            expiradas.append(interacao)
+        return expiradas
+
+    def ativas(self) -> Iterable[_Interacao]:
+        return self._interacoes
+
+    def top(self, k: int, agora: float) -> List[Tuple[int, float]]:
+        """Até ``k`` pares (post_id, escore em ``agora``), do maior escore ao menor; O(k log n)"""
+        resultado, devolver, vistos = [], [], set()
+        while self._heap and len(resultado) < k:
+            entrada = heapq.heappop(self._heap)
+            post_id = -entrada[1]
+            if self._escores.get(post_id) != -entrada[0] or post_id in vistos:
+                continue  # entrada desatualizada
+            vistos.add(post_id)
+            devolver.append(entrada)
+            resultado.append((post_id, -entrada[0]))
+        for entrada in devolver:
+            heapq.heappush(self._heap, entrada)
+        fator = 1.0 / self._escala(agora) if resultado else 1.0
+        return [(post_id, escore * fator) for post_id, escore in resultado]
+
+
+class RankingEmAlta:
+    """Posts em alta em várias janelas, alimentado pelos eventos de curtida e comentário"""
+
+    JANELAS = {'1h': 3600, '24h': 86400, '7d': 7 * 86400}
+    PESO_CURTIDA, PESO_COMENTARIO = 1.0, 2.0
+    FRACAO_MEIA_VIDA = 0.25  # meia-vida do decaimento como fração da janela
+
+    def __init__(self, janelas: Optional[Dict[str, float]] = None, peso_curtida: Optional[float] = None,
+                 peso_comentario: Optional[float] = None, relogio: Callable[[], float] = time.time):
+        janelas = janelas or self.JANELAS
+        self.janelas = {nome: JanelaEmAlta(duracao, duracao * self.FRACAO_MEIA_VIDA)
+                        for nome, duracao in janelas.items()}
+        self._maior = max(self.janelas.values(), key=lambda janela: janela.duracao)
+        self.peso_curtida = self.PESO_CURTIDA if peso_curtida is None else peso_curtida
+        self.peso_comentario = self.PESO_COMENTARIO if peso_comentario is None else peso_comentario
+        self.relogio = relogio
+        self._curtidas: Dict[Tuple[int, str], _Interacao] = {}
+
+    @property
+    def maior_janela(self) -> float:
+        """Duração da maior janela, em segundos"""
+        return self._maior.duracao
+
+    def carregar(self, posts: Iterable[Dict], comentarios: Iterable[Tuple[int, Dict]],
+                 curtidas: Callable[[int], Iterable[str]]) -> None:
+        """Monta o ranking a partir dos dados existentes.
+
+        ``posts`` e ``comentarios`` são os da maior janela. Curtidas não têm
+        instante gravado, então contam no instante do post.
+        """
+        interacoes = [_Interacao(c['timestamp'], post_id, self.peso_comentario) for post_id, c in comentarios]
+        for post in posts:
+            interacoes += (_Interacao(post['timestamp'], post['id'], self.peso_curtida, u)
+                           for u in curtidas(post['id']))
+        interacoes.sort(key=lambda interacao: interacao.instante)
+        self._expirar(self.relogio())
+        for interacao in interacoes:
+            self._adicionar(interacao)
+
+    def _adicionar(self, interacao: _Interacao) -> None:
+        if interacao.usuario is not None:
+            self._curtidas[interacao.post_id, interacao.usuario] = interacao
+        for janela in self.janelas.values():
+            janela.adicionar(interacao)
+
+    def _expirar(self, agora: float) -> None:
+        for janela in self.janelas.values():
+            expiradas = janela.expirar(agora)
+            if janela is self._maior:
+                for interacao in expiradas:
+                    if interacao.usuario is not None and \
+                            self._curtidas.get((interacao.post_id, interacao.usuario)) is interacao:
+                        del self._curtidas[interacao.post_id, interacao.usuario]
+
+    # ----- eventos -----
+
+    def curtir(self, post_id: int, usuario: str, instante: Optional[float] = None) -> None:
+        self._adicionar(_Interacao(self.relogio() if instante is None else instante, post_id,
+                                   self.peso_curtida, usuario))
+
+    def descurtir(self, post_id: int, usuario: str) -> None:
+        """Desconta a curtida, se ela ainda estiver em alguma janela"""
+        interacao = self._curtidas.pop((post_id, usuario), None)
+        if interacao is not None and interacao.ativa:
+            for janela in self.janelas.values():
+                janela.retirar(interacao)
+            interacao.ativa = False
+
+    def comentar(self, post_id: int, instante: Optional[float] = None) -> None:
+        self._adicionar(_Interacao(self.relogio() if instante is None else instante, post_id,
+                                   self.peso_comentario))
+
+    def remover_post(self, post_id: int) -> None:
+        for interacao in self._maior.ativas():
+            if interacao.post_id == post_id:
+                interacao.ativa = False
+        self._curtidas = {chave: i for chave, i in self._curtidas.items() if chave[0] != post_id}
+        for janela in self.janelas.values():
+            janela.esquecer(post_id)
+
+    def aplicar(self, evento: Dict) -> None:
+        """Atualiza o ranking a partir de um evento de mutação"""
+        op = evento['op']
+        if op == 'curtir':
+            self.curtir(evento['id'], evento['usuario'])
+        elif op == 'descurtir':
+            self.descurtir(evento['id'], evento['usuario'])
+        elif op == 'comentar':
+            self.comentar(evento['id'], evento['comentario']['timestamp'])
+        elif op == 'deletar_post':
+            self.remover_post(evento['id'])
+
+    # ----- consultas -----
+
+    def top(self, janela: str = '24h', k: int = 10) -> List[Tuple[int, float]]:
+        """Até ``k`` pares (post_id, escore) mais em alta na janela, do maior ao menor"""
+        agora = self.relogio()
+        self._expirar(agora)
+        return self.janelas[janela].top(k, agora)
@@ -0,0 +1,180 @@
+"""
+FEED DA MINHA REDE DO LINKEDIN SPA
+Descrição: Monta o feed personalizado (conexões + seguindo + o próprio usuário)
+por merge k-way das linhas do tempo dos autores na leitura, por caixas de
+entrada pré-calculadas na publicação (fan-out) ou por um híbrido que não faz
+fan-out de autores com audiência grande.
+"""
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from linha_do_tempo import LinhaDoTempo
+
+
+def _mais_recente_primeiro(post: Dict) -> int:
+    return -post['id']
+
+
+class LinhaDaRede:
+    """Linha do tempo virtual: merge k-way de várias linhas por id decrescente.
+
+    Com ``reserva`` e ``piso``, as ``fontes`` só respondem por ids >= piso e a
+    reserva (merge completo dos autores) cobre o restante.
+    """
+
+    def __init__(self, fontes: List, total: Callable[[], int],
+                 reserva: Optional['LinhaDaRede'] = None, piso: int = 0):
+        self.fontes, self._total, self.reserva, self.piso = fontes, total, reserva, piso
+
+    def __len__(self) -> int:
+        return self._total()
+
+    def __bool__(self) -> bool:
+        return bool(self.antes(None, 1))
+
+    def __iter__(self):
+        cursor = None
+        while True:
+            pagina = self.antes(cursor, 100)
+            if not pagina:
+                return
+            yield from pagina
+            cursor = pagina[-1]['id']
+
+    def _merge(self, paginas: Iterable[List[Dict]], limite: int, chave=_mais_recente_primeiro) -> List[Dict]:
+        resultado, vistos = [], set()
+        for post in heapq.merge(*paginas, key=chave):
+            if post['id'] not in vistos:
+                vistos.add(post['id'])
+                resultado.append(post)
+                if len(resultado) == limite:
+                    break
+        return resultado
+
+    def antes(self, cursor: Optional[int] = None, limite: int = 5) -> List[Dict]:
+        """Até ``limite`` posts mais antigos que o cursor, do mais recente ao mais antigo"""
+        if self.reserva is not None and cursor is not None and cursor <= self.piso:
+            return self.reserva.antes(cursor, limite)
+        pagina = self._merge((f.antes(cursor, limite) for f in self.fontes), limite)
+        if self.reserva is None:
+            return pagina
+        pagina = [p for p in pagina if p['id'] >= self.piso]
+        if len(pagina) < limite and self.piso > 0:
+            pagina += self.reserva.antes(self.piso, limite - len(pagina))
+        return pagina
+
+    def depois(self, cursor: int, limite: int = 5) -> List[Dict]:
+        """Até ``limite`` posts mais recentes que o cursor, do mais recente ao mais antigo"""
+        if self.reserva is not None and cursor < self.piso:
+            return self.reserva.depois(cursor, limite)
+        paginas = (reversed(f.depois(cursor, limite)) for f in self.fontes)
+        pagina = self._merge(paginas, limite, chave=lambda p: p['id'])
+        pagina.reverse()
+        return pagina
+
+
+class FeedRede:
+    """Feed personalizado com estratégia configurável: 'merge', 'fanout' ou 'hibrido'"""
+
+    ESTRATEGIAS = ('merge', 'fanout', 'hibrido')
+
+    def __init__(self, estrategia: str, rede: Callable[[str], Set[str]],
+                 audiencia: Callable[[str], Set[str]], linha_do_autor: Callable[[str], LinhaDoTempo],
+                 popularidade: Optional[Callable[[str], int]] = None,
+                 tamanho_caixa: int = 200, limite_celebridade: int = 1000):
+        """
+        rede(u): autores que aparecem no feed de u; audiencia(a): usuários em cujo
+        feed a aparece; linha_do_autor(a): linha do tempo dos posts de a;
+        popularidade(a): tamanho (aproximado) da audiência, usado pelo híbrido.
+        """
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estratégia de feed inválida: {estrategia}")
+        self.estrategia = estrategia
+        self.rede, self.audiencia, self.linha_do_autor = rede, audiencia, linha_do_autor
+        self.popularidade = popularidade or (lambda autor: len(audiencia(autor)))
+        self.tamanho_caixa, self.limite_celebridade = tamanho_caixa, limite_celebridade
+        self._caixas: Dict[str, LinhaDoTempo] = {}
+        self._pisos: Dict[str, int] = {}
+
+    # ----- leitura -----
+
+    def _celebridade(self, autor: str) -> bool:
+        return self.estrategia == 'hibrido' and self.popularidade(autor) > self.limite_celebridade
+
+    def _merge_autores(self, autores: Iterable[str]) -> LinhaDaRede:
+        fontes = [self.linha_do_autor(a) for a in autores]
+        return LinhaDaRede(fontes, lambda: sum(len(f) for f in fontes))
+
+    def linha(self, username: str) -> LinhaDaRede:
+        """Linha do tempo da rede de ``username`` (aceita pelo Navegador)"""
+        autores = self.rede(username)
+        completa = self._merge_autores(autores)
+        if self.estrategia == 'merge':
+            return completa
+        caixa = self._caixa(username, autores)
+        celebridades = [self.linha_do_autor(a) for a in autores if self._celebridade(a)]
+        return LinhaDaRede([caixa] + celebridades, completa._total, completa, self._pisos[username])
+
+    def _caixa(self, username: str, autores: Set[str]) -> LinhaDoTempo:
+        """Caixa de entrada de ``username``, materializada na primeira leitura"""
+        if username not in self._caixas:
+            normais = [a for a in autores if not self._celebridade(a)]
+            recentes = self._merge_autores(normais).antes(None, self.tamanho_caixa)
+            self._caixas[username] = LinhaDoTempo(recentes)
+            truncada = len(recentes) == self.tamanho_caixa
+            self._pisos[username] = recentes[-1]['id'] if truncada else 0
+        return self._caixas[username]
+
+    def limpar(self) -> None:
+        """Descarta as caixas de entrada (rematerializadas na próxima leitura)"""
+        self._caixas.clear()
+        self._pisos.clear()
+
+    # ----- escrita (fan-out) -----
+
+    def aplicar(self, evento: Dict) -> None:
+        """Mantém as caixas de entrada a partir de um evento de mutação"""
+        if self.estrategia == 'merge' or not self._caixas:
+            return
+        op = evento['op']
+        if op == 'post':
+            self._publicado(evento['post'])
+        elif op == 'deletar_post':
+            for username in self.audiencia(evento['usuario']):
+                if username in self._caixas:
+                    self._caixas[username].remover(evento['id'])
+        elif op == 'conectar':
+            self._conectado(evento['origem'], evento['alvo'])
+
+    def _publicado(self, post: Dict) -> None:
+        """Entrega o post nas caixas já materializadas da audiência do autor"""
+        if self._celebridade(post['usuario']):
+            return  # lido por merge no híbrido
+        for username in self.audiencia(post['usuario']):
+            caixa = self._caixas.get(username)
+            if caixa is not None:
+                caixa.publicar(post)
+                if len(caixa) > 2 * self.tamanho_caixa:
+                    self._aparar(username)
+
+    def _aparar(self, username: str) -> None:
+        """Mantém só os ``tamanho_caixa`` posts mais recentes e sobe o piso"""
+        recentes = self._caixas[username].antes(None, self.tamanho_caixa)
+        self._caixas[username] = LinhaDoTempo(recentes)
+        self._pisos[username] = recentes[-1]['id']
+
+    def _conectado(self, origem: str, alvo: str) -> None:
+        """Traz para as caixas os posts do novo autor acima do piso"""
+        for leitor, autor in ((origem, alvo), (alvo, origem)):
+            caixa = self._caixas.get(leitor)
+            if caixa is None or self._celebridade(autor) or autor not in self.rede(leitor):
+                continue
+            piso = self._pisos[leitor]
+            for post in self.linha_do_autor(autor):
+                if post['id'] < piso:
+                    break
+                if caixa.obter(post['id']) is None:
+                    caixa.publicar(post)
+            if len(caixa) > 2 * self.tamanho_caixa:
+                self._aparar(leitor)
@@ -0,0 +1,181 @@
+"""
+GERADOR DE REDES SINTÉTICAS DO LINKEDIN SPA
+Descrição: Gera, a partir de uma semente, redes de qualquer tamanho (10 mil, 100
+mil, 1 milhão de usuários) com os nomes, títulos e bios de
+NucleoSPA.DADOS_PRECONFIGURADOS. As conexões seguem ligação preferencial (o grau
+dos usuários segue uma lei de potência); autores, curtidas e comentários vêm
+sobretudo dos usuários mais conectados, e a quantidade de curtidas e comentários
+por post tem cauda longa. Todos compartilham a senha SENHA, cujo hash é
+calculado uma vez. Os registros saem em streaming no formato de
+importacao.py, para gravar em JSONL/CSV ou importar direto em qualquer modo.
+Uso: python gerador.py 100000 --saida rede.jsonl
+     python gerador.py 100000 --modo sqlite      # importa na pasta atual
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from importacao import Importador, escrever
+from nucleo import NucleoSPA
+from registros import data_de
+from senhas import hash_senha
+
+CONTEUDOS = (
+    'Compartilhando aprendizados da semana como {titulo}',
+    'Procurando indicações de cursos para {titulo}',
+    'Feliz em anunciar minha nova posição como {titulo}! 🚀',
+    'Alguém mais acha que a área de {titulo} mudou muito este ano?',
+    'Dicas para quem está começando como {titulo}',
+    'Encerrando mais um projeto com o time. Obrigado a todos! 💼',
+)
+COMENTARIOS = ('Parabéns!', 'Muito bom', 'Concordo totalmente', 'Ótima dica, obrigado!',
+               'Sucesso na nova fase!', 'Interessante, vamos conversar?')
+
+
+class GeradorRede:
+    """Rede sintética reproduzível: a mesma semente gera sempre os mesmos registros.
+
+    Só a lista de extremidades das conexões (usada para sortear usuários
+    proporcionalmente ao grau) cresce com o tamanho da rede; os registros são
+    produzidos um a um.
+    """
+
+    # Médias por usuário (conexões, posts) e por post (curtidas, comentários)
+    CONEXOES_POR_USUARIO, POSTS_POR_USUARIO = 3, 1.0
+    CURTIDAS_POR_POST, COMENTARIOS_POR_POST = 4.0, 1.0
+    # Expoente das caudas (Pareto): quanto menor, mais concentrado em poucos posts
+    ALFA = 1.6
+    # Fração dos autores sorteada pelo grau (o resto é uniforme)
+    PESO_GRAU = 0.8
+    # A rede cobre os últimos DIAS até o instante de referência
+    DIAS = 30
+    SENHA = 'Senha123'
+
+    def __init__(self, usuarios: int, semente: int = 42, agora: Optional[float] = None):
+        """``agora`` é o instante do registro mais recente (padrão: o atual)"""
+        if usuarios < 2:
+            raise ValueError("A rede precisa de pelo menos 2 usuários")
+        self.usuarios = usuarios
+        self.semente = semente
+        self.agora = time.time() if agora is None else agora
+        self.inicio = self.agora - self.DIAS * 86400
+        dados = NucleoSPA.DADOS_PRECONFIGURADOS
+        self._primeiros = sorted({n.split()[0] for n in dados['nomes'].values()})
+        self._sobrenomes = sorted({n.split()[-1] for n in dados['nomes'].values()})
+        self._titulos = list(dados['titulos'].values())
+        self._pesos_titulos = [1 / (k + 1) for k in range(len(self._titulos))]  # Zipf: poucos títulos dominam
+        self._bios = list(dados['bios'].values())
+        self._senha = hash_senha(self.SENHA, sal=random.Random(semente).randbytes(16))  # reproduzível como o resto
+
+    def username(self, indice: int) -> str:
+        """Username do usuário de índice ``indice`` (o mesmo para toda semente)"""
+        return f'membro{indice}'
+
+    def _criacao(self, indice: int) -> float:
+        """Instante de cadastro: os usuários entram em ordem ao longo do período"""
+        return self.inicio + (self.agora - self.inicio) * indice / self.usuarios
+
+    def _cauda(self, rng: random.Random, media: float) -> int:
+        """Inteiro >= 0 com a ``media`` aproximada e cauda de Pareto"""
+        return int(media * (self.ALFA - 1) * (rng.paretovariate(self.ALFA) - 1) + rng.random())
+
+    def registros(self) -> Iterator[Tuple[str, Dict]]:
+        """Pares (tipo, campos): usuários, conexões e então cada post seguido de comentários e curtidas"""
+        rng = random.Random(self.semente)
+        n = self.usuarios
+        titulos: List[str] = []
+        for i in range(n):
+            primeiro, sobrenome = rng.choice(self._primeiros), rng.choice(self._sobrenomes)
+            titulo = rng.choices(self._titulos, self._pesos_titulos)[0]
+            titulos.append(titulo)
+            instante = self._criacao(i)
+            yield 'usuario', {'username': self.username(i), 'nome': f'{primeiro} {sobrenome}',
+                              'email': f'{primeiro.lower()}.{sobrenome.lower()}.{i}@example.com',
+                              'senha': self._senha, 'titulo': titulo, 'bio': rng.choice(self._bios),
+                              'data_criacao': data_de(instante), 'timestamp_criacao': instante}
+
+        # Ligação preferencial (Barabási-Albert): cada usuário se conecta a m anteriores,
+        # sorteados em ``extremidades``, onde cada um aparece uma vez por conexão que tem
+        m = min(self.CONEXOES_POR_USUARIO, n - 1)
+        extremidades: List[int] = []
+        for i in range(1, n):
+            if i <= m:
+                alvos = set(range(i))
+            else:
+                alvos = set()
+                while len(alvos) < m:
+                    alvos.add(rng.choice(extremidades))
+            for alvo in sorted(alvos):
+                yield 'conexao', {'origem': self.username(i), 'alvo': self.username(alvo)}
+                extremidades.append(alvo)
+                extremidades.append(i)
+
+        def ativo(limite: int) -> int:
+            """Usuário já cadastrado (índice < limite), sorteado pelo grau na maior parte das vezes"""
+            if rng.random() < self.PESO_GRAU:
+                indice = rng.choice(extremidades)
+                if indice < limite:
+                    return indice
+            return rng.randrange(limite)
+
+        # Posts como um processo de Poisson ao longo do período: ids e instantes crescem juntos
+        total_posts = max(1, round(n * self.POSTS_POR_USUARIO))
+        intervalo = self.agora - self.inicio
+        instante = self.inicio
+        for post_id in range(1, total_posts + 1):
+            instante = min(self.agora, instante + rng.expovariate(total_posts / intervalo))
+            limite = max(1, min(n, int(n * (instante - self.inicio) / intervalo) + 1))
+            autor = ativo(limite)
+            yield 'post', {'id': post_id, 'usuario': self.username(autor),
+                           'conteudo': rng.choice(CONTEUDOS).format(titulo=titulos[autor]),
+                           'data': data_de(instante), 'timestamp': instante}
+            for _ in range(min(self._cauda(rng, self.COMENTARIOS_POR_POST), n)):
+                quando = min(self.agora, instante + rng.expovariate(1 / 3600))
+                yield 'comentario', {'post_id': post_id, 'usuario': self.username(ativo(n)),
+                                     'texto': rng.choice(COMENTARIOS), 'data': data_de(quando),
+                                     'timestamp': quando}
+            curtidas = set()
+            for _ in range(min(self._cauda(rng, self.CURTIDAS_POR_POST), n)):
+                curtidas.add(ativo(n))
+            for indice in sorted(curtidas):
+                yield 'curtida', {'post_id': post_id, 'usuario': self.username(indice)}
+
+    def importar(self, nucleo: NucleoSPA, tamanho_lote: Optional[int] = None) -> Dict[str, int]:
+        """Carrega a rede no núcleo pelo importador em lotes; retorna as contagens"""
+        return Importador(nucleo, tamanho_lote).importar(
+            ('gerador', numero, tipo, campos) for numero, (tipo, campos) in enumerate(self.registros(), 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Gerador de redes sintéticas do LinkedIn SPA')
+    parser.add_argument('usuarios', type=int, help='quantidade de usuários (ex.: 10000, 100000, 1000000)')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', type=Path, help='arquivo .jsonl ou pasta de CSVs (sem ela, importa na pasta atual)')
+    parser.add_argument('--formato', choices=('jsonl', 'csv'), help='da saída (padrão: pela extensão)')
+    parser.add_argument('--modo', choices=('completo', 'diario', 'segmentado', 'sqlite'),
+                        default=NucleoSPA.MODO_ARMAZENAMENTO, help='modo de armazenamento ao importar')
+    args = parser.parse_args()
+    gerador = GeradorRede(args.usuarios, args.semente)
+    inicio = time.perf_counter()
+    try:
+        if args.saida:
+            formato = args.formato or ('jsonl' if args.saida.suffix.lower() == '.jsonl' else 'csv')
+            contagem = escrever(gerador.registros(), args.saida, formato)
+        else:
+            nucleo = NucleoSPA(args.modo)
+            try:
+                contagem = gerador.importar(nucleo)
+            finally:
+                nucleo.fechar()
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+        return
+    duracao = time.perf_counter() - inicio
+    print(f"✅ Rede gerada em {duracao:.1f}s: " + ', '.join(f'{tipo}={n}' for tipo, n in contagem.items()))
+
+
+if __name__ == "__main__":
+    main()
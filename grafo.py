@@ -0,0 +1,143 @@
+"""
+GRAFO SOCIAL DO LINKEDIN SPA
+Descrição: Fonte única das conexões (não direcionadas), de quem segue quem
+(direcionado) e das curtidas dos posts, guardadas como conjuntos ordenados
+(dict com valores None) para pertinência e mutação O(1). As listas do formato
+JSON (conexoes, seguidores/seguindo, likes) são derivadas só na serialização.
+"""
+
+import sys
+from typing import Collection, Dict, Iterable, List
+
+_VAZIO: Dict = {}
+
+
+class GrafoSocial:
+    """Adjacências e curtidas em memória, cada relação em uma única estrutura"""
+
+    def __init__(self):
+        """Cria o grafo vazio"""
+        self._conexoes: Dict[str, Dict[str, None]] = {}
+        self._seguindo: Dict[str, Dict[str, None]] = {}
+        self._seguidores: Dict[str, Dict[str, None]] = {}  # índice reverso de _seguindo
+        self._curtidas: Dict[int, Dict[str, None]] = {}
+        self._usuarios: Dict[str, None] = {}
+
+    @classmethod
+    def de_json(cls, usuarios: Dict, conexoes: Dict, posts: Iterable[Dict]) -> 'GrafoSocial':
+        """Constrói o grafo a partir do formato dos arquivos, retirando as listas
+        'seguidores'/'seguindo' dos usuários e 'likes' dos posts"""
+        grafo = cls()
+        for username, dados in usuarios.items():
+            grafo.adicionar_usuario(username)
+            if not isinstance(dados, dict):
+                continue  # registro já sem as listas
+            for seguido in dados.pop('seguindo', ()):
+                grafo._seguir(username, seguido)
+            for seguidor in dados.pop('seguidores', ()):
+                grafo._seguir(seguidor, username)
+        for username, lista in conexoes.items():
+            grafo.adicionar_usuario(username)
+            for outro in lista:
+                grafo._adicionar(grafo._conexoes, username, outro)
+        grafo.carregar_curtidas(posts)
+        return grafo
+
+    def carregar_curtidas(self, posts: Iterable[Dict]) -> None:
+        """Retira a lista 'likes' de cada post e a registra no grafo"""
+        for post in posts:
+            for username in post.pop('likes', ()):
+                self.curtir(post['id'], username)
+
+    # ----- visões no formato JSON -----
+
+    def usuario_json(self, username: str, dados: Dict) -> Dict:
+        """Dict do usuário com as listas seguidores/seguindo"""
+        return {**dados, 'seguidores': list(self.seguidores(username)), 'seguindo': list(self.seguindo(username))}
+
+    def usuarios_json(self, usuarios: Dict) -> Dict[str, Dict]:
+        """Todos os usuários no formato de dados_usuarios.json"""
+        return {u: self.usuario_json(u, d) for u, d in usuarios.items()}
+
+    def conexoes_json(self) -> Dict[str, List[str]]:
+        """Conteúdo de dados_conexoes.json"""
+        return {u: list(self.conexoes(u)) for u in self._usuarios}
+
+    def post_json(self, post: Dict) -> Dict:
+        """Dict do post com a lista de likes"""
+        return {**post, 'likes': list(self.curtidas(post['id']))}
+
+    # ----- usuários e conexões -----
+
+    @staticmethod
+    def _adicionar(adjacencia: Dict, origem, destino: str) -> bool:
+        vizinhos = adjacencia.get(origem)
+        if vizinhos is None:
+            adjacencia[origem] = vizinhos = {}
+        elif destino in vizinhos:
+            return False
+        vizinhos[sys.intern(destino)] = None
+        return True
+
+    def _seguir(self, seguidor: str, seguido: str) -> None:
+        if self._adicionar(self._seguindo, seguidor, seguido):
+            self._adicionar(self._seguidores, seguido, seguidor)
+
+    def adicionar_usuario(self, username: str) -> None:
+        """Registra um vértice sem arestas"""
+        self._usuarios[sys.intern(username)] = None
+
+    def conectar(self, origem: str, alvo: str) -> bool:
+        """Conecta os dois usuários e faz origem seguir alvo; False se já conectados"""
+        if self.conectados(origem, alvo):
+            return False
+        self._adicionar(self._conexoes, origem, alvo)
+        self._adicionar(self._conexoes, alvo, origem)
+        self._seguir(origem, alvo)
+        return True
+
+    def conectados(self, a: str, b: str) -> bool:
+        """Pertinência O(1)"""
+        return b in self._conexoes.get(a, _VAZIO)
+
+    def conexoes(self, username: str) -> Collection[str]:
+        """Conexões do usuário, em ordem de criação"""
+        return self._conexoes.get(username, _VAZIO).keys()
+
+    def seguidores(self, username: str) -> Collection[str]:
+        """Quem segue o usuário"""
+        return self._seguidores.get(username, _VAZIO).keys()
+
+    def seguindo(self, username: str) -> Collection[str]:
+        """Quem o usuário segue"""
+        return self._seguindo.get(username, _VAZIO).keys()
+
+    # ----- curtidas -----
+
+    def curtir(self, post_id: int, username: str) -> bool:
+        """Registra a curtida; False se já existia"""
+        return self._adicionar(self._curtidas, post_id, username)
+
+    def descurtir(self, post_id: int, username: str) -> bool:
+        """Remove a curtida; False se não existia"""
+        curtidas = self._curtidas.get(post_id)
+        if not curtidas or username not in curtidas:
+            return False
+        del curtidas[username]
+        return True
+
+    def curtiu(self, post_id: int, username: str) -> bool:
+        """Pertinência O(1)"""
+        return username in self._curtidas.get(post_id, _VAZIO)
+
+    def curtidas(self, post_id: int) -> Collection[str]:
+        """Quem curtiu o post"""
+        return self._curtidas.get(post_id, _VAZIO).keys()
+
+    def total_curtidas(self, post_id: int) -> int:
+        """Número de curtidas do post"""
+        return len(self._curtidas.get(post_id, _VAZIO))
+
+    def remover_post(self, post_id: int) -> None:
+        """Descarta as curtidas de um post apagado"""
+        self._curtidas.pop(post_id, None)
@@ -0,0 +1,340 @@
+"""
+IMPORTAÇÃO E EXPORTAÇÃO EM MASSA DO LINKEDIN SPA
+Descrição: Carrega usuários, conexões, posts, comentários e curtidas de arquivos
+JSONL ou CSV lendo um registro por vez, com as mesmas validações do cadastro, e
+persiste em lotes grandes em vez de uma gravação por registro. Senhas em texto
+puro recebem hash em paralelo, lote a lote, no pool de senhas do núcleo; as que
+já vêm em hash (de uma exportação) são mantidas. O exportador escreve os mesmos
+formatos, também em streaming.
+Uso: python importacao.py importar dados.jsonl [--modo sqlite]
+     python importacao.py exportar pasta_csv --formato csv
+"""
+
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from nucleo import ErroDominio, NaoEncontrado, NucleoSPA
+from registros import Comentario, Post, Usuario, data_de, instante_de
+from senhas import eh_hash
+
+# Campos de cada tipo de registro; no JSONL cada linha traz também 'tipo'.
+# 'id' de post e 'post_id' de comentários/curtidas referem-se aos ids do próprio arquivo.
+CAMPOS = {
+    'usuario': ('username', 'nome', 'email', 'senha', 'titulo', 'bio', 'data_criacao', 'timestamp_criacao'),
+    'conexao': ('origem', 'alvo'),
+    'post': ('id', 'usuario', 'conteudo', 'data', 'timestamp'),
+    'comentario': ('post_id', 'usuario', 'texto', 'data', 'timestamp'),
+    'curtida': ('post_id', 'usuario'),
+}
+# Em CSV, um arquivo por tipo, lidos nesta ordem quando a origem é uma pasta
+ARQUIVOS_CSV = {'usuario': 'usuarios.csv', 'conexao': 'conexoes.csv', 'post': 'posts.csv',
+                'comentario': 'comentarios.csv', 'curtida': 'curtidas.csv'}
+
+Registro = Tuple[str, int, Optional[str], Union[Dict, ErroDominio]]  # (arquivo, linha, tipo, campos ou erro de leitura)
+
+
+# ----- leitura -----
+
+def ler_jsonl(arquivo: Path, encoding: str = 'utf-8') -> Iterator[Registro]:
+    """Registros de um arquivo JSONL com o campo 'tipo'; linhas ilegíveis vêm com o erro no lugar
+    dos campos, para o importador rejeitá-las com a mensagem certa"""
+    nome = Path(arquivo).name
+    with open(arquivo, 'r', encoding=encoding) as f:
+        for numero, linha in enumerate(f, 1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                yield nome, numero, None, ErroDominio("JSON inválido")
+                continue
+            if not isinstance(registro, dict):
+                yield nome, numero, None, ErroDominio("O registro deve ser um objeto JSON")
+            elif 'tipo' not in registro:
+                yield nome, numero, None, ErroDominio("Campo obrigatório: tipo")
+            else:
+                yield nome, numero, registro.pop('tipo'), registro
+
+
+def ler_csv(arquivo: Path, tipo: Optional[str] = None, encoding: str = 'utf-8') -> Iterator[Registro]:
+    """Registros de um CSV com cabeçalho; o tipo vem do nome do arquivo (usuarios.csv...)"""
+    arquivo = Path(arquivo)
+    if tipo is None:
+        tipo = next((t for t, nome in ARQUIVOS_CSV.items() if nome == arquivo.name), None)
+    with open(arquivo, 'r', encoding=encoding, newline='') as f:
+        for numero, registro in enumerate(csv.DictReader(f), 2):
+            yield arquivo.name, numero, tipo, registro
+
+
+def ler(origem: Path, encoding: str = 'utf-8') -> Iterator[Registro]:
+    """Registros de um .jsonl, de um .csv ou de uma pasta com os CSVs de ARQUIVOS_CSV"""
+    origem = Path(origem)
+    if origem.is_dir():
+        for nome in ARQUIVOS_CSV.values():
+            if (origem / nome).exists():
+                yield from ler_csv(origem / nome, encoding=encoding)
+    elif origem.suffix.lower() == '.csv':
+        yield from ler_csv(origem, encoding=encoding)
+    else:
+        yield from ler_jsonl(origem, encoding)
+
+
+# ----- importação -----
+
+class Importador:
+    """Aplica registros ao núcleo validando cada um e persiste a cada ``tamanho_lote`` mutações.
+
+    Registros inválidos são contados e descritos em ``erros`` sem interromper a
+    carga. Só o mapa id do arquivo -> id atribuído dos posts cresce com a entrada.
+    """
+
+    TAMANHO_LOTE = 50_000
+    MAX_ERROS = 100  # mensagens guardadas; os demais rejeitados só são contados
+
+    def __init__(self, nucleo: NucleoSPA, tamanho_lote: Optional[int] = None):
+        self.nucleo = nucleo
+        self.tamanho_lote = tamanho_lote or self.TAMANHO_LOTE
+        self.importados = dict.fromkeys(CAMPOS, 0)
+        self.rejeitados = 0
+        self.erros: List[str] = []
+        self._ids_posts: Dict[int, int] = {}
+        self._lote: List[Dict] = []
+        self._emails_lote: Set[str] = set()
+        self._sem_hash: List[Usuario] = []
+        self._proximo_id = 0
+        self._agora, self._data_agora = 0.0, ''
+        self._aplicar = {'usuario': self._usuario, 'conexao': self._conexao, 'post': self._post,
+                         'comentario': self._comentario, 'curtida': self._curtida}
+
+    def importar(self, registros: Iterable[Registro]) -> Dict[str, int]:
+        """Importa os registros e retorna as contagens por tipo (mais 'rejeitados')"""
+        self.nucleo.atualizar()
+        self._proximo_id, self._agora = self.nucleo.repositorio.proximo_id_post(), time.time()
+        self._data_agora = data_de(self._agora)
+        try:
+            for arquivo, numero, tipo, registro in registros:
+                try:
+                    if isinstance(registro, ErroDominio):
+                        raise registro
+                    aplicar = self._aplicar.get(tipo) if isinstance(tipo, str) else None
+                    if aplicar is None:
+                        raise ErroDominio(f"Tipo inválido: {tipo}")
+                    evento = aplicar(registro)
+                except KeyError as e:
+                    self._rejeitar(arquivo, numero, f"Campo obrigatório: {e.args[0]}")
+                    continue
+                except (ValueError, TypeError) as e:  # inclui ErroDominio
+                    self._rejeitar(arquivo, numero, str(e))
+                    continue
+                self.importados[tipo] += 1
+                if evento is not None:
+                    self._lote.append(evento)
+                    if len(self._lote) >= self.tamanho_lote:
+                        self._gravar_lote()
+            self._gravar_lote()
+        finally:
+            self.nucleo._concluir_lote()
+        return {**self.importados, 'rejeitados': self.rejeitados}
+
+    def _rejeitar(self, arquivo: str, numero: int, motivo: str) -> None:
+        self.rejeitados += 1
+        if len(self.erros) < self.MAX_ERROS:
+            self.erros.append(f"{arquivo}:{numero}: {motivo}")
+
+    def _gravar_lote(self) -> None:
+        if self._lote:
+            if self._sem_hash:
+                hashes = self.nucleo.senhas.gerar_varios(u['senha'] for u in self._sem_hash)
+                for usuario, senha_hash in zip(self._sem_hash, hashes):
+                    usuario['senha'] = senha_hash
+                self._sem_hash = []
+            self.nucleo._persistir_lote(self._lote)
+            self._lote, self._emails_lote = [], set()
+
+    def _instante(self, registro: Dict, campo_instante: str, campo_data: str) -> Tuple[float, str]:
+        """(instante, data) do registro: o epoch e/ou a data informados, senão o início da carga"""
+        data = registro.get(campo_data)
+        if registro.get(campo_instante) not in (None, ''):
+            instante = float(registro[campo_instante])
+            return instante, data or data_de(instante)
+        if data:
+            return instante_de(data), data
+        return self._agora, self._data_agora
+
+    def _id_post(self, registro: Dict) -> int:
+        post_id = self._ids_posts.get(int(registro['post_id']))
+        if post_id is None:
+            raise NaoEncontrado("Post não encontrado")
+        return post_id
+
+    def _autor(self, registro: Dict) -> Tuple[str, Dict]:
+        username = registro['usuario'].strip()
+        return username, self.nucleo.usuario(username)
+
+    def _usuario(self, registro: Dict) -> Dict:
+        nucleo = self.nucleo
+        username, email, nome = registro['username'].strip(), registro['email'].strip(), registro['nome'].strip()
+        nucleo.validar_novo_username(username)
+        if email in self._emails_lote:
+            raise ErroDominio("Email inválido ou já existe")
+        nucleo.validar_novo_email(email)
+        if len(nome) < 3:
+            raise ErroDominio("Nome muito curto")
+        if not registro['senha']:
+            raise ErroDominio("Senha vazia")
+        instante, data = self._instante(registro, 'timestamp_criacao', 'data_criacao')
+        usuario = Usuario(nome, email, registro['senha'], (registro.get('titulo') or '').strip() or "Profissional",
+                          (registro.get('bio') or '').strip()[:nucleo.MAX_BIO_LEN] or "Sem bio", data, instante)
+        if not eh_hash(usuario['senha']):
+            self._sem_hash.append(usuario)
+        nucleo.usuarios[username] = usuario
+        nucleo.grafo.adicionar_usuario(username)
+        self._emails_lote.add(email)
+        return {'op': 'registrar', 'username': username, 'usuario': usuario}
+
+    def _conexao(self, registro: Dict) -> Optional[Dict]:
+        origem, alvo = registro['origem'].strip(), registro['alvo'].strip()
+        if origem not in self.nucleo.usuarios or alvo not in self.nucleo.usuarios or origem == alvo:
+            raise ErroDominio("Conexão inválida: usuário inexistente ou a si mesmo")
+        if not self.nucleo.grafo.conectar(origem, alvo):
+            return None  # já conectados
+        return {'op': 'conectar', 'origem': origem, 'alvo': alvo}
+
+    def _post(self, registro: Dict) -> Dict:
+        nucleo = self.nucleo
+        username, autor = self._autor(registro)
+        conteudo = registro['conteudo'].strip()
+        if len(conteudo) < nucleo.MIN_POST_LEN:
+            raise ErroDominio(f"Mín {nucleo.MIN_POST_LEN} caracteres")
+        id_origem = int(registro['id']) if registro.get('id') not in (None, '') else None
+        if id_origem in self._ids_posts:
+            raise ErroDominio(f"Post {id_origem} repetido")
+        instante, data = self._instante(registro, 'timestamp', 'data')
+        post = Post(self._proximo_id, username, autor, conteudo[:nucleo.MAX_POST_LEN], data, timestamp=instante)
+        self._proximo_id += 1
+        if id_origem is not None:
+            self._ids_posts[id_origem] = post.id
+        nucleo.posts.publicar(post)
+        return {'op': 'post', 'post': post}
+
+    def _comentario(self, registro: Dict) -> Dict:
+        nucleo = self.nucleo
+        post_id = self._id_post(registro)
+        username, autor = self._autor(registro)
+        texto = registro['texto'].strip()[:nucleo.MAX_COMENTARIO]
+        if len(texto) < 2:
+            raise ErroDominio("Muito curto")
+        instante, data = self._instante(registro, 'timestamp', 'data')
+        comentario = Comentario(username, autor, texto, data, instante)
+        nucleo.comentarios.adicionar(post_id, comentario)
+        nucleo.posts.obter(post_id)['total_comentarios'] += 1
+        return {'op': 'comentar', 'id': post_id, 'comentario': comentario}
+
+    def _curtida(self, registro: Dict) -> Optional[Dict]:
+        post_id = self._id_post(registro)
+        username, _ = self._autor(registro)
+        if not self.nucleo.grafo.curtir(post_id, username):
+            return None  # já curtido
+        self.nucleo.posts.obter(post_id)['total_curtidas'] += 1
+        return {'op': 'curtir', 'id': post_id, 'usuario': username}
+
+
+# ----- exportação -----
+
+def registros_de(nucleo: NucleoSPA) -> Iterator[Tuple[str, Dict]]:
+    """(tipo, campos) de todo o estado, na ordem em que a importação os aceita"""
+    repo, grafo = nucleo.repositorio, nucleo.grafo
+    for username, u in repo.percorrer_usuarios():
+        yield 'usuario', {'username': username, **{c: u[c] for c in CAMPOS['usuario'][1:]}}
+    for username in nucleo.usuarios:
+        seguindo = grafo.seguindo(username)
+        for outro in grafo.conexoes(username):
+            # cada conexão uma vez, partindo de quem segue o outro
+            if outro in seguindo or (username < outro and username not in grafo.seguindo(outro)):
+                yield 'conexao', {'origem': username, 'alvo': outro}
+    comentarios = nucleo.comentarios.itens()  # por post_id, como os posts: as duas leituras andam juntas
+    proximo = next(comentarios, None)
+    for post in repo.percorrer_posts():
+        post_id = post['id']
+        yield 'post', {c: post[c] for c in CAMPOS['post']}
+        while proximo is not None and proximo[0] <= post_id:
+            if proximo[0] == post_id:
+                c = proximo[1]
+                yield 'comentario', {'post_id': post_id, 'usuario': c['usuario'], 'texto': c['texto'],
+                                     'data': c['data'], 'timestamp': c['timestamp']}
+            proximo = next(comentarios, None)
+        for username in grafo.curtidas(post_id):
+            yield 'curtida', {'post_id': post_id, 'usuario': username}
+
+
+def escrever(registros: Iterable[Tuple[str, Dict]], destino: Path, formato: str = 'jsonl',
+             encoding: str = 'utf-8') -> Dict[str, int]:
+    """Escreve pares (tipo, campos) em ``destino`` (arquivo .jsonl, ou pasta com um CSV por tipo); retorna as contagens"""
+    destino = Path(destino)
+    contagem = dict.fromkeys(CAMPOS, 0)
+    if formato == 'jsonl':
+        with open(destino, 'w', encoding=encoding) as f:
+            for tipo, registro in registros:
+                f.write(json.dumps({'tipo': tipo, **registro}, ensure_ascii=False) + '\n')
+                contagem[tipo] += 1
+        return contagem
+    if formato != 'csv':
+        raise ValueError(f"Formato desconhecido: {formato}")
+    destino.mkdir(parents=True, exist_ok=True)
+    arquivos: Dict[str, IO] = {}
+    try:
+        escritores = {}
+        for tipo, nome in ARQUIVOS_CSV.items():
+            arquivos[tipo] = open(destino / nome, 'w', encoding=encoding, newline='')
+            escritores[tipo] = csv.writer(arquivos[tipo])
+            escritores[tipo].writerow(CAMPOS[tipo])
+        for tipo, registro in registros:
+            escritores[tipo].writerow(registro.get(campo) for campo in CAMPOS[tipo])
+            contagem[tipo] += 1
+    finally:
+        for f in arquivos.values():
+            f.close()
+    return contagem
+
+
+def exportar(nucleo: NucleoSPA, destino: Path, formato: str = 'jsonl', encoding: str = 'utf-8') -> Dict[str, int]:
+    """Escreve todo o estado em ``destino`` (arquivo .jsonl, ou pasta com um CSV por tipo); retorna as contagens"""
+    return escrever(registros_de(nucleo), destino, formato, encoding)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Importação/exportação em massa do LinkedIn SPA')
+    parser.add_argument('acao', choices=('importar', 'exportar'))
+    parser.add_argument('caminho', type=Path, help='arquivo .jsonl/.csv ou pasta de CSVs')
+    parser.add_argument('--formato', choices=('jsonl', 'csv'), help='na exportação (padrão: pela extensão)')
+    parser.add_argument('--modo', choices=('completo', 'diario', 'segmentado', 'sqlite'),
+                        default=NucleoSPA.MODO_ARMAZENAMENTO, help='modo de armazenamento')
+    parser.add_argument('--lote', type=int, default=Importador.TAMANHO_LOTE, help='mutações por gravação')
+    args = parser.parse_args()
+    nucleo = NucleoSPA(args.modo)
+    try:
+        inicio = time.perf_counter()
+        if args.acao == 'importar':
+            importador = Importador(nucleo, args.lote)
+            contagem = importador.importar(ler(args.caminho, nucleo.ENCODING))
+            for erro in importador.erros:
+                print(f"⚠️  {erro}")
+        else:
+            formato = args.formato or ('jsonl' if args.caminho.suffix.lower() == '.jsonl' else 'csv')
+            contagem = exportar(nucleo, args.caminho, formato, nucleo.ENCODING)
+        duracao = time.perf_counter() - inicio
+        total = sum(n for tipo, n in contagem.items() if tipo != 'rejeitados')
+        print(f"✅ {total} registros em {duracao:.1f}s ({total / max(duracao, 1e-9):,.0f}/s): "
+              + ', '.join(f'{tipo}={n}' for tipo, n in contagem.items()))
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+    finally:
+        nucleo.fechar()
+
+
+if __name__ == "__main__":
+    main()
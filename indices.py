@@ -0,0 +1,243 @@
+"""
+ÍNDICES EM MEMÓRIA DO LINKEDIN SPA
+Descrição: Estruturas auxiliares mantidas incrementalmente para evitar varreduras
+lineares sobre usuários e posts.
+"""
+
+import heapq
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple, Iterable
+
+from linha_do_tempo import LinhaDoTempo
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos ("Otávio" -> "otavio")"""
+    texto = texto.casefold()
+    if texto.isascii():
+        return texto
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+class IndiceTrigramas:
+    """Índice de trigramas + prefixos sobre username e nome dos usuários.
+
+    A busca devolve primeiro os usuários com palavras (username ou partes do
+    nome) que começam com as palavras do termo, via bisect em uma lista
+    ordenada: mais palavras casadas à frente, depois mais palavras exatas,
+    depois pelo nome; para termos com 3+ caracteres completa o top-k com
+    ocorrências no meio do texto, varrendo só a lista de postagem do trigrama
+    mais raro.
+    """
+
+    N = 3
+
+    def __init__(self, usuarios: Iterable[Tuple[str, str]] = (), primeiro: int = 0):
+        """Constrói o índice a partir de pares (username, nome). Com ``primeiro`` > 0 é um índice
+        parcial, de uma fatia que começa nessa posição, só para ``mesclar``"""
+        self._primeiro = primeiro
+        self._usernames: List[str] = []
+        self._textos: List[str] = []
+        self._uids: Dict[str, int] = {}  # username -> posição em _usernames/_textos
+        self._gramas: Dict[str, array] = {}
+        self._prefixos: List[str] = []  # 'palavra\0username', ordenada
+        for username, nome in usuarios:
+            self.adicionar(username, nome, ordenar=False)
+        self._prefixos.sort()
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+    @classmethod
+    def mesclar(cls, partes: Iterable['IndiceTrigramas']) -> 'IndiceTrigramas':
+        """Junta índices de fatias consecutivas dos usuários, na ordem: as postagens de cada
+        trigrama só são concatenadas, porque cada parte já numera a partir de ``primeiro``"""
+        indice = cls()
+        for parte in partes:
+            if parte._primeiro != len(indice._usernames):
+                raise ValueError(f"Parte fora de ordem: começa em {parte._primeiro}, esperado {len(indice._usernames)}")
+            indice._usernames += parte._usernames
+            indice._textos += parte._textos
+            indice._uids.update(parte._uids)
+            for grama, postagem in parte._gramas.items():
+                atual = indice._gramas.get(grama)
+                if atual is None:
+                    indice._gramas[grama] = postagem
+                else:
+                    atual.extend(postagem)
+            indice._prefixos += parte._prefixos
+        indice._prefixos.sort()  # sequências já ordenadas: o timsort só as intercala
+        return indice
+
+    def adicionar(self, username: str, nome: str, ordenar: bool = True) -> None:
+        """Indexa um novo usuário"""
+        uid = self._primeiro + len(self._usernames)
+        username_norm, nome_norm = normalizar(username), normalizar(nome)
+        texto = f"{username_norm}\0{nome_norm}"
+        self._usernames.append(username)
+        self._textos.append(texto)
+        self._uids[username] = uid
+        gramas = self._gramas
+        for grama in {texto[i:i + self.N] for i in range(len(texto) - self.N + 1)}:
+            postagem = gramas.get(grama)
+            if postagem is None:
+                gramas[grama] = postagem = array('i')
+            postagem.append(uid)
+        for palavra in {username_norm, *nome_norm.split()}:
+            if ordenar:
+                insort(self._prefixos, f"{palavra}\0{username}")
+            else:
+                self._prefixos.append(f"{palavra}\0{username}")
+
+    def buscar(self, termo: str, limite: int = 20) -> List[str]:
+        """Usernames mais relevantes para o termo (top-k)"""
+        termo = normalizar(termo.strip()).replace('\0', '')
+        if not termo:
+            return []
+        resultado = self._buscar_prefixo(termo, limite)
+        if len(termo) < self.N or len(resultado) >= limite:
+            return resultado
+
+        postagens = [self._gramas.get(termo[i:i + self.N]) for i in range(len(termo) - self.N + 1)]
+        if any(p is None for p in postagens):
+            return resultado
+        vistos, textos = set(resultado), self._textos
+        for uid in min(postagens, key=len):
+            if termo in textos[uid] and self._usernames[uid] not in vistos:
+                resultado.append(self._usernames[uid])
+                if len(resultado) >= limite:
+                    break
+        return resultado
+
+    def _buscar_prefixo(self, termo: str, limite: int) -> List[str]:
+        """Usuários com alguma palavra começando por uma palavra do termo: mais palavras do termo
+        casadas primeiro, depois mais casamentos exatos, depois pelo nome"""
+        placar: Dict[str, List[int]] = {}  # username -> [palavras do termo casadas, casadas por inteiro]
+        prefixos = self._prefixos
+        for palavra in set(termo.split()):
+            exatos: Dict[str, bool] = {}
+            i = bisect_left(prefixos, palavra)
+            while i < len(prefixos) and prefixos[i].startswith(palavra):
+                indexada, username = prefixos[i].split('\0', 1)
+                exatos[username] = exatos.get(username, False) or indexada == palavra
+                i += 1
+            for username, exato in exatos.items():
+                pontos = placar.setdefault(username, [0, 0])
+                pontos[0] += 1
+                pontos[1] += exato
+        textos, uids = self._textos, self._uids
+        return heapq.nsmallest(limite, placar, key=lambda u: (-placar[u][0], -placar[u][1],
+                                                              textos[uids[u]].split('\0', 1)[1], u))
+
+
+class IndiceTemporal:
+    """Chaves ordenadas pelo instante (epoch) para consultas por intervalo com bisect"""
+
+    def __init__(self, itens: Iterable[Tuple[float, Any]] = ()):
+        """Constrói o índice a partir de pares (instante, chave)"""
+        pares = sorted(itens, key=lambda par: par[0])
+        self._instantes = array('d', (instante for instante, _ in pares))
+        self._chaves: List[Any] = [chave for _, chave in pares]
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+    def adicionar(self, instante: float, chave: Any) -> None:
+        """Indexa uma chave; O(1) quando o instante é o mais recente (caso normal)"""
+        if not self._instantes or instante >= self._instantes[-1]:
+            self._instantes.append(instante)
+            self._chaves.append(chave)
+        else:
+            i = bisect_right(self._instantes, instante)
+            self._instantes.insert(i, instante)
+            self._chaves.insert(i, chave)
+
+    def remover(self, instante: float, chave: Any) -> bool:
+        """Retira a chave (comparada por identidade ou igualdade) indexada no instante"""
+        i = bisect_left(self._instantes, instante)
+        while i < len(self._instantes) and self._instantes[i] == instante:
+            if self._chaves[i] is chave or self._chaves[i] == chave:
+                del self._instantes[i]
+                del self._chaves[i]
+                return True
+            i += 1
+        return False
+
+    def _faixa(self, inicio: Optional[float], fim: Optional[float]) -> Tuple[int, int]:
+        i = 0 if inicio is None else bisect_left(self._instantes, inicio)
+        j = len(self._instantes) if fim is None else bisect_right(self._instantes, fim)
+        return i, j
+
+    def entre(self, inicio: Optional[float] = None, fim: Optional[float] = None) -> List[Any]:
+        """Chaves com inicio <= instante <= fim, da mais antiga à mais recente"""
+        i, j = self._faixa(inicio, fim)
+        return self._chaves[i:j]
+
+    def contar(self, inicio: Optional[float] = None, fim: Optional[float] = None) -> int:
+        """Quantas chaves há no intervalo, sem copiá-las"""
+        i, j = self._faixa(inicio, fim)
+        return max(0, j - i)
+
+
+class IndicesSecundarios:
+    """Índices email -> username, id -> post, autor -> linha do tempo dos seus posts
+    e instante -> post / (post_id, comentário)"""
+
+    def __init__(self, usuarios: Dict = None, posts: Iterable[Dict] = (), comentarios: Any = None):
+        """Constrói os índices a partir dos dados carregados (``comentarios``: comentarios.Comentarios)"""
+        self.username_por_email: Dict[str, str] = {}
+        self.post_por_id: Dict[int, Dict] = {}
+        self.posts_por_autor: Dict[str, LinhaDoTempo] = {}
+        self.posts_por_tempo = IndiceTemporal()
+        self.comentarios_por_tempo = IndiceTemporal()
+        self.maior_id_post = 0
+        for username, dados in (usuarios or {}).items():
+            self.adicionar_usuario(username, dados)
+        for post in sorted(posts, key=lambda p: p['id']):
+            self.adicionar_post(post)
+        for post_id, comentario in (comentarios.itens() if comentarios is not None else ()):
+            self.adicionar_comentario(post_id, comentario)
+
+    def adicionar_usuario(self, username: str, dados: Dict) -> None:
+        """Indexa o email de um usuário"""
+        self.username_por_email[dados['email']] = username
+
+    def adicionar_post(self, post: Dict) -> None:
+        """Indexa um post pelo id e pelo autor"""
+        self.post_por_id[post['id']] = post
+        linha = self.posts_por_autor.get(post['usuario'])
+        if linha is None:
+            self.posts_por_autor[post['usuario']] = linha = LinhaDoTempo()
+        linha.publicar(post)
+        self.maior_id_post = max(self.maior_id_post, post['id'])
+        self.posts_por_tempo.adicionar(post['timestamp'], post)
+
+    def adicionar_comentario(self, post_id: int, comentario: Dict) -> None:
+        """Indexa um comentário pelo instante"""
+        self.comentarios_por_tempo.adicionar(comentario['timestamp'], (post_id, comentario))
+
+    def remover_post(self, post_id: int) -> None:
+        """Remove um post dos índices; os seus comentários são descartados nas consultas"""
+        post = self.post_por_id.pop(post_id, None)
+        if post is not None:
+            self.posts_por_autor[post['usuario']].remover(post_id)
+            self.posts_por_tempo.remover(post['timestamp'], post)
+
+    def aplicar(self, evento: Dict) -> None:
+        """Mantém os índices a partir de um evento de mutação"""
+        if evento['op'] == 'registrar':
+            self.adicionar_usuario(evento['username'], evento['usuario'])
+        elif evento['op'] == 'post':
+            self.adicionar_post(evento['post'])
+        elif evento['op'] == 'deletar_post':
+            self.remover_post(evento['id'])
+        elif evento['op'] == 'comentar' and evento['id'] in self.post_por_id:
+            self.adicionar_comentario(evento['id'], evento['comentario'])
+
+    def posts_do_autor(self, username: str) -> LinhaDoTempo:
+        """Linha do tempo dos posts do autor"""
+        linha = self.posts_por_autor.get(username)
+        return LinhaDoTempo() if linha is None else linha
@@ -0,0 +1,174 @@
+"""
+LINHA DO TEMPO DE POSTS DO LINKEDIN SPA
+Descrição: Armazena posts em ordem de id (= ordem de publicação) com publicação
+O(1), remoção por lápide e paginação estável por cursor nos dois sentidos.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Iterable, Iterator
+
+
+class LinhaDoTempo:
+    """Posts ordenados por id; o cursor de paginação é o id de um post.
+
+    Remoções apenas marcam a posição como lápide (None), então cursores
+    continuam válidos; as lápides são descartadas quando passam da metade.
+    """
+
+    def __init__(self, posts: Iterable[Dict] = ()):
+        """Cria a linha do tempo a partir de posts em qualquer ordem"""
+        ordenados = sorted(posts, key=lambda p: p['id'])
+        self._ids = array('q', (p['id'] for p in ordenados))
+        self._posts: List[Optional[Dict]] = ordenados
+        self._vivos = len(ordenados)
+
+    def __len__(self) -> int:
+        return self._vivos
+
+    def __bool__(self) -> bool:
+        return self._vivos > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Posts do mais recente ao mais antigo"""
+        for post in reversed(self._posts):
+            if post is not None:
+                yield post
+
+    def para_lista(self) -> List[Dict]:
+        """Lista no formato do arquivo dados_posts.json (mais recente primeiro)"""
+        return list(self)
+
+    def publicar(self, post: Dict) -> None:
+        """Acrescenta um post; O(1) quando o id é o maior (caso normal)"""
+        if not self._ids or post['id'] > self._ids[-1]:
+            self._ids.append(post['id'])
+            self._posts.append(post)
+        else:
+            i = bisect_left(self._ids, post['id'])
+            self._ids.insert(i, post['id'])
+            self._posts.insert(i, post)
+        self._vivos += 1
+
+    def _posicao(self, post_id: int) -> Optional[int]:
+        i = bisect_left(self._ids, post_id)
+        if i < len(self._ids) and self._ids[i] == post_id and self._posts[i] is not None:
+            return i
+        return None
+
+    def obter(self, post_id: int) -> Optional[Dict]:
+        """Post pelo id (busca binária), ou None"""
+        i = self._posicao(post_id)
+        return None if i is None else self._posts[i]
+
+    def remover(self, post_id: int) -> Optional[Dict]:
+        """Marca o post como lápide e o retorna"""
+        i = self._posicao(post_id)
+        if i is None:
+            return None
+        post, self._posts[i] = self._posts[i], None
+        self._vivos -= 1
+        if len(self._posts) > 64 and self._vivos * 2 < len(self._posts):
+            self._compactar()
+        return post
+
+    def _compactar(self) -> None:
+        """Descarta as lápides"""
+        self._posts = [p for p in self._posts if p is not None]
+        self._ids = array('q', (p['id'] for p in self._posts))
+
+    def antes(self, cursor: Optional[int] = None, limite: int = 5) -> List[Dict]:
+        """Até ``limite`` posts mais antigos que o cursor (None = do mais recente)"""
+        i = len(self._ids) if cursor is None else bisect_left(self._ids, cursor)
+        pagina = []
+        while i > 0 and len(pagina) < limite:
+            i -= 1
+            if self._posts[i] is not None:
+                pagina.append(self._posts[i])
+        return pagina
+
+    def depois(self, cursor: int, limite: int = 5) -> List[Dict]:
+        """Até ``limite`` posts mais recentes que o cursor, do mais recente ao mais antigo"""
+        i = bisect_right(self._ids, cursor)
+        pagina = []
+        while i < len(self._ids) and len(pagina) < limite:
+            if self._posts[i] is not None:
+                pagina.append(self._posts[i])
+            i += 1
+        pagina.reverse()
+        return pagina
+
+
+class Navegador:
+    """Percorre uma linha do tempo post a post, buscando uma página por vez"""
+
+    def __init__(self, linha, tamanho_pagina: int = 5):
+        """``linha`` é qualquer objeto com antes/depois/remover (LinhaDoTempo ou visão SQLite)"""
+        self.linha, self.tamanho_pagina = linha, tamanho_pagina
+        self._pagina = linha.antes(None, tamanho_pagina)
+        self._i = 0
+        self.posicao = 0  # distância do post atual até o mais recente, a partir de 0
+
+    @property
+    def atual(self) -> Optional[Dict]:
+        """Post em exibição, ou None se a linha estiver vazia"""
+        return self._pagina[self._i] if self._pagina else None
+
+    def tem_anterior(self) -> bool:
+        """Há post mais recente que o atual?"""
+        return self.atual is not None and (self._i > 0 or bool(self.linha.depois(self.atual['id'], 1)))
+
+    def tem_proximo(self) -> bool:
+        """Há post mais antigo que o atual?"""
+        return self.atual is not None and (self._i + 1 < len(self._pagina)
+                                           or bool(self.linha.antes(self.atual['id'], 1)))
+
+    def proximo(self) -> bool:
+        """Avança para o post mais antigo seguinte"""
+        if self.atual is None:
+            return False
+        if self._i + 1 < len(self._pagina):
+            self._i += 1
+        else:
+            pagina = self.linha.antes(self.atual['id'], self.tamanho_pagina)
+            if not pagina:
+                return False
+            self._pagina, self._i = pagina, 0
+        self.posicao += 1
+        return True
+
+    def anterior(self) -> bool:
+        """Volta para o post mais recente anterior"""
+        if self.atual is None:
+            return False
+        if self._i > 0:
+            self._i -= 1
+        else:
+            pagina = self.linha.depois(self.atual['id'], self.tamanho_pagina)
+            if not pagina:
+                return False
+            self._pagina, self._i = pagina, len(pagina) - 1
+        self.posicao -= 1
+        return True
+
+    def trocar_linha(self, linha) -> None:
+        """Continua em ``linha`` (dados relidos) a partir do post atual ou do mais antigo seguinte"""
+        cursor = self.atual['id'] + 1 if self.atual is not None else None
+        self.linha, self._i = linha, 0
+        self._pagina = linha.antes(cursor, self.tamanho_pagina)
+
+    def descartar_atual(self) -> None:
+        """Tira da página o post atual (já removido da linha) e mostra o vizinho"""
+        removido = self._pagina.pop(self._i)
+        if self._i < len(self._pagina):
+            return
+        pagina = self.linha.antes(removido['id'], self.tamanho_pagina)
+        if pagina:
+            self._pagina[self._i:] = pagina
+        elif self._pagina:
+            self._i -= 1
+            self.posicao = max(0, self.posicao - 1)
+        else:
+            self._pagina = self.linha.depois(removido['id'], self.tamanho_pagina)
+            self._i = len(self._pagina) - 1 if self._pagina else 0
+            self.posicao = max(0, self.posicao - 1)
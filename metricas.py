@@ -0,0 +1,293 @@
+"""
+MÉTRICAS DE OPERAÇÃO DO LINKEDIN SPA
+Descrição: Histogramas de latência e contadores por operação (carregar, salvar,
+buscar, feed, curtir, comentar, conectar, login...) e por arquivo gravado
+(bytes e duração), exportados no formato de texto do Prometheus ou em JSON para
+um arquivo ou socket. Desligadas, as operações não são embrulhadas e
+``medir`` devolve um contexto vazio compartilhado, então o custo é desprezível.
+"""
+
+import functools
+import json
+import os
+import re
+import signal
+import socket
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Limites superiores (segundos) dos baldes dos histogramas, de 100 µs a 10 s
+LIMITES = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DESCRICOES = {
+    'spa_operacao_segundos': 'Duração das operações do núcleo',
+    'spa_operacoes_total': 'Operações do núcleo concluídas, por resultado',
+    'spa_gravacao_segundos': 'Duração de cada gravação de arquivo (escrita + fsync)',
+    'spa_gravacao_bytes_total': 'Bytes gravados por arquivo',
+    'spa_quadro_segundos': 'Latência entre a tecla e o quadro seguinte da CLI',
+    'spa_quadro_bytes_total': 'Bytes enviados ao terminal pelos quadros da CLI',
+    'spa_notificacao_segundos': 'Tempo entre o evento e a entrega em todas as caixas de notificação',
+    'spa_notificacoes_total': 'Notificações entregues em caixas de usuários, por tipo',
+}
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+class Histograma:
+    """Contagens por balde de LIMITES, soma e total das observações"""
+
+    __slots__ = ('contagens', 'soma', 'total')
+
+    def __init__(self):
+        self.contagens = [0] * (len(LIMITES) + 1)  # o último balde é +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.contagens[bisect_left(LIMITES, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def acumulados(self) -> List[int]:
+        """Contagens acumuladas por limite (formato 'le' do Prometheus), terminando em +Inf"""
+        acumulado, resultado = 0, []
+        for contagem in self.contagens:
+            acumulado += contagem
+            resultado.append(acumulado)
+        return resultado
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Estimativa do quantil ``q`` pelo limite do balde que o contém"""
+        if not self.total:
+            return None
+        alvo = q * self.total
+        for limite, acumulado in zip(LIMITES + (float('inf'),), self.acumulados()):
+            if acumulado >= alvo:
+                return limite
+        return float('inf')
+
+
+class _Medicao:
+    """Contexto que observa a duração do bloco em um histograma"""
+
+    __slots__ = ('_metricas', '_nome', '_rotulos', '_inicio')
+
+    def __init__(self, metricas: 'Metricas', nome: str, rotulos: Rotulos):
+        self._metricas, self._nome, self._rotulos = metricas, nome, rotulos
+
+    def __enter__(self) -> '_Medicao':
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, *_) -> None:
+        duracao = time.perf_counter() - self._inicio
+        self._metricas.observar(self._nome, duracao, self._rotulos)
+        if self._nome == 'spa_operacao_segundos':
+            self._metricas.incrementar('spa_operacoes_total', 1,
+                                       self._rotulos + (('resultado', 'erro' if tipo else 'ok'),))
+
+
+class _SemMedicao:
+    """Contexto vazio usado com as métricas desligadas"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_SemMedicao':
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+_SEM_MEDICAO = _SemMedicao()
+
+
+def _limite_json(limite: Optional[float]) -> Any:
+    return '+Inf' if limite == float('inf') else limite
+
+
+class Metricas:
+    """Registro de histogramas e contadores, rotulados, seguro entre threads"""
+
+    def __init__(self):
+        self.ativo = False
+        self._histogramas: Dict[str, Dict[Rotulos, Histograma]] = {}
+        self._contadores: Dict[str, Dict[Rotulos, float]] = {}
+        self._trava = threading.Lock()
+        self._pedido_despejo = threading.Event()  # levantado pelo SIGUSR1; o despejo roda em outra thread
+        self._alvo_despejo: Optional[Tuple[Callable[[], str], Optional[str]]] = None
+
+    def ativar(self, ativo: bool = True) -> None:
+        self.ativo = ativo
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._histogramas.clear()
+            self._contadores.clear()
+
+    # ----- coleta -----
+
+    def observar(self, nome: str, valor: float, rotulos: Rotulos = ()) -> None:
+        with self._trava:
+            por_rotulos = self._histogramas.setdefault(nome, {})
+            histograma = por_rotulos.get(rotulos)
+            if histograma is None:
+                por_rotulos[rotulos] = histograma = Histograma()
+            histograma.observar(valor)
+
+    def incrementar(self, nome: str, valor: float = 1, rotulos: Rotulos = ()) -> None:
+        with self._trava:
+            por_rotulos = self._contadores.setdefault(nome, {})
+            por_rotulos[rotulos] = por_rotulos.get(rotulos, 0) + valor
+
+    def medir(self, operacao: str) -> Any:
+        """Context manager que cronometra o bloco como ``operacao`` (vazio se desligado)"""
+        if not self.ativo:
+            return _SEM_MEDICAO
+        return _Medicao(self, 'spa_operacao_segundos', (('operacao', operacao),))
+
+    def cronometrar(self, funcao: Callable, operacao: str) -> Callable:
+        """Embrulha ``funcao`` para cronometrá-la como ``operacao``"""
+        rotulos = (('operacao', operacao),)
+        contagem_ok, contagem_erro = rotulos + (('resultado', 'ok'),), rotulos + (('resultado', 'erro'),)
+        relogio, trava = time.perf_counter, self._trava
+
+        def concluir(duracao: float, contagem: Rotulos) -> None:
+            with trava:
+                histograma = self._histogramas.setdefault('spa_operacao_segundos', {}).get(rotulos)
+                if histograma is None:
+                    self._histogramas['spa_operacao_segundos'][rotulos] = histograma = Histograma()
+                histograma.observar(duracao)
+                contadores = self._contadores.setdefault('spa_operacoes_total', {})
+                contadores[contagem] = contadores.get(contagem, 0) + 1
+
+        @functools.wraps(funcao)
+        def cronometrada(*args, **kwargs):
+            inicio = relogio()
+            try:
+                resultado = funcao(*args, **kwargs)
+            except BaseException:
+                concluir(relogio() - inicio, contagem_erro)
+                raise
+            concluir(relogio() - inicio, contagem_ok)
+            return resultado
+        return cronometrada
+
+    def instrumentar(self, objeto: Any, operacoes: Dict[str, str]) -> None:
+        """Substitui, só nesta instância, cada método ``nome`` de ``operacoes`` por sua versão cronometrada"""
+        for nome, operacao in operacoes.items():
+            setattr(objeto, nome, self.cronometrar(getattr(objeto, nome), operacao))
+
+    def registrar_gravacao(self, arquivo: Any, tamanho: int, duracao: float) -> None:
+        """Bytes e duração de uma gravação; arquivos numerados (segmentos) compartilham o rótulo"""
+        rotulos = (('arquivo', re.sub(r'\d+', 'N', Path(arquivo).name)),)
+        self.observar('spa_gravacao_segundos', duracao, rotulos)
+        self.incrementar('spa_gravacao_bytes_total', tamanho, rotulos)
+
+    # ----- exportação -----
+
+    def _copia(self) -> Tuple[Dict, Dict]:
+        with self._trava:
+            histogramas = {nome: {r: (h.acumulados(), h.soma, h.total, h.quantil(0.5), h.quantil(0.99))
+                                  for r, h in por_rotulos.items()}
+                           for nome, por_rotulos in self._histogramas.items()}
+            contadores = {nome: dict(por_rotulos) for nome, por_rotulos in self._contadores.items()}
+        return histogramas, contadores
+
+    @staticmethod
+    def _rotulos_prometheus(rotulos: Rotulos, extra: Rotulos = ()) -> str:
+        pares = rotulos + extra
+        if not pares:
+            return ''
+        return '{' + ','.join('{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"'))
+                              for k, v in pares) + '}'
+
+    def prometheus(self) -> str:
+        """Texto no formato de exposição do Prometheus (0.0.4)"""
+        histogramas, contadores = self._copia()
+        linhas = []
+        for nome in sorted(histogramas):
+            linhas += [f'# HELP {nome} {DESCRICOES.get(nome, nome)}', f'# TYPE {nome} histogram']
+            for rotulos, (acumulados, soma, total, _, _) in sorted(histogramas[nome].items()):
+                for limite, acumulado in zip(LIMITES + ('+Inf',), acumulados):
+                    linhas.append(f'{nome}_bucket{self._rotulos_prometheus(rotulos, (("le", str(limite)),))} '
+                                  f'{acumulado}')
+                linhas.append(f'{nome}_sum{self._rotulos_prometheus(rotulos)} {soma!r}')
+                linhas.append(f'{nome}_count{self._rotulos_prometheus(rotulos)} {total}')
+        for nome in sorted(contadores):
+            linhas += [f'# HELP {nome} {DESCRICOES.get(nome, nome)}', f'# TYPE {nome} counter']
+            for rotulos, valor in sorted(contadores[nome].items()):
+                linhas.append(f'{nome}{self._rotulos_prometheus(rotulos)} {valor}')
+        return '\n'.join(linhas) + '\n'
+
+    def para_json(self) -> Dict[str, Any]:
+        """Histogramas (com p50/p99 estimados) e contadores em um dict serializável"""
+        histogramas, contadores = self._copia()
+        return {
+            'limites': list(LIMITES),
+            'histogramas': {nome: [{'rotulos': dict(r), 'total': total, 'soma': soma,
+                                    'p50': _limite_json(p50), 'p99': _limite_json(p99),
+                                    'acumulados': acumulados}
+                                   for r, (acumulados, soma, total, p50, p99) in sorted(por_rotulos.items())]
+                            for nome, por_rotulos in histogramas.items()},
+            'contadores': {nome: [{'rotulos': dict(r), 'valor': valor} for r, valor in sorted(por_rotulos.items())]
+                           for nome, por_rotulos in contadores.items()},
+        }
+
+    def despejar(self, destino: str, formato: Optional[str] = None) -> None:
+        """Grava as métricas em um arquivo (temporário + rename), ou as envia a ``tcp://host:porta``
+        ou ``unix:///caminho``. O formato padrão é JSON para destinos .json e Prometheus para os demais."""
+        destino = str(destino)
+        formato = formato or ('json' if destino.endswith('.json') else 'prometheus')
+        if formato not in ('json', 'prometheus'):
+            raise ValueError(f"Formato desconhecido: {formato}")
+        texto = json.dumps(self.para_json(), ensure_ascii=False) if formato == 'json' else self.prometheus()
+        dados = texto.encode('utf-8')
+        if destino.startswith('tcp://'):
+            host, _, porta = destino[len('tcp://'):].rpartition(':')
+            with socket.create_connection((host, int(porta)), timeout=5) as conexao:
+                conexao.sendall(dados)
+        elif destino.startswith('unix://'):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+                conexao.settimeout(5)
+                conexao.connect(destino[len('unix://'):])
+                conexao.sendall(dados)
+        else:
+            tmp = f'{destino}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(dados)
+            os.replace(tmp, destino)
+
+    def despejar_ao_receber_sinal(self, destino: Callable[[], str], formato: Optional[str] = None) -> bool:
+        """Despeja em ``destino()`` a cada SIGUSR1 (kill -USR1 <pid>); False onde não há o sinal.
+
+        O tratador só levanta um Event: ele roda na thread principal entre duas instruções
+        quaisquer, possivelmente com a trava do registro tomada, então o despejo fica com a
+        thread 'metricas-sinal'.
+        """
+        if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+            return False
+        primeira = self._alvo_despejo is None
+        self._alvo_despejo = (destino, formato)
+        if primeira:
+            threading.Thread(target=self._despejar_quando_pedido, name='metricas-sinal', daemon=True).start()
+        signal.signal(signal.SIGUSR1, lambda *_: self._pedido_despejo.set())
+        return True
+
+    def _despejar_quando_pedido(self) -> None:
+        """Thread que atende os pedidos de despejo levantados pelo sinal"""
+        while True:
+            self._pedido_despejo.wait()
+            self._pedido_despejo.clear()
+            destino, formato = self._alvo_despejo
+            try:
+                self.despejar(destino(), formato)
+            except OSError as e:
+                print(f"❌ Erro ao despejar métricas: {e}")
+
+
+# Registro do processo, compartilhado pelo núcleo e pelas camadas de armazenamento
+REGISTRO = Metricas()
@@ -0,0 +1,256 @@
+"""
+NOTIFICAÇÕES DO LINKEDIN SPA
+Descrição: Avisa o usuário de curtidas e comentários nos seus posts, de novas
+conexões e de posts de quem está na sua rede. As operações do núcleo só
+enfileiram o evento e retornam: quem envia passa os destinatários (a audiência
+inteira, no caso de um post), copiados na hora, e trabalhadores em um laço
+asyncio próprio, em segundo plano, entregam em caixas de tamanho limitado por
+usuário. Para quem publica, uma audiência de 10 mil custa só essa cópia. O laço
+nunca lê o grafo nem o banco, que só a thread do núcleo altera. Avisos ainda
+não lidos do mesmo tipo e sobre o mesmo alvo são agrupados ("Ana e mais 4
+pessoas curtiram seu post", "Bruno publicou 3 posts"). As caixas ficam na
+memória do processo.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from metricas import REGISTRO
+
+TIPOS = ('curtir', 'comentar', 'conectar', 'post')
+
+
+class Notificacao:
+    """Um aviso, possivelmente agrupando vários eventos do mesmo tipo e alvo"""
+
+    __slots__ = ('tipo', 'alvo', 'atores', 'pessoas', 'total', 'instante', 'lida')
+
+    # Quantos usernames distintos (os mais recentes) cada aviso guarda para exibir
+    ATORES_GUARDADOS = 10
+
+    def __init__(self, tipo: str, alvo: Optional[int], ator: str, instante: float):
+        self.tipo, self.alvo, self.instante = tipo, alvo, instante
+        self.atores: List[str] = [ator]  # do mais recente ao mais antigo
+        self.pessoas = self.total = 1    # autores distintos e eventos agrupados
+        self.lida = False
+
+    def agrupar(self, ator: str, instante: float) -> None:
+        """Soma mais um evento ao aviso"""
+        if ator in self.atores:
+            self.atores.remove(ator)
+        else:
+            self.pessoas += 1
+        self.atores.insert(0, ator)
+        del self.atores[self.ATORES_GUARDADOS:]
+        self.total += 1
+        self.instante = instante
+
+    def texto(self, nome: Callable[[str], str]) -> str:
+        """Frase exibível; ``nome(username)`` dá o nome de cada autor"""
+        quem, outros = nome(self.atores[0]), self.pessoas - 1
+        if self.tipo == 'post':
+            return f"{quem} publicou {'um post' if self.total == 1 else f'{self.total} posts'}"
+        if outros:
+            quem += f" e mais {outros} {'pessoa' if outros == 1 else 'pessoas'}"
+        singular = outros == 0
+        if self.tipo == 'curtir':
+            return f"{quem} {'curtiu' if singular else 'curtiram'} seu post #{self.alvo}"
+        if self.tipo == 'comentar':
+            return f"{quem} {'comentou' if singular else 'comentaram'} no seu post #{self.alvo}"
+        return f"{quem} {'se conectou' if singular else 'se conectaram'} com você"
+
+    def copia(self) -> 'Notificacao':
+        """Cópia independente (o original continua recebendo eventos em segundo plano)"""
+        copia = Notificacao(self.tipo, self.alvo, self.atores[0], self.instante)
+        copia.atores, copia.pessoas, copia.total, copia.lida = list(self.atores), self.pessoas, self.total, self.lida
+        return copia
+
+    def para_json(self) -> Dict:
+        return {'tipo': self.tipo, 'alvo': self.alvo, 'atores': list(self.atores), 'pessoas': self.pessoas,
+                'total': self.total, 'instante': self.instante, 'lida': self.lida}
+
+
+class CaixaNotificacoes:
+    """Avisos de um usuário, do mais antigo ao mais recente, com no máximo ``capacidade`` (os mais
+    antigos saem); cada aviso não lido é o ponto de agrupamento do seu grupo (ver ``_grupo``)"""
+
+    def __init__(self, capacidade: int):
+        self.capacidade = capacidade
+        self.nao_lidas = 0
+        self._itens: 'OrderedDict[int, Notificacao]' = OrderedDict()
+        self._abertos: Dict[Tuple[str, Optional[int]], int] = {}  # (tipo, alvo) -> chave do aviso não lido
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    @staticmethod
+    def _grupo(tipo: str, alvo: Optional[int], ator: str) -> Tuple:
+        """Posts agrupam por autor ("Ana publicou 3 posts"); o resto, pelo post (ou nada, nas conexões)"""
+        return (tipo, ator) if tipo == 'post' else (tipo, alvo)
+
+    def receber(self, tipo: str, alvo: Optional[int], ator: str, instante: float) -> None:
+        """Agrupa no aviso não lido do mesmo grupo ou cria um novo; o aviso vai para o topo"""
+        grupo = self._grupo(tipo, alvo, ator)
+        chave = self._abertos.get(grupo)
+        if chave is not None:
+            notificacao = self._itens.pop(chave)
+            notificacao.agrupar(ator, instante)
+            notificacao.alvo = alvo
+        else:
+            notificacao = Notificacao(tipo, alvo, ator, instante)
+            self.nao_lidas += 1
+        self._seq += 1
+        self._itens[self._seq] = notificacao
+        self._abertos[grupo] = self._seq
+        while len(self._itens) > self.capacidade:
+            chave, antiga = self._itens.popitem(last=False)
+            if not antiga.lida:
+                self.nao_lidas -= 1
+                del self._abertos[self._grupo(antiga.tipo, antiga.alvo, antiga.atores[0])]
+
+    def recentes(self, limite: Optional[int] = None) -> List[Notificacao]:
+        """Até ``limite`` avisos, do mais recente ao mais antigo"""
+        itens = reversed(self._itens.values())
+        return [n for _, n in zip(range(limite), itens)] if limite is not None else list(itens)
+
+    def marcar_lidas(self) -> None:
+        """Marca todos como lidos; os próximos eventos começam avisos novos"""
+        for notificacao in self._itens.values():
+            notificacao.lida = True
+        self._abertos.clear()
+        self.nao_lidas = 0
+
+
+class CentralNotificacoes:
+    """Fila asyncio de eventos e as caixas de todos os usuários.
+
+    O laço de eventos roda em uma thread própria, iniciada no primeiro
+    ``enviar``, com ``trabalhadores`` tarefas consumindo a fila. A entrega
+    para uma audiência grande é feita em lotes de ``LOTE`` caixas, cedendo a
+    vez entre eles, para que um post de alguém muito seguido não atrase as
+    curtidas e comentários que chegam depois.
+    """
+
+    LOTE = 500
+
+    def __init__(self, capacidade: int = 50, trabalhadores: int = 2):
+        self.capacidade = capacidade
+        self.trabalhadores = trabalhadores
+        self.entregues = 0  # avisos entregues em caixas (agrupados ou não)
+        self._caixas: Dict[str, CaixaNotificacoes] = {}
+        self._trava = threading.Lock()         # caixas: escritas pelos trabalhadores, lidas pelas sessões
+        self._trava_inicio = threading.Lock()
+        self._laco: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._fila: Optional[asyncio.Queue] = None
+
+    # ----- laço em segundo plano -----
+
+    def _iniciar(self) -> asyncio.AbstractEventLoop:
+        with self._trava_inicio:
+            if self._laco is None:
+                laco, pronto = asyncio.new_event_loop(), threading.Event()
+                self._thread = threading.Thread(target=self._rodar, args=(laco, pronto),
+                                                name='notificacoes', daemon=True)
+                self._thread.start()
+                pronto.wait()
+                self._laco = laco
+            return self._laco
+
+    def _rodar(self, laco: asyncio.AbstractEventLoop, pronto: threading.Event) -> None:
+        """Corpo da thread: a fila e os trabalhadores pertencem a este laço"""
+        asyncio.set_event_loop(laco)
+        try:
+            self._fila = asyncio.Queue()
+            tarefas = [laco.create_task(self._trabalhador()) for _ in range(self.trabalhadores)]
+            pronto.set()
+            laco.run_forever()
+            for tarefa in tarefas:
+                tarefa.cancel()
+            laco.run_until_complete(asyncio.gather(*tarefas, return_exceptions=True))
+        finally:
+            laco.close()
+
+    async def _trabalhador(self) -> None:
+        while True:
+            tipo, ator, destinos, alvo, instante = await self._fila.get()
+            try:
+                entregues = 0
+                for inicio in range(0, len(destinos), self.LOTE):
+                    with self._trava:
+                        for username in destinos[inicio:inicio + self.LOTE]:
+                            if username != ator:
+                                self._caixa(username).receber(tipo, alvo, ator, instante)
+                                entregues += 1
+                    await asyncio.sleep(0)  # cede a vez aos outros trabalhadores entre lotes
+                self.entregues += entregues
+                if REGISTRO.ativo:
+                    REGISTRO.observar('spa_notificacao_segundos', time.time() - instante, (('tipo', tipo),))
+                    REGISTRO.incrementar('spa_notificacoes_total', entregues, (('tipo', tipo),))
+            except Exception as e:
+                print(f"❌ Erro ao entregar notificação: {e}")
+            finally:
+                self._fila.task_done()
+
+    def _caixa(self, username: str) -> CaixaNotificacoes:
+        caixa = self._caixas.get(username)
+        if caixa is None:
+            self._caixas[username] = caixa = CaixaNotificacoes(self.capacidade)
+        return caixa
+
+    # ----- produtores -----
+
+    def enviar(self, tipo: str, ator: str, destinos: Iterable[str], alvo: Optional[int] = None) -> None:
+        """Enfileira um evento para os ``destinos`` e retorna sem esperar a entrega. Os destinos
+        são copiados aqui, na thread de quem envia; o próprio ator é ignorado"""
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de notificação desconhecido: {tipo}")
+        destinos = tuple(destinos)  # o ator sai na entrega, fora da thread de quem envia
+        if not destinos or destinos == (ator,):
+            return
+        laco = self._iniciar()
+        laco.call_soon_threadsafe(self._fila.put_nowait, (tipo, ator, destinos, alvo, time.time()))
+
+    def aguardar(self, tempo: Optional[float] = None) -> None:
+        """Bloqueia até a fila esvaziar (tudo que já foi enviado estar nas caixas)"""
+        laco = self._laco
+        if laco is not None:
+            asyncio.run_coroutine_threadsafe(self._fila.join(), laco).result(tempo)
+
+    def fechar(self) -> None:
+        """Entrega o que está na fila e encerra o laço"""
+        with self._trava_inicio:
+            laco, self._laco = self._laco, None
+        if laco is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._fila.join(), laco).result()
+        laco.call_soon_threadsafe(laco.stop)
+        self._thread.join()
+        self._thread = None
+
+    # ----- consumidores -----
+
+    def nao_lidas(self, username: str) -> int:
+        with self._trava:
+            caixa = self._caixas.get(username)
+            return caixa.nao_lidas if caixa is not None else 0
+
+    def recentes(self, username: str, limite: Optional[int] = None) -> List[Notificacao]:
+        """Cópias dos avisos do usuário, do mais recente ao mais antigo"""
+        with self._trava:
+            caixa = self._caixas.get(username)
+            return [n.copia() for n in caixa.recentes(limite)] if caixa is not None else []
+
+    def ler(self, username: str, limite: Optional[int] = None) -> List[Notificacao]:
+        """``recentes`` e marca todos como lidos, sem deixar chegar nada entre uma coisa e outra"""
+        with self._trava:
+            caixa = self._caixas.get(username)
+            if caixa is None:
+                return []
+            avisos = [n.copia() for n in caixa.recentes(limite)]
+            caixa.marcar_lidas()
+            return avisos
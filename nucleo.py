@@ -0,0 +1,722 @@
+"""
+NÚCLEO DO LINKEDIN SPA
+Descrição: Regras de negócio da rede social (cadastro, login, busca, posts,
+curtidas, comentários, conexões e feeds) sem entrada/saída de console. A CLI
+(GS.py) e a API HTTP (api.py) são clientes deste núcleo: as operações validam
+os dados, aplicam a mutação, persistem o evento e levantam ErroDominio com uma
+mensagem exibível quando a operação é recusada. Se outro processo gravar na
+mesma pasta de dados, ``atualizar`` relê o estado e descarta o que é derivado.
+"""
+
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Generator
+from pathlib import Path
+
+from busca_posts import IndicePosts
+from cache import CacheLRU
+from comentarios import Comentarios
+from em_alta import RankingEmAlta
+from feed_rede import FeedRede
+from grafo import GrafoSocial
+from linha_do_tempo import LinhaDoTempo
+from metricas import REGISTRO
+from notificacoes import CentralNotificacoes, Notificacao
+from reconstrucao import montar_indice_posts, montar_indice_usuarios, montar_indices
+from recomendacoes import Recomendador
+from registros import Comentario, Post, Usuario, data_de
+from senhas import ServicoSenhas
+from repositorio import (ConflitoVersao, Repositorio, RepositorioJSON, RepositorioSegmentado, RepositorioSQLite,
+                         migrar_json_para_sqlite)
+
+
+class ErroDominio(ValueError):
+    """Operação recusada por uma regra de negócio; a mensagem pode ser exibida ao usuário"""
+
+
+class NaoEncontrado(ErroDominio):
+    """Usuário ou post inexistente"""
+
+
+class NaoPermitido(ErroDominio):
+    """O usuário não pode fazer a operação sobre o recurso"""
+
+
+class Conflito(ErroDominio):
+    """O registro foi alterado por outra sessão entre a leitura e a escrita"""
+
+
+class FalhaGravacao(ErroDominio):
+    """A mutação foi aplicada em memória mas o repositório não a gravou (disco cheio, sem permissão...)"""
+
+
+class NucleoSPA:
+    """Estado e operações de domínio do LinkedIn SPA, compartilhados pela CLI e pela API"""
+    
+    # Constantes de validação
+    REGEX_EMAIL = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    MIN_USERNAME_LEN, MIN_SENHA_LEN, MAX_BIO_LEN = 3, 6, 200
+    MAX_POST_LEN, MIN_POST_LEN, MAX_COMENTARIO = 500, 5, 200
+    PAGINA_SIZE, ENCODING, LIMITE_BUSCA, TAMANHO_CACHE = 5, 'utf-8', 20, 1024
+    PAGINA_COMENTARIOS = 10  # comentários por página (cursor = id do último exibido)
+    
+    # Persistência: 'completo' reescreve os JSON a cada mutação; 'diario' anexa
+    # cada mutação em um diário e compacta em snapshot a cada LIMITE_DIARIO registros;
+    # 'segmentado' carrega só usuários/conexões ao iniciar e lê os posts de dados_posts/
+    # por segmentos, no primeiro acesso; 'sqlite' grava cada mutação como uma transação em dados.sqlite3
+    MODO_ARMAZENAMENTO, LIMITE_DIARIO = 'completo', 1000
+    
+    # Codec dos arquivos de dados (ver serializacao.py): 'json', 'json_compacto', 'gzip', 'lzma',
+    # 'pickle' ou 'marshal'; vale para as gravações, a leitura reconhece o formato de cada arquivo
+    CODEC_ARQUIVOS = 'json'
+    
+    # Feed da rede: 'merge' (k-way na leitura), 'fanout' (caixas de entrada na
+    # publicação) ou 'hibrido' (fan-out exceto autores com audiência > LIMITE_CELEBRIDADE)
+    ESTRATEGIA_FEED, TAMANHO_CAIXA, LIMITE_CELEBRIDADE = 'hibrido', 200, 1000
+    
+    # Pessoas que talvez você conheça: escore = conexões em comum + PESO_TITULO se o título for igual
+    LIMITE_SUGESTOES, PESO_TITULO = 5, 0.5
+    
+    # Posts em alta: quantos exibir por janela (1h, 24h, 7d)
+    LIMITE_EM_ALTA = 10
+    
+    # Notificações (notificacoes.py): até NOTIFICACOES_POR_USUARIO avisos por caixa, entregues em
+    # segundo plano por TRABALHADORES_NOTIFICACAO tarefas asyncio
+    NOTIFICACOES_POR_USUARIO, TRABALHADORES_NOTIFICACAO = 50, 2
+    
+    # Índices de busca de usuários e de posts (reconstrucao.py): com muitos dados, montados em
+    # fatias por PROCESSOS_RECONSTRUCAO processos (None = um por núcleo) e mesclados
+    PROCESSOS_RECONSTRUCAO = None
+    
+    # Senhas: 'scrypt' ou 'pbkdf2_sha256' (custos em senhas.ServicoSenhas), calculadas em um pool
+    # de TRABALHADORES_SENHA threads (None = um por núcleo); senhas em texto puro de dados
+    # antigos, ou com custo diferente, são regravadas no próximo login
+    ALGORITMO_SENHA, TRABALHADORES_SENHA = 'scrypt', None
+    
+    # Métricas (metricas.py): ativas, os métodos abaixo são cronometrados nesta instância e
+    # as métricas vão para ARQUIVO_METRICAS ao fechar e a cada SIGUSR1; desligadas, nada é embrulhado
+    METRICAS_ATIVAS, ARQUIVO_METRICAS = False, 'metricas.prom'
+    OPERACOES_MEDIDAS = {
+        '_carregar_dados': 'carregar', 'atualizar': 'atualizar', '_salvar_dados': 'salvar',
+        '_persistir': 'persistir', '_persistir_lote': 'persistir_lote', 'buscar': 'buscar',
+        '_obter_posts_usuario': 'posts_usuario', 'pagina_feed': 'pagina_feed', 'posts_em_alta': 'em_alta',
+        'autenticar': 'login', 'registrar': 'registrar', 'editar_perfil': 'editar_perfil',
+        'conectar': 'conectar', 'publicar': 'publicar', 'deletar_post': 'deletar_post',
+        'alternar_curtida': 'curtir', 'comentar': 'comentar', 'pagina_comentarios': 'comentarios',
+        'buscar_posts': 'buscar_posts', 'reconstruir_indices': 'reconstruir',
+    }
+    
+    # Dados de teste pré-configurados em formato de dicionário
+    DADOS_PRECONFIGURADOS = {
+        'nomes': {
+            0: 'Ana Costa', 1: 'Bruno Martins', 2: 'Carlos Oliveira', 3: 'Diana Ferreira', 4: 'Eduardo Santos',
+            5: 'Fernanda Lima', 6: 'Gustavo Pereira', 7: 'Helena Rocha', 8: 'Igor Mendes', 9: 'Juliana Gomes',
+            10: 'Kevin Alves', 11: 'Larissa Dias', 12: 'Matheus Correia', 13: 'Natalia Souza', 14: 'Otavio Carvalho',
+            15: 'Patricia Ribeiro', 16: 'Quentin Barbosa', 17: 'Rafaela Campos', 18: 'Samuel Costa', 19: 'Tania Monteiro',
+            20: 'Ulisses Rodrigues', 21: 'Vanessa Duarte', 22: 'Wagner Nunes', 23: 'Ximena Lopez', 24: 'Yasmin Azevedo',
+            25: 'Zoe Machado', 26: 'Adriana Teles', 27: 'Bernardo Silva', 28: 'Camila Rosa', 29: 'Daphne Oliveira',
+            30: 'Emerson Costa', 31: 'Fabiana Souza', 32: 'Gilson Pereira', 33: 'Hercules Santos', 34: 'Iris Almeida',
+            35: 'Jeferson Martins', 36: 'Katarina Dias', 37: 'Leonardo Campos', 38: 'Mariana Rocha', 39: 'Norberto Lima',
+            40: 'Octavia Ferreira', 41: 'Pompeia Gomes', 42: 'Quasimodo Vargas', 43: 'Rosangela Pinto', 44: 'Sheila Castro',
+            45: 'Tiago Morais', 46: 'Urania Neves', 47: 'Vicente Barbosa', 48: 'Wanda Ramos', 49: 'Xavier Fontes',
+            50: 'Yara Mendes', 51: 'Zilda Moraes'
+        },
+        'titulos': {
+            0: 'Desenvolvedor Python', 1: 'Designer UX/UI', 2: 'Engenheiro de Software', 3: 'Analista de Dados',
+            4: 'Gerente de Projetos', 5: 'Especialista em Marketing', 6: 'Arquiteto de Sistemas', 7: 'DevOps Engineer',
+            8: 'Data Scientist', 9: 'Front-end Developer', 10: 'Back-end Developer', 11: 'Full Stack Developer',
+            12: 'DBA - Database Administrator', 13: 'Consultor de TI', 14: 'Gestor de Recursos Humanos',
+            15: 'Especialista em Segurança', 16: 'Product Manager', 17: 'Scrum Master', 18: 'QA Engineer',
+            19: 'Ilustrador Digital', 20: 'Redator Técnico', 21: 'Especialista em Cloud', 22: 'Mobile Developer'
+        },
+        'bios': {
+            0: 'Apaixonado por tecnologia e inovação', 1: 'Sempre buscando novos desafios profissionais',
+            2: 'Especialista em soluções criativas', 3: 'Amante de desenvolvimento sustentável',
+            4: 'Focado em qualidade e excelência', 5: 'Colaborador e team player', 6: 'Entusiasta de programação',
+            7: 'Criando o futuro através da tecnologia', 8: 'Dedicado ao aprendizado contínuo',
+            9: 'Profissional versátil e adaptável', 10: 'Transformando ideias em realidade', 11: 'Conectando pessoas e soluções'
+        }
+    }
+    
+    def __init__(self, modo_armazenamento: Optional[str] = None, estrategia_feed: Optional[str] = None):
+        """Inicializa o sistema"""
+        self.usuarios, self.grafo, self.posts, self.comentarios = {}, GrafoSocial(), LinhaDoTempo(), Comentarios()
+        self._cache_posts = CacheLRU(self.TAMANHO_CACHE)
+        self._cache_busca = CacheLRU(self.TAMANHO_CACHE)
+        self._cache_perfil = CacheLRU(self.TAMANHO_CACHE)
+        self._indice_busca = None
+        self._em_alta: Optional[RankingEmAlta] = None
+        self._busca_posts: Optional[IndicePosts] = None
+        self.recargas = 0  # quantas vezes o estado foi relido por alteração de outro processo
+        self._serial: Optional[ThreadPoolExecutor] = None  # thread única de em_serie, criada no primeiro uso
+        self.arquivo_usuarios = Path('dados_usuarios.json')
+        self.arquivo_conexoes = Path('dados_conexoes.json')
+        self.arquivo_posts = Path('dados_posts.json')
+        self.arquivo_comentarios = Path('dados_comentarios.json')
+        self.pasta_posts = Path('dados_posts')
+        self.arquivo_diario = Path('dados_diario.jsonl')
+        self.arquivo_sqlite = Path('dados.sqlite3')
+        self.arquivo_busca = Path('dados_busca.json')
+        self.arquivo_metricas = Path(self.ARQUIVO_METRICAS)
+        self.metricas = REGISTRO
+        if self.METRICAS_ATIVAS or REGISTRO.ativo:
+            REGISTRO.ativar()
+            REGISTRO.instrumentar(self, self.OPERACOES_MEDIDAS)
+            REGISTRO.despejar_ao_receber_sinal(lambda: self.arquivo_metricas)
+        self.modo_armazenamento = modo_armazenamento or self.MODO_ARMAZENAMENTO
+        self.senhas = ServicoSenhas(self.ALGORITMO_SENHA, self.TRABALHADORES_SENHA)
+        self.repositorio = self._criar_repositorio()
+        self.feed_rede = FeedRede(estrategia_feed or self.ESTRATEGIA_FEED, self._rede_de, self._audiencia_de,
+                                  lambda autor: self.repositorio.posts_do_autor(autor),
+                                  lambda autor: len(self.grafo.conexoes(autor)) + len(self.grafo.seguidores(autor)),
+                                  self.TAMANHO_CAIXA, self.LIMITE_CELEBRIDADE)
+        self.notificacoes = CentralNotificacoes(self.NOTIFICACOES_POR_USUARIO, self.TRABALHADORES_NOTIFICACAO)
+        self.recomendador = Recomendador(lambda u: self.grafo.conexoes(u), lambda u: self.usuarios[u]['titulo'],
+                                         self.PESO_TITULO, capacidade=self.TAMANHO_CACHE)
+        self._carregar_dados()
+    
+    def _criar_repositorio(self) -> Repositorio:
+        """Cria o repositório do modo de armazenamento configurado"""
+        if self.modo_armazenamento == 'sqlite':
+            novo = not self.arquivo_sqlite.exists()
+            repo = RepositorioSQLite(self.arquivo_sqlite)
+            if novo and self.arquivo_usuarios.exists():
+                origem = RepositorioJSON(self.arquivo_usuarios, self.arquivo_conexoes, self.arquivo_posts,
+                                         self.arquivo_diario if self.arquivo_diario.exists() else None,
+                                         self.ENCODING, self.arquivo_comentarios, self.CODEC_ARQUIVOS)
+                print(f"✅ {migrar_json_para_sqlite(origem, repo)} usuários migrados para {self.arquivo_sqlite}")
+                origem.fechar()
+            return repo
+        if self.modo_armazenamento == 'segmentado':
+            return RepositorioSegmentado(self.arquivo_usuarios, self.arquivo_conexoes, self.arquivo_posts,
+                                         self.pasta_posts, self.ENCODING, self.CODEC_ARQUIVOS)
+        repo = RepositorioJSON(self.arquivo_usuarios, self.arquivo_conexoes, self.arquivo_posts,
+                               self.arquivo_diario if self.modo_armazenamento == 'diario' else None,
+                               self.ENCODING, self.arquivo_comentarios, self.CODEC_ARQUIVOS)
+        repo.limite_diario = self.LIMITE_DIARIO
+        return repo
+    
+    def _carregar_dados(self) -> None:
+        """Carrega dados do repositório ou inicializa"""
+        self._indice_busca = self._em_alta = self._busca_posts = None
+        try:
+            if self.repositorio.existe():
+                self.usuarios, self.grafo, self.posts, self.comentarios = self.repositorio.carregar()
+                print("✅ Dados carregados com sucesso!")
+            else:
+                self._inicializar_dados_teste()
+                self._salvar_dados()
+                self.usuarios, self.grafo, self.posts, self.comentarios = self.repositorio.carregar()
+        except Exception as e:
+            print(f"❌ Erro ao carregar dados: {e}")
+            self._inicializar_dados_teste()
+    
+    def _salvar_dados(self) -> None:
+        """Salva o estado completo no repositório"""
+        try:
+            self.repositorio.salvar(self.usuarios, self.grafo, self.posts, self.comentarios)
+            self._descartar_derivados()
+        except Exception as e:
+            print(f"❌ Erro ao salvar dados: {e}")
+    
+    def _descartar_derivados(self) -> None:
+        """Esvazia caches, índices e rankings montados a partir do estado"""
+        for cache in (self._cache_posts, self._cache_busca, self._cache_perfil):
+            cache.limpar()
+        self.recomendador.limpar()
+        self.feed_rede.limpar()
+        self._indice_busca = self._em_alta = self._busca_posts = None
+    
+    def atualizar(self) -> bool:
+        """Relê os dados se outro processo os alterou; True se recarregou"""
+        try:
+            if not self.repositorio.desatualizado():
+                return False
+            self.usuarios, self.grafo, self.posts, self.comentarios = self.repositorio.carregar()
+        except Exception as e:
+            print(f"❌ Erro ao recarregar dados: {e}")
+            return False
+        self._descartar_derivados()
+        self.recargas += 1
+        return True
+    
+    def _persistir(self, evento: Dict) -> None:
+        """Persiste uma mutação já aplicada em memória; FalhaGravacao se o repositório não a gravou"""
+        try:
+            self.repositorio.registrar(evento)
+        except ConflitoVersao:
+            self.atualizar()  # descarta a alteração local junto com o estado antigo
+            raise Conflito("Alterado por outra sessão; tente de novo") from None
+        except Exception as e:
+            self._descartar_derivados()  # nada derivado fica sem a mutação que está em memória
+            raise FalhaGravacao(f"Erro ao salvar dados: {e}") from e
+        self._invalidar_caches(evento)
+        self.feed_rede.aplicar(evento)
+        if self._em_alta is not None:
+            self._em_alta.aplicar(evento)
+        if self._busca_posts is not None:
+            self._busca_posts.aplicar(evento)
+        if self.repositorio.mesclou():
+            self.atualizar()  # a gravação encontrou (e mesclou) dados de outro processo
+    
+    def _persistir_lote(self, eventos: List[Dict]) -> None:
+        """Persiste um lote de mutações já aplicadas em memória (carga em massa)"""
+        try:
+            self.repositorio.registrar_lote(eventos)
+        except ConflitoVersao:
+            self.atualizar()
+            raise Conflito("Alterado por outra sessão; tente de novo") from None
+    
+    def _concluir_lote(self) -> None:
+        """Grava o que os lotes deixaram pendente e descarta os dados derivados"""
+        try:
+            self.repositorio.concluir_lote()
+        except ConflitoVersao:
+            self.atualizar()
+            raise Conflito("Alterado por outra sessão; tente de novo") from None
+        finally:
+            self._descartar_derivados()
+    
+    @staticmethod
+    def _nova_versao(registro: Dict) -> int:
+        """Avança a versão do registro e devolve a anterior, que vai no evento"""
+        versao = registro.get('versao', 0)
+        registro['versao'] = versao + 1
+        return versao
+    
+    def _invalidar_caches(self, evento: Dict) -> None:
+        """Invalida só as entradas de cache afetadas pela mutação.
+        
+        Curtidas e comentários alteram os próprios dicts dos posts já em cache,
+        então não invalidam nada.
+        """
+        op = evento['op']
+        if op == 'registrar':
+            self._cache_busca.limpar()
+        elif op == 'conectar':
+            self._cache_perfil.invalidar(evento['origem'], evento['alvo'])
+        elif op in ('post', 'deletar_post'):
+            autor = evento['post']['usuario'] if op == 'post' else evento['usuario']
+            self._cache_posts.invalidar(autor)
+            self._cache_perfil.invalidar(autor)
+        self.recomendador.aplicar(evento)
+    
+    def estatisticas_cache(self) -> Dict[str, Dict]:
+        """Contadores de acertos/falhas de cada cache"""
+        return {'posts': self._cache_posts.estatisticas(), 'busca': self._cache_busca.estatisticas(),
+                'perfil': self._cache_perfil.estatisticas(), **self.recomendador.estatisticas()}
+    
+    async def em_serie(self, funcao: Callable[..., Any], *args: Any) -> Any:
+        """Executa ``funcao(*args)`` na thread única do núcleo, sem bloquear o laço de eventos.
+
+        Quem serve o núcleo por asyncio (api.py) passa por aqui: leituras, mutações e a gravação
+        de cada evento (fsync do diário, reescrita dos JSON, commit do SQLite) ficam em série
+        nessa thread, então o estado continua sem travas e o laço segue atendendo conexões.
+        """
+        if self._serial is None:
+            self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nucleo')
+        return await asyncio.wrap_future(self._serial.submit(funcao, *args))
+    
+    def fechar(self) -> None:
+        """Grava o índice de busca de posts, se mudou, entrega as notificações pendentes, libera o
+        repositório (descarrega diário, fecha banco) e despeja as métricas, se ativas"""
+        if self._serial is not None:
+            self._serial.shutdown()  # termina a operação em andamento antes de fechar o repositório
+        if self._busca_posts is not None and self._busca_posts.alterado:
+            try:
+                self._busca_posts.gravar(self.arquivo_busca, self._marca_posts(), self.ENCODING,
+                                         self.CODEC_ARQUIVOS)
+            except OSError as e:
+                print(f"❌ Erro ao salvar índice de busca: {e}")
+        self.notificacoes.fechar()
+        self.repositorio.fechar()
+        self.senhas.fechar()
+        if self.metricas.ativo:
+            self.despejar_metricas()
+    
+    def despejar_metricas(self, destino: Optional[str] = None, formato: Optional[str] = None) -> None:
+        """Grava as métricas em ``destino`` (padrão: arquivo_metricas), arquivo ou tcp://host:porta"""
+        try:
+            self.metricas.despejar(destino or self.arquivo_metricas, formato)
+        except (OSError, ValueError) as e:
+            print(f"❌ Erro ao despejar métricas: {e}")
+    
+    def _inicializar_dados_teste(self) -> None:
+        """Inicializa dados de teste"""
+        try:
+            agora = time.time()
+            senha = self.senhas.gerar('123456')  # contas de demonstração: um hash para a senha conhecida de todas
+            self.usuarios = {
+                'usuario1': self._criar_usuario('João Silva', 'joao@example.com', senha, 
+                                               'Desenvolvedor Python', 'Apaixonado por programação', agora),
+                'usuario2': self._criar_usuario('Maria Santos', 'maria@example.com', senha,
+                                               'Designer UX/UI', 'Criando experiências incríveis', agora)
+            }
+            
+            nomes_dict = self.DADOS_PRECONFIGURADOS['nomes']
+            titulos_dict = self.DADOS_PRECONFIGURADOS['titulos']
+            bios_dict = self.DADOS_PRECONFIGURADOS['bios']
+            
+            for i, nome in enumerate(nomes_dict.values(), 3):
+                username = f'usuario{i}'
+                self.usuarios[username] = self._criar_usuario(
+                    nome, f'{nome.lower().replace(" ", ".")}@example.com', senha,
+                    titulos_dict[i % len(titulos_dict)], bios_dict[i % len(bios_dict)], agora
+                )
+            
+            conexoes = {u: [] for u in self.usuarios}
+            conexoes['usuario1'] = ['usuario2']
+            conexoes['usuario2'] = ['usuario1']
+            
+            posts = [
+                {'id': 1, 'usuario': 'usuario1', 'autor_nome': 'João Silva', 'conteudo': 'Bem-vindo ao LinkedIn SPA! 🚀',
+                 'data': data_de(agora), 'timestamp': agora, 'likes': []},
+                {'id': 2, 'usuario': 'usuario2', 'autor_nome': 'Maria Santos', 
+                 'conteudo': 'Adorando este novo sistema! 💼', 'data': data_de(agora), 'timestamp': agora, 'likes': ['usuario1'], 'total_curtidas': 1}
+            ]
+            self.grafo = GrafoSocial.de_json(self.usuarios, conexoes, posts)
+            self.posts = LinhaDoTempo(Post.de_json(p, self.usuarios) for p in posts)
+            self.comentarios = Comentarios()
+        except Exception as e:
+            print(f"Erro ao inicializar dados: {e}")
+    
+    def _criar_usuario(self, nome: str, email: str, senha: str, titulo: str, bio: str, instante: float) -> Usuario:
+        """Factory para criar usuário (``senha`` já em hash, ``instante`` em epoch)"""
+        return Usuario(nome, email, senha, titulo, bio, data_de(instante), instante)
+    
+    def _validar_email(self, email: str) -> bool:
+        """Valida email"""
+        return bool(re.match(self.REGEX_EMAIL, email.strip()))
+    
+    def _validar_senha(self, senha: str) -> Tuple[bool, str]:
+        """Valida senha"""
+        if len(senha) < self.MIN_SENHA_LEN:
+            return False, f"Mín. {self.MIN_SENHA_LEN} caracteres"
+        if not any(c.isupper() for c in senha):
+            return False, "Requer letra maiúscula"
+        if not any(c.isdigit() for c in senha):
+            return False, "Requer números"
+        return True, "Válida"
+    
+    def _validar_username(self, username: str) -> Tuple[bool, str]:
+        """Valida usuário"""
+        username = username.strip()
+        if len(username) < self.MIN_USERNAME_LEN:
+            return False, f"Mín. {self.MIN_USERNAME_LEN} caracteres"
+        if not re.match(r'^[a-zA-Z0-9_]+$', username):
+            return False, "Apenas letras, números e _"
+        return True, "Válido"
+    
+    def _buscar_usuarios(self, termo: str) -> Generator:
+        """Generator com os LIMITE_BUSCA usuários mais relevantes (índice de trigramas)"""
+        if self._indice_busca is None:
+            self._indice_busca = montar_indice_usuarios(((u, d['nome']) for u, d in self.usuarios.items()),
+                                                        self.PROCESSOS_RECONSTRUCAO)
+        usernames = self._cache_busca.obter(termo.strip().lower(),
+                                            lambda: self._indice_busca.buscar(termo, self.LIMITE_BUSCA))
+        for username in usernames:
+            yield username, self.usuarios[username]
+    
+    def _obter_posts_usuario(self, username: str) -> List[Dict]:
+        """Obtém posts com cache"""
+        return self._cache_posts.obter(username, lambda: self.repositorio.posts_do_autor(username))
+    
+    def posts_recentes(self, horas: float = 24) -> List[Dict]:
+        """Posts publicados nas últimas ``horas``, do mais antigo ao mais recente"""
+        return self.repositorio.posts_entre(time.time() - horas * 3600)
+    
+    def comentarios_desde(self, instante: float) -> List[Tuple[int, Dict]]:
+        """Pares (post_id, comentário) feitos a partir do instante epoch"""
+        return self.repositorio.comentarios_entre(instante)
+    
+    def _ranking_em_alta(self) -> RankingEmAlta:
+        """Ranking de posts em alta, montado na primeira consulta e depois mantido pelos eventos"""
+        if self._em_alta is None:
+            self._em_alta = ranking = RankingEmAlta()
+            corte = time.time() - ranking.maior_janela
+            ranking.carregar(self.repositorio.posts_entre(corte), self.repositorio.comentarios_entre(corte),
+                             self.grafo.curtidas)
+        return self._em_alta
+    
+    def posts_em_alta(self, janela: str = '24h', limite: Optional[int] = None) -> List[Tuple[Dict, float]]:
+        """Pares (post, escore) mais em alta na janela ('1h', '24h' ou '7d')"""
+        top = self._ranking_em_alta().top(janela, limite or self.LIMITE_EM_ALTA)
+        return [(post, escore) for post, escore in ((self.repositorio.post_por_id(i), e) for i, e in top)
+                if post is not None]
+    
+    def _marca_posts(self) -> Tuple[int, int, int]:
+        """(posts, maior id, comentários): muda com qualquer post, comentário ou remoção"""
+        ultimo = self.posts.antes(None, 1)
+        return len(self.posts), ultimo[0]['id'] if ultimo else 0, self.comentarios.quantidade()
+    
+    def _indice_posts(self) -> IndicePosts:
+        """Índice de busca de posts: o de dados_busca.json se a marca conferir, senão montado de novo"""
+        if self._busca_posts is None:
+            self._busca_posts = (IndicePosts.carregar(self.arquivo_busca, self._marca_posts(), self.ENCODING)
+                                 or montar_indice_posts(self.repositorio.percorrer_posts(), self.comentarios.itens(),
+                                                        self.PROCESSOS_RECONSTRUCAO))
+        return self._busca_posts
+    
+    def reconstruir_indices(self) -> None:
+        """Monta de novo, a partir do estado e de uma vez, os índices de busca de usuários e de posts
+        (normalmente montados na primeira busca), por exemplo depois de uma carga em massa"""
+        self._indice_busca, self._busca_posts = montar_indices(
+            ((u, d['nome']) for u, d in self.usuarios.items()), self.repositorio.percorrer_posts(),
+            self.comentarios.itens(), self.PROCESSOS_RECONSTRUCAO)
+        self._cache_busca.limpar()
+    
+    def _preparar_busca(self) -> None:
+        """Antes de uma mutação que muda o índice: o gravado só confere com o estado anterior a ela"""
+        if self._busca_posts is None and self.arquivo_busca.exists():
+            self._indice_posts()
+    
+    def _rede_de(self, username: str) -> set:
+        """Autores do feed da rede: conexões, quem o usuário segue e ele mesmo"""
+        return {username, *self.grafo.conexoes(username), *self.grafo.seguindo(username)}
+    
+    def _audiencia_de(self, autor: str) -> set:
+        """Usuários em cujo feed da rede os posts do autor aparecem"""
+        return {autor, *self.grafo.conexoes(autor), *self.grafo.seguidores(autor)}
+    
+    def _obter_estatisticas_perfil(self, username: str) -> Tuple[int, int, int, int]:
+        """(conexões, seguidores, seguindo, posts) com cache"""
+        def calcular() -> Tuple[int, int, int, int]:
+            return (len(self.grafo.conexoes(username)), len(self.grafo.seguidores(username)),
+                    len(self.grafo.seguindo(username)), len(self._obter_posts_usuario(username)))
+        return self._cache_perfil.obter(username, calcular)
+    
+    
+    # ----- operações de domínio -----
+    
+    def validar_novo_username(self, username: str) -> None:
+        """Levanta ErroDominio se o username for inválido ou já existir"""
+        valido, msg = self._validar_username(username)
+        if not valido:
+            raise ErroDominio(msg)
+        if username in self.usuarios:
+            raise ErroDominio("Já existe")
+    
+    def validar_novo_email(self, email: str) -> None:
+        """Levanta ErroDominio se o email for inválido ou já estiver em uso"""
+        if not self._validar_email(email) or self.repositorio.email_em_uso(email):
+            raise ErroDominio("Email inválido ou já existe")
+    
+    def validar_nova_senha(self, senha: str) -> None:
+        """Levanta ErroDominio se a senha não atender aos requisitos"""
+        valido, msg = self._validar_senha(senha)
+        if not valido:
+            raise ErroDominio(msg)
+    
+    def _validar_registro(self, username: str, email: str, senha: str, nome: str) -> None:
+        self.validar_novo_username(username)
+        self.validar_novo_email(email)
+        self.validar_nova_senha(senha)
+        if len(nome) < 3:
+            raise ErroDominio("Nome muito curto")
+    
+    def registrar(self, username: str, email: str, senha: str, nome: str,
+                  titulo: str = '', bio: str = '') -> Usuario:
+        """Cadastra um usuário e o retorna"""
+        username, email, nome = username.strip(), email.strip(), nome.strip()
+        self._validar_registro(username, email, senha, nome)
+        return self._cadastrar(username, email, self.senhas.gerar(senha), nome, titulo, bio)
+    
+    async def registrar_async(self, username: str, email: str, senha: str, nome: str,
+                              titulo: str = '', bio: str = '') -> Usuario:
+        """Como ``registrar``, sem bloquear o laço de eventos enquanto o hash é calculado; validação
+        e gravação rodam em série (``em_serie``)"""
+        with self.metricas.medir('registrar'):
+            username, email, nome = username.strip(), email.strip(), nome.strip()
+            await self.em_serie(self._validar_registro, username, email, senha, nome)
+            senha_hash = await self.senhas.gerar_async(senha)
+            return await self.em_serie(self._cadastrar_validado, username, email, senha, senha_hash, nome,
+                                       titulo, bio)
+    
+    def _cadastrar_validado(self, username: str, email: str, senha: str, senha_hash: str, nome: str,
+                            titulo: str, bio: str) -> Usuario:
+        self._validar_registro(username, email, senha, nome)  # outra sessão pode ter usado o nome na espera
+        return self._cadastrar(username, email, senha_hash, nome, titulo, bio)
+    
+    def _cadastrar(self, username: str, email: str, senha_hash: str, nome: str, titulo: str, bio: str) -> Usuario:
+        usuario = self._criar_usuario(nome, email, senha_hash, titulo.strip() or "Profissional",
+                                      bio.strip()[:self.MAX_BIO_LEN] or "Sem bio", time.time())
+        self.usuarios[username] = usuario
+        self.grafo.adicionar_usuario(username)
+        if self._indice_busca is not None:
+            self._indice_busca.adicionar(username, nome)
+        self._persistir({'op': 'registrar', 'username': username, 'usuario': usuario})
+        return usuario
+    
+    def _usuario_do_login(self, username: str) -> Tuple[str, Usuario]:
+        username = username.strip()
+        usuario = self.usuarios.get(username)
+        if usuario is None:
+            raise NaoEncontrado("Usuário não encontrado")
+        return username, usuario
+    
+    def autenticar(self, username: str, senha: str) -> Usuario:
+        """Confere as credenciais e retorna o usuário"""
+        username, usuario = self._usuario_do_login(username)
+        if not self.senhas.verificar(senha, usuario['senha']):
+            raise ErroDominio("Senha incorreta")
+        if self.senhas.precisa_atualizar(usuario['senha']):
+            self._regravar_senha(username, usuario, self.senhas.gerar(senha))
+        return usuario
+    
+    async def autenticar_async(self, username: str, senha: str) -> Usuario:
+        """Como ``autenticar``, sem bloquear o laço de eventos enquanto o hash é verificado; a leitura
+        do usuário e a regravação do hash rodam em série (``em_serie``)"""
+        with self.metricas.medir('login'):
+            username, usuario = await self.em_serie(self._usuario_do_login, username)
+            if not await self.senhas.verificar_async(senha, usuario['senha']):
+                raise ErroDominio("Senha incorreta")
+            if self.senhas.precisa_atualizar(usuario['senha']):
+                await self.em_serie(self._regravar_senha, username, usuario, await self.senhas.gerar_async(senha))
+            return usuario
+    
+    def _regravar_senha(self, username: str, usuario: Usuario, senha_hash: str) -> None:
+        """Atualiza o hash guardado (texto puro antigo ou custo desatualizado) após um login válido"""
+        if self.usuarios.get(username) is not usuario:
+            return  # recarregado por outro processo durante o cálculo: fica para o próximo login
+        usuario['senha'] = senha_hash
+        try:
+            self._persistir({'op': 'perfil', 'username': username, 'campo': 'senha', 'valor': senha_hash,
+                             'versao': self._nova_versao(usuario)})
+        except (Conflito, FalhaGravacao):
+            pass  # outra sessão alterou o perfil ou a gravação falhou: o login vale, o hash fica para o próximo
+    
+    def usuario(self, username: str) -> Usuario:
+        """Usuário pelo username"""
+        usuario = self.usuarios.get(username)
+        if usuario is None:
+            raise NaoEncontrado("Usuário não encontrado")
+        return usuario
+    
+    def nome_de(self, username: str) -> str:
+        """Nome exibível do usuário (o @username, se ele não existir mais)"""
+        usuario = self.usuarios.get(username)
+        return usuario['nome'] if usuario is not None else f'@{username}'
+    
+    def buscar(self, termo: str) -> List[Tuple[str, Usuario]]:
+        """Pares (username, usuário) mais relevantes para o termo"""
+        termo = termo.strip().lower()
+        return list(self._buscar_usuarios(termo)) if termo else []
+    
+    def editar_perfil(self, username: str, campo: str, valor: str) -> None:
+        """Altera o título ou a bio do usuário"""
+        if campo not in ('titulo', 'bio'):
+            raise ErroDominio(f"Campo não editável: {campo}")
+        valor = valor.strip()[:self.MAX_BIO_LEN] if campo == 'bio' else valor.strip()
+        if not valor:
+            raise ErroDominio("Vazio")
+        usuario = self.usuario(username)
+        usuario[campo] = valor
+        self._persistir({'op': 'perfil', 'username': username, 'campo': campo, 'valor': valor,
+                         'versao': self._nova_versao(usuario)})
+    
+    def conectar(self, origem: str, alvo: str) -> bool:
+        """Conecta dois usuários; False se já estavam conectados"""
+        if alvo not in self.usuarios or alvo == origem:
+            raise ErroDominio("Inválido")
+        if not self.grafo.conectar(origem, alvo):
+            return False
+        self._persistir({'op': 'conectar', 'origem': origem, 'alvo': alvo})
+        self.notificacoes.enviar('conectar', origem, (alvo,))
+        return True
+    
+    def publicar(self, username: str, conteudo: str) -> Post:
+        """Cria um post do usuário e o retorna"""
+        conteudo = conteudo.strip()
+        if len(conteudo) < self.MIN_POST_LEN:
+            raise ErroDominio(f"Mín {self.MIN_POST_LEN} caracteres")
+        self._preparar_busca()
+        novo_id, agora = self.repositorio.proximo_id_post(), time.time()
+        post = Post(novo_id, username, self.usuario(username), conteudo[:self.MAX_POST_LEN], data_de(agora),
+                    timestamp=agora)
+        self.posts.publicar(post)
+        self._persistir({'op': 'post', 'post': post})
+        self.notificacoes.enviar('post', username, self._audiencia_de(username), novo_id)
+        return post
+    
+    def post(self, post_id: int) -> Post:
+        """Post pelo id"""
+        post = self.repositorio.post_por_id(post_id)
+        if post is None:
+            raise NaoEncontrado("Post não encontrado")
+        return post
+    
+    def deletar_post(self, username: str, post_id: int) -> None:
+        """Apaga um post do próprio usuário"""
+        if self.post(post_id)['usuario'] != username:
+            raise NaoPermitido("Só o autor pode apagar o post")
+        self._preparar_busca()
+        self.posts.remover(post_id)
+        self.grafo.remover_post(post_id)
+        self.comentarios.remover_post(post_id)
+        self._persistir({'op': 'deletar_post', 'id': post_id, 'usuario': username})
+    
+    def alternar_curtida(self, username: str, post_id: int) -> bool:
+        """Curte ou descurte o post; True se ficou curtido"""
+        post = self.post(post_id)
+        if self.grafo.descurtir(post_id, username):
+            op = 'descurtir'
+            post['total_curtidas'] -= 1
+        else:
+            self.grafo.curtir(post_id, username)
+            op = 'curtir'
+            post['total_curtidas'] += 1
+        self._persistir({'op': op, 'id': post_id, 'usuario': username, 'versao': self._nova_versao(post)})
+        if op == 'curtir':
+            self.notificacoes.enviar('curtir', username, (post['usuario'],), post_id)
+        return op == 'curtir'
+    
+    def comentar(self, username: str, post_id: int, texto: str) -> Comentario:
+        """Adiciona um comentário ao post e o retorna"""
+        texto = texto.strip()[:self.MAX_COMENTARIO]
+        if len(texto) < 2:
+            raise ErroDominio("Muito curto")
+        post, agora = self.post(post_id), time.time()
+        comentario = Comentario(username, self.usuario(username), texto, data_de(agora), agora)
+        self._preparar_busca()
+        self.comentarios.adicionar(post_id, comentario)
+        post['total_comentarios'] += 1
+        self._persistir({'op': 'comentar', 'id': post_id, 'comentario': comentario,
+                         'versao': self._nova_versao(post)})
+        self.notificacoes.enviar('comentar', username, (post['usuario'],), post_id)
+        return comentario
+    
+    def pagina_comentarios(self, post_id: int, cursor: Optional[int] = None,
+                           limite: Optional[int] = None) -> List[Comentario]:
+        """Página de comentários do post, do mais antigo, depois do cursor (id do último comentário exibido)"""
+        self.post(post_id)
+        return self.comentarios.pagina(post_id, cursor, limite or self.PAGINA_COMENTARIOS)
+    
+    def buscar_posts(self, termo: str, autor: Optional[str] = None, desde: Optional[float] = None,
+                     ate: Optional[float] = None, limite: Optional[int] = None) -> List[Tuple[Post, float]]:
+        """Pares (post, escore) mais relevantes para o termo no conteúdo e nos comentários,
+        opcionalmente só do ``autor`` e publicados entre ``desde`` e ``ate`` (epoch)"""
+        if autor is not None:
+            self.usuario(autor)
+        encontrados = self._indice_posts().buscar(termo, limite or self.LIMITE_BUSCA, autor, desde, ate)
+        return [(post, escore) for post, escore in ((self.repositorio.post_por_id(i), e) for i, e in encontrados)
+                if post is not None]
+    
+    def notificacoes_nao_lidas(self, username: str) -> int:
+        """Quantos avisos o usuário ainda não leu"""
+        return self.notificacoes.nao_lidas(username)
+    
+    def ler_notificacoes(self, username: str, limite: Optional[int] = None) -> List[Notificacao]:
+        """Avisos mais recentes do usuário, que passam a contar como lidos (os devolvidos mantêm
+        ``lida`` como estava, para a tela destacar os novos)"""
+        return self.notificacoes.ler(username, limite or self.NOTIFICACOES_POR_USUARIO)
+    
+    def linha_feed(self, username: str, rede: bool = False):
+        """Linha do tempo do feed geral ou da rede do usuário"""
+        return self.feed_rede.linha(username) if rede else self.posts
+    
+    def pagina_feed(self, username: str, rede: bool = False, cursor: Optional[int] = None,
+                    limite: Optional[int] = None) -> List[Dict]:
+        """Página do feed com posts mais antigos que o cursor (id do último post da página anterior)"""
+        return self.linha_feed(username, rede).antes(cursor, limite or self.PAGINA_SIZE)
@@ -0,0 +1,139 @@
+"""
+RECOMENDAÇÕES E GRAUS DE SEPARAÇÃO DO LINKEDIN SPA
+Descrição: "Pessoas que talvez você conheça" (conexões de conexões ranqueadas
+por conexões em comum, com bônus opcional por título igual) e o caminho mais
+curto entre dois usuários por BFS bidirecional. Os resultados ficam em caches
+LRU invalidados só para os usuários afetados por cada evento.
+"""
+
+import heapq
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+from cache import CacheLRU
+from indices import normalizar
+
+
+class Recomendador:
+    """Sugestões de conexão e consultas de caminho sobre o grafo social"""
+
+    def __init__(self, conexoes: Callable[[str], Collection[str]], titulo: Callable[[str], str],
+                 peso_titulo: float = 0.0, limite_amostra: int = 1000,
+                 limite_visitas: int = 200_000, capacidade: int = 1024):
+        """
+        conexoes(u): vizinhos de u; titulo(u): título profissional de u.
+        peso_titulo soma ao escore de candidatos com o mesmo título (0 desliga);
+        limite_amostra limita quantos vizinhos de cada conexão são examinados e
+        limite_visitas o total de vértices visitados por uma busca de caminho.
+        """
+        self.conexoes, self.titulo = conexoes, titulo
+        self.peso_titulo, self.limite_amostra, self.limite_visitas = peso_titulo, limite_amostra, limite_visitas
+        self._sugestoes = CacheLRU(capacidade)
+        self._caminhos = CacheLRU(capacidade)
+
+    # ----- pessoas que talvez você conheça -----
+
+    def sugestoes(self, username: str, limite: int = 5) -> List[Tuple[str, int]]:
+        """Até ``limite`` pares (username, conexões em comum), do mais provável ao menos"""
+        return self._sugestoes.obter(username, lambda: self._calcular_sugestoes(username))[:limite]
+
+    def _calcular_sugestoes(self, username: str, limite: int = 20) -> List[Tuple[str, int]]:
+        diretas = set(self.conexoes(username))
+        comuns: Dict[str, int] = {}
+        for conexao in diretas:
+            for i, candidato in enumerate(self.conexoes(conexao)):
+                if i == self.limite_amostra:
+                    break
+                if candidato != username and candidato not in diretas:
+                    comuns[candidato] = comuns.get(candidato, 0) + 1
+        if not comuns:
+            return []
+        if self.peso_titulo:
+            meu_titulo = normalizar(self.titulo(username))
+            def escore(item: Tuple[str, int]) -> float:
+                return item[1] + self.peso_titulo * (normalizar(self.titulo(item[0])) == meu_titulo)
+        else:
+            def escore(item: Tuple[str, int]) -> float:
+                return item[1]
+        return heapq.nlargest(limite, comuns.items(), key=escore)
+
+    def em_comum(self, a: str, b: str) -> int:
+        """Número de conexões em comum entre dois usuários"""
+        ca, cb = self.conexoes(a), self.conexoes(b)
+        if len(ca) > len(cb):
+            ca, cb = cb, ca
+        return sum(1 for c in ca if c in cb)
+
+    # ----- graus de separação -----
+
+    def caminho(self, origem: str, destino: str, max_graus: int = 6) -> Optional[List[str]]:
+        """Caminho mais curto origem -> destino (lista de usernames), ou None"""
+        return self._caminhos.obter((origem, destino, max_graus),
+                                    lambda: self._bfs_bidirecional(origem, destino, max_graus))
+
+    def grau(self, origem: str, destino: str) -> Optional[int]:
+        """Grau de separação (1 = conexão direta), ou None se não conectados"""
+        caminho = self.caminho(origem, destino)
+        return None if caminho is None else len(caminho) - 1
+
+    def _bfs_bidirecional(self, origem: str, destino: str, max_graus: int) -> Optional[List[str]]:
+        """Expande sempre a fronteira menor até as duas buscas se encontrarem"""
+        if origem == destino:
+            return [origem]
+        pais = {origem: None}, {destino: None}
+        fronteiras = [origem], [destino]
+        visitas, graus = 0, 0
+        while fronteiras[0] and fronteiras[1] and graus < max_graus:
+            lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+            meus, outros = pais[lado], pais[1 - lado]
+            proxima, encontros = [], []
+            for atual in fronteiras[lado]:
+                for vizinho in self.conexoes(atual):
+                    if vizinho in meus:
+                        continue
+                    meus[vizinho] = atual
+                    if vizinho in outros:
+                        encontros.append(vizinho)
+                    proxima.append(vizinho)
+                visitas += 1
+                if visitas > self.limite_visitas:
+                    return None
+            if encontros:  # a camada inteira é examinada para garantir o mais curto
+                return min((self._montar_caminho(pais, e) for e in encontros), key=len)
+            fronteiras = (proxima, fronteiras[1]) if lado == 0 else (fronteiras[0], proxima)
+            graus += 1
+        return None
+
+    @staticmethod
+    def _montar_caminho(pais: Tuple[Dict, Dict], encontro: str) -> List[str]:
+        caminho, no = [], encontro
+        while no is not None:
+            caminho.append(no)
+            no = pais[0][no]
+        caminho.reverse()
+        no = pais[1][encontro]
+        while no is not None:
+            caminho.append(no)
+            no = pais[1][no]
+        return caminho
+
+    # ----- manutenção -----
+
+    def aplicar(self, evento: Dict) -> None:
+        """Invalida os resultados afetados por um evento de mutação"""
+        op = evento['op']
+        if op == 'conectar':
+            # as sugestões mudam para os dois usuários e para as conexões de cada um
+            for username in (evento['origem'], evento['alvo']):
+                self._sugestoes.invalidar(username, *self.conexoes(username))
+            self._caminhos.limpar()  # uma aresta nova pode encurtar qualquer caminho
+        elif op == 'perfil' and evento['campo'] == 'titulo' and self.peso_titulo:
+            self._sugestoes.limpar()
+
+    def limpar(self) -> None:
+        """Descarta todos os resultados em cache"""
+        self._sugestoes.limpar()
+        self._caminhos.limpar()
+
+    def estatisticas(self) -> Dict[str, Dict]:
+        """Contadores dos caches de sugestões e caminhos"""
+        return {'sugestoes': self._sugestoes.estatisticas(), 'caminhos': self._caminhos.estatisticas()}
@@ -0,0 +1,148 @@
+"""
+RECONSTRUÇÃO PARALELA DOS ÍNDICES DO LINKEDIN SPA
+Descrição: Monta os índices derivados do estado que mais custam CPU (trigramas
+da busca de usuários e BM25 da busca de posts) em vários processos. Os
+usuários são repartidos em fatias consecutivas e os posts por id módulo o
+número de fatias (cada post com os seus comentários); cada processo devolve um
+índice parcial e os parciais são mesclados, na ordem, no processo principal.
+Onde existe o início por 'fork' (Linux), os processos herdam a entrada pela
+memória: cada tarefa recebe só o número da fatia e apenas o resultado volta
+serializado. Nos outros sistemas a fatia vai como argumento. Abaixo de
+MINIMO_PARALELO itens, ou com um só processo, monta no próprio processo.
+
+O grafo, as linhas do tempo por autor e os índices secundários guardam
+referências aos registros em memória (que as operações alteram no lugar) e
+continuam montados pelo repositório ao carregar.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from busca_posts import IndicePosts
+from indices import IndiceTrigramas
+from serializacao import sem_coleta
+
+# Itens (usuários, ou posts + comentários) a partir dos quais compensa subir o pool
+MINIMO_PARALELO = 50000
+
+_ENTRADA: Dict[str, Any] = {}  # entrada da reconstrução em andamento, herdada no fork
+
+
+def processos_disponiveis() -> int:
+    """Núcleos que este processo pode usar"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _contexto() -> multiprocessing.context.BaseContext:
+    """'fork' onde existir (a entrada é herdada, não serializada); senão, o início padrão"""
+    return multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+
+# ----- tarefas (funções de módulo, para rodar em outro processo) -----
+
+def _fatia_usuarios(inicio: int, fim: int, pares: Optional[List[Tuple[str, str]]] = None) -> IndiceTrigramas:
+    """Índice parcial dos usuários nas posições [inicio, fim)"""
+    return IndiceTrigramas(_ENTRADA['pares'][inicio:fim] if pares is None else pares, primeiro=inicio)
+
+
+def _dividir_posts(posts: List[Dict], comentarios: List[Tuple[int, Dict]], fatia: int,
+                   fatias: int) -> Tuple[List[Dict], List[Tuple[int, Dict]]]:
+    """Posts com id % fatias == fatia e os seus comentários"""
+    return ([p for p in posts if p['id'] % fatias == fatia],
+            [(post_id, c) for post_id, c in comentarios if post_id % fatias == fatia])
+
+
+def _fatia_posts(fatia: int, fatias: int, entrada: Optional[Tuple[List, List]] = None) -> IndicePosts:
+    """Índice parcial de uma fatia dos posts"""
+    if entrada is None:
+        entrada = _dividir_posts(_ENTRADA['posts'], _ENTRADA['comentarios'], fatia, fatias)
+    return IndicePosts.montar(*entrada)
+
+
+# ----- planos: tarefas de cada índice e como mesclar os parciais -----
+
+Plano = Tuple[List[Tuple[Callable, tuple]], Callable[[List], Any]]
+
+
+def _plano_usuarios(pares: List[Tuple[str, str]], fatias: int, herda: bool) -> Plano:
+    limites = [len(pares) * i // fatias for i in range(fatias + 1)]
+    tarefas = [(_fatia_usuarios, (a, b) if herda else (a, b, pares[a:b])) for a, b in zip(limites, limites[1:])]
+    return tarefas, IndiceTrigramas.mesclar
+
+
+def _plano_posts(posts: List[Dict], comentarios: List[Tuple[int, Dict]], fatias: int, herda: bool) -> Plano:
+    tarefas = [(_fatia_posts, (i, fatias) if herda else (i, fatias, _dividir_posts(posts, comentarios, i, fatias)))
+               for i in range(fatias)]
+    return tarefas, IndicePosts.mesclar
+
+
+def _executar(planos: List[Plano], processos: int) -> List[Any]:
+    """Roda as tarefas de todos os planos em um único pool e devolve o resultado mesclado de cada um"""
+    contexto = _contexto()
+    tarefas = [tarefa for plano in planos for tarefa in plano[0]]
+    # Sem o coletor de ciclos enquanto os parciais (milhões de objetos novos) chegam e são mesclados;
+    # os processos, criados por fork aqui dentro, também montam as fatias sem ele
+    with sem_coleta():
+        try:
+            with ProcessPoolExecutor(min(processos, len(tarefas)), mp_context=contexto) as pool:
+                futuros = [pool.submit(funcao, *argumentos) for funcao, argumentos in tarefas]
+                parciais = [futuro.result() for futuro in futuros]
+        finally:
+            _ENTRADA.clear()
+        resultados, inicio = [], 0
+        for plano_tarefas, mesclar in planos:
+            resultados.append(mesclar(parciais[inicio:inicio + len(plano_tarefas)]))
+            inicio += len(plano_tarefas)
+    return resultados
+
+
+def _preparar(processos: Optional[int], itens: int) -> Tuple[int, bool]:
+    """(processos a usar, se a entrada é herdada); 1 processo = montar aqui mesmo"""
+    processos = processos or processos_disponiveis()
+    if processos < 2 or itens < MINIMO_PARALELO:
+        return 1, False
+    return processos, _contexto().get_start_method() == 'fork'
+
+
+# ----- montagem -----
+
+def montar_indice_usuarios(usuarios: Iterable[Tuple[str, str]], processos: Optional[int] = None) -> IndiceTrigramas:
+    """IndiceTrigramas dos pares (username, nome); ``processos`` None = um por núcleo"""
+    pares = list(usuarios)
+    processos, herda = _preparar(processos, len(pares))
+    if processos == 1:
+        return IndiceTrigramas(pares)
+    if herda:
+        _ENTRADA['pares'] = pares
+    return _executar([_plano_usuarios(pares, processos, herda)], processos)[0]
+
+
+def montar_indice_posts(posts: Iterable[Dict], comentarios: Iterable[Tuple[int, Dict]],
+                        processos: Optional[int] = None) -> IndicePosts:
+    """IndicePosts dos posts e pares (post_id, comentário); ``processos`` None = um por núcleo"""
+    posts, comentarios = list(posts), list(comentarios)
+    processos, herda = _preparar(processos, len(posts) + len(comentarios))
+    if processos == 1:
+        return IndicePosts.montar(posts, comentarios)
+    if herda:
+        _ENTRADA.update(posts=posts, comentarios=comentarios)
+    return _executar([_plano_posts(posts, comentarios, processos, herda)], processos)[0]
+
+
+def montar_indices(usuarios: Iterable[Tuple[str, str]], posts: Iterable[Dict], comentarios: Iterable[Tuple[int, Dict]],
+                   processos: Optional[int] = None) -> Tuple[IndiceTrigramas, IndicePosts]:
+    """Os dois índices, com as fatias de ambos no mesmo pool"""
+    pares, posts, comentarios = list(usuarios), list(posts), list(comentarios)
+    processos, herda = _preparar(processos, len(pares) + len(posts) + len(comentarios))
+    if processos == 1:
+        return IndiceTrigramas(pares), IndicePosts.montar(posts, comentarios)
+    if herda:
+        _ENTRADA.update(pares=pares, posts=posts, comentarios=comentarios)
+    planos = [_plano_usuarios(pares, processos, herda), _plano_posts(posts, comentarios, processos, herda)]
+    indice_usuarios, indice_posts = _executar(planos, processos)
+    return indice_usuarios, indice_posts
@@ -0,0 +1,188 @@
+"""
+REGISTROS DO LINKEDIN SPA
+Descrição: Tipos compactos (__slots__) para usuários, posts e comentários, no
+lugar de um dict por entidade. Aceitam o mesmo acesso por chave dos dicts
+(registro['campo'], get, keys, dict(registro)), então o formato dos arquivos
+JSON não muda. Usernames e títulos são internados, e o nome do autor de posts
+e comentários é lido do próprio usuário em vez de copiado. Cada data de
+exibição vem acompanhada do instante (epoch) correspondente, calculado a partir
+da data ao ler arquivos antigos. Usuários e posts têm um número de versão,
+incrementado a cada alteração, usado para detectar escritas concorrentes. Os
+comentários ficam fora do post (ver comentarios.py); o post guarda só os totais
+de curtidas e comentários.
+"""
+
+import sys
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Union
+
+_intern = sys.intern
+
+FORMATO_DATA = '%d/%m/%Y %H:%M'
+
+
+@lru_cache(maxsize=4096)
+def instante_de(data: str) -> float:
+    """Epoch de uma data no formato de exibição (hora local); as datas têm resolução de minuto e se repetem"""
+    return datetime.strptime(data, FORMATO_DATA).timestamp()
+
+
+def data_de(instante: float) -> str:
+    """Data de exibição de um instante epoch"""
+    return datetime.fromtimestamp(instante).strftime(FORMATO_DATA)
+
+
+class Registro:
+    """Base: acesso por chave sobre os campos declarados em CAMPOS"""
+
+    __slots__ = ()
+    CAMPOS: Tuple[str, ...] = ()
+
+    def __getitem__(self, campo: str) -> Any:
+        try:
+            return getattr(self, campo)
+        except AttributeError:
+            raise KeyError(campo) from None
+
+    def __setitem__(self, campo: str, valor: Any) -> None:
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo: object) -> bool:
+        return campo in self.CAMPOS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.CAMPOS)
+
+    def __len__(self) -> int:
+        return len(self.CAMPOS)
+
+    def __eq__(self, outro: object) -> bool:
+        if isinstance(outro, (Registro, dict)):
+            return self.para_json() == (outro.para_json() if isinstance(outro, Registro) else outro)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.para_json()!r})"
+
+    def get(self, campo: str, padrao: Any = None) -> Any:
+        return getattr(self, campo, padrao) if campo in self.CAMPOS else padrao
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.CAMPOS
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((campo, getattr(self, campo)) for campo in self.CAMPOS)
+
+    def para_json(self) -> Dict[str, Any]:
+        """Dict no formato dos arquivos"""
+        return {campo: getattr(self, campo) for campo in self.CAMPOS}
+
+
+def para_json(obj: Any) -> Any:
+    """``default`` do json.dump para serializar registros"""
+    if isinstance(obj, Registro):
+        return obj.para_json()
+    raise TypeError(f"Objeto não serializável: {type(obj).__name__}")
+
+
+def _nome(autor: Union[Mapping, str]) -> str:
+    return autor if isinstance(autor, str) else autor['nome']
+
+
+class Usuario(Registro):
+    """Perfil de um usuário (o username é a chave do dicionário de usuários)"""
+
+    __slots__ = ('nome', 'email', 'senha', 'titulo', 'bio', 'data_criacao', 'timestamp_criacao', 'versao')
+    CAMPOS = __slots__
+
+    def __init__(self, nome: str, email: str, senha: str, titulo: str, bio: str, data_criacao: str,
+                 timestamp_criacao: Optional[float] = None, versao: int = 0):
+        self.nome, self.email, self.senha = nome, email, senha
+        self.titulo, self.bio, self.data_criacao = _intern(titulo), bio, data_criacao
+        self.timestamp_criacao = instante_de(data_criacao) if timestamp_criacao is None else timestamp_criacao
+        self.versao = versao
+
+    def __setitem__(self, campo: str, valor: Any) -> None:
+        super().__setitem__(campo, _intern(valor) if campo == 'titulo' else valor)
+
+    @classmethod
+    def de_json(cls, dados: Mapping) -> 'Usuario':
+        """Cria a partir do dict dos arquivos (campos extras são ignorados)"""
+        return cls(dados['nome'], dados['email'], dados['senha'], dados['titulo'], dados['bio'],
+                   dados['data_criacao'], dados.get('timestamp_criacao'), dados.get('versao', 0))
+
+
+class Comentario(Registro):
+    """Comentário de um post; 'nome' vem do usuário referenciado e 'id' cresce dentro do post"""
+
+    __slots__ = ('id', 'usuario', 'texto', 'data', 'timestamp', '_autor')
+    CAMPOS = ('id', 'usuario', 'nome', 'texto', 'data', 'timestamp')
+
+    def __init__(self, usuario: str, autor: Union[Mapping, str], texto: str, data: str,
+                 timestamp: Optional[float] = None, id: int = 0):
+        """``autor`` é o registro do usuário, ou o nome quando ele não é conhecido"""
+        self.usuario, self._autor, self.texto, self.data = _intern(usuario), autor, texto, data
+        self.timestamp = instante_de(data) if timestamp is None else timestamp
+        self.id = id
+
+    @property
+    def nome(self) -> str:
+        return _nome(self._autor)
+
+    @nome.setter
+    def nome(self, valor: str) -> None:
+        self._autor = valor
+
+    @classmethod
+    def de_json(cls, dados: Mapping, usuarios: Optional[Mapping] = None) -> 'Comentario':
+        """Cria a partir do dict dos arquivos, ligando o autor em ``usuarios`` se existir"""
+        autor = usuarios.get(dados['usuario']) if usuarios is not None else None
+        return cls(dados['usuario'], dados['nome'] if autor is None else autor, dados['texto'], dados['data'],
+                   dados.get('timestamp'), dados.get('id', 0))
+
+
+class Post(Registro):
+    """Post de um usuário; 'autor_nome' vem do usuário referenciado"""
+
+    __slots__ = ('id', 'usuario', 'conteudo', 'data', 'timestamp', 'versao', 'total_curtidas',
+                 'total_comentarios', '_autor')
+    CAMPOS = ('id', 'usuario', 'autor_nome', 'conteudo', 'data', 'timestamp', 'versao', 'total_curtidas',
+              'total_comentarios')
+
+    def __init__(self, id: int, usuario: str, autor: Union[Mapping, str], conteudo: str, data: str,
+                 timestamp: Optional[float] = None, versao: int = 0, total_curtidas: int = 0,
+                 total_comentarios: int = 0):
+        """``autor`` é o registro do usuário, ou o nome quando ele não é conhecido"""
+        self.id, self.usuario, self._autor = id, _intern(usuario), autor
+        self.conteudo, self.data = conteudo, data
+        self.timestamp = instante_de(data) if timestamp is None else timestamp
+        self.versao = versao
+        self.total_curtidas, self.total_comentarios = total_curtidas, total_comentarios
+
+    @property
+    def autor_nome(self) -> str:
+        return _nome(self._autor)
+
+    @autor_nome.setter
+    def autor_nome(self, valor: str) -> None:
+        self._autor = valor
+
+    @classmethod
+    def de_json(cls, dados: Mapping, usuarios: Optional[Mapping] = None) -> 'Post':
+        """Cria a partir do dict dos arquivos (listas 'likes' e 'comentarios', se houver, são ignoradas)"""
+        if isinstance(dados, Post):
+            return dados
+        autor = usuarios.get(dados['usuario']) if usuarios is not None else None
+        return cls(dados['id'], dados['usuario'], dados['autor_nome'] if autor is None else autor,
+                   dados['conteudo'], dados['data'], dados.get('timestamp'), dados.get('versao', 0),
+                   dados.get('total_curtidas', 0), dados.get('total_comentarios', 0))
+
+
+def usuarios_de_json(usuarios: Mapping[str, Mapping]) -> Dict[str, Usuario]:
+    """Converte o conteúdo de dados_usuarios.json, internando os usernames"""
+    return {_intern(u): d if isinstance(d, Usuario) else Usuario.de_json(d) for u, d in usuarios.items()}
@@ -0,0 +1,1040 @@
+"""
+CAMADA DE REPOSITÓRIO DO LINKEDIN SPA
+Descrição: Abstrai a persistência do sistema. RepositorioJSON mantém os arquivos
+dados_*.json (reescrita completa ou diário de escrita); RepositorioSegmentado
+carrega os usuários de imediato e os posts por segmentos sob demanda;
+RepositorioSQLite guarda usuários, conexões, posts, curtidas e comentários em
+tabelas indexadas e carrega os registros sob demanda. Em todos os modos os
+comentários ficam à parte dos posts, paginados por cursor (ver comentarios.py),
+e cada post guarda os totais de curtidas e comentários. Vários processos podem
+usar a mesma pasta: no modo completo as escritas são serializadas por uma trava
+de arquivo e mescladas sobre o que outro processo gravou, com verificação de
+versão (compare-and-swap) nas edições de perfil; diário e segmentado reservam a
+pasta para um único processo; o SQLite serializa as transações sozinho.
+"""
+
+import os
+import sqlite3
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional, Iterator
+
+from comentarios import Comentarios
+from diario import Diario, aplicar_evento
+from grafo import GrafoSocial
+from indices import IndicesSecundarios, IndiceTemporal
+from linha_do_tempo import LinhaDoTempo
+from registros import Comentario, Post, Usuario, instante_de, usuarios_de_json
+from segmentos import ComentariosSegmentados, LinhaDoAutor, LinhaSegmentada
+from serializacao import CODECS, gravar, ler
+from travas import TravaArquivo
+
+
+class ConflitoVersao(RuntimeError):
+    """O registro foi alterado por outro processo desde que foi lido"""
+
+
+class Repositorio:
+    """Interface de persistência usada pelo LinkedInSPA.
+
+    Toda mutação chega como um evento (ver ``diario.aplicar_evento``) depois de
+    já ter sido aplicada às estruturas em memória devolvidas por ``carregar``.
+    Conexões, seguidores e curtidas vivem no grafo social (ver ``grafo.GrafoSocial``);
+    Os posts são expostos como linhas do tempo (publicar, remover, obter e
+    paginação antes/depois de um cursor), ver ``linha_do_tempo.LinhaDoTempo``,
+    e os comentários como ``comentarios.Comentarios`` (páginas por post).
+    """
+
+    def existe(self) -> bool:
+        """Indica se já há dados persistidos"""
+        raise NotImplementedError
+
+    def carregar(self) -> Tuple[Dict, GrafoSocial, LinhaDoTempo, Comentarios]:
+        """Retorna (usuarios, grafo, posts, comentarios)"""
+        raise NotImplementedError
+
+    def salvar(self, usuarios: Dict, grafo: GrafoSocial, posts: LinhaDoTempo, comentarios: Comentarios) -> None:
+        """Grava o estado completo"""
+        raise NotImplementedError
+
+    def registrar(self, evento: Dict) -> None:
+        """Persiste uma única mutação"""
+        raise NotImplementedError
+
+    def registrar_lote(self, eventos: List[Dict]) -> None:
+        """Persiste várias mutações de uma vez; a gravação pode ficar para ``concluir_lote``"""
+        for evento in eventos:
+            self.registrar(evento)
+
+    def mesclou(self) -> bool:
+        """Se uma gravação encontrou dados de outro processo, que a memória ainda não tem
+        (sem consultar o disco: vale o que as gravações já verificaram)"""
+        return False
+
+    def concluir_lote(self) -> None:
+        """Grava o que ``registrar_lote`` deixou pendente"""
+
+    def email_em_uso(self, email: str) -> bool:
+        """Verifica se o email já pertence a algum usuário"""
+        raise NotImplementedError
+
+    def post_por_id(self, post_id: int) -> Optional[Dict]:
+        """Post pelo id, ou None"""
+        raise NotImplementedError
+
+    def posts_do_autor(self, username: str) -> LinhaDoTempo:
+        """Linha do tempo dos posts de um autor"""
+        raise NotImplementedError
+
+    def proximo_id_post(self) -> int:
+        """Próximo id livre para um post"""
+        raise NotImplementedError
+
+    def posts_entre(self, inicio: Optional[float] = None, fim: Optional[float] = None) -> List[Dict]:
+        """Posts com inicio <= timestamp <= fim (epoch), do mais antigo ao mais recente"""
+        raise NotImplementedError
+
+    def comentarios_entre(self, inicio: Optional[float] = None,
+                          fim: Optional[float] = None) -> List[Tuple[int, Dict]]:
+        """Pares (post_id, comentário) com inicio <= timestamp <= fim, do mais antigo ao mais recente"""
+        raise NotImplementedError
+
+    def percorrer_usuarios(self) -> Iterator[Tuple[str, Dict]]:
+        """Pares (username, usuário) na ordem de cadastro"""
+        return iter(self.usuarios.items())
+
+    def percorrer_posts(self, tamanho_pagina: int = 500) -> Iterator[Dict]:
+        """Todos os posts, do mais antigo ao mais recente, paginando pela linha do tempo (sem os comentários)"""
+        cursor = 0
+        while True:
+            pagina = self.posts.depois(cursor, tamanho_pagina)
+            if not pagina:
+                return
+            yield from reversed(pagina)
+            cursor = pagina[0]['id']
+
+    def desatualizado(self) -> bool:
+        """Indica se outro processo gravou dados que ainda não foram carregados"""
+        return False
+
+    def fechar(self) -> None:
+        """Libera recursos (arquivos, conexões)"""
+
+
+class RepositorioJSON(Repositorio):
+    """Arquivos dados_*.json, com reescrita completa ou diário de escrita.
+
+    Sem diário, cada mutação é gravada sob a trava dados.lock: se os arquivos
+    não mudaram desde a última leitura o estado em memória é reescrito; senão o
+    evento é mesclado sobre o conteúdo atual do disco. Com diário a pasta fica
+    reservada a este processo até ``fechar``.
+    """
+
+    ARQUIVO_TRAVA = 'dados.lock'
+
+    def __init__(self, arquivo_usuarios: Path, arquivo_conexoes: Path, arquivo_posts: Path,
+                 arquivo_diario: Optional[Path] = None, encoding: str = 'utf-8',
+                 arquivo_comentarios: Optional[Path] = None, codec: str = 'json'):
+        """Com ``arquivo_diario`` as mutações são anexadas ao diário em vez de reescrever tudo;
+        ``arquivo_comentarios`` padrão: dados_comentarios.json ao lado dos posts; ``codec`` é o
+        da gravação (ver serializacao.py), a leitura aceita qualquer um"""
+        if codec not in CODECS:
+            raise ValueError(f"Codec desconhecido: {codec} (use {', '.join(CODECS)})")
+        self.arquivo_usuarios, self.arquivo_conexoes = arquivo_usuarios, arquivo_conexoes
+        self.arquivo_posts, self.encoding, self.codec = arquivo_posts, encoding, codec
+        self.arquivo_comentarios = arquivo_comentarios or Path(arquivo_posts).parent / 'dados_comentarios.json'
+        self.usuarios, self.grafo, self.posts, self.comentarios = {}, GrafoSocial(), LinhaDoTempo(), Comentarios()
+        self.indices = IndicesSecundarios()
+        self.limite_diario = 1000
+        self._trava = TravaArquivo(Path(arquivo_usuarios).parent / self.ARQUIVO_TRAVA)
+        self._lido: Optional[Tuple] = None  # assinatura dos arquivos na última leitura/escrita
+        self._mesclado = False  # o disco tem eventos de outros processos que a memória não tem
+        self._comentarios_sujos = False  # comentários ainda dentro dos posts no disco (formato antigo)
+        self._lote_pendente = False
+        self._diario = None
+        if arquivo_diario:
+            self._reservar()
+            self._diario = Diario(arquivo_diario, {'usuarios': arquivo_usuarios,
+                                                   'conexoes': arquivo_conexoes,
+                                                   'posts': arquivo_posts,
+                                                   'comentarios': self.arquivo_comentarios}, encoding, codec)
+
+    def _reservar(self) -> None:
+        """Trava a pasta de dados até ``fechar``; levanta TravaOcupada se outro processo a estiver usando"""
+        self._trava.adquirir(bloquear=False)
+
+    def _assinatura(self) -> Tuple:
+        """(inode, mtime, tamanho) dos arquivos; muda a cada escrita atômica"""
+        assinatura = []
+        for arquivo in (self.arquivo_usuarios, self.arquivo_conexoes, self.arquivo_posts, self.arquivo_comentarios):
+            try:
+                st = os.stat(arquivo)
+                assinatura.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                assinatura.append(None)
+        return tuple(assinatura)
+
+    def existe(self) -> bool:
+        """Indica se já há dados persistidos"""
+        return self.arquivo_usuarios.exists()
+
+    def desatualizado(self) -> bool:
+        """No modo completo, se outro processo gravou desde a última leitura"""
+        if self._diario:
+            return False
+        return self._mesclado or self._assinatura() != self._lido
+
+    def mesclou(self) -> bool:
+        return self._mesclado
+
+    def carregar(self) -> Tuple[Dict, GrafoSocial, LinhaDoTempo, Comentarios]:
+        """Lê o snapshot, monta o grafo e reaplica o diário, se houver"""
+        with self._trava:
+            self._carregar()
+            self._lido, self._mesclado = self._assinatura(), False
+        return self.usuarios, self.grafo, self.posts, self.comentarios
+
+    def _carregar(self) -> None:
+        self.usuarios = self._ler_json(self.arquivo_usuarios)
+        posts = self._ler_json(self.arquivo_posts)
+        comentarios = self._ler_comentarios(posts)
+        self.grafo = GrafoSocial.de_json(self.usuarios, self._ler_json(self.arquivo_conexoes), posts)
+        self.posts = LinhaDoTempo(posts)
+        if self._diario:
+            for evento in self._diario.eventos():
+                aplicar_evento(self.usuarios, self.grafo, self.posts, comentarios, evento)
+        self.usuarios = usuarios_de_json(self.usuarios)
+        self.posts = LinhaDoTempo(Post.de_json(p, self.usuarios) for p in self.posts)
+        self.comentarios = Comentarios.de_json(comentarios.para_json(), self.usuarios)
+        for post in self.posts:  # arquivos antigos não têm os totais
+            post['total_curtidas'] = self.grafo.total_curtidas(post['id'])
+            post['total_comentarios'] = self.comentarios.total(post['id'])
+        self.indices = IndicesSecundarios(self.usuarios, self.posts, self.comentarios)
+
+    def _ler_comentarios(self, posts: List[Dict]) -> Comentarios:
+        """Comentários do arquivo próprio, mais os que ainda estiverem dentro dos posts (formato antigo)"""
+        try:
+            comentarios = Comentarios.de_json(self._ler_json(self.arquivo_comentarios))
+        except FileNotFoundError:
+            comentarios = Comentarios()
+        self._comentarios_sujos = comentarios.separar(posts)
+        return comentarios
+
+    def _ler_json(self, arquivo: Path) -> Any:
+        """Lê um arquivo de dados, qualquer que seja o codec com que foi gravado"""
+        return ler(arquivo, self.encoding)
+
+    def salvar(self, usuarios: Dict, grafo: GrafoSocial, posts: LinhaDoTempo, comentarios: Comentarios) -> None:
+        """Reescreve os arquivos (e zera o diário)"""
+        self._salvar(usuarios, grafo, posts, comentarios, True)
+
+    def _salvar(self, usuarios: Dict, grafo: GrafoSocial, posts: LinhaDoTempo, comentarios: Comentarios,
+                com_comentarios: bool) -> None:
+        """Sem ``com_comentarios``, dados_comentarios.json não é regravado (nenhum comentário mudou)"""
+        if usuarios is not self.usuarios or posts is not self.posts or comentarios is not self.comentarios:
+            self.indices = IndicesSecundarios(usuarios, posts, comentarios)
+        self.usuarios, self.grafo, self.posts, self.comentarios = usuarios, grafo, posts, comentarios
+        com_comentarios = com_comentarios or self._comentarios_sujos
+        with self._trava:
+            if self._diario:
+                self._diario.aguardar_compactacao()
+            self._gravar(grafo.usuarios_json(usuarios), grafo.conexoes_json(), [grafo.post_json(p) for p in posts],
+                         comentarios.para_json() if com_comentarios else None)
+            self._comentarios_sujos = False
+            if self._diario:
+                self._diario.snapshot_escrito()
+
+    def _gravar(self, usuarios: Dict, conexoes: Dict, posts: List[Dict], comentarios: Optional[Dict] = None) -> None:
+        """Reescreve os arquivos (com a trava adquirida); o de comentários só se ``comentarios`` vier"""
+        self._escrever_json(self.arquivo_usuarios, usuarios)
+        self._escrever_json(self.arquivo_conexoes, conexoes)
+        self._escrever_json(self.arquivo_posts, posts)
+        if comentarios is not None:
+            self._escrever_json(self.arquivo_comentarios, comentarios)
+        self._lido = self._assinatura()
+
+    def _escrever_json(self, arquivo: Path, dados: Any) -> None:
+        """Escreve os dados no codec configurado (temporário + rename)"""
+        gravar(arquivo, dados, self.codec, self.encoding)
+
+    def registrar(self, evento: Dict) -> None:
+        """Anexa o evento ao diário ou grava os arquivos"""
+        if not self._diario:
+            with self._trava:
+                if self._assinatura() == self._lido and not self._mesclado:
+                    self.indices.aplicar(evento)
+                    self._salvar(self.usuarios, self.grafo, self.posts, self.comentarios,
+                                 evento['op'] in ('comentar', 'deletar_post'))
+                else:
+                    self._mesclar(evento)
+            return
+        self.indices.aplicar(evento)
+        self._diario.anexar(evento)
+        if self._diario.registros_ativos >= self.limite_diario:
+            self._diario.compactar()
+
+    def registrar_lote(self, eventos: List[Dict]) -> None:
+        """Diário: anexa o lote com um só fsync; completo: a reescrita fica para ``concluir_lote``"""
+        for evento in eventos:
+            self.indices.aplicar(evento)
+        if not self._diario:
+            self._lote_pendente = True
+            return
+        for evento in eventos:
+            self._diario.anexar(evento, aguardar=False)
+        self._diario.sincronizar()
+        if self._diario.registros_ativos >= self.limite_diario:
+            self._diario.compactar()
+
+    def concluir_lote(self) -> None:
+        """Reescreve os arquivos uma vez para todos os lotes (modo completo)"""
+        if not self._lote_pendente:
+            return
+        self._lote_pendente = False
+        with self._trava:
+            if self._assinatura() != self._lido or self._mesclado:
+                raise ConflitoVersao("Arquivos alterados por outro processo durante a gravação do lote")
+            self.salvar(self.usuarios, self.grafo, self.posts, self.comentarios)
+
+    def _mesclar(self, evento: Dict) -> None:
+        """Aplica o evento sobre os arquivos gravados por outro processo.
+
+        Edições de perfil exigem que o usuário no disco ainda esteja na versão em
+        que o evento se baseou; um post com id já usado recebe o próximo id livre e
+        um comentário, o id seguinte ao último do post no disco.
+        O estado em memória fica desatualizado até ser recarregado.
+        """
+        usuarios, posts = self._ler_json(self.arquivo_usuarios), self._ler_json(self.arquivo_posts)
+        comentarios = self._ler_comentarios(posts)
+        grafo = GrafoSocial.de_json(usuarios, self._ler_json(self.arquivo_conexoes), posts)
+        linha = LinhaDoTempo(posts)
+        op = evento['op']
+        if op == 'registrar' and evento['username'] in usuarios:
+            raise ConflitoVersao(f"Usuário {evento['username']} já registrado")
+        if op == 'perfil' and usuarios[evento['username']].get('versao', 0) != evento.get('versao', 0):
+            raise ConflitoVersao(f"Perfil de {evento['username']} alterado")
+        if op == 'post' and linha.obter(evento['post']['id']) is not None:
+            evento['post']['id'] = max(p['id'] for p in linha) + 1
+        if op == 'comentar':
+            evento['comentario']['id'] = comentarios.total(evento['id']) + 1
+        aplicar_evento(usuarios, grafo, linha, comentarios, evento)
+        self._gravar(grafo.usuarios_json(usuarios), grafo.conexoes_json(), [grafo.post_json(p) for p in linha],
+                     comentarios.para_json() if self._comentarios_sujos or op in ('comentar', 'deletar_post')
+                     else None)
+        self._comentarios_sujos = False
+        self._mesclado = True
+
+    def email_em_uso(self, email: str) -> bool:
+        """Verifica se o email já pertence a algum usuário"""
+        return email in self.indices.username_por_email
+
+    def post_por_id(self, post_id: int) -> Optional[Dict]:
+        """Post pelo id, ou None"""
+        return self.indices.post_por_id.get(post_id)
+
+    def posts_do_autor(self, username: str) -> LinhaDoTempo:
+        """Linha do tempo dos posts de um autor"""
+        return self.indices.posts_do_autor(username)
+
+    def proximo_id_post(self) -> int:
+        """Próximo id livre para um post"""
+        return self.indices.maior_id_post + 1
+
+    def posts_entre(self, inicio: Optional[float] = None, fim: Optional[float] = None) -> List[Dict]:
+        """Posts no intervalo, por bisect no índice temporal"""
+        return self.indices.posts_por_tempo.entre(inicio, fim)
+
+    def comentarios_entre(self, inicio: Optional[float] = None,
+                          fim: Optional[float] = None) -> List[Tuple[int, Dict]]:
+        """Comentários no intervalo, por bisect no índice temporal (sem os de posts apagados)"""
+        return [(post_id, c) for post_id, c in self.indices.comentarios_por_tempo.entre(inicio, fim)
+                if post_id in self.indices.post_por_id]
+
+    def fechar(self) -> None:
+        """Descarrega o diário, aguarda a compactação em andamento e libera a pasta"""
+        if self._diario:
+            self._diario.fechar()
+        if self._trava.adquirida:
+            self._trava.liberar()
+
+
+class RepositorioSegmentado(RepositorioJSON):
+    """Usuários e conexões nos dados_*.json; posts em segmentos lidos sob demanda.
+
+    Cada mutação regrava só o que mudou: os arquivos de usuários/conexões, o
+    segmento do post alterado (mais o manifesto) ou o segmento de comentários
+    dele. As curtidas de um post entram no grafo quando o segmento dele é lido.
+    Como os segmentos ficam em memória, a pasta fica reservada a este processo
+    até ``fechar``.
+    """
+
+    def __init__(self, arquivo_usuarios: Path, arquivo_conexoes: Path, arquivo_posts: Path,
+                 pasta_posts: Path, encoding: str = 'utf-8', codec: str = 'json'):
+        """``arquivo_posts`` só é lido para migrar para ``pasta_posts`` na primeira carga"""
+        super().__init__(arquivo_usuarios, arquivo_conexoes, arquivo_posts, None, encoding, codec=codec)
+        self._reservar()
+        self.pasta_posts = Path(pasta_posts)
+        # Segmentos não são feitos para leitura humana: o 'json' de um registro por linha sai compacto neles
+        self.codec_segmentos = 'json_compacto' if codec == 'json' else codec
+        self.posts = LinhaSegmentada(self.pasta_posts, encoding, codec=self.codec_segmentos)
+        self.comentarios = ComentariosSegmentados(self.pasta_posts, self.posts.tamanho_segmento, encoding,
+                                                  codec=self.codec_segmentos)
+        self._tempo: Optional[Tuple[IndiceTemporal, IndiceTemporal]] = None
+        self._usuarios_pendentes = False
+
+    def desatualizado(self) -> bool:
+        return False
+
+    def carregar(self) -> Tuple[Dict, GrafoSocial, LinhaSegmentada, ComentariosSegmentados]:
+        """Lê usuários e conexões; posts e comentários ficam para o primeiro acesso"""
+        usuarios = self._ler_json(self.arquivo_usuarios)
+        self.grafo = GrafoSocial.de_json(usuarios, self._ler_json(self.arquivo_conexoes), ())
+        self.usuarios = usuarios_de_json(usuarios)
+        self.posts = LinhaSegmentada(self.pasta_posts, self.encoding, self._preparar_posts, self.codec_segmentos)
+        self.comentarios = ComentariosSegmentados(self.pasta_posts, self.posts.tamanho_segmento, self.encoding,
+                                                  lambda c: Comentario.de_json(c, self.usuarios), self.codec_segmentos)
+        if not self.posts.arquivo_manifesto.exists() and self.arquivo_posts.exists():
+            posts = self._ler_json(self.arquivo_posts)
+            comentarios = self._ler_comentarios(posts)
+            self.comentarios.importar((post_id, Comentario.de_json(c, self.usuarios))
+                                      for post_id, c in comentarios.itens())
+            self.posts.importar(self._preparar_posts(posts), self.grafo.post_json)
+        self.indices = IndicesSecundarios(self.usuarios)
+        self._tempo = None
+        return self.usuarios, self.grafo, self.posts, self.comentarios
+
+    def _preparar_posts(self, posts: List[Dict]) -> List[Post]:
+        """Posts lidos de um segmento: curtidas para o grafo, comentários de segmentos antigos para
+        os arquivos de comentários, dicts para registros"""
+        for post in posts:
+            post.setdefault('total_curtidas', len(post.get('likes', ())))
+        self.grafo.carregar_curtidas(posts)
+        antigos = [p for p in posts if 'comentarios' in p]
+        if antigos and self.posts.arquivo_manifesto.exists():
+            for post in antigos:
+                self.posts.marcar_sujo(post['id'])
+                if self.comentarios.total(post['id']):  # já migrados antes de uma interrupção
+                    del post['comentarios']
+                    post['total_comentarios'] = self.comentarios.total(post['id'])
+            self.comentarios.separar(antigos, self.usuarios)
+        return [Post.de_json(p, self.usuarios) for p in posts]
+
+    def salvar(self, usuarios: Dict, grafo: GrafoSocial, posts: LinhaDoTempo, comentarios: Comentarios) -> None:
+        """Reescreve usuários e conexões e importa posts e comentários para os segmentos"""
+        if usuarios is not self.usuarios:
+            self.indices = IndicesSecundarios(usuarios)
+        self.usuarios, self.grafo = usuarios, grafo
+        self._salvar_usuarios()
+        if comentarios is self.comentarios:
+            self.comentarios.gravar()
+        else:
+            self.comentarios.importar(comentarios.itens())
+        if posts is self.posts:
+            self.posts.gravar(grafo.post_json)
+        else:
+            self.posts.importar(reversed(list(posts)), grafo.post_json)
+        if posts is not self.posts or comentarios is not self.comentarios:
+            self._tempo = None
+
+    def _salvar_usuarios(self) -> None:
+        self._escrever_json(self.arquivo_usuarios, self.grafo.usuarios_json(self.usuarios))
+        self._escrever_json(self.arquivo_conexoes, self.grafo.conexoes_json())
+
+    def registrar(self, evento: Dict) -> None:
+        """Regrava os arquivos de usuários ou só o segmento do post afetado"""
+        op = evento['op']
+        if op == 'registrar':
+            self.indices.adicionar_usuario(evento['username'], evento['usuario'])
+        if op in ('registrar', 'perfil', 'conectar'):
+            self._salvar_usuarios()
+            return
+        self.posts.marcar_sujo(evento['post']['id'] if op == 'post' else evento['id'])
+        self.comentarios.gravar()  # antes dos posts: um segmento antigo só perde os comentários depois de migrá-los
+        self.posts.gravar(self.grafo.post_json)
+        if self._tempo is not None and op == 'post':
+            self._tempo[0].adicionar(evento['post']['timestamp'], evento['post'])
+        elif self._tempo is not None and op == 'comentar':
+            self._tempo[1].adicionar(evento['comentario']['timestamp'], (evento['id'], evento['comentario']))
+
+    def registrar_lote(self, eventos: List[Dict]) -> None:
+        """Marca o que mudou; usuários e segmentos são regravados uma vez em ``concluir_lote``"""
+        for evento in eventos:
+            op = evento['op']
+            if op == 'registrar':
+                self.indices.adicionar_usuario(evento['username'], evento['usuario'])
+            if op in ('registrar', 'perfil', 'conectar'):
+                self._usuarios_pendentes = True
+            else:
+                self.posts.marcar_sujo(evento['post']['id'] if op == 'post' else evento['id'])
+        self._tempo = None
+
+    def concluir_lote(self) -> None:
+        """Regrava usuários/conexões (se mudaram) e os segmentos alterados"""
+        if self._usuarios_pendentes:
+            self._usuarios_pendentes = False
+            self._salvar_usuarios()
+        self.comentarios.gravar()
+        self.posts.gravar(self.grafo.post_json)
+
+    def post_por_id(self, post_id: int) -> Optional[Dict]:
+        """Post pelo id (lê só o segmento dele), ou None"""
+        return self.posts.obter(post_id)
+
+    def posts_do_autor(self, username: str) -> LinhaDoAutor:
+        """Linha do tempo de um autor pelos ids do manifesto"""
+        return self.posts.do_autor(username)
+
+    def proximo_id_post(self) -> int:
+        """Próximo id livre para um post"""
+        return self.posts.maior_id + 1
+
+    def _indices_temporais(self) -> Tuple[IndiceTemporal, IndiceTemporal]:
+        """Índices de posts e comentários, montados na primeira consulta (lê todos os segmentos).
+
+        Posts apagados não são retirados; as consultas os descartam.
+        """
+        if self._tempo is None:
+            posts = list(self.posts)[::-1]  # do mais antigo, para empates seguirem o id
+            self._tempo = (IndiceTemporal((p['timestamp'], p) for p in posts),
+                           IndiceTemporal((c['timestamp'], (post_id, c)) for post_id, c in self.comentarios.itens()))
+        return self._tempo
+
+    def posts_entre(self, inicio: Optional[float] = None, fim: Optional[float] = None) -> List[Dict]:
+        """Posts no intervalo, por bisect no índice temporal"""
+        return [p for p in self._indices_temporais()[0].entre(inicio, fim) if self.posts.obter(p['id']) is p]
+
+    def comentarios_entre(self, inicio: Optional[float] = None,
+                          fim: Optional[float] = None) -> List[Tuple[int, Dict]]:
+        """Comentários no intervalo, por bisect no índice temporal"""
+        return [(post_id, c) for post_id, c in self._indices_temporais()[1].entre(inicio, fim)
+                if self.posts.obter(post_id) is not None]
+
+
+# ----- SQLite -----
+
+ESQUEMA_SQLITE = '''
+CREATE TABLE IF NOT EXISTS usuarios (
+    username TEXT PRIMARY KEY, nome TEXT NOT NULL, email TEXT NOT NULL UNIQUE, senha TEXT NOT NULL,
+    titulo TEXT, bio TEXT, data_criacao TEXT, timestamp_criacao REAL, versao INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS conexoes (
+    usuario TEXT NOT NULL REFERENCES usuarios(username), conexao TEXT NOT NULL REFERENCES usuarios(username),
+    UNIQUE (usuario, conexao)
+);
+CREATE TABLE IF NOT EXISTS seguidores (
+    seguidor TEXT NOT NULL REFERENCES usuarios(username), seguido TEXT NOT NULL REFERENCES usuarios(username),
+    UNIQUE (seguidor, seguido)
+);
+CREATE INDEX IF NOT EXISTS idx_seguidores_seguido ON seguidores (seguido);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY, usuario TEXT NOT NULL REFERENCES usuarios(username), autor_nome TEXT,
+    conteudo TEXT NOT NULL, data TEXT, timestamp REAL, versao INTEGER NOT NULL DEFAULT 0,
+    total_curtidas INTEGER NOT NULL DEFAULT 0, total_comentarios INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_posts_usuario ON posts (usuario, id);
+CREATE TABLE IF NOT EXISTS curtidas (
+    post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE, usuario TEXT NOT NULL,
+    UNIQUE (post_id, usuario)
+);
+CREATE TABLE IF NOT EXISTS comentarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+    usuario TEXT NOT NULL, nome TEXT, texto TEXT NOT NULL, data TEXT, timestamp REAL
+);
+CREATE INDEX IF NOT EXISTS idx_comentarios_post ON comentarios (post_id, id);
+'''
+
+# (tabela, coluna epoch, coluna da data de exibição): colunas acrescentadas a bancos antigos
+COLUNAS_INSTANTE = (('usuarios', 'timestamp_criacao', 'data_criacao'), ('posts', 'timestamp', 'data'),
+                    ('comentarios', 'timestamp', 'data'))
+
+# (tabela, coluna): contadores de versão acrescentados a bancos antigos
+COLUNAS_VERSAO = (('usuarios', 'versao'), ('posts', 'versao'))
+
+# (coluna de posts, tabela contada): totais acrescentados a bancos antigos
+COLUNAS_TOTAL = (('total_curtidas', 'curtidas'), ('total_comentarios', 'comentarios'))
+
+INDICES_INSTANTE = '''
+CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts (timestamp);
+CREATE INDEX IF NOT EXISTS idx_comentarios_timestamp ON comentarios (timestamp);
+'''
+
+CAMPOS_USUARIO = ('nome', 'email', 'senha', 'titulo', 'bio', 'data_criacao', 'timestamp_criacao', 'versao')
+CAMPOS_POST = ('id', 'usuario', 'autor_nome', 'conteudo', 'data', 'timestamp', 'versao', 'total_curtidas',
+               'total_comentarios')
+CAMPOS_COMENTARIO = ('usuario', 'nome', 'texto', 'data', 'timestamp')  # o id é atribuído pelo banco
+CONTADORES = ('versao', 'total_curtidas', 'total_comentarios')
+
+
+def _marcadores(n: int) -> str:
+    return ', '.join('?' * n)
+
+
+def _valores(registro: Dict, campos: Tuple[str, ...]) -> Tuple:
+    """Valores das colunas, com versão e totais 0 para registros de antes desses contadores"""
+    return tuple(registro.get(c, 0) if c in CONTADORES else registro[c] for c in campos)
+
+
+class _UsuariosSQLite(MutableMapping):
+    """Visão dict de usuários carregados sob demanda (e mantidos em cache)"""
+
+    def __init__(self, repo: 'RepositorioSQLite'):
+        self._repo, self._cache = repo, {}
+
+    def __getitem__(self, username: str) -> Dict:
+        if username not in self._cache:
+            usuario = self._repo._ler_usuario(username)
+            if usuario is None:
+                raise KeyError(username)
+            self._cache[username] = usuario
+        return self._cache[username]
+
+    def __contains__(self, username: object) -> bool:
+        return username in self._cache or self._repo._existe('usuarios', 'username', username)
+
+    def __setitem__(self, username: str, usuario: Dict) -> None:
+        self._cache[username] = usuario  # gravado pelo evento 'registrar'
+
+    def __delitem__(self, username: str) -> None:
+        del self._cache[username]
+
+    def __iter__(self) -> Iterator[str]:
+        for (username,) in self._repo._con.execute('SELECT username FROM usuarios ORDER BY rowid'):
+            yield username
+
+    def __len__(self) -> int:
+        return self._repo._con.execute('SELECT COUNT(*) FROM usuarios').fetchone()[0]
+
+
+class _GrafoSQLite:
+    """Mesma interface de GrafoSocial respondida por consultas indexadas.
+
+    As mutações só informam se algo mudaria; a gravação é feita pelo evento.
+    """
+
+    def __init__(self, repo: 'RepositorioSQLite'):
+        self._repo = repo
+
+    def adicionar_usuario(self, username: str) -> None:
+        pass  # gravado pelo evento 'registrar'
+
+    def conectar(self, origem: str, alvo: str) -> bool:
+        return not self.conectados(origem, alvo)
+
+    def conectados(self, a: str, b: str) -> bool:
+        return self._repo._con.execute('SELECT 1 FROM conexoes WHERE usuario = ? AND conexao = ?',
+                                       (a, b)).fetchone() is not None
+
+    def conexoes(self, username: str) -> List[str]:
+        return self._repo._lista('SELECT conexao FROM conexoes WHERE usuario = ? ORDER BY rowid', username)
+
+    def seguidores(self, username: str) -> List[str]:
+        return self._repo._lista('SELECT seguidor FROM seguidores WHERE seguido = ? ORDER BY rowid', username)
+
+    def seguindo(self, username: str) -> List[str]:
+        return self._repo._lista('SELECT seguido FROM seguidores WHERE seguidor = ? ORDER BY rowid', username)
+
+    def curtir(self, post_id: int, username: str) -> bool:
+        return not self.curtiu(post_id, username)
+
+    def descurtir(self, post_id: int, username: str) -> bool:
+        return self.curtiu(post_id, username)
+
+    def curtiu(self, post_id: int, username: str) -> bool:
+        return self._repo._con.execute('SELECT 1 FROM curtidas WHERE post_id = ? AND usuario = ?',
+                                       (post_id, username)).fetchone() is not None
+
+    def curtidas(self, post_id: int) -> List[str]:
+        return self._repo._lista('SELECT usuario FROM curtidas WHERE post_id = ? ORDER BY rowid', post_id)
+
+    def total_curtidas(self, post_id: int) -> int:
+        return self._repo._con.execute('SELECT COUNT(*) FROM curtidas WHERE post_id = ?', (post_id,)).fetchone()[0]
+
+    def remover_post(self, post_id: int) -> None:
+        pass  # curtidas apagadas em cascata pelo evento 'deletar_post'
+
+
+class _PostsSQLite:
+    """Linha do tempo de posts (opcionalmente de um só autor) lida sob demanda"""
+
+    def __init__(self, repo: 'RepositorioSQLite', autor: Optional[str] = None):
+        self._repo, self._autor = repo, autor
+        self._cache = repo.posts._cache if autor is not None else {}
+        self._filtro = ' AND usuario = ?' if autor is not None else ''
+        self._params = (autor,) if autor is not None else ()
+
+    def _post(self, post_id: int) -> Dict:
+        if post_id not in self._cache:
+            self._cache[post_id] = self._repo._ler_post(post_id)
+        return self._cache[post_id]
+
+    def _ids(self, sql: str, *params: Any) -> List[Dict]:
+        return [self._post(i) for i in self._repo._lista(sql, *params)]
+
+    def __len__(self) -> int:
+        return self._repo._con.execute(f'SELECT COUNT(*) FROM posts WHERE 1{self._filtro}',
+                                       self._params).fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return self._repo._con.execute(f'SELECT 1 FROM posts WHERE 1{self._filtro} LIMIT 1',
+                                       self._params).fetchone() is not None
+
+    def __iter__(self) -> Iterator[Dict]:
+        cursor = None
+        while True:
+            pagina = self.antes(cursor, 500)
+            if not pagina:
+                return
+            yield from pagina
+            cursor = pagina[-1]['id']
+
+    def publicar(self, post: Dict) -> None:
+        self._cache[post['id']] = post  # gravado pelo evento 'post'
+
+    def obter(self, post_id: int) -> Optional[Dict]:
+        if post_id in self._cache or self._repo._existe('posts', 'id', post_id):
+            return self._post(post_id)
+        return None
+
+    def remover(self, post_id: int) -> Optional[Dict]:
+        post = self.obter(post_id)
+        self._cache.pop(post_id, None)  # apagado pelo evento 'deletar_post'
+        return post
+
+    def antes(self, cursor: Optional[int] = None, limite: int = 5) -> List[Dict]:
+        if cursor is None:
+            return self._ids(f'SELECT id FROM posts WHERE 1{self._filtro} ORDER BY id DESC LIMIT ?',
+                             *self._params, limite)
+        return self._ids(f'SELECT id FROM posts WHERE id < ?{self._filtro} ORDER BY id DESC LIMIT ?',
+                         cursor, *self._params, limite)
+
+    def depois(self, cursor: int, limite: int = 5) -> List[Dict]:
+        pagina = self._ids(f'SELECT id FROM posts WHERE id > ?{self._filtro} ORDER BY id LIMIT ?',
+                           cursor, *self._params, limite)
+        pagina.reverse()
+        return pagina
+
+
+class _ComentariosSQLite:
+    """Mesma interface de comentarios.Comentarios respondida por consultas no índice (post_id, id).
+
+    O id de cada comentário é a chave da tabela, atribuída na gravação do evento.
+    """
+
+    def __init__(self, repo: 'RepositorioSQLite'):
+        self._repo = repo
+
+    def _selecionar(self, sql: str, *params: Any) -> List[Comentario]:
+        return [self._repo._comentario(*linha) for linha in self._repo._con.execute(
+            f'SELECT id, {", ".join(CAMPOS_COMENTARIO)} FROM comentarios {sql}', params)]
+
+    def adicionar(self, post_id: int, comentario: Comentario) -> None:
+        pass  # gravado (e numerado) pelo evento 'comentar'
+
+    def total(self, post_id: int) -> int:
+        linha = self._repo._con.execute('SELECT total_comentarios FROM posts WHERE id = ?', (post_id,)).fetchone()
+        return linha[0] if linha else 0
+
+    def quantidade(self) -> int:
+        return self._repo._con.execute('SELECT COUNT(*) FROM comentarios').fetchone()[0]
+
+    def pagina(self, post_id: int, cursor: Optional[int] = None, limite: int = 5) -> List[Comentario]:
+        return self._selecionar('WHERE post_id = ? AND id > ? ORDER BY id LIMIT ?', post_id, cursor or 0, limite)
+
+    def do_post(self, post_id: int) -> List[Comentario]:
+        return self._selecionar('WHERE post_id = ? ORDER BY id', post_id)
+
+    def remover_post(self, post_id: int) -> List[Comentario]:
+        return []  # apagados em cascata pelo evento 'deletar_post'
+
+    def itens(self) -> Iterator[Tuple[int, Comentario]]:
+        for post_id, *linha in self._repo._con.execute(
+                f'SELECT post_id, id, {", ".join(CAMPOS_COMENTARIO)} FROM comentarios ORDER BY post_id, id'):
+            yield post_id, Comentario(linha[1], linha[2], *linha[3:], id=linha[0])
+
+
+class RepositorioSQLite(Repositorio):
+    """Banco SQLite com tabelas indexadas; cada mutação é uma transação curta.
+
+    Outros processos podem gravar no mesmo banco: edições de perfil só são
+    aplicadas se a versão do usuário não mudou (compare-and-swap) e
+    ``desatualizado`` indica quando os registros em cache devem ser relidos.
+    """
+
+    ESPERA_TRAVA = 30.0  # segundos aguardando a transação de outro processo
+
+    def __init__(self, arquivo: Path):
+        """Abre (ou cria) o banco"""
+        self.arquivo = Path(arquivo)
+        self._novo = not self.arquivo.exists()
+        self._con = sqlite3.connect(str(self.arquivo), timeout=self.ESPERA_TRAVA, check_same_thread=False)
+        self._con.execute('PRAGMA foreign_keys = ON')
+        self._con.execute('PRAGMA journal_mode = WAL')
+        self._con.execute('PRAGMA synchronous = NORMAL')
+        self._con.executescript(ESQUEMA_SQLITE)
+        self._migrar_instantes()
+        self._migrar_versoes()
+        self._migrar_totais()
+        self._con.executescript(INDICES_INSTANTE)
+        self.usuarios = _UsuariosSQLite(self)
+        self.grafo = _GrafoSQLite(self)
+        self.posts = _PostsSQLite(self)
+        self.comentarios = _ComentariosSQLite(self)
+        self._versao_dados = self._data_version()
+        self._alterado = False
+
+    def _migrar_instantes(self) -> None:
+        """Acrescenta as colunas epoch a bancos antigos e as preenche a partir das datas"""
+        self._con.create_function('instante_de', 1, instante_de, deterministic=True)
+        with self._con:
+            for tabela, coluna, origem in COLUNAS_INSTANTE:
+                colunas = {linha[1] for linha in self._con.execute(f'PRAGMA table_info({tabela})')}
+                if coluna not in colunas:
+                    self._con.execute(f'ALTER TABLE {tabela} ADD COLUMN {coluna} REAL')
+                    self._con.execute(f'UPDATE {tabela} SET {coluna} = instante_de({origem}) WHERE {coluna} IS NULL')
+
+    def _migrar_versoes(self) -> None:
+        """Acrescenta os contadores de versão a bancos antigos"""
+        with self._con:
+            for tabela, coluna in COLUNAS_VERSAO:
+                colunas = {linha[1] for linha in self._con.execute(f'PRAGMA table_info({tabela})')}
+                if coluna not in colunas:
+                    self._con.execute(f'ALTER TABLE {tabela} ADD COLUMN {coluna} INTEGER NOT NULL DEFAULT 0')
+
+    def _migrar_totais(self) -> None:
+        """Acrescenta os totais de curtidas e comentários a bancos antigos, contando as tabelas"""
+        with self._con:
+            colunas = {linha[1] for linha in self._con.execute('PRAGMA table_info(posts)')}
+            for coluna, tabela in COLUNAS_TOTAL:
+                if coluna not in colunas:
+                    self._con.execute(f'ALTER TABLE posts ADD COLUMN {coluna} INTEGER NOT NULL DEFAULT 0')
+                    self._con.execute(f'UPDATE posts SET {coluna} = '
+                                      f'(SELECT COUNT(*) FROM {tabela} WHERE post_id = posts.id)')
+
+    def _data_version(self) -> int:
+        """Muda quando outra conexão confirma uma transação no banco"""
+        return self._con.execute('PRAGMA data_version').fetchone()[0]
+
+    def existe(self) -> bool:
+        """Indica se já há dados persistidos"""
+        return self._con.execute('SELECT 1 FROM usuarios LIMIT 1').fetchone() is not None
+
+    def desatualizado(self) -> bool:
+        """Se outro processo confirmou transações desde a última carga"""
+        return self._alterado or self._data_version() != self._versao_dados
+
+    def mesclou(self) -> bool:
+        return self._alterado
+
+    def carregar(self) -> Tuple[Dict, _GrafoSQLite, '_PostsSQLite', _ComentariosSQLite]:
+        """Retorna visões preguiçosas; nada é lido até ser acessado (o cache é descartado)"""
+        self.usuarios._cache.clear()
+        self.posts._cache.clear()
+        self._versao_dados, self._alterado = self._data_version(), False
+        return self.usuarios, self.grafo, self.posts, self.comentarios
+
+    # ----- leitura -----
+
+    def _existe(self, tabela: str, coluna: str, valor: Any) -> bool:
+        return self._con.execute(f'SELECT 1 FROM {tabela} WHERE {coluna} = ?', (valor,)).fetchone() is not None
+
+    def _lista(self, sql: str, *params: Any) -> List:
+        return [linha[0] for linha in self._con.execute(sql, params)]
+
+    def _ler_usuario(self, username: str) -> Optional[Dict]:
+        linha = self._con.execute(f'SELECT {", ".join(CAMPOS_USUARIO)} FROM usuarios WHERE username = ?',
+                                  (username,)).fetchone()
+        if linha is None:
+            return None
+        return Usuario(*linha)
+
+    def _ler_post(self, post_id: int) -> Dict:
+        linha = self._con.execute(f'SELECT {", ".join(CAMPOS_POST)} FROM posts WHERE id = ?',
+                                  (post_id,)).fetchone()
+        post_id, usuario, autor_nome, conteudo, data, timestamp, versao, curtidas, comentarios = linha
+        return Post(post_id, usuario, self.usuarios.get(usuario) or autor_nome, conteudo, data, timestamp, versao,
+                    curtidas, comentarios)
+
+    def _comentario(self, id: int, usuario: str, nome: str, texto: str, data: str, timestamp: float) -> Comentario:
+        return Comentario(usuario, self.usuarios.get(usuario) or nome, texto, data, timestamp, id)
+
+    def email_em_uso(self, email: str) -> bool:
+        """Verifica se o email já pertence a algum usuário (índice UNIQUE)"""
+        return self._existe('usuarios', 'email', email)
+
+    def post_por_id(self, post_id: int) -> Optional[Dict]:
+        """Post pelo id (chave primária), ou None"""
+        return self.posts.obter(post_id)
+
+    def posts_do_autor(self, username: str) -> '_PostsSQLite':
+        """Linha do tempo de um autor via índice (usuario, id)"""
+        return _PostsSQLite(self, username)
+
+    def proximo_id_post(self) -> int:
+        """Próximo id livre para um post"""
+        return self._con.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM posts').fetchone()[0]
+
+    def posts_entre(self, inicio: Optional[float] = None, fim: Optional[float] = None) -> List[Dict]:
+        """Posts no intervalo, via índice em posts(timestamp)"""
+        return self.posts._ids('SELECT id FROM posts WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, id',
+                               float('-inf') if inicio is None else inicio, float('inf') if fim is None else fim)
+
+    def comentarios_entre(self, inicio: Optional[float] = None,
+                          fim: Optional[float] = None) -> List[Tuple[int, Dict]]:
+        """Comentários no intervalo, via índice em comentarios(timestamp)"""
+        return [(linha[0], self._comentario(*linha[1:])) for linha in self._con.execute(
+            f'SELECT post_id, id, {", ".join(CAMPOS_COMENTARIO)} FROM comentarios '
+            'WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, id',
+            (float('-inf') if inicio is None else inicio, float('inf') if fim is None else fim))]
+
+    def percorrer_usuarios(self) -> Iterator[Tuple[str, Dict]]:
+        """Pares (username, usuário) lidos em sequência, sem passar pelo cache"""
+        for username, *linha in self._con.execute(
+                f'SELECT username, {", ".join(CAMPOS_USUARIO)} FROM usuarios ORDER BY rowid'):
+            yield username, Usuario(*linha)
+
+    def percorrer_posts(self, tamanho_pagina: int = 500) -> Iterator[Dict]:
+        """Todos os posts por id, lidos em sequência, sem passar pelo cache"""
+        for linha in self._con.execute(f'SELECT {", ".join(CAMPOS_POST)} FROM posts ORDER BY id'):
+            yield Post(*linha)
+
+    # ----- escrita -----
+
+    def salvar(self, usuarios: Dict, grafo: GrafoSocial, posts: LinhaDoTempo, comentarios: Comentarios) -> None:
+        """Importa um estado completo (usado na carga inicial e na migração)"""
+        if grafo is self.grafo:
+            return  # visões próprias: cada mutação já foi gravada pelo seu evento
+        posts = list(posts)
+        posts.reverse()
+        with self._con:
+            self._con.executemany(
+                f'INSERT OR REPLACE INTO usuarios (username, {", ".join(CAMPOS_USUARIO)}) '
+                f'VALUES ({_marcadores(len(CAMPOS_USUARIO) + 1)})',
+                ((u, *_valores(d, CAMPOS_USUARIO)) for u, d in usuarios.items()))
+            self._con.executemany('INSERT OR IGNORE INTO conexoes (usuario, conexao) VALUES (?, ?)',
+                                  ((u, c) for u in usuarios for c in grafo.conexoes(u)))
+            self._con.executemany('INSERT OR IGNORE INTO seguidores (seguidor, seguido) VALUES (?, ?)',
+                                  ((u, s) for u in usuarios for s in grafo.seguindo(u)))
+            self._con.executemany(f'INSERT OR REPLACE INTO posts ({", ".join(CAMPOS_POST)}) '
+                                  f'VALUES ({_marcadores(len(CAMPOS_POST))})',
+                                  (_valores(p, CAMPOS_POST) for p in posts))
+            self._con.executemany('INSERT OR IGNORE INTO curtidas (post_id, usuario) VALUES (?, ?)',
+                                  ((p['id'], u) for p in posts for u in grafo.curtidas(p['id'])))
+            self._con.executemany(
+                f'INSERT INTO comentarios (post_id, {", ".join(CAMPOS_COMENTARIO)}) '
+                f'VALUES ({_marcadores(len(CAMPOS_COMENTARIO) + 1)})',
+                ((post_id, *(c[campo] for campo in CAMPOS_COMENTARIO)) for post_id, c in comentarios.itens()))
+
+    def registrar(self, evento: Dict) -> None:
+        """Grava a mutação em uma única transação"""
+        try:
+            with self._con:
+                self._executar(evento)
+        finally:
+            self._verificar_outros()
+
+    def registrar_lote(self, eventos: List[Dict]) -> None:
+        """Grava o lote em uma única transação e esvazia o cache, para a carga não acumular registros"""
+        try:
+            with self._con:
+                for evento in eventos:
+                    self._executar(evento)
+        finally:
+            self._verificar_outros()
+        self.usuarios._cache.clear()
+        self.posts._cache.clear()
+
+    def _verificar_outros(self) -> None:
+        if self._data_version() != self._versao_dados:
+            self._alterado = True  # outro processo gravou antes desta transação
+
+    def _executar(self, evento: Dict) -> None:
+        op = evento['op']
+        if op == 'registrar':
+            u = evento['usuario']
+            try:
+                self._con.execute(
+                    f'INSERT INTO usuarios (username, {", ".join(CAMPOS_USUARIO)}) '
+                    f'VALUES ({_marcadores(len(CAMPOS_USUARIO) + 1)})',
+                    (evento['username'], *_valores(u, CAMPOS_USUARIO)))
+            except sqlite3.IntegrityError as e:
+                raise ConflitoVersao(f"Usuário {evento['username']} já registrado") from e
+        elif op == 'perfil':
+            if evento['campo'] not in CAMPOS_USUARIO or evento['campo'] == 'versao':
+                raise ValueError(f"Campo inválido: {evento['campo']}")
+            alterados = self._con.execute(
+                f"UPDATE usuarios SET {evento['campo']} = ?, versao = versao + 1 "
+                "WHERE username = ? AND versao = ?",
+                (evento['valor'], evento['username'], evento.get('versao', 0))).rowcount
+            if not alterados:
+                raise ConflitoVersao(f"Perfil de {evento['username']} alterado")
+        elif op == 'conectar':
+            origem, alvo = evento['origem'], evento['alvo']
+            self._con.executemany('INSERT OR IGNORE INTO conexoes (usuario, conexao) VALUES (?, ?)',
+                                  ((origem, alvo), (alvo, origem)))
+            self._con.execute('INSERT OR IGNORE INTO seguidores (seguidor, seguido) VALUES (?, ?)',
+                              (origem, alvo))
+        elif op == 'post':
+            post = evento['post']
+            try:
+                self._inserir_post(post)
+            except sqlite3.IntegrityError:  # id tomado por outro processo: a transação já é a escritora
+                self.posts._cache.pop(post['id'], None)
+                post['id'] = self.proximo_id_post()
+                self._inserir_post(post)
+                self._alterado = True
+        elif op == 'deletar_post':
+            self._con.execute('DELETE FROM posts WHERE id = ?', (evento['id'],))
+        elif op == 'curtir':
+            if self._con.execute('INSERT OR IGNORE INTO curtidas (post_id, usuario) VALUES (?, ?)',
+                                 (evento['id'], evento['usuario'])).rowcount:
+                self._con.execute('UPDATE posts SET total_curtidas = total_curtidas + 1 WHERE id = ?',
+                                  (evento['id'],))
+        elif op == 'descurtir':
+            if self._con.execute('DELETE FROM curtidas WHERE post_id = ? AND usuario = ?',
+                                 (evento['id'], evento['usuario'])).rowcount:
+                self._con.execute('UPDATE posts SET total_curtidas = total_curtidas - 1 WHERE id = ?',
+                                  (evento['id'],))
+        elif op == 'comentar':
+            c = evento['comentario']
+            c['id'] = self._con.execute(
+                f'INSERT INTO comentarios (post_id, {", ".join(CAMPOS_COMENTARIO)}) '
+                f'VALUES ({_marcadores(len(CAMPOS_COMENTARIO) + 1)})',
+                (evento['id'], *(c[campo] for campo in CAMPOS_COMENTARIO))).lastrowid
+            self._con.execute('UPDATE posts SET total_comentarios = total_comentarios + 1 WHERE id = ?',
+                              (evento['id'],))
+        else:
+            raise ValueError(f"Operação desconhecida: {op}")
+        if op in ('curtir', 'descurtir', 'comentar'):
+            self._con.execute('UPDATE posts SET versao = versao + 1 WHERE id = ?', (evento['id'],))
+
+    def _inserir_post(self, post: Dict) -> None:
+        """Insere com os totais zerados: curtidas e comentários chegam pelos seus eventos"""
+        self._con.execute(f'INSERT INTO posts ({", ".join(CAMPOS_POST)}) VALUES ({_marcadores(len(CAMPOS_POST))})',
+                          _valores(post, CAMPOS_POST)[:-2] + (0, 0))
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco"""
+        self._con.close()
+
+
+def migrar_json_para_sqlite(origem: RepositorioJSON, destino: RepositorioSQLite) -> int:
+    """Migração única dos arquivos dados_*.json para o banco; retorna o nº de usuários"""
+    usuarios, grafo, posts, comentarios = origem.carregar()
+    destino.salvar(usuarios, grafo, posts, comentarios)
+    return len(usuarios)
+
+
+if __name__ == "__main__":
+    # Uso: python repositorio.py  -> migra dados_*.json (e o diário) para dados.sqlite3
+    diario = Path('dados_diario.jsonl')
+    json_repo = RepositorioJSON(Path('dados_usuarios.json'), Path('dados_conexoes.json'),
+                                Path('dados_posts.json'), diario if diario.exists() else None)
+    sqlite_repo = RepositorioSQLite(Path('dados.sqlite3'))
+    try:
+        if sqlite_repo.existe():
+            print("⚠️  dados.sqlite3 já contém dados; migração ignorada")
+        else:
+            print(f"✅ {migrar_json_para_sqlite(json_repo, sqlite_repo)} usuários migrados para dados.sqlite3")
+    finally:
+        json_repo.fechar()
+        sqlite_repo.fechar()
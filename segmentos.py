@@ -0,0 +1,323 @@
+"""
+POSTS SEGMENTADOS DO LINKEDIN SPA
+Descrição: Guarda os posts (com curtidas) em arquivos por faixa de ids,
+dados_posts/segmento_NNNNNN.json, e só lê um segmento quando algum post dele é
+acessado. Os comentários da mesma faixa ficam à parte, em
+dados_posts/comentarios_NNNNNN.json, lidos só quando se pede uma página deles.
+O manifesto guarda apenas contagens e ids por autor, então a inicialização não
+depende do volume de posts nem de comentários.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from comentarios import Comentarios
+from linha_do_tempo import LinhaDoTempo
+from registros import Comentario
+from serializacao import gravar, ler
+
+
+class LinhaSegmentada:
+    """Linha do tempo cujos segmentos de ``tamanho_segmento`` ids são lidos sob demanda.
+
+    Mesmo protocolo da LinhaDoTempo (publicar, remover, obter, antes/depois).
+    Segmentos alterados ficam marcados como sujos até ``gravar`` ser chamado.
+    """
+
+    TAMANHO_SEGMENTO = 1000
+
+    def __init__(self, pasta: Path, encoding: str = 'utf-8',
+                 preparar: Optional[Callable[[List[Dict]], List]] = None, codec: str = 'json_compacto'):
+        """``preparar(posts)`` recebe os dicts de cada segmento recém-lido e devolve os posts a guardar;
+        ``codec`` é o da gravação dos segmentos e do manifesto (ver serializacao.py)"""
+        self.pasta, self.encoding, self.codec = Path(pasta), encoding, codec
+        self._preparar = preparar
+        manifesto = self._ler(self.arquivo_manifesto) if self.arquivo_manifesto.exists() else {}
+        self.tamanho_segmento = manifesto.get('tamanho_segmento', self.TAMANHO_SEGMENTO)
+        self.maior_id = manifesto.get('maior_id', 0)
+        self._totais: Dict[int, int] = {int(k): n for k, n in manifesto.get('segmentos', {}).items()}
+        self._chaves: List[int] = sorted(self._totais)
+        self._total = sum(self._totais.values())
+        self._por_autor: Dict[str, array] = {u: array('q', ids)
+                                            for u, ids in manifesto.get('posts_por_autor', {}).items()}
+        self._segmentos: Dict[int, LinhaDoTempo] = {}
+        self._sujos: Set[int] = set()
+        self._manifesto_sujo = False  # contagens ou ids por autor mudaram desde a última gravação
+
+    @property
+    def arquivo_manifesto(self) -> Path:
+        return self.pasta / 'manifesto.json'
+
+    def _arquivo(self, chave: int) -> Path:
+        return self.pasta / f'segmento_{chave:06d}.json'
+
+    def _ler(self, arquivo: Path):
+        return ler(arquivo, self.encoding)
+
+    def _escrever(self, arquivo: Path, dados) -> None:
+        gravar(arquivo, dados, self.codec, self.encoding)
+
+    # ----- segmentos -----
+
+    @property
+    def segmentos_carregados(self) -> int:
+        """Quantos segmentos já foram lidos do disco"""
+        return len(self._segmentos)
+
+    def _segmento(self, chave: int) -> LinhaDoTempo:
+        """Segmento da chave, lido do disco no primeiro acesso"""
+        segmento = self._segmentos.get(chave)
+        if segmento is None:
+            posts = self._ler(self._arquivo(chave)) if self._totais.get(chave) else []
+            if self._preparar is not None:
+                posts = self._preparar(posts)
+            self._segmentos[chave] = segmento = LinhaDoTempo(posts)
+        return segmento
+
+    def marcar_sujo(self, post_id: int) -> None:
+        """Marca o segmento do post para ser regravado (post alterado no lugar)"""
+        self._sujos.add(post_id // self.tamanho_segmento)
+
+    def gravar(self, serializar: Callable[[Dict], Dict] = dict) -> None:
+        """Regrava os segmentos sujos e, se contagens ou ids por autor mudaram, o manifesto.
+
+        Curtidas e comentários só alteram posts no lugar: regravam o segmento, não o manifesto.
+        """
+        if not self._sujos and not self._manifesto_sujo:
+            return
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        for chave in sorted(self._sujos):
+            if self._totais.get(chave):
+                self._escrever(self._arquivo(chave), [serializar(p) for p in self._segmentos[chave]])
+            elif self._arquivo(chave).exists():
+                self._arquivo(chave).unlink()
+        self._sujos.clear()
+        if self._manifesto_sujo:
+            self._escrever(self.arquivo_manifesto, {
+                'tamanho_segmento': self.tamanho_segmento, 'maior_id': self.maior_id,
+                'segmentos': {str(k): n for k, n in self._totais.items() if n},
+                'posts_por_autor': {u: ids.tolist() for u, ids in self._por_autor.items() if ids},
+            })
+            self._manifesto_sujo = False
+
+    def importar(self, posts: Iterable[Dict], serializar: Callable[[Dict], Dict] = dict) -> None:
+        """Substitui todo o conteúdo por ``posts`` e grava (carga inicial e migração)"""
+        antigos = set(self._chaves)
+        self._segmentos, self._totais, self._chaves, self._total = {}, {}, [], 0
+        self._por_autor, self.maior_id = {}, 0
+        self._manifesto_sujo = True
+        for post in posts:
+            self.publicar(post)
+        self._sujos |= antigos
+        self.gravar(serializar)
+
+    # ----- protocolo de linha do tempo -----
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __bool__(self) -> bool:
+        return self._total > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Posts do mais recente ao mais antigo (lê os segmentos conforme avança)"""
+        for chave in reversed(self._chaves):
+            if self._totais[chave]:
+                yield from self._segmento(chave)
+
+    def para_lista(self) -> List[Dict]:
+        """Lista no formato do arquivo dados_posts.json (lê todos os segmentos)"""
+        return list(self)
+
+    def publicar(self, post: Dict) -> None:
+        """Acrescenta um post ao seu segmento"""
+        chave = post['id'] // self.tamanho_segmento
+        self._segmento(chave).publicar(post)
+        if chave not in self._totais:
+            insort(self._chaves, chave)
+        self._totais[chave] = self._totais.get(chave, 0) + 1
+        self._total += 1
+        ids = self._por_autor.get(post['usuario'])
+        if ids is None:
+            self._por_autor[post['usuario']] = ids = array('q')
+        if not ids or post['id'] > ids[-1]:
+            ids.append(post['id'])
+        else:
+            ids.insert(bisect_left(ids, post['id']), post['id'])
+        self.maior_id = max(self.maior_id, post['id'])
+        self._sujos.add(chave)
+        self._manifesto_sujo = True
+
+    def obter(self, post_id: int) -> Optional[Dict]:
+        """Post pelo id (lê só o segmento dele), ou None"""
+        chave = post_id // self.tamanho_segmento
+        if not self._totais.get(chave):
+            return None
+        return self._segmento(chave).obter(post_id)
+
+    def remover(self, post_id: int) -> Optional[Dict]:
+        """Remove o post e o retorna"""
+        chave = post_id // self.tamanho_segmento
+        post = self._segmento(chave).remover(post_id) if self._totais.get(chave) else None
+        if post is None:
+            return None
+        self._totais[chave] -= 1
+        self._total -= 1
+        ids = self._por_autor[post['usuario']]
+        del ids[bisect_left(ids, post_id)]
+        self._sujos.add(chave)
+        self._manifesto_sujo = True
+        return post
+
+    def antes(self, cursor: Optional[int] = None, limite: int = 5) -> List[Dict]:
+        """Até ``limite`` posts mais antigos que o cursor (None = do mais recente)"""
+        fim = len(self._chaves) if cursor is None else bisect_right(self._chaves, cursor // self.tamanho_segmento)
+        pagina = []
+        for chave in reversed(self._chaves[:fim]):
+            if len(pagina) >= limite:
+                break
+            if self._totais[chave]:
+                pagina += self._segmento(chave).antes(cursor, limite - len(pagina))
+        return pagina
+
+    def depois(self, cursor: int, limite: int = 5) -> List[Dict]:
+        """Até ``limite`` posts mais recentes que o cursor, do mais recente ao mais antigo"""
+        inicio = bisect_left(self._chaves, cursor // self.tamanho_segmento)
+        pagina: List[Dict] = []
+        for chave in self._chaves[inicio:]:
+            if len(pagina) >= limite:
+                break
+            if self._totais[chave]:
+                pagina = self._segmento(chave).depois(cursor, limite - len(pagina)) + pagina
+        return pagina
+
+    def do_autor(self, username: str) -> 'LinhaDoAutor':
+        """Linha do tempo só com os posts de ``username``"""
+        return LinhaDoAutor(self, username)
+
+
+class LinhaDoAutor:
+    """Posts de um autor, pelos ids do manifesto; só os segmentos visitados são lidos"""
+
+    def __init__(self, linha: LinhaSegmentada, autor: str):
+        self._linha, self._autor = linha, autor
+
+    @property
+    def _ids(self) -> array:
+        return self._linha._por_autor.get(self._autor, array('q'))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __bool__(self) -> bool:
+        return len(self._ids) > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        for post_id in reversed(self._ids.tolist()):
+            yield self._linha.obter(post_id)
+
+    def publicar(self, post: Dict) -> None:
+        self._linha.publicar(post)
+
+    def remover(self, post_id: int) -> Optional[Dict]:
+        return self._linha.remover(post_id) if self.obter(post_id) is not None else None
+
+    def obter(self, post_id: int) -> Optional[Dict]:
+        ids = self._ids
+        i = bisect_left(ids, post_id)
+        return self._linha.obter(post_id) if i < len(ids) and ids[i] == post_id else None
+
+    def antes(self, cursor: Optional[int] = None, limite: int = 5) -> List[Dict]:
+        ids = self._ids
+        i = len(ids) if cursor is None else bisect_left(ids, cursor)
+        return [self._linha.obter(ids[j]) for j in range(i - 1, max(i - limite, 0) - 1, -1)]
+
+    def depois(self, cursor: int, limite: int = 5) -> List[Dict]:
+        ids = self._ids
+        i = bisect_right(ids, cursor)
+        return [self._linha.obter(ids[j]) for j in range(min(i + limite, len(ids)) - 1, i - 1, -1)]
+
+
+class ComentariosSegmentados(Comentarios):
+    """Comentários em arquivos por faixa de ids de post, lidos sob demanda.
+
+    Segmentos alterados ficam marcados como sujos até ``gravar`` ser chamado.
+    """
+
+    def __init__(self, pasta: Path, tamanho_segmento: int, encoding: str = 'utf-8',
+                 preparar: Optional[Callable[[Dict], Comentario]] = None, codec: str = 'json_compacto'):
+        """``preparar(dados)`` converte cada comentário lido do disco"""
+        super().__init__()
+        self.pasta, self.tamanho_segmento, self.encoding = Path(pasta), tamanho_segmento, encoding
+        self.codec = codec
+        self._preparar = preparar or Comentario.de_json
+        self._segmentos: Dict[int, Dict[int, List]] = {}
+        self._sujos: Set[int] = set()
+
+    def _arquivo(self, chave: int) -> Path:
+        return self.pasta / f'comentarios_{chave:06d}.json'
+
+    def _segmento(self, chave: int) -> Dict[int, List]:
+        segmento = self._segmentos.get(chave)
+        if segmento is None:
+            arquivo = self._arquivo(chave)
+            segmento = {}
+            if arquivo.exists():
+                segmento = {int(post_id): [self._preparar(c) for c in lista]
+                            for post_id, lista in ler(arquivo, self.encoding).items()}
+            self._segmentos[chave] = segmento
+        return segmento
+
+    def _chaves(self) -> List[int]:
+        """Chaves dos segmentos em disco ou em memória"""
+        em_disco = {int(a.stem.rpartition('_')[2]) for a in self.pasta.glob('comentarios_*.json')}
+        return sorted(em_disco | set(self._segmentos))
+
+    def _lista(self, post_id: int) -> Optional[List]:
+        return self._segmento(post_id // self.tamanho_segmento).get(post_id)
+
+    def _lista_para_escrita(self, post_id: int) -> List:
+        chave = post_id // self.tamanho_segmento
+        self._sujos.add(chave)
+        segmento = self._segmento(chave)
+        lista = segmento.get(post_id)
+        if lista is None:
+            segmento[post_id] = lista = []
+        return lista
+
+    def _remover_lista(self, post_id: int) -> Optional[List]:
+        chave = post_id // self.tamanho_segmento
+        lista = self._segmento(chave).pop(post_id, None)
+        if lista is not None:
+            self._sujos.add(chave)
+        return lista
+
+    def _listas(self) -> Iterator[Tuple[int, List]]:
+        for chave in self._chaves():
+            segmento = self._segmento(chave)
+            for post_id in sorted(segmento):
+                yield post_id, segmento[post_id]
+
+    def gravar(self) -> None:
+        """Regrava os segmentos sujos (apaga os que ficaram vazios)"""
+        if not self._sujos:
+            return
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        for chave in sorted(self._sujos):
+            segmento = {str(post_id): lista for post_id, lista in sorted(self._segmentos[chave].items()) if lista}
+            if segmento:
+                gravar(self._arquivo(chave), segmento, self.codec, self.encoding)
+            elif self._arquivo(chave).exists():
+                self._arquivo(chave).unlink()
+        self._sujos.clear()
+
+    def importar(self, itens: Iterable[Tuple[int, Comentario]]) -> None:
+        """Substitui todo o conteúdo pelos pares (post_id, comentário) e grava"""
+        antigos = self._chaves()
+        self._segmentos = {chave: {} for chave in antigos}
+        self._sujos |= set(antigos)
+        for post_id, comentario in itens:
+            self.adicionar(post_id, comentario)
+        self.gravar()
@@ -0,0 +1,154 @@
+"""
+SENHAS DO LINKEDIN SPA
+Descrição: Hash de senhas com sal (scrypt ou PBKDF2-SHA256, via hashlib) no
+formato ``algoritmo$parâmetros$sal$hash``, verificação em tempo constante e
+detecção de registros a atualizar (senha em texto puro de dados antigos ou
+custo abaixo do configurado). O cálculo, caro de propósito, roda em um pool de
+threads (o hashlib libera o GIL durante o scrypt e o PBKDF2) ou de processos,
+para não travar as demais sessões da API.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+ALGORITMOS = ('scrypt', 'pbkdf2_sha256')
+
+
+def _b64(dados: bytes) -> str:
+    return base64.b64encode(dados).decode('ascii').rstrip('=')
+
+
+def _de_b64(texto: str) -> bytes:
+    return base64.b64decode(texto + '=' * (-len(texto) % 4))
+
+
+def _derivar(algoritmo: str, senha: str, sal: bytes, parametros: Tuple[int, ...]) -> bytes:
+    """Chave derivada da senha (função de módulo, para rodar também em outro processo)"""
+    if algoritmo == 'scrypt':
+        n, r, p = parametros
+        return hashlib.scrypt(senha.encode('utf-8'), salt=sal, n=n, r=r, p=p, dklen=32,
+                              maxmem=max(32 * 1024 * 1024, 256 * n * r))
+    if algoritmo == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', senha.encode('utf-8'), sal, parametros[0])
+    raise ValueError(f"Algoritmo de senha desconhecido: {algoritmo}")
+
+
+def _decompor(armazenado: str) -> Optional[Tuple[str, Tuple[int, ...], bytes, bytes]]:
+    """(algoritmo, parâmetros, sal, hash) de uma senha armazenada, ou None se for texto puro"""
+    partes = armazenado.split('$')
+    if len(partes) != 4 or partes[0] not in ALGORITMOS:
+        return None
+    try:
+        parametros = tuple(int(v) for v in partes[1].split(','))
+        return partes[0], parametros, _de_b64(partes[2]), _de_b64(partes[3])
+    except ValueError:
+        return None
+
+
+def _verificar(senha: str, armazenado: str) -> bool:
+    decomposto = _decompor(armazenado)
+    if decomposto is None:  # registro antigo em texto puro
+        return hmac.compare_digest(senha.encode('utf-8'), armazenado.encode('utf-8'))
+    algoritmo, parametros, sal, esperado = decomposto
+    return hmac.compare_digest(_derivar(algoritmo, senha, sal, parametros), esperado)
+
+
+def _gerar(algoritmo: str, parametros: Tuple[int, ...], senha: str, sal: Optional[bytes] = None) -> str:
+    sal = sal or os.urandom(16)
+    chave = _derivar(algoritmo, senha, sal, parametros)
+    return f"{algoritmo}${','.join(map(str, parametros))}${_b64(sal)}${_b64(chave)}"
+
+
+def hash_senha(senha: str, algoritmo: str = 'scrypt', parametros: Optional[Tuple[int, ...]] = None,
+               sal: Optional[bytes] = None) -> str:
+    """Hash calculado na própria thread, com os custos padrão de ServicoSenhas se ``parametros`` faltar;
+    ``sal`` fixo só para dados sintéticos reproduzíveis"""
+    if parametros is None:
+        parametros = ServicoSenhas(algoritmo).parametros
+    return _gerar(algoritmo, tuple(parametros), senha, sal)
+
+
+def eh_hash(armazenado: str) -> bool:
+    """Indica se o valor já está no formato de hash (e não em texto puro)"""
+    return _decompor(armazenado) is not None
+
+
+class ServicoSenhas:
+    """Gera e verifica hashes de senha em um pool de trabalhadores.
+
+    Os métodos síncronos bloqueiam só a thread que chama (CLI, importação); os
+    ``*_async`` liberam o laço de eventos enquanto o hash é calculado.
+    """
+
+    # Custos padrão: scrypt n=2^14, r=8, p=1 (16 MiB por hash); PBKDF2 com 600 mil iterações
+    ALGORITMO = 'scrypt'
+    SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+    PBKDF2_ITERACOES = 600_000
+    POOL = 'threads'  # 'threads' | 'processos'
+
+    def __init__(self, algoritmo: Optional[str] = None, trabalhadores: Optional[int] = None,
+                 pool: Optional[str] = None, scrypt: Optional[Tuple[int, int, int]] = None,
+                 iteracoes: Optional[int] = None):
+        """``trabalhadores`` padrão: um por núcleo; ``scrypt`` = (n, r, p)"""
+        self.algoritmo = algoritmo or self.ALGORITMO
+        if self.algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo de senha desconhecido: {self.algoritmo}")
+        if self.algoritmo == 'scrypt':
+            self.parametros: Tuple[int, ...] = tuple(scrypt or (self.SCRYPT_N, self.SCRYPT_R, self.SCRYPT_P))
+        else:
+            self.parametros = (iteracoes or self.PBKDF2_ITERACOES,)
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.pool = pool or self.POOL
+        if self.pool not in ('threads', 'processos'):
+            raise ValueError(f"Pool desconhecido: {self.pool}")
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        """Pool criado no primeiro uso"""
+        if self._executor is None:
+            if self.pool == 'processos':
+                self._executor = ProcessPoolExecutor(self.trabalhadores)
+            else:
+                self._executor = ThreadPoolExecutor(self.trabalhadores, thread_name_prefix='senhas')
+        return self._executor
+
+    def precisa_atualizar(self, armazenado: str) -> bool:
+        """Texto puro, outro algoritmo ou custo diferente do configurado"""
+        decomposto = _decompor(armazenado)
+        return decomposto is None or decomposto[:2] != (self.algoritmo, self.parametros)
+
+    # ----- síncrono -----
+
+    def gerar(self, senha: str) -> str:
+        """Hash com sal novo da senha"""
+        return self.executor.submit(_gerar, self.algoritmo, self.parametros, senha).result()
+
+    def gerar_varios(self, senhas: Iterable[str]) -> List[str]:
+        """Hashes de várias senhas calculados em paralelo no pool"""
+        senhas = list(senhas)
+        return list(self.executor.map(_gerar, [self.algoritmo] * len(senhas), [self.parametros] * len(senhas),
+                                      senhas))
+
+    def verificar(self, senha: str, armazenado: str) -> bool:
+        """Confere a senha com o valor armazenado (hash ou texto puro antigo)"""
+        return self.executor.submit(_verificar, senha, armazenado).result()
+
+    # ----- assíncrono -----
+
+    async def gerar_async(self, senha: str) -> str:
+        return await asyncio.wrap_future(self.executor.submit(_gerar, self.algoritmo, self.parametros, senha))
+
+    async def verificar_async(self, senha: str, armazenado: str) -> bool:
+        return await asyncio.wrap_future(self.executor.submit(_verificar, senha, armazenado))
+
+    def fechar(self) -> None:
+        """Encerra o pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
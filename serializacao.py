@@ -0,0 +1,158 @@
+"""
+SERIALIZAÇÃO DOS ARQUIVOS DO LINKEDIN SPA
+Descrição: Codecs dos arquivos de dados (dados_*.json, segmentos, índice de
+busca): 'json' (um registro por linha, legível e fácil de comparar),
+'json_compacto' (sem espaços nem quebras), 'gzip' e 'lzma' (JSON compacto
+comprimido), 'pickle' (protocolo 5) e 'marshal' (binários, os mais rápidos de
+ler). O codec vale só para a gravação: a leitura reconhece o formato pelos
+primeiros bytes do arquivo, então trocar de codec não exige migração (cada
+arquivo passa ao novo formato na próxima vez que for gravado) e os nomes dos
+arquivos não mudam. Ler um pickle pode executar código e o marshal não valida o
+que lê: use-os só em pastas que apenas a própria aplicação grava. O formato do
+marshal pode mudar entre versões do Python.
+"""
+
+import gc
+import gzip
+import io
+import json
+import lzma
+import marshal
+import pickle
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from registros import Registro, para_json
+from travas import escrever_atomico
+
+CODECS = ('json', 'json_compacto', 'gzip', 'lzma', 'pickle', 'marshal')
+
+# Níveis de compressão: gzip de 1 a 9, preset do lzma de 0 a 9. O lzma só compensa pelo
+# tamanho (no 6, cerca de um terço menor que o gzip), gravando dez vezes mais devagar: serve
+# melhor ao modo diario, que reescreve os arquivos só na compactação, em segundo plano
+NIVEL_GZIP, NIVEL_LZMA = 6, 6
+
+_GZIP = b'\x1f\x8b'
+_LZMA = b'\xfd7zXZ\x00'
+_PICKLE = b'\x80\x05'
+_MARSHAL = b'SPAm'  # + versão do marshal (1 byte)
+
+
+def _json_por_registro(dados: Any, f: IO[str]) -> None:
+    """json.dump de um dict ou lista com um item por linha: cada item sai do codificador
+    em C (o ``indent`` usa o codificador em Python, várias vezes mais lento)"""
+    dumps = json.JSONEncoder(ensure_ascii=False, default=para_json).encode
+    if isinstance(dados, dict):
+        itens, abre, fecha = (f'{dumps(k)}: {dumps(v)}' for k, v in dados.items()), '{', '}'
+    else:
+        itens, abre, fecha = (dumps(v) for v in dados), '[', ']'
+    vazio = True
+    f.write(abre)
+    for item in itens:
+        f.write('\n  ' if vazio else ',\n  ')
+        f.write(item)
+        vazio = False
+    f.write(fecha + '\n' if vazio else f'\n{fecha}\n')
+
+
+def _simples(dados: Any) -> Any:
+    """Cópia só com dicts, listas e escalares, para pickle e marshal. Os arquivos são coleções
+    (dict ou lista) de registros ou de listas de registros: só esses dois níveis são convertidos"""
+    def item(valor: Any) -> Any:
+        if isinstance(valor, Registro):
+            return valor.para_json()
+        if isinstance(valor, list):
+            return [v.para_json() if isinstance(v, Registro) else v for v in valor]
+        return valor
+    if isinstance(dados, dict):
+        return {k: item(v) for k, v in dados.items()}
+    return [item(v) for v in dados]
+
+
+@contextmanager
+def sem_coleta() -> Iterator[None]:
+    """Desliga o coletor de ciclos enquanto se criam muitos objetos sem ciclos (decodificação, mescla
+    de índices): com milhões de objetos novos ele rodaria a cada poucas centenas de alocações sem achar nada"""
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+
+def codificar(dados: Any, codec: str, encoding: str = 'utf-8') -> bytes:
+    """Conteúdo do arquivo no ``codec``"""
+    if codec == 'json':
+        texto = io.StringIO()
+        _json_por_registro(dados, texto)
+        return texto.getvalue().encode(encoding)
+    if codec in ('json_compacto', 'gzip', 'lzma'):
+        conteudo = json.dumps(dados, ensure_ascii=False, separators=(',', ':'), default=para_json).encode(encoding)
+        if codec == 'gzip':
+            return gzip.compress(conteudo, NIVEL_GZIP, mtime=0)
+        if codec == 'lzma':
+            return lzma.compress(conteudo, preset=NIVEL_LZMA)
+        return conteudo
+    if codec == 'pickle':
+        return pickle.dumps(_simples(dados), protocol=5)
+    if codec == 'marshal':
+        return _MARSHAL + bytes((marshal.version,)) + marshal.dumps(_simples(dados))
+    raise ValueError(f"Codec desconhecido: {codec} (use {', '.join(CODECS)})")
+
+
+def escrever(f: IO[bytes], dados: Any, codec: str = 'json', encoding: str = 'utf-8') -> None:
+    """Grava ``dados`` no arquivo binário ``f`` (o 'json' sai registro a registro, sem montar o texto inteiro)"""
+    if codec != 'json':
+        f.write(codificar(dados, codec, encoding))
+        return
+    texto = io.TextIOWrapper(f, encoding=encoding)
+    _json_por_registro(dados, texto)
+    texto.flush()
+    texto.detach()
+
+
+def gravar(arquivo: Path, dados: Any, codec: str = 'json', encoding: str = 'utf-8') -> None:
+    """Grava ``dados`` em ``arquivo`` de forma atômica (ver travas.escrever_atomico)"""
+    if codec not in CODECS:
+        raise ValueError(f"Codec desconhecido: {codec} (use {', '.join(CODECS)})")
+    escrever_atomico(arquivo, lambda f: escrever(f, dados, codec, encoding), encoding, binario=True)
+
+
+def detectar(conteudo: bytes) -> str:
+    """Codec de um conteúdo pelos primeiros bytes ('json' para qualquer JSON, compacto ou não)"""
+    if conteudo.startswith(_GZIP):
+        return 'gzip'
+    if conteudo.startswith(_LZMA):
+        return 'lzma'
+    if conteudo.startswith(_PICKLE):
+        return 'pickle'
+    if conteudo.startswith(_MARSHAL):
+        return 'marshal'
+    return 'json'
+
+
+def decodificar(conteudo: bytes, encoding: str = 'utf-8') -> Any:
+    """Dados de um conteúdo em qualquer codec; conteúdo inválido levanta ValueError"""
+    codec = detectar(conteudo)
+    try:
+        if codec == 'gzip':
+            conteudo = gzip.decompress(conteudo)
+        elif codec == 'lzma':
+            conteudo = lzma.decompress(conteudo)
+        with sem_coleta():
+            if codec == 'pickle':
+                return pickle.loads(conteudo)
+            if codec == 'marshal':
+                return marshal.loads(memoryview(conteudo)[len(_MARSHAL) + 1:])
+            return json.loads(conteudo.decode(encoding))
+    except (OSError, EOFError, lzma.LZMAError, pickle.UnpicklingError) as e:
+        raise ValueError(f"Conteúdo {codec} inválido: {e}") from e
+
+
+def ler(arquivo: Path, encoding: str = 'utf-8') -> Any:
+    """Lê um arquivo gravado em qualquer codec"""
+    with open(arquivo, 'rb') as f:
+        return decodificar(f.read(), encoding)
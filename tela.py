@@ -0,0 +1,179 @@
+"""
+TELAS DO LINKEDIN SPA
+Descrição: Compõe cada tela da CLI em um buffer e a envia ao terminal em uma
+única escrita, limpando com sequências ANSI em vez de ``os.system('clear')``
+(um processo novo a cada tecla). Entre duas telas só as linhas que mudaram são
+reescritas; quando a posição das linhas na tela não é conhecida (linhas que
+quebram, saída maior que o terminal) a tela inteira é redesenhada.
+"""
+
+import os
+import shutil
+import sys
+import time
+import unicodedata
+from typing import Callable, List, Optional, TextIO
+
+LIMPAR = '\x1b[H\x1b[J'        # cursor no topo e apaga até o fim da tela
+APAGAR_LINHA = '\x1b[K'        # apaga do cursor até o fim da linha
+APAGAR_ABAIXO = '\x1b[J'
+
+
+def largura(texto: str) -> int:
+    """Colunas ocupadas no terminal (emojis e ideogramas valem 2, marcas combinantes 0)"""
+    total = 0
+    for caractere in texto:
+        if unicodedata.combining(caractere) or caractere in '‍︎️':
+            continue
+        total += 2 if unicodedata.east_asian_width(caractere) in 'WF' else 1
+    return total
+
+
+class Tela:
+    """Substituto de sys.stdout durante a CLI (``with tela:``).
+
+    O que é impresso depois de ``limpar()`` forma o quadro, enviado de uma vez
+    quando a CLI lê a próxima tecla (``ler``) ou em ``flush()``. O que vem
+    depois disso (avisos, prompts e a resposta digitada) é acrescentado abaixo
+    do quadro e apagado no próximo. Fora do ``with`` ou sem terminal, ``ler``
+    é o próprio ``input`` e nada de ANSI é emitido.
+    """
+
+    # Folga (colunas) para emojis cuja largura o terminal calcula diferente de ``largura``
+    FOLGA = 2
+
+    def __init__(self, saida: Optional[TextIO] = None,
+                 ao_desenhar: Optional[Callable[[float, int], None]] = None):
+        """``ao_desenhar(latencia, bytes)`` é chamado a cada quadro; a latência conta desde a última tecla"""
+        self.saida = saida
+        self.ao_desenhar = ao_desenhar
+        self.quadros = 0
+        self._ativa = False
+        self._ansi = False
+        self._quadro: Optional[List[str]] = None   # quadro em composição
+        self._pendente: List[str] = []             # saída depois do quadro, ainda não enviada
+        self._anterior: Optional[List[str]] = None  # linhas na tela (None = desconhecidas)
+        self._linhas_usadas = 0                     # linhas ocupadas desde o topo do último quadro
+        self._tecla: Optional[float] = None
+        self._stdout: Optional[TextIO] = None
+
+    # ----- instalação -----
+
+    def __enter__(self) -> 'Tela':
+        self._stdout = sys.stdout
+        if self.saida is None:
+            self.saida = sys.stdout
+        self._ansi = self.saida.isatty()
+        if self._ansi and os.name == 'nt':
+            os.system('')  # uma vez: ativa o processamento de sequências ANSI no console do Windows
+        self._ativa = True
+        sys.stdout = self
+        return self
+
+    def __exit__(self, *_) -> None:
+        try:
+            self.flush()
+        finally:
+            self._ativa = False
+            sys.stdout = self._stdout
+
+    # ----- interface de arquivo -----
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.saida, 'encoding', None) or 'utf-8'
+
+    def isatty(self) -> bool:
+        return self.saida.isatty()
+
+    def fileno(self) -> int:
+        return self.saida.fileno()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, texto: str) -> int:
+        (self._quadro if self._quadro is not None else self._pendente).append(texto)
+        return len(texto)
+
+    def flush(self) -> None:
+        """Envia o quadro em composição e o que veio depois dele em uma escrita"""
+        partes, desenhou = [], self._quadro is not None
+        if desenhou:
+            partes.append(self._desenhar(''.join(self._quadro)))
+            self._quadro = None
+        if self._pendente:
+            texto = ''.join(self._pendente)
+            self._pendente.clear()
+            self._contar(texto)
+            partes.append(texto)
+        if not partes:
+            return
+        dados = ''.join(partes)
+        self.saida.write(dados)
+        self.saida.flush()
+        if desenhou and self._tecla is not None:
+            if self.ao_desenhar is not None:
+                self.ao_desenhar(time.perf_counter() - self._tecla, len(dados.encode(self.encoding, 'replace')))
+            self._tecla = None
+
+    # ----- CLI -----
+
+    def limpar(self) -> None:
+        """Começa um novo quadro; o que ainda não foi enviado é descartado, como faria o clear
+        (sem terminal, é enviado antes, para não sumir do registro da sessão)"""
+        if not self._ativa:
+            if sys.stdout.isatty():
+                sys.stdout.write(LIMPAR)
+                sys.stdout.flush()
+            return
+        if self._ansi:
+            self._pendente.clear()
+        else:
+            self.flush()
+        self._quadro = []
+
+    def ler(self, prompt: str = '') -> str:
+        """``input`` com o prompt na mesma escrita do quadro; marca o instante da tecla"""
+        if not self._ativa:
+            return input(prompt)
+        self._pendente.append(prompt)
+        self.flush()
+        resposta = input()
+        self._tecla = time.perf_counter()
+        self._contar(resposta + '\n')
+        return resposta
+
+    # ----- desenho -----
+
+    def _desenhar(self, texto: str) -> str:
+        """Sequência que leva a tela do quadro anterior ao novo"""
+        linhas = texto.split('\n')
+        resto = linhas.pop()  # depois da última quebra (normalmente vazio)
+        self.quadros += 1
+        if not self._ansi:
+            return texto
+        colunas, altura = shutil.get_terminal_size((80, 24))
+        cabe = len(linhas) < altura and all(largura(l) + self.FOLGA < colunas for l in linhas)
+        if self._anterior is None or not cabe:
+            self._anterior = linhas if cabe else None
+            self._linhas_usadas = len(linhas)
+            return LIMPAR + texto
+        anterior = self._anterior
+        partes = [f'\x1b[{i};1H{linha}{APAGAR_LINHA}'
+                  for i, linha in enumerate(linhas, 1)
+                  if i > len(anterior) or anterior[i - 1] != linha]
+        partes.append(f'\x1b[{len(linhas) + 1};1H{APAGAR_ABAIXO}{resto}')
+        self._anterior = linhas
+        self._linhas_usadas = len(linhas)
+        return ''.join(partes)
+
+    def _contar(self, texto: str) -> None:
+        """Acompanha as linhas usadas abaixo do quadro; se a tela rolou, o próximo é redesenhado inteiro"""
+        if not self._ansi or self._anterior is None:
+            return
+        colunas, altura = shutil.get_terminal_size((80, 24))
+        for linha in texto.split('\n')[:-1]:
+            self._linhas_usadas += 1 + max(0, largura(linha) - 1) // colunas
+        if self._linhas_usadas >= altura - 1:
+            self._anterior = None
@@ -0,0 +1 @@
+"""Testes de comportamento do LinkedIn SPA (rodar com ``python -m pytest`` na raiz do projeto)"""
@@ -0,0 +1,135 @@
+"""Roteiro de eventos e fotografia do estado usados pelos testes de persistência"""
+
+import copy
+from pathlib import Path
+from typing import Dict, List
+
+from comentarios import Comentarios
+from diario import aplicar_evento
+from grafo import GrafoSocial
+from linha_do_tempo import LinhaDoTempo
+from registros import instante_de
+from nucleo import NucleoSPA
+from repositorio import Repositorio, RepositorioJSON, RepositorioSegmentado, RepositorioSQLite
+
+BACKENDS = ('completo', 'diario', 'segmentado', 'sqlite')
+
+AGORA = '01/01/2025 10:00'
+INSTANTE = instante_de(AGORA)
+
+
+def usuario(nome: str) -> Dict:
+    return {'nome': nome, 'email': f'{nome.lower()}@example.com', 'senha': 'Segredo1', 'titulo': 'Dev',
+            'bio': 'Sem bio', 'data_criacao': AGORA, 'timestamp_criacao': INSTANTE, 'versao': 0,
+            'seguidores': [], 'seguindo': []}
+
+
+def post(id: int, autor: str, conteudo: str) -> Dict:
+    return {'id': id, 'usuario': autor, 'autor_nome': autor.capitalize(), 'conteudo': conteudo,
+            'data': AGORA, 'timestamp': INSTANTE, 'versao': 0, 'likes': [], 'comentarios': []}
+
+
+# Uma mutação de cada tipo, na ordem em que o núcleo as registraria
+EVENTOS: List[Dict] = [
+    {'op': 'registrar', 'username': 'ana', 'usuario': usuario('Ana')},
+    {'op': 'registrar', 'username': 'bia', 'usuario': usuario('Bia')},
+    {'op': 'conectar', 'origem': 'ana', 'alvo': 'bia'},
+    {'op': 'post', 'post': post(1, 'ana', 'Primeiro post')},
+    {'op': 'post', 'post': post(2, 'bia', 'Será apagado')},
+    {'op': 'curtir', 'id': 1, 'usuario': 'bia'},
+    {'op': 'curtir', 'id': 1, 'usuario': 'ana'},
+    {'op': 'descurtir', 'id': 1, 'usuario': 'ana'},
+    {'op': 'comentar', 'id': 1, 'comentario': {'id': 1, 'usuario': 'bia', 'nome': 'Bia', 'texto': 'Oi', 'data': AGORA,
+                                            'timestamp': INSTANTE}},
+    {'op': 'perfil', 'username': 'ana', 'campo': 'titulo', 'valor': 'Arquiteta'},
+    {'op': 'deletar_post', 'id': 2},
+]
+
+
+def aplicados(eventos: List[Dict]) -> Dict:
+    """Estado ({'usuarios', 'conexoes', 'posts', 'comentarios'}) resultante dos eventos, a partir do vazio"""
+    usuarios, grafo, posts, comentarios = {}, GrafoSocial(), LinhaDoTempo(), Comentarios()
+    for evento in copy.deepcopy(eventos):  # os registros dos eventos passam a fazer parte dos dados
+        aplicar_evento(usuarios, grafo, posts, comentarios, evento)
+    return fotografia(usuarios, grafo, posts, comentarios)
+
+
+def fotografia(usuarios, grafo, posts, comentarios) -> Dict:
+    """Estado no formato dos arquivos JSON, a partir do que um repositório devolve (visões preguiçosas inclusive).
+
+    A 'versao' dos registros fica de fora: o SQLite a avança a cada gravação, os arquivos só nas edições.
+    """
+    def campos(registro: Dict) -> Dict:
+        return {k: v for k, v in registro.items() if k != 'versao'}
+    posts = list(posts)
+    return {'usuarios': {u: {**campos(usuarios[u]), 'seguidores': list(grafo.seguidores(u)),
+                             'seguindo': list(grafo.seguindo(u))} for u in usuarios},
+            'conexoes': {u: list(grafo.conexoes(u)) for u in usuarios},
+            'posts': [{**campos(p), 'likes': list(grafo.curtidas(p['id']))} for p in posts],
+            'comentarios': {p['id']: [dict(c) for c in comentarios.do_post(p['id'])] for p in posts}}
+
+
+def abrir_repositorio(pasta: Path, backend: str) -> Repositorio:
+    """Repositório do backend sobre os arquivos da pasta"""
+    if backend == 'sqlite':
+        return RepositorioSQLite(pasta / 'dados.sqlite3')
+    if backend == 'segmentado':
+        return RepositorioSegmentado(pasta / 'dados_usuarios.json', pasta / 'dados_conexoes.json',
+                                     pasta / 'dados_posts.json', pasta / 'dados_posts')
+    return RepositorioJSON(pasta / 'dados_usuarios.json', pasta / 'dados_conexoes.json', pasta / 'dados_posts.json',
+                           pasta / 'dados_diario.jsonl' if backend == 'diario' else None)
+
+
+def gravar_eventos(repositorio: Repositorio, backend: str, eventos: List[Dict]) -> None:
+    """Como o sistema: aplica cada mutação em memória e a registra"""
+    if not repositorio.existe() and backend != 'sqlite':
+        repositorio.salvar({}, GrafoSocial(), LinhaDoTempo(), Comentarios())
+    usuarios, grafo, posts, comentarios = repositorio.carregar()
+    if backend == 'sqlite':
+        comentarios = Comentarios()  # o SQLite grava os comentários ao registrar; as visões só leem
+    for evento in copy.deepcopy(eventos):
+        aplicar_evento(usuarios, grafo, posts, comentarios, evento)
+        repositorio.registrar(evento)
+
+
+
+def todos_os_posts(nucleo: NucleoSPA, username: str = 'usuario1', rede: bool = False) -> List[Dict]:
+    """Percorre o feed inteiro pelas páginas com cursor"""
+    posts, cursor = [], None
+    while True:
+        pagina = nucleo.pagina_feed(username, rede, cursor)
+        if not pagina:
+            return posts
+        posts.extend(pagina)
+        cursor = pagina[-1]['id']
+
+
+def povoar(nucleo: NucleoSPA) -> Dict[str, int]:
+    """Aplica uma operação de cada tipo e devolve os ids dos posts criados"""
+    nucleo.registrar('carla_dev', 'carla@example.com', 'Segredo1', 'Carla Dias', 'Dev', 'Gosta de testes')
+    nucleo.conectar('carla_dev', 'usuario1')
+    nucleo.conectar('usuario3', 'usuario1')
+    mantido = nucleo.publicar('carla_dev', 'Primeiro post escrito pelos testes')
+    apagado = nucleo.publicar('usuario3', 'Post que vai ser apagado depois')
+    nucleo.alternar_curtida('usuario1', mantido['id'])
+    nucleo.alternar_curtida('usuario2', mantido['id'])
+    nucleo.alternar_curtida('usuario2', mantido['id'])  # descurtida
+    nucleo.comentar('usuario1', mantido['id'], 'Comentário de boas-vindas')
+    nucleo.comentar('usuario2', apagado['id'], 'Some junto com o post')
+    nucleo.editar_perfil('usuario1', 'titulo', 'Arquiteto de Testes')
+    nucleo.editar_perfil('carla_dev', 'bio', 'Bio nova')
+    nucleo.deletar_post('usuario3', apagado['id'])
+    return {'mantido': mantido['id'], 'apagado': apagado['id']}
+
+
+def estado(nucleo: NucleoSPA) -> Dict:
+    """Estado visível pelas operações públicas, em tipos simples e comparáveis"""
+    posts = todos_os_posts(nucleo)
+    return {
+        'usuarios': {u: (d['nome'], d['titulo'], d['bio']) for u, d in nucleo.usuarios.items()},
+        'conexoes': {u: sorted(nucleo.grafo.conexoes(u)) for u in nucleo.usuarios},
+        'posts': [(p['id'], p['usuario'], p['conteudo'], p['total_curtidas'], p['total_comentarios'],
+                   sorted(nucleo.grafo.curtidas(p['id']))) for p in posts],
+        'comentarios': {p['id']: [(c['usuario'], c['texto']) for c in nucleo.pagina_comentarios(p['id'], limite=100)]
+                        for p in posts},
+    }
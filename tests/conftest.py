@@ -0,0 +1,50 @@
+"""Fixtures compartilhadas: cada teste roda em uma pasta temporária própria"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nucleo import NucleoSPA  # noqa: E402
+
+MODOS = ('completo', 'diario', 'segmentado', 'sqlite')
+
+
+class Nucleos:
+    """Abre núcleos na pasta do teste e fecha, ao final, os que ficaram abertos"""
+
+    def __init__(self) -> None:
+        self.abertos: List[NucleoSPA] = []
+
+    def abrir(self, modo: str = 'completo', estrategia: Optional[str] = None) -> NucleoSPA:
+        nucleo = NucleoSPA(modo, estrategia)
+        self.abertos.append(nucleo)
+        return nucleo
+
+    def fechar(self, nucleo: NucleoSPA) -> None:
+        if nucleo in self.abertos:
+            self.abertos.remove(nucleo)
+            nucleo.fechar()
+
+    def reabrir(self, nucleo: NucleoSPA) -> NucleoSPA:
+        """Fecha o núcleo e abre outro, no mesmo modo, sobre os mesmos arquivos"""
+        self.fechar(nucleo)
+        return self.abrir(nucleo.modo_armazenamento, nucleo.feed_rede.estrategia)
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch) -> Path:
+    """Pasta de trabalho vazia (os arquivos de dados são relativos ao diretório atual)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def nucleos(pasta):
+    gerenciador = Nucleos()
+    yield gerenciador
+    for nucleo in list(gerenciador.abertos):
+        gerenciador.fechar(nucleo)
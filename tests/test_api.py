@@ -0,0 +1,197 @@
+"""API HTTP: códigos de status das rotas, sessões e leitura das requisições"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from api import ErroHTTP, Requisicao, ServidorAPI
+from nucleo import Conflito
+
+
+@pytest.fixture
+def servidor(nucleos):
+    return ServidorAPI(nucleos.abrir())
+
+
+def chamar(servidor, metodo, alvo, corpo=None, token=None, bruto=None):
+    cabecalhos = {'authorization': f'Bearer {token}'} if token else {}
+    dados = bruto if bruto is not None else (b'' if corpo is None else json.dumps(corpo).encode())
+    return asyncio.run(servidor.despachar(Requisicao(metodo, alvo, cabecalhos, dados)))
+
+
+def entrar(servidor, username='usuario1', senha='123456'):
+    status, corpo = chamar(servidor, 'POST', '/sessoes', {'username': username, 'senha': senha})
+    assert status == 201
+    return corpo['token']
+
+
+def test_cadastro_e_login(servidor):
+    novo = {'username': 'carla_dev', 'email': 'carla@example.com', 'senha': 'Segredo1', 'nome': 'Carla Dias'}
+    status, corpo = chamar(servidor, 'POST', '/usuarios', novo)
+    assert status == 201 and corpo['username'] == 'carla_dev' and corpo['posts'] == 0
+    assert chamar(servidor, 'POST', '/usuarios', novo)[0] == 400
+    assert chamar(servidor, 'POST', '/usuarios', {'username': 'x'})[0] == 400
+    assert chamar(servidor, 'POST', '/usuarios', bruto=b'{quebrado')[0] == 400
+    assert chamar(servidor, 'POST', '/usuarios', bruto=b'[1, 2]')[0] == 400
+    assert entrar(servidor, 'carla_dev', 'Segredo1')
+    assert chamar(servidor, 'POST', '/sessoes', {'username': 'carla_dev', 'senha': 'errada'})[0] == 401
+    assert chamar(servidor, 'POST', '/sessoes', {'username': 'ninguem', 'senha': 'x'})[0] == 401
+
+
+def test_rotas_autenticadas_e_logout(servidor):
+    assert chamar(servidor, 'POST', '/posts', {'conteudo': 'Sem token não publica'})[0] == 401
+    assert chamar(servidor, 'GET', '/feed', token='inventado')[0] == 401
+    token = entrar(servidor)
+    status, post = chamar(servidor, 'POST', '/posts', {'conteudo': 'Publicado pela API'}, token)
+    assert status == 201 and post['usuario'] == 'usuario1'
+    assert chamar(servidor, 'DELETE', '/sessoes', token=token) == (204, None)
+    assert chamar(servidor, 'GET', '/feed', token=token)[0] == 401
+
+
+def test_posts_curtidas_comentarios_e_remocao(servidor):
+    autor, outro = entrar(servidor, 'usuario1'), entrar(servidor, 'usuario2')
+    post_id = chamar(servidor, 'POST', '/posts', {'conteudo': 'Post para interações'}, autor)[1]['id']
+    assert chamar(servidor, 'POST', f'/posts/{post_id}/curtida', token=outro) == (200, {'curtido': True, 'curtidas': 1})
+    assert chamar(servidor, 'POST', f'/posts/{post_id}/curtida', token=outro)[1]['curtido'] is False
+    for i in range(3):
+        assert chamar(servidor, 'POST', f'/posts/{post_id}/comentarios', {'texto': f'Comentário {i}'}, outro)[0] == 201
+    status, pagina = chamar(servidor, 'GET', f'/posts/{post_id}/comentarios?limite=2')
+    assert status == 200 and [c['texto'] for c in pagina['comentarios']] == ['Comentário 0', 'Comentário 1']
+    pagina = chamar(servidor, 'GET', f"/posts/{post_id}/comentarios?limite=2&cursor={pagina['proximo_cursor']}")[1]
+    assert [c['texto'] for c in pagina['comentarios']] == ['Comentário 2'] and pagina['proximo_cursor'] is None
+    assert chamar(servidor, 'POST', f'/posts/{post_id}/comentarios', {'texto': 'x'}, outro)[0] == 400
+
+    assert chamar(servidor, 'DELETE', f'/posts/{post_id}', token=outro)[0] == 403
+    assert chamar(servidor, 'DELETE', f'/posts/{post_id}', token=autor) == (204, None)
+    assert chamar(servidor, 'GET', f'/posts/{post_id}')[0] == 404
+    assert chamar(servidor, 'POST', f'/posts/{post_id}/curtida', token=outro)[0] == 404
+
+
+def test_feed_paginado_e_conexoes(servidor):
+    token = entrar(servidor, 'usuario5')
+    assert chamar(servidor, 'POST', '/conexoes', {'alvo': 'usuario6'}, token) == (201, {'conectado': True, 'nova': True})
+    assert chamar(servidor, 'POST', '/conexoes', {'alvo': 'usuario6'}, token)[0] == 200
+    assert chamar(servidor, 'POST', '/conexoes', {'alvo': 'ninguem'}, token)[0] == 400
+    for i in range(3):
+        chamar(servidor, 'POST', '/posts', {'conteudo': f'Post da rede {i}'}, entrar(servidor, 'usuario6'))
+    primeira = chamar(servidor, 'GET', '/feed?rede=1&limite=2', token=token)[1]
+    segunda = chamar(servidor, 'GET', f"/feed?rede=1&limite=2&cursor={primeira['proximo_cursor']}", token=token)[1]
+    conteudos = [p['conteudo'] for p in primeira['posts'] + segunda['posts']]
+    assert conteudos == ['Post da rede 2', 'Post da rede 1', 'Post da rede 0']
+    assert segunda['proximo_cursor'] is None
+    assert chamar(servidor, 'GET', '/feed?limite=abc', token=token)[0] == 400
+
+
+def test_rotas_publicas_e_erros_de_rota(servidor):
+    assert chamar(servidor, 'GET', '/usuarios/usuario1')[1]['nome'] == 'João Silva'
+    assert chamar(servidor, 'GET', '/usuarios/ninguem')[0] == 404
+    assert chamar(servidor, 'GET', '/usuarios?q=joao')[1]['usuarios'][0]['username'] == 'usuario1'
+    assert chamar(servidor, 'GET', '/em-alta?janela=2h')[0] == 400
+    assert chamar(servidor, 'GET', '/em-alta?janela=7d')[0] == 200
+    assert chamar(servidor, 'GET', '/metricas')[0] == 404  # desligadas
+    assert chamar(servidor, 'GET', '/inexistente')[0] == 404
+    assert chamar(servidor, 'PUT', '/posts')[0] == 405
+
+
+def test_conflito_vira_409(servidor, monkeypatch):
+    def publicar(*_):
+        raise Conflito("Alterado por outra sessão; tente de novo")
+    monkeypatch.setattr(servidor.nucleo, 'publicar', publicar)
+    token = entrar(servidor)
+    assert chamar(servidor, 'POST', '/posts', {'conteudo': 'Perde a corrida'}, token)[0] == 409
+
+
+def test_falha_ao_gravar_vira_503(servidor, monkeypatch):
+    token = entrar(servidor)
+
+    def sem_espaco(evento):
+        raise OSError(28, 'No space left on device')
+    monkeypatch.setattr(servidor.nucleo.repositorio, 'registrar', sem_espaco)
+    status, corpo = chamar(servidor, 'POST', '/posts', {'conteudo': 'Não cabe mais no disco'}, token)
+    assert status == 503 and 'salvar' in corpo['erro']
+
+
+def test_gravacao_lenta_nao_trava_o_laco(servidor, monkeypatch):
+    registrar, threads = servidor.nucleo.repositorio.registrar, []
+
+    def registrar_lento(evento):
+        threads.append(threading.current_thread())
+        time.sleep(0.3)  # fsync/reescrita demorada
+        registrar(evento)
+    monkeypatch.setattr(servidor.nucleo.repositorio, 'registrar', registrar_lento)
+    token = entrar(servidor)
+
+    async def executar():
+        publicacao = asyncio.ensure_future(servidor.despachar(Requisicao(
+            'POST', '/posts', {'authorization': f'Bearer {token}'}, b'{"conteudo": "Gravado devagar"}')))
+        voltas = 0
+        while not publicacao.done():
+            await asyncio.sleep(0.01)
+            voltas += 1
+        return (await publicacao)[0], voltas
+    status, voltas = asyncio.run(executar())
+    assert status == 201 and voltas >= 10  # o laço seguiu rodando durante a gravação
+    assert threads and threading.main_thread() not in threads
+
+
+def test_modo_padrao_da_api_e_o_diario():
+    assert ServidorAPI.MODO_ARMAZENAMENTO == 'diario'
+
+
+def test_login_descarta_sessoes_vencidas(servidor, monkeypatch):
+    monkeypatch.setattr(servidor, 'DURACAO_SESSAO', -1)
+    vencidos = [entrar(servidor) for _ in range(3)]
+    monkeypatch.setattr(servidor, 'DURACAO_SESSAO', 3600)
+    valido = entrar(servidor)
+    assert list(servidor._sessoes) == [valido]
+    assert chamar(servidor, 'GET', '/feed', token=vencidos[0])[0] == 401
+    assert chamar(servidor, 'GET', '/feed', token=valido)[0] == 200
+
+
+def ler(servidor, dados: bytes, fim: bool = True):
+    async def executar():
+        leitor = asyncio.StreamReader()
+        leitor.feed_data(dados)
+        if fim:
+            leitor.feed_eof()
+        return await servidor._ler_requisicao(leitor)
+    return asyncio.run(executar())
+
+
+def test_leitura_da_requisicao(servidor, monkeypatch):
+    req = ler(servidor, b'POST /posts?x=1 HTTP/1.1\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}')
+    assert (req.metodo, req.caminho, req.query, req.corpo) == ('POST', '/posts', {'x': '1'}, b'{}')
+    assert req.cabecalhos['connection'] == 'close'
+    assert ler(servidor, b'') is None  # cliente fechou
+
+    for cabecalho, status in ((b'Content-Length: -1', 400), (b'Content-Length: abc', 400),
+                              (b'Content-Length: 999999', 413), (b'Transfer-Encoding: chunked', 501)):
+        with pytest.raises(ErroHTTP) as erro:
+            ler(servidor, b'POST /posts HTTP/1.1\r\n' + cabecalho + b'\r\n\r\n')
+        assert erro.value.status == status
+
+    monkeypatch.setattr(servidor, 'TEMPO_CORPO', 0.05)
+    with pytest.raises(ErroHTTP) as erro:
+        ler(servidor, b'POST /posts HTTP/1.1\r\nContent-Length: 10\r\n\r\n{"a"', fim=False)
+    assert erro.value.status == 408
+
+
+def test_conexao_mantida_atende_varias_requisicoes(servidor):
+    async def executar():
+        pronto = asyncio.get_running_loop().create_future()
+        tarefa = asyncio.create_task(servidor.servir('127.0.0.1', 0, pronto.set_result))
+        leitor, escritor = await asyncio.open_connection('127.0.0.1', await pronto)
+        respostas = []
+        for alvo in ('/posts/1', '/posts/999'):
+            escritor.write(f'GET {alvo} HTTP/1.1\r\nHost: teste\r\n\r\n'.encode())
+            cabecalho = (await leitor.readuntil(b'\r\n\r\n')).decode()
+            tamanho = int(cabecalho.split('Content-Length: ')[1].split('\r\n')[0])
+            respostas.append((cabecalho.split(' ')[1], json.loads(await leitor.readexactly(tamanho))))
+        escritor.close()
+        tarefa.cancel()
+        return respostas
+    (status1, post), (status2, erro) = asyncio.run(executar())
+    assert (status1, post['id'], status2) == ('200', 1, '404') and 'erro' in erro
@@ -0,0 +1,110 @@
+"""Busca de posts: termos, radical, ranking BM25, filtros e o índice gravado em dados_busca.json"""
+
+import pytest
+
+import nucleo as modulo_nucleo
+from busca_posts import IndicePosts, radical, termos
+from nucleo import NaoEncontrado
+from tests.conftest import MODOS
+
+
+@pytest.mark.parametrize('palavra, esperado', [
+    ('projetos', 'projeto'), ('acoes', 'acao'), ('capitaes', 'capitao'), ('animais', 'animal'), ('papeis', 'papel'),
+    ('lencois', 'lencol'), ('flores', 'flor'), ('luzes', 'luz'), ('homens', 'homem'), ('livres', 'livre'),
+    ('dados', 'dado'), ('lapis', 'lapis'), ('onibus', 'onibus'), ('gas', 'gas'), ('2025', '2025'),
+])
+def test_radical(palavra, esperado):
+    assert radical(palavra) == esperado
+
+
+def test_termos_sem_acento_nem_palavras_vazias():
+    assert termos('Os Projetos de Python são ÓTIMOS, e 3 ações!') == ['projeto', 'python', 'otimo', '3', 'acao']
+
+
+def _post(id, usuario, conteudo, timestamp=0.0):
+    return {'id': id, 'usuario': usuario, 'conteudo': conteudo, 'timestamp': timestamp}
+
+
+def test_bm25_frequencia_comprimento_e_raridade():
+    indice = IndicePosts.montar([
+        _post(1, 'ana', 'python python python agora'),
+        _post(2, 'bia', 'python hoje'),
+        _post(3, 'ana', 'python com muitas outras palavras que diluem o termo buscado aqui'),
+        _post(4, 'bia', 'rust hoje'),
+    ], [(4, {'texto': 'e python também'})])
+    assert [i for i, _ in indice.buscar('python')] == [1, 2, 4, 3]
+    escores = dict(indice.buscar('rust python'))
+    assert escores[4] > escores[1]  # o termo raro pesa mais
+    assert [i for i, _ in indice.buscar('Python', autor='ana')] == [1, 3]
+    assert indice.buscar('python', limite=1)[0][0] == 1 and indice.buscar('inexistente') == []
+
+
+def test_empate_favorece_o_mais_recente_e_filtros_de_periodo():
+    indice = IndicePosts.montar([_post(i, 'ana', 'vaga aberta', 100.0 * i) for i in range(1, 5)], [])
+    assert [i for i, _ in indice.buscar('vagas')] == [4, 3, 2, 1]
+    assert [i for i, _ in indice.buscar('vaga', inicio=200, fim=300)] == [3, 2]
+
+
+def test_eventos_mantem_o_indice():
+    indice = IndicePosts()
+    indice.aplicar({'op': 'post', 'post': _post(1, 'ana', 'primeiro')})
+    indice.aplicar({'op': 'post', 'post': _post(2, 'ana', 'segundo')})
+    indice.aplicar({'op': 'comentar', 'id': 2, 'comentario': {'texto': 'comentário sobre o primeiro'}})
+    assert [i for i, _ in indice.buscar('primeiro')] == [1, 2]
+    indice.aplicar({'op': 'deletar_post', 'id': 1})
+    assert [i for i, _ in indice.buscar('primeiro')] == [2] and len(indice) == 1
+
+
+def test_gravar_e_carregar_com_marca(tmp_path):
+    indice = IndicePosts.montar([_post(1, 'ana', 'dados salvos'), _post(2, 'bia', 'outros dados')], [])
+    arquivo = tmp_path / 'dados_busca.json'
+    indice.gravar(arquivo, (2, 2, 0))
+    assert not indice.alterado
+    carregado = IndicePosts.carregar(arquivo, (2, 2, 0))
+    assert carregado.buscar('dado') == indice.buscar('dado')
+    carregado.remover_post(1)
+    assert [i for i, _ in carregado.buscar('dado')] == [2]
+    assert IndicePosts.carregar(arquivo, (3, 3, 0)) is None
+    arquivo.write_text('{corrompido', encoding='utf-8')
+    assert IndicePosts.carregar(arquivo, (2, 2, 0)) is None
+    assert IndicePosts.carregar(tmp_path / 'nada.json', (2, 2, 0)) is None
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_busca_no_nucleo(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    antigo = nucleo.publicar('usuario3', 'Vagas abertas para projetos de dados')
+    novo = nucleo.publicar('usuario1', 'Procuro projeto com Python')
+    apagado = nucleo.publicar('usuario1', 'Projeto que será apagado')
+    nucleo.comentar('usuario2', antigo['id'], 'Tenho interesse em python')
+    nucleo.deletar_post('usuario1', apagado['id'])
+
+    encontrados = [p['id'] for p, _ in nucleo.buscar_posts('projetos python')]
+    assert set(encontrados) == {antigo['id'], novo['id']}
+    assert [p['id'] for p, _ in nucleo.buscar_posts('python', autor='usuario3')] == [antigo['id']]
+    assert [p['id'] for p, _ in nucleo.buscar_posts('projeto', desde=novo['timestamp'])] == [novo['id']]
+    assert [p['id'] for p, _ in nucleo.buscar_posts('projeto', ate=antigo['timestamp'])] == [antigo['id']]
+    with pytest.raises(NaoEncontrado):
+        nucleo.buscar_posts('python', autor='ninguem')
+
+    nucleo = nucleos.reabrir(nucleo)
+    assert set(p['id'] for p, _ in nucleo.buscar_posts('projetos python')) == {antigo['id'], novo['id']}
+
+
+def test_indice_gravado_e_reaproveitado(nucleos, pasta):
+    nucleo = nucleos.abrir()
+    post = nucleo.publicar('usuario2', 'Índice gravado ao fechar')
+    assert [p['id'] for p, _ in nucleo.buscar_posts('indice')] == [post['id']]
+    nucleo.comentar('usuario1', post['id'], 'Comentário indexado também')
+    nucleo = nucleos.reabrir(nucleo)
+    assert (pasta / 'dados_busca.json').exists()
+
+    def nao_remontar(*_):
+        raise AssertionError('índice remontado apesar da marca conferir')
+    with pytest.MonkeyPatch.context() as remendo:
+        remendo.setattr(modulo_nucleo, 'montar_indice_posts', nao_remontar)
+        assert [p['id'] for p, _ in nucleo.buscar_posts('comentarios indexados')] == [post['id']]
+
+    outro = nucleos.reabrir(nucleo)
+    outro.publicar('usuario3', 'Post novo indexado')  # o índice gravado confere com o estado anterior
+    assert len(outro.buscar_posts('indexado')) == 2
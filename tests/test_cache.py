@@ -0,0 +1,58 @@
+"""Cache LRU e a invalidação seletiva feita pelos eventos do sistema"""
+
+from cache import CacheLRU
+
+
+def test_despeja_a_entrada_menos_usada():
+    cache = CacheLRU(2)
+    cache.obter('a', lambda: 1)
+    cache.obter('b', lambda: 2)
+    cache.obter('a', lambda: 0)  # 'a' passa a ser a mais recente
+    cache.obter('c', lambda: 3)
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.estatisticas() == {'entradas': 2, 'capacidade': 2, 'acertos': 1, 'falhas': 3, 'despejos': 1,
+                                    'taxa_acerto': 0.25}
+
+
+def test_carregar_so_roda_na_falha_e_invalidar_descarta():
+    cache, chamadas = CacheLRU(), []
+
+    def carregar():
+        chamadas.append(1)
+        return len(chamadas)
+
+    assert cache.obter('x', carregar) == 1
+    assert cache.obter('x', carregar) == 1
+    cache.invalidar('x', 'inexistente')
+    assert cache.obter('x', carregar) == 2
+    cache.limpar()
+    assert len(cache) == 0 and cache.falhas == 2
+
+
+def test_estatisticas_do_perfil_acompanham_conexoes_e_posts(nucleos):
+    nucleo = nucleos.abrir()
+    conexoes, _, _, posts = nucleo._obter_estatisticas_perfil('usuario5')
+    conexoes_alvo = nucleo._obter_estatisticas_perfil('usuario9')[0]
+    nucleo.conectar('usuario5', 'usuario9')
+    nucleo.publicar('usuario5', 'Post que muda o perfil')
+    assert nucleo._obter_estatisticas_perfil('usuario5')[0] == conexoes + 1
+    assert nucleo._obter_estatisticas_perfil('usuario5')[3] == posts + 1
+    assert nucleo._obter_estatisticas_perfil('usuario9')[0] == conexoes_alvo + 1
+
+
+def test_mutacao_de_um_autor_mantem_o_cache_dos_outros(nucleos):
+    nucleo = nucleos.abrir()
+    nucleo._obter_posts_usuario('usuario1')
+    nucleo._obter_posts_usuario('usuario2')
+    nucleo.publicar('usuario1', 'Post que invalida só o autor')
+    assert 'usuario2' in nucleo._cache_posts and 'usuario1' not in nucleo._cache_posts
+    assert [p['conteudo'] for p in nucleo._obter_posts_usuario('usuario1')][0] == 'Post que invalida só o autor'
+
+
+def test_busca_fica_em_cache_ate_um_registro(nucleos):
+    nucleo = nucleos.abrir()
+    assert [u for u, _ in nucleo.buscar('joão')] == ['usuario1']
+    nucleo.buscar('joão')
+    assert nucleo._cache_busca.acertos == 1
+    nucleo.registrar('nova', 'nova@example.com', 'Segredo1', 'Nova Pessoa')
+    assert len(nucleo._cache_busca) == 0
@@ -0,0 +1,90 @@
+"""Comentários fora dos posts: ids por post, páginas por cursor, totais e formato antigo"""
+
+import json
+
+import pytest
+
+from comentarios import Comentarios
+from nucleo import ErroDominio, NaoEncontrado, NucleoSPA
+from registros import Comentario
+from tests.conftest import MODOS
+
+
+def _comentario(texto):
+    return Comentario('usuario1', 'João Silva', texto, '01/01/2025 10:00')
+
+
+def test_ids_crescem_dentro_do_post_e_paginas_seguem_o_cursor():
+    comentarios = Comentarios()
+    for i in range(7):
+        comentarios.adicionar(3, _comentario(f'c{i}'))
+    comentarios.adicionar(1, _comentario('outro post'))
+    assert [c['id'] for c in comentarios.do_post(3)] == list(range(1, 8))
+    primeira = comentarios.pagina(3, limite=3)
+    segunda = comentarios.pagina(3, primeira[-1]['id'], 3)
+    assert [c['texto'] for c in primeira + segunda] == ['c0', 'c1', 'c2', 'c3', 'c4', 'c5']
+    assert [c['texto'] for c in comentarios.pagina(3, 6, 3)] == ['c6'] and comentarios.pagina(3, 7) == []
+    assert comentarios.pagina(99) == [] and comentarios.total(99) == 0
+    assert comentarios.quantidade() == 8 and [p for p, _ in comentarios.itens()][:2] == [1, 3]
+    assert len(comentarios.remover_post(3)) == 7 and comentarios.quantidade() == 1
+
+
+def test_json_e_formato_antigo():
+    comentarios = Comentarios()
+    comentarios.adicionar(2, _comentario('guardado'))
+    copia = Comentarios.de_json(json.loads(json.dumps(comentarios.para_json(), default=lambda r: r.para_json())))
+    assert copia.para_json() == {'2': [dict(_comentario('guardado').para_json(), id=1)]}
+
+    posts = [{'id': 5, 'comentarios': [{'usuario': 'usuario2', 'nome': 'Maria', 'texto': 'antigo', 'data': '01/01/2025 10:00'}]},
+             {'id': 6}]
+    novos = Comentarios()
+    assert novos.separar(posts) and 'comentarios' not in posts[0] and posts[0]['total_comentarios'] == 1
+    assert not Comentarios().separar([{'id': 6}])
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_comentarios_no_nucleo(nucleos, modo, monkeypatch):
+    monkeypatch.setattr(NucleoSPA, 'PAGINA_COMENTARIOS', 4)
+    nucleo = nucleos.abrir(modo)
+    post = nucleo.publicar('usuario2', 'Post para muitos comentários')
+    for i in range(10):
+        nucleo.comentar('usuario1' if i % 2 else 'usuario3', post['id'], f'Comentário {i}')
+    with pytest.raises(ErroDominio):
+        nucleo.comentar('usuario1', post['id'], ' x ')
+    with pytest.raises(NaoEncontrado):
+        nucleo.pagina_comentarios(9999)
+    assert nucleo.post(post['id'])['total_comentarios'] == 10
+
+    nucleo = nucleos.reabrir(nucleo)
+    textos, cursor = [], None
+    while True:
+        pagina = nucleo.pagina_comentarios(post['id'], cursor)
+        if not pagina:
+            break
+        assert len(pagina) <= 4
+        textos += [c['texto'] for c in pagina]
+        cursor = pagina[-1]['id']
+    assert textos == [f'Comentário {i}' for i in range(10)]
+    assert nucleo.post(post['id'])['total_comentarios'] == 10
+    assert nucleo.pagina_comentarios(post['id'])[0]['nome'] == nucleo.usuario('usuario3')['nome']
+
+    nucleo.deletar_post('usuario2', post['id'])
+    nucleo = nucleos.reabrir(nucleo)
+    assert nucleo.comentarios.total(post['id']) == 0
+
+
+def test_posts_antigos_com_comentarios_embutidos(nucleos, pasta):
+    nucleos.fechar(nucleos.abrir())
+    posts = json.loads((pasta / 'dados_posts.json').read_text(encoding='utf-8'))
+    posts[0]['comentarios'] = [{'usuario': 'usuario2', 'nome': 'Maria Santos', 'texto': 'Do formato antigo',
+                                'data': '01/01/2025 10:00'}]
+    (pasta / 'dados_posts.json').write_text(json.dumps(posts), encoding='utf-8')
+    (pasta / 'dados_comentarios.json').unlink(missing_ok=True)
+
+    nucleo = nucleos.abrir()
+    post_id = posts[0]['id']
+    assert nucleo.post(post_id)['total_comentarios'] == 1
+    nucleo.comentar('usuario1', post_id, 'Depois da migração')
+    nucleo = nucleos.reabrir(nucleo)
+    assert [c['texto'] for c in nucleo.pagina_comentarios(post_id)] == ['Do formato antigo', 'Depois da migração']
+    assert 'comentarios' not in json.loads((pasta / 'dados_posts.json').read_text(encoding='utf-8'))[0]
@@ -0,0 +1,78 @@
+"""Vários processos na mesma pasta: mescla das gravações, conflito de versão e trava do diário"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from nucleo import Conflito, NucleoSPA
+from travas import TravaOcupada
+from tests.auxiliares import todos_os_posts
+
+POR_PROCESSO = 15
+
+
+def _escritor(pasta, modo, indice, largada, fila):
+    os.chdir(pasta)
+    nucleo = NucleoSPA(modo)
+    largada.wait()
+    ids = []
+    for i in range(POR_PROCESSO):
+        ids.append(nucleo.publicar(f'usuario{indice + 3}', f'Post {i} do processo {indice}')['id'])
+        nucleo.comentar(f'usuario{indice + 3}', 1, f'Comentário {i} do processo {indice}')
+    nucleo.fechar()
+    fila.put(ids)
+
+
+@pytest.mark.parametrize('modo', ('completo', 'sqlite'))
+def test_dois_processos_gravando_nao_perdem_nada(nucleos, pasta, modo):
+    nucleos.fechar(nucleos.abrir(modo))  # cria os dados antes da largada
+    contexto = multiprocessing.get_context('fork')
+    largada, fila = contexto.Barrier(2), contexto.Queue()
+    processos = [contexto.Process(target=_escritor, args=(str(pasta), modo, i, largada, fila)) for i in range(2)]
+    for processo in processos:
+        processo.start()
+    ids = [i for _ in processos for i in fila.get(timeout=120)]
+    for processo in processos:
+        processo.join(timeout=120)
+        assert processo.exitcode == 0
+
+    nucleo = nucleos.abrir(modo)
+    assert len(set(ids)) == len(ids) == 2 * POR_PROCESSO
+    gravados = {p['id']: p['conteudo'] for p in todos_os_posts(nucleo)}
+    assert set(ids) <= set(gravados)
+    textos = [c['texto'] for c in nucleo.pagina_comentarios(1, limite=100)]
+    assert len(textos) == len(set(textos)) == 2 * POR_PROCESSO
+    assert nucleo.post(1)['total_comentarios'] == 2 * POR_PROCESSO
+
+
+@pytest.mark.parametrize('modo', ('completo', 'sqlite'))
+def test_gravacao_sobre_dados_alheios_mescla_e_recarrega(nucleos, modo):
+    a, b = nucleos.abrir(modo), nucleos.abrir(modo)
+    b.publicar('usuario2', 'Post de B sem concorrência')
+    assert b.recargas == 0  # nada de outro processo: sem recarga
+    primeiro = a.publicar('usuario1', 'Post de A')
+    segundo = b.publicar('usuario2', 'Post de B depois de A')
+    assert primeiro['id'] != segundo['id']
+    assert b.recargas == 1 and b.post(primeiro['id'])['conteudo'] == 'Post de A'
+    assert a.atualizar() and a.post(segundo['id'])['conteudo'] == 'Post de B depois de A'
+
+
+@pytest.mark.parametrize('modo', ('completo', 'sqlite'))
+def test_edicao_de_perfil_sobre_versao_antiga_e_recusada(nucleos, modo):
+    a, b = nucleos.abrir(modo), nucleos.abrir(modo)
+    assert b.usuario('usuario1')['titulo'] != 'Título de A'  # B leu o perfil antes da edição de A
+    a.editar_perfil('usuario1', 'titulo', 'Título de A')
+    with pytest.raises(Conflito):
+        b.editar_perfil('usuario1', 'titulo', 'Título de B')
+    assert b.usuario('usuario1')['titulo'] == 'Título de A'  # o conflito recarregou o estado
+    b.editar_perfil('usuario1', 'titulo', 'Título de B')
+    assert a.atualizar() and a.usuario('usuario1')['titulo'] == 'Título de B'
+
+
+def test_modo_diario_usa_a_pasta_com_exclusividade(nucleos):
+    primeiro = nucleos.abrir('diario')
+    with pytest.raises(TravaOcupada):
+        NucleoSPA('diario')
+    nucleos.fechar(primeiro)
+    nucleos.abrir('diario')  # liberada ao fechar
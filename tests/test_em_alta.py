@@ -0,0 +1,109 @@
+"""Posts em alta: escore com decaimento, expiração das janelas e manutenção pelos eventos"""
+
+import pytest
+
+from em_alta import JanelaEmAlta, RankingEmAlta, _Interacao
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio():
+    return Relogio()
+
+
+@pytest.fixture
+def ranking(relogio):
+    return RankingEmAlta({'curta': 100, 'longa': 1000}, relogio=relogio)
+
+
+def ids(top):
+    return [post_id for post_id, _ in top]
+
+
+def test_comentario_pesa_o_dobro_da_curtida(ranking):
+    ranking.curtir(1, 'ana')
+    ranking.curtir(1, 'bia')
+    ranking.comentar(2)
+    ranking.curtir(2, 'caio')
+    assert ranking.top('curta') == [(2, 3.0), (1, 2.0)]
+    assert ranking.top('curta', k=1) == [(2, 3.0)]
+
+
+def test_interacoes_saem_da_janela_curta_e_decaem_na_longa(ranking, relogio):
+    ranking.curtir(1, 'ana')
+    ranking.comentar(2)
+    relogio.agora = 150.0
+    assert ranking.top('curta') == []
+    meia_vida = 1000 * RankingEmAlta.FRACAO_MEIA_VIDA
+    assert ranking.top('longa') == [(2, pytest.approx(2.0 * 2 ** (-150 / meia_vida))),
+                                    (1, pytest.approx(2 ** (-150 / meia_vida)))]
+    ranking.curtir(1, 'bia')
+    assert ranking.top('curta') == [(1, 1.0)]
+    relogio.agora = 1100.0
+    assert ranking.top('longa') == [(1, pytest.approx(2 ** (-950 / meia_vida)))]
+
+
+def test_interacao_recente_vale_mais_que_antiga(ranking, relogio):
+    ranking.curtir(3, 'ana')
+    relogio.agora = 200.0
+    ranking.curtir(4, 'ana')
+    assert ids(ranking.top('longa')) == [4, 3]
+
+
+def test_descurtir_e_apagar_post(ranking, relogio):
+    ranking.curtir(1, 'ana')
+    ranking.curtir(1, 'bia')
+    ranking.curtir(2, 'ana')
+    ranking.descurtir(1, 'ana')
+    ranking.descurtir(1, 'ana')  # segunda vez não desconta de novo
+    assert ranking.top('curta') == [(2, 1.0), (1, 1.0)]
+    ranking.remover_post(2)
+    assert ids(ranking.top('longa')) == [1]
+    ranking.descurtir(1, 'bia')
+    assert ranking.top('longa') == []
+    relogio.agora = 2000.0
+    assert ranking.top('longa') == []  # a expiração ignora as já descontadas
+
+
+def test_carregar_equivale_aos_eventos(relogio):
+    posts = [{'id': 1, 'timestamp': 10.0}, {'id': 2, 'timestamp': 20.0}]
+    curtidas = {1: ['ana', 'bia'], 2: ['ana']}
+    carregado = RankingEmAlta({'curta': 100}, relogio=relogio)
+    carregado.carregar(posts, [(2, {'timestamp': 30.0})], curtidas.get)
+    por_eventos = RankingEmAlta({'curta': 100}, relogio=relogio)
+    por_eventos.curtir(1, 'ana', 10.0)
+    por_eventos.curtir(1, 'bia', 10.0)
+    por_eventos.curtir(2, 'ana', 20.0)
+    por_eventos.comentar(2, 30.0)
+    relogio.agora = 40.0
+    assert carregado.top('curta') == pytest.approx(por_eventos.top('curta'))
+
+
+def test_rebase_evita_estouro_com_meia_vida_curta():
+    janela = JanelaEmAlta(duracao=10_000, meia_vida=1)
+    janela.adicionar(_Interacao(0.0, 1, 1.0))
+    janela.adicionar(_Interacao(2000.0, 2, 1.0))  # 2 ** 2000 estouraria um float
+    janela.adicionar(_Interacao(2001.0, 2, 1.0))
+    assert janela.top(2, 2001.0) == [(2, pytest.approx(1.5)), (1, pytest.approx(0.0))]
+
+
+def test_nucleo_mantem_o_ranking_pelos_eventos(nucleos):
+    nucleo = nucleos.abrir()
+    assert [p['id'] for p, _ in nucleo.posts_em_alta('1h')] == [2]  # curtida dos dados de demonstração
+    post = nucleo.publicar('usuario3', 'Post que vai bombar')
+    for usuario in ('usuario4', 'usuario5', 'usuario6'):
+        nucleo.alternar_curtida(usuario, post['id'])
+    nucleo.comentar('usuario6', 1, 'Comentário em post antigo')
+    assert [(p['id'], escore) for p, escore in nucleo.posts_em_alta('1h')] == [
+        (post['id'], pytest.approx(3.0, rel=1e-3)), (1, pytest.approx(2.0, rel=1e-3)), (2, pytest.approx(1.0, rel=1e-3))]
+    nucleo.alternar_curtida('usuario4', post['id'])
+    nucleo.alternar_curtida('usuario5', post['id'])
+    nucleo.deletar_post('usuario1', 1)
+    assert [p['id'] for p, _ in nucleo.posts_em_alta('1h')] == [post['id'], 2]  # uma curtida cada; a mais nova vale mais
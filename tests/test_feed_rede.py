@@ -0,0 +1,53 @@
+"""Feed da rede: as três estratégias devolvem os mesmos posts, na mesma ordem"""
+
+import pytest
+
+from feed_rede import FeedRede
+from nucleo import NucleoSPA
+from tests.auxiliares import todos_os_posts
+
+
+def esperado(nucleo, username):
+    rede = nucleo._rede_de(username)
+    return [p['id'] for p in todos_os_posts(nucleo) if p['usuario'] in rede]
+
+
+def feed(nucleo, username):
+    return [p['id'] for p in todos_os_posts(nucleo, username, rede=True)]
+
+
+@pytest.mark.parametrize('estrategia', FeedRede.ESTRATEGIAS)
+def test_feed_segue_publicacoes_conexoes_e_remocoes(nucleos, monkeypatch, estrategia):
+    monkeypatch.setattr(NucleoSPA, 'TAMANHO_CAIXA', 4)  # caixas pequenas: o piso e a reserva entram em jogo
+    monkeypatch.setattr(NucleoSPA, 'LIMITE_CELEBRIDADE', 3)
+    nucleo = nucleos.abrir('completo', estrategia)
+    for seguidor in ('usuario10', 'usuario11', 'usuario12', 'usuario13'):
+        nucleo.conectar(seguidor, 'usuario4')  # usuario4 vira celebridade no híbrido
+    assert feed(nucleo, 'usuario1') == esperado(nucleo, 'usuario1')  # materializa a caixa
+
+    publicados = []
+    for i in range(6):
+        for autor in ('usuario1', 'usuario2', 'usuario4', 'usuario7'):
+            publicados.append(nucleo.publicar(autor, f'Post {i} de {autor}'))
+    assert feed(nucleo, 'usuario1') == esperado(nucleo, 'usuario1')
+    assert not {p['id'] for p in publicados if p['usuario'] == 'usuario7'} & set(feed(nucleo, 'usuario1'))
+
+    nucleo.conectar('usuario1', 'usuario7')  # posts antigos do novo contato entram no feed
+    nucleo.conectar('usuario1', 'usuario4')
+    nucleo.deletar_post('usuario2', publicados[-3]['id'])
+    assert feed(nucleo, 'usuario1') == esperado(nucleo, 'usuario1')
+    assert feed(nucleo, 'usuario7') == esperado(nucleo, 'usuario7')
+
+
+@pytest.mark.parametrize('estrategia', FeedRede.ESTRATEGIAS)
+def test_paginas_do_feed_com_cursor(nucleos, estrategia):
+    nucleo = nucleos.abrir('completo', estrategia)
+    for i in range(7):
+        nucleo.publicar('usuario2', f'Post {i} da conexão')
+        nucleo.publicar('usuario9', f'Post {i} de fora da rede')
+    ids = esperado(nucleo, 'usuario1')
+    primeira = nucleo.pagina_feed('usuario1', rede=True)
+    segunda = nucleo.pagina_feed('usuario1', rede=True, cursor=primeira[-1]['id'])
+    assert [p['id'] for p in primeira + segunda] == ids[:10]
+    linha = nucleo.linha_feed('usuario1', rede=True)
+    assert [p['id'] for p in linha.depois(ids[7], 3)] == ids[4:7]
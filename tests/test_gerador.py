@@ -0,0 +1,62 @@
+"""Gerador de redes sintéticas e utilitários do benchmark"""
+
+from collections import Counter
+
+import benchmark
+from gerador import GeradorRede
+
+AGORA = 1_750_000_000.0
+
+
+def test_mesma_semente_gera_os_mesmos_registros():
+    primeiro = list(GeradorRede(200, semente=7, agora=AGORA).registros())
+    assert primeiro == list(GeradorRede(200, semente=7, agora=AGORA).registros())
+    assert primeiro != list(GeradorRede(200, semente=8, agora=AGORA).registros())
+
+
+def test_registros_sao_consistentes():
+    gerador = GeradorRede(300, semente=3, agora=AGORA)
+    registros = list(gerador.registros())
+    tipos = Counter(tipo for tipo, _ in registros)
+    assert tipos['usuario'] == 300 and tipos['post'] == 300
+    usernames = {r['username'] for t, r in registros if t == 'usuario'}
+    posts = [r for t, r in registros if t == 'post']
+    assert [p['id'] for p in posts] == list(range(1, 301))
+    assert all(gerador.inicio <= p['timestamp'] <= AGORA for p in posts)
+    assert [p['timestamp'] for p in posts] == sorted(p['timestamp'] for p in posts)
+    for tipo, registro in registros:
+        if tipo == 'conexao':
+            assert registro['origem'] in usernames and registro['alvo'] in usernames
+            assert registro['origem'] != registro['alvo']
+        elif tipo in ('curtida', 'comentario'):
+            assert 1 <= registro['post_id'] <= 300 and registro['usuario'] in usernames
+
+
+def test_graus_concentrados_nos_primeiros_usuarios():
+    conexoes = Counter()
+    for tipo, registro in GeradorRede(2000, semente=1, agora=AGORA).registros():
+        if tipo == 'conexao':
+            conexoes[registro['origem']] += 1
+            conexoes[registro['alvo']] += 1
+    graus = sorted(conexoes.values(), reverse=True)
+    assert graus[0] > 10 * GeradorRede.CONEXOES_POR_USUARIO  # hubs da ligação preferencial
+    assert graus[len(graus) // 2] <= 2 * GeradorRede.CONEXOES_POR_USUARIO
+
+
+def test_importar_no_nucleo(nucleos):
+    nucleo = nucleos.abrir('sqlite')
+    contagem = GeradorRede(50, semente=2).importar(nucleo, tamanho_lote=40)
+    assert contagem['usuario'] == 50 and contagem['rejeitados'] == 0
+    nucleo = nucleos.reabrir(nucleo)
+    nucleo.autenticar('membro0', GeradorRede.SENHA)
+    assert len(nucleo.grafo.conexoes('membro0')) >= GeradorRede.CONEXOES_POR_USUARIO
+
+
+def test_resumo_e_comparacao_do_benchmark():
+    resumo = benchmark._resumo([0.004, 0.001, 0.002, 0.003])
+    assert resumo == {'repeticoes': 4, 'mediana_ms': 3.0, 'p99_ms': 4.0, 'ops_por_s': 400.0}
+    anteriores = [{'benchmark': 'escala', 'modo': 'sqlite', 'mediana_ms': 2.0}]
+    atuais = [{'benchmark': 'escala', 'modo': 'sqlite', 'mediana_ms': 3.0},
+              {'benchmark': 'escala', 'modo': 'diario', 'mediana_ms': 1.0}]
+    linhas = benchmark.comparar(atuais, anteriores)
+    assert len(linhas) == 1 and 'modo=sqlite' in linhas[0] and 'mediana_ms=1.50x' in linhas[0]
@@ -0,0 +1,52 @@
+"""Grafo social: conexões, seguidores e curtidas em uma única estrutura"""
+
+import pytest
+
+from grafo import GrafoSocial
+from nucleo import ErroDominio
+
+
+def test_conectar_e_simetrico_e_seguir_e_direcionado():
+    grafo = GrafoSocial()
+    assert grafo.conectar('ana', 'bia')
+    assert not grafo.conectar('bia', 'ana')  # já conectadas
+    assert grafo.conectados('ana', 'bia') and grafo.conectados('bia', 'ana')
+    assert list(grafo.seguindo('ana')) == ['bia'] and list(grafo.seguidores('bia')) == ['ana']
+    assert list(grafo.seguindo('bia')) == [] and list(grafo.conexoes('caio')) == []
+
+
+def test_curtidas_sem_duplicar():
+    grafo = GrafoSocial()
+    assert grafo.curtir(1, 'ana') and not grafo.curtir(1, 'ana')
+    grafo.curtir(1, 'bia')
+    assert grafo.total_curtidas(1) == 2 and grafo.curtiu(1, 'bia')
+    assert grafo.descurtir(1, 'ana') and not grafo.descurtir(1, 'ana')
+    grafo.remover_post(1)
+    assert grafo.total_curtidas(1) == 0 and not grafo.descurtir(1, 'bia')
+
+
+def test_formato_json_ida_e_volta():
+    grafo = GrafoSocial()
+    for nome in ('ana', 'bia', 'caio'):
+        grafo.adicionar_usuario(nome)
+    grafo.conectar('ana', 'bia')
+    grafo.conectar('caio', 'ana')
+    grafo.curtir(7, 'caio')
+    usuarios = grafo.usuarios_json({nome: {'nome': nome.title()} for nome in ('ana', 'bia', 'caio')})
+    posts = [grafo.post_json({'id': 7})]
+    assert posts == [{'id': 7, 'likes': ['caio']}]
+    relido = GrafoSocial.de_json(usuarios, grafo.conexoes_json(), posts)
+    assert 'seguindo' not in usuarios['ana'] and 'likes' not in posts[0]  # listas retiradas na leitura
+    for nome in ('ana', 'bia', 'caio'):
+        assert set(relido.conexoes(nome)) == set(grafo.conexoes(nome))
+        assert set(relido.seguidores(nome)) == set(grafo.seguidores(nome))
+    assert list(relido.curtidas(7)) == ['caio']
+
+
+def test_nucleo_recusa_conexao_invalida(nucleos):
+    nucleo = nucleos.abrir()
+    with pytest.raises(ErroDominio):
+        nucleo.conectar('usuario1', 'usuario1')
+    with pytest.raises(ErroDominio):
+        nucleo.conectar('usuario1', 'ninguem')
+    assert nucleo.conectar('usuario1', 'usuario8') and not nucleo.conectar('usuario8', 'usuario1')
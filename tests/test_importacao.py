@@ -0,0 +1,100 @@
+"""Importação e exportação em massa: validação por registro, lotes e ida e volta dos formatos"""
+
+import json
+
+import pytest
+
+import importacao
+from importacao import Importador, exportar, ler
+from tests.auxiliares import povoar
+from tests.conftest import MODOS
+
+REGISTROS = [
+    {'tipo': 'usuario', 'username': 'pessoa1', 'nome': 'Pessoa Um', 'email': 'p1@example.com', 'senha': 'Senha123'},
+    {'tipo': 'usuario', 'username': 'pessoa2', 'nome': 'Pessoa Dois', 'email': 'p2@example.com', 'senha': 'Senha123',
+     'data_criacao': '01/02/2024 10:30'},
+    {'tipo': 'usuario', 'username': 'pessoa3', 'nome': 'Pessoa Três', 'email': 'p1@example.com', 'senha': 'x'},
+    {'tipo': 'usuario', 'username': 'p', 'nome': 'Curto', 'email': 'p4@example.com', 'senha': 'x'},
+    {'tipo': 'conexao', 'origem': 'pessoa1', 'alvo': 'pessoa2'},
+    {'tipo': 'conexao', 'origem': 'pessoa2', 'alvo': 'pessoa1'},  # já conectados: aceito sem evento
+    {'tipo': 'conexao', 'origem': 'pessoa1', 'alvo': 'ninguem'},
+    {'tipo': 'post', 'id': 100, 'usuario': 'pessoa1', 'conteudo': 'Post importado cem', 'timestamp': 1700000000},
+    {'tipo': 'post', 'id': 100, 'usuario': 'pessoa2', 'conteudo': 'Id repetido no arquivo'},
+    {'tipo': 'post', 'id': 101, 'usuario': 'pessoa2', 'conteudo': 'oi'},
+    {'tipo': 'comentario', 'post_id': 100, 'usuario': 'pessoa2', 'texto': 'Comentário importado'},
+    {'tipo': 'comentario', 'post_id': 555, 'usuario': 'pessoa2', 'texto': 'Post inexistente'},
+    {'tipo': 'curtida', 'post_id': 100, 'usuario': 'pessoa2'},
+    {'tipo': 'curtida', 'post_id': 100, 'usuario': 'pessoa2'},
+    {'tipo': 'desconhecido'},
+]
+
+
+@pytest.fixture
+def arquivo(pasta):
+    caminho = pasta / 'carga.jsonl'
+    linhas = [json.dumps(r, ensure_ascii=False) for r in REGISTROS]
+    caminho.write_text('\n'.join(linhas[:6] + ['{quebrado'] + linhas[6:]) + '\n', encoding='utf-8')
+    return caminho
+
+
+def test_linhas_ilegiveis_do_jsonl_tem_erro_proprio(pasta):
+    caminho = pasta / 'ruim.jsonl'
+    caminho.write_text('{quebrado\n[1, 2]\n{"username": "x"}\n\n{"tipo": "conexao", "origem": "a"}\n', encoding='utf-8')
+    lidos = list(importacao.ler_jsonl(caminho))
+    assert [(n, str(r)) for _, n, _, r in lidos[:3]] == [
+        (1, 'JSON inválido'), (2, 'O registro deve ser um objeto JSON'), (3, 'Campo obrigatório: tipo')]
+    assert lidos[3] == ('ruim.jsonl', 5, 'conexao', {'origem': 'a'})
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_importa_validos_rejeita_invalidos_e_persiste(nucleos, arquivo, modo):
+    nucleo = nucleos.abrir(modo)
+    importador = Importador(nucleo, tamanho_lote=3)
+    contagem = importador.importar(ler(arquivo))
+    assert contagem == {'usuario': 2, 'conexao': 2, 'post': 1, 'comentario': 1, 'curtida': 2, 'rejeitados': 8}
+    assert importador.erros[0] == 'carga.jsonl:3: Email inválido ou já existe'
+    assert 'carga.jsonl:7: JSON inválido' in importador.erros
+    assert 'carga.jsonl:16: Tipo inválido: desconhecido' in importador.erros
+
+    nucleo = nucleos.reabrir(nucleo)
+    nucleo.autenticar('pessoa1', 'Senha123')  # texto puro recebeu hash na carga
+    assert nucleo.usuario('pessoa1')['senha'] != 'Senha123'
+    assert nucleo.usuario('pessoa2')['data_criacao'] == '01/02/2024 10:30'
+    assert nucleo.grafo.conectados('pessoa1', 'pessoa2')
+    post = nucleo.repositorio.posts_do_autor('pessoa1').antes(None, 1)[0]
+    assert (post['conteudo'], post['timestamp'], post['total_curtidas'], post['total_comentarios']) == \
+        ('Post importado cem', 1700000000, 1, 1)
+    assert [c['texto'] for c in nucleo.pagina_comentarios(post['id'])] == ['Comentário importado']
+
+
+@pytest.mark.parametrize('formato', ('jsonl', 'csv'))
+def test_exportacao_relida_igual_ao_estado(nucleos, pasta, formato):
+    nucleo = nucleos.abrir()
+    povoar(nucleo)
+    destino = pasta / ('exportado.jsonl' if formato == 'jsonl' else 'exportado')
+    contagem = exportar(nucleo, destino, formato)
+    esperados = list(importacao.registros_de(nucleo))
+    assert sum(contagem.values()) == len(esperados)
+    relidos = [(tipo, registro) for _, _, tipo, registro in ler(destino)]
+    normalizar = lambda registro: {k: str(v) for k, v in registro.items() if v not in ('', None)}  # noqa: E731
+    assert sorted((t, sorted(normalizar(r).items())) for t, r in relidos) == \
+        sorted((t, sorted(normalizar(r).items())) for t, r in esperados)
+
+
+def test_exportacao_importada_em_outra_pasta(nucleos, pasta, monkeypatch, tmp_path_factory):
+    nucleo = nucleos.abrir()
+    povoar(nucleo)
+    exportar(nucleo, pasta / 'exportado.jsonl')
+    senha_hash = nucleo.usuario('carla_dev')['senha']
+    nucleos.fechar(nucleo)
+
+    monkeypatch.chdir(tmp_path_factory.mktemp('destino'))
+    destino = nucleos.abrir()
+    contagem = Importador(destino).importar(ler(pasta / 'exportado.jsonl'))
+    assert contagem['usuario'] == 1 and contagem['rejeitados'] > 0  # os de demonstração já existem
+    assert destino.usuario('carla_dev')['senha'] == senha_hash  # hash exportado é mantido
+    destino.autenticar('carla_dev', 'Segredo1')
+    importado = [p for p in destino.repositorio.posts_do_autor('carla_dev')]
+    assert [p['conteudo'] for p in importado] == ['Primeiro post escrito pelos testes']
+    assert importado[0]['total_curtidas'] == 1
+    assert [c['texto'] for c in destino.pagina_comentarios(importado[0]['id'])] == ['Comentário de boas-vindas']
@@ -0,0 +1,40 @@
+"""Instantes nativos e consultas por intervalo de posts e comentários"""
+
+import time
+
+import pytest
+
+from indices import IndiceTemporal
+from tests.conftest import MODOS
+
+
+def test_entre_e_contar_com_limites_inclusivos():
+    indice = IndiceTemporal([(30.0, 'c'), (10.0, 'a'), (20.0, 'b')])
+    indice.adicionar(40.0, 'd')
+    indice.adicionar(15.0, 'a2')  # fora de ordem
+    assert indice.entre() == ['a', 'a2', 'b', 'c', 'd']
+    assert indice.entre(15.0, 30.0) == ['a2', 'b', 'c']
+    assert indice.entre(41.0) == [] and indice.contar(None, 20.0) == 3
+    assert indice.contar(35.0, 11.0) == 0
+
+
+def test_remover_pela_chave_no_mesmo_instante():
+    indice = IndiceTemporal([(10.0, 'a'), (10.0, 'b'), (20.0, 'c')])
+    assert indice.remover(10.0, 'b') and not indice.remover(10.0, 'b') and not indice.remover(20.0, 'a')
+    assert indice.entre() == ['a', 'c'] and len(indice) == 2
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_posts_e_comentarios_recentes(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    inicio = time.time()
+    post = nucleo.publicar('usuario2', 'Post recente para o intervalo')
+    nucleo.comentar('usuario1', post['id'], 'Comentário recente')
+    nucleo.comentar('usuario1', 1, 'Comentário em post antigo')
+    assert post['timestamp'] >= inicio
+    assert nucleo.posts_recentes(horas=1)[-1]['id'] == post['id']
+    assert [(i, c['texto']) for i, c in nucleo.comentarios_desde(inicio)] == [
+        (post['id'], 'Comentário recente'), (1, 'Comentário em post antigo')]
+    nucleo.deletar_post('usuario2', post['id'])
+    assert post['id'] not in [p['id'] for p in nucleo.posts_recentes(horas=1)]
+    assert [i for i, _ in nucleo.comentarios_desde(inicio)] == [1]
@@ -0,0 +1,57 @@
+"""Busca de usuários pelo índice de trigramas e prefixos"""
+
+from indices import IndiceTrigramas, normalizar
+
+USUARIOS = [('mariana_r', 'Mariana Rocha'), ('ana_c', 'Ana Costa'), ('anabela', 'Anabela Souza'),
+            ('otavio', 'Otávio Carvalho'), ('joao', 'João Silva')]
+
+
+def test_prefixos_vem_antes_das_ocorrencias_no_meio():
+    indice = IndiceTrigramas(USUARIOS)
+    assert indice.buscar('ana') == ['ana_c', 'anabela', 'mariana_r']
+
+
+def test_termo_curto_busca_so_por_prefixo():
+    indice = IndiceTrigramas(USUARIOS)
+    assert indice.buscar('an') == ['ana_c', 'anabela']
+
+
+def test_busca_ignora_acentos_e_maiusculas():
+    indice = IndiceTrigramas(USUARIOS)
+    assert normalizar('Otávio João') == 'otavio joao'
+    assert indice.buscar('OTÁV') == ['otavio']
+    assert indice.buscar('joão') == ['joao']
+    assert indice.buscar('carvalho') == ['otavio']
+
+
+def test_limite_e_termo_sem_resultado():
+    indice = IndiceTrigramas(USUARIOS)
+    assert indice.buscar('a', limite=2) == ['ana_c', 'anabela']
+    assert indice.buscar('xyz') == []
+    assert indice.buscar('   ') == []
+
+
+def test_prefixos_ordenados_por_palavras_casadas_exatas_e_nome():
+    indice = IndiceTrigramas([('zeca', 'Ana Beatriz Lima'), ('bia', 'Beatriz Anabela'), ('ana_l', 'Ana Lima'),
+                              ('carla', 'Anastácia Carla'), ('bruna', 'Ana Souza'), ('abel', 'Ana Abel')])
+    assert indice.buscar('ana lima') == ['zeca', 'ana_l', 'abel', 'bruna', 'carla', 'bia']  # 2 palavras, depois 1
+    assert indice.buscar('ana li') == ['zeca', 'ana_l', 'abel', 'bruna', 'carla', 'bia']
+    assert indice.buscar('ana') == ['abel', 'zeca', 'ana_l', 'bruna', 'carla', 'bia']  # exatas, depois prefixos
+    assert indice.buscar('anab') == ['bia']
+
+
+def test_adicionar_equivale_a_construir_com_todos():
+    incremental = IndiceTrigramas(USUARIOS[:2])
+    for username, nome in USUARIOS[2:]:
+        incremental.adicionar(username, nome)
+    completo = IndiceTrigramas(USUARIOS)
+    for termo in ('ana', 'an', 'sil', 'rocha', 'o'):
+        assert incremental.buscar(termo) == completo.buscar(termo)
+
+
+def test_nucleo_encontra_usuario_recem_registrado(nucleos):
+    nucleo = nucleos.abrir()
+    assert nucleo.buscar('zuleica') == []
+    nucleo.registrar('zuleica', 'zuleica@example.com', 'Segredo1', 'Zuleica Prado')
+    assert [u for u, _ in nucleo.buscar('prado')] == ['zuleica']
+    assert nucleo.buscar('João')[0][0] == 'usuario1'
@@ -0,0 +1,88 @@
+"""Índices secundários: email, post por id e posts por autor, mantidos pelos eventos"""
+
+import pytest
+
+from indices import IndicesSecundarios
+from nucleo import ErroDominio, NaoEncontrado
+from tests.auxiliares import BACKENDS, EVENTOS, abrir_repositorio, gravar_eventos, post, usuario
+from tests.conftest import MODOS
+
+
+def test_indices_acompanham_os_eventos():
+    indices = IndicesSecundarios({'ana': usuario('Ana')}, [post(2, 'ana', 'Segundo'), post(1, 'ana', 'Primeiro')])
+    assert indices.username_por_email == {'ana@example.com': 'ana'} and indices.maior_id_post == 2
+    assert [p['id'] for p in indices.posts_do_autor('ana')] == [2, 1]
+
+    indices.aplicar({'op': 'registrar', 'username': 'bia', 'usuario': usuario('Bia')})
+    indices.aplicar({'op': 'post', 'post': post(3, 'bia', 'Terceiro')})
+    indices.aplicar({'op': 'deletar_post', 'id': 2})
+    indices.aplicar({'op': 'deletar_post', 'id': 99})  # já removido: nada muda
+    indices.aplicar({'op': 'curtir', 'id': 1, 'usuario': 'bia'})
+    assert indices.username_por_email['bia@example.com'] == 'bia'
+    assert [p['id'] for p in indices.posts_do_autor('ana')] == [1] and not indices.posts_do_autor('ninguem')
+    assert indices.post_por_id[3]['conteudo'] == 'Terceiro' and 2 not in indices.post_por_id
+    assert indices.maior_id_post == 3
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_repositorio_consulta_pelos_indices(pasta, backend):
+    repositorio = abrir_repositorio(pasta, backend)
+    try:
+        gravar_eventos(repositorio, backend, EVENTOS + [{'op': 'registrar', 'username': 'caio', 'usuario': usuario('Caio')},
+                                                        {'op': 'post', 'post': post(3, 'caio', 'Post do Caio')}])
+        assert repositorio.email_em_uso('caio@example.com')
+        assert repositorio.post_por_id(3)['conteudo'] == 'Post do Caio'
+        assert repositorio.post_por_id(2) is None  # apagado
+        assert [p['id'] for p in repositorio.posts_do_autor('caio')] == [3]
+        gravar_eventos(repositorio, backend, [{'op': 'deletar_post', 'id': 3}])
+        assert not repositorio.posts_do_autor('caio') and repositorio.post_por_id(3) is None
+    finally:
+        repositorio.fechar()
+
+
+@pytest.mark.parametrize('backend', ('completo', 'diario'))
+def test_id_do_proximo_post_vem_depois_do_maior_indexado(pasta, backend):
+    repositorio = abrir_repositorio(pasta, backend)
+    gravar_eventos(repositorio, backend, EVENTOS + [{'op': 'post', 'post': post(3, 'ana', 'Terceiro')},
+                                                    {'op': 'deletar_post', 'id': 3}])
+    assert repositorio.proximo_id_post() == 4
+    repositorio.fechar()
+    repositorio = abrir_repositorio(pasta, backend)
+    try:
+        repositorio.carregar()
+        assert repositorio.proximo_id_post() == 2  # só o post 1 ficou gravado
+    finally:
+        repositorio.fechar()
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_email_ja_usado_e_recusado(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    nucleo.registrar('carla_dev', 'carla@example.com', 'Segredo1', 'Carla Dias')
+    assert nucleo.repositorio.email_em_uso('carla@example.com')
+    with pytest.raises(ErroDominio):
+        nucleo.registrar('carla_2', 'carla@example.com', 'Segredo1', 'Carla Dois')
+    with pytest.raises(ErroDominio):
+        nucleo.registrar('carla_dev', 'outra@example.com', 'Segredo1', 'Carla Dias')
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_post_por_id_e_posts_do_autor_acompanham_as_mutacoes(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    primeiro = nucleo.publicar('usuario3', 'Primeiro post do autor')
+    segundo = nucleo.publicar('usuario3', 'Segundo post do autor')
+    assert nucleo.post(segundo['id'])['conteudo'] == 'Segundo post do autor'
+    assert [p['id'] for p in nucleo.repositorio.posts_do_autor('usuario3')] == [segundo['id'], primeiro['id']]
+
+    nucleo.deletar_post('usuario3', primeiro['id'])
+    with pytest.raises(NaoEncontrado):
+        nucleo.post(primeiro['id'])
+    assert [p['id'] for p in nucleo.repositorio.posts_do_autor('usuario3')] == [segundo['id']]
+    assert list(nucleo.repositorio.posts_do_autor('ninguem')) == []
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_id_do_proximo_post_vem_depois_do_maior_gravado(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    ultimo = nucleo.publicar('usuario1', 'Post antes de reabrir')
+    assert nucleos.reabrir(nucleo).publicar('usuario1', 'Post depois de reabrir')['id'] == ultimo['id'] + 1
@@ -0,0 +1,92 @@
+"""Linha do tempo: paginação por cursor, lápides e o navegador post a post"""
+
+import pytest
+
+from linha_do_tempo import LinhaDoTempo, Navegador
+from tests.auxiliares import BACKENDS, EVENTOS, abrir_repositorio, gravar_eventos, post, todos_os_posts
+from tests.conftest import MODOS
+
+
+def linha_com(*ids):
+    return LinhaDoTempo({'id': i} for i in ids)
+
+
+def ids(posts):
+    return [p['id'] for p in posts]
+
+
+def test_paginas_antes_e_depois_do_cursor():
+    linha = linha_com(*range(1, 13))
+    assert ids(linha.antes(None, 5)) == [12, 11, 10, 9, 8]
+    assert ids(linha.antes(8, 5)) == [7, 6, 5, 4, 3]
+    assert ids(linha.antes(3, 5)) == [2, 1]
+    assert linha.antes(1, 5) == []
+    assert ids(linha.depois(3, 5)) == [8, 7, 6, 5, 4]
+    assert ids(linha.depois(10, 5)) == [12, 11]
+
+
+def test_publicacao_fora_de_ordem_fica_na_posicao_do_id():
+    linha = linha_com(5, 1)
+    linha.publicar({'id': 9})
+    linha.publicar({'id': 3})
+    assert ids(linha) == [9, 5, 3, 1] and len(linha) == 4
+
+
+def test_remocao_mantem_os_cursores_validos():
+    linha = linha_com(*range(1, 101))
+    for i in range(2, 100, 2):
+        assert linha.remover(i)['id'] == i  # passa da metade: as lápides são compactadas
+    assert linha.remover(2) is None and linha.obter(2) is None
+    assert ids(linha.antes(50, 3)) == [49, 47, 45]
+    assert ids(linha.depois(50, 3)) == [55, 53, 51]
+    assert len(linha) == 51
+
+
+def test_navegador_atravessa_paginas_nos_dois_sentidos():
+    navegador = Navegador(linha_com(*range(1, 8)), tamanho_pagina=3)
+    vistos = [navegador.atual['id']]
+    while navegador.proximo():
+        vistos.append(navegador.atual['id'])
+    assert vistos == [7, 6, 5, 4, 3, 2, 1] and navegador.posicao == 6
+    assert not navegador.tem_proximo() and navegador.tem_anterior()
+    while navegador.anterior():
+        pass
+    assert navegador.atual['id'] == 7 and navegador.posicao == 0
+
+
+def test_navegador_descarta_o_post_apagado():
+    linha = linha_com(1, 2, 3)
+    navegador = Navegador(linha, tamanho_pagina=2)
+    navegador.proximo()
+    linha.remover(2)
+    navegador.descartar_atual()
+    assert navegador.atual['id'] == 1
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_posts_do_repositorio_paginados_nao_repetem_nem_pulam(pasta, backend):
+    repositorio = abrir_repositorio(pasta, backend)
+    try:
+        gravar_eventos(repositorio, backend, EVENTOS[:2] + [{'op': 'post', 'post': post(i, 'ana', f'Post número {i}')}
+                                                            for i in range(1, 13)])
+        gravar_eventos(repositorio, backend, [{'op': 'deletar_post', 'id': 6}])
+        _, _, posts, _ = repositorio.carregar()
+        navegador, vistos = Navegador(posts, tamanho_pagina=5), []
+        while navegador.atual:
+            vistos.append(navegador.atual['id'])
+            if not navegador.proximo():
+                break
+        assert vistos == [12, 11, 10, 9, 8, 7, 5, 4, 3, 2, 1]
+        assert ids(posts.antes(4, 2)) == [3, 2] and ids(repositorio.posts_do_autor('ana').depois(5, 2)) == [8, 7]
+    finally:
+        repositorio.fechar()
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_feed_paginado_pelo_nucleo_nao_repete_nem_pula(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    criados = [nucleo.publicar('usuario1', f'Post número {i}')['id'] for i in range(12)]
+    nucleo.deletar_post('usuario1', criados[5])
+    esperados = sorted(set(criados + [1, 2]) - {criados[5]}, reverse=True)
+    assert ids(todos_os_posts(nucleo)) == esperados
+    assert ids(nucleo.pagina_feed('usuario1', cursor=criados[3], limite=2)) == criados[2:0:-1]
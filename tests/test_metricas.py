@@ -0,0 +1,122 @@
+"""Métricas: histogramas, contadores, exportação Prometheus/JSON e instrumentação do núcleo"""
+
+import json
+import os
+import signal
+import socket
+import threading
+import time
+
+import pytest
+
+from metricas import LIMITES, REGISTRO, Histograma, Metricas
+from nucleo import ErroDominio, NucleoSPA
+
+
+def test_histograma_baldes_e_quantis():
+    histograma = Histograma()
+    for valor in (0.00005, 0.0003, 0.0003, 0.02, 20.0):
+        histograma.observar(valor)
+    acumulados = histograma.acumulados()
+    assert len(acumulados) == len(LIMITES) + 1 and acumulados[0] == 1 and acumulados[-1] == 5
+    assert histograma.quantil(0.5) == 0.0005 and histograma.quantil(1.0) == float('inf')
+    assert Histograma().quantil(0.5) is None
+
+
+def test_medir_conta_sucesso_e_erro():
+    metricas = Metricas()
+    with metricas.medir('nada'):
+        pass
+    assert metricas.para_json()['histogramas'] == {}  # desligadas: nada registrado
+    metricas.ativar()
+    with metricas.medir('buscar'):
+        pass
+    with pytest.raises(ValueError):
+        with metricas.medir('buscar'):
+            raise ValueError
+    contadores = metricas.para_json()['contadores']['spa_operacoes_total']
+    assert [(c['rotulos']['resultado'], c['valor']) for c in contadores] == [('erro', 1), ('ok', 1)]
+
+
+def test_formato_prometheus():
+    metricas = Metricas()
+    metricas.registrar_gravacao('dados_posts/segmento_000012.json', 300, 0.002)
+    metricas.incrementar('spa_notificacoes_total', 2, (('tipo', 'post "novo"'),))
+    texto = metricas.prometheus()
+    assert '# TYPE spa_gravacao_segundos histogram' in texto
+    assert 'spa_gravacao_segundos_bucket{arquivo="segmento_N.json",le="0.0025"} 1' in texto
+    assert 'spa_gravacao_segundos_bucket{arquivo="segmento_N.json",le="+Inf"} 1' in texto
+    assert 'spa_gravacao_bytes_total{arquivo="segmento_N.json"} 300' in texto
+    assert 'spa_notificacoes_total{tipo="post \\"novo\\""} 2' in texto
+
+
+def test_despejar_em_arquivo_e_tcp(pasta):
+    metricas = Metricas()
+    metricas.incrementar('spa_operacoes_total', 1, (('operacao', 'login'), ('resultado', 'ok')))
+    metricas.despejar(str(pasta / 'metricas.json'))
+    assert json.loads((pasta / 'metricas.json').read_text())['contadores']['spa_operacoes_total'][0]['valor'] == 1
+    metricas.despejar(str(pasta / 'metricas.prom'))
+    assert (pasta / 'metricas.prom').read_text().startswith('# HELP spa_operacoes_total')
+    with pytest.raises(ValueError):
+        metricas.despejar(str(pasta / 'x'), 'xml')
+
+    recebido = []
+    with socket.create_server(('127.0.0.1', 0)) as servidor:
+        def aceitar():
+            conexao, _ = servidor.accept()
+            with conexao:
+                recebido.append(conexao.makefile('rb').read())
+        thread = threading.Thread(target=aceitar)
+        thread.start()
+        metricas.despejar(f'tcp://127.0.0.1:{servidor.getsockname()[1]}')
+        thread.join(timeout=5)
+    assert recebido and b'spa_operacoes_total{operacao="login",resultado="ok"} 1' in recebido[0]
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGUSR1'), reason='sem SIGUSR1')
+def test_sinal_no_meio_de_uma_medicao_nao_trava(pasta):
+    metricas, destino = Metricas(), pasta / 'sinal.prom'
+    metricas.ativar()
+    metricas.incrementar('spa_operacoes_total', 1, (('operacao', 'login'), ('resultado', 'ok')))
+    tratador = signal.getsignal(signal.SIGUSR1)
+    try:
+        assert metricas.despejar_ao_receber_sinal(lambda: str(destino))
+        with metricas._trava:  # o sinal chega enquanto a thread principal registra uma medição
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.05)
+        prazo = time.monotonic() + 5
+        while not destino.exists() and time.monotonic() < prazo:
+            time.sleep(0.01)
+        assert 'operacao="login"' in destino.read_text(encoding='utf-8')
+    finally:
+        signal.signal(signal.SIGUSR1, tratador)
+
+
+@pytest.fixture
+def registro_ativo(monkeypatch):
+    monkeypatch.setattr(NucleoSPA, 'METRICAS_ATIVAS', True)
+    tratador = signal.getsignal(signal.SIGUSR1)
+    REGISTRO.limpar()
+    yield REGISTRO
+    REGISTRO.ativar(False)
+    REGISTRO.limpar()
+    signal.signal(signal.SIGUSR1, tratador)
+
+
+def test_nucleo_instrumentado_e_despejado_ao_fechar(nucleos, pasta, registro_ativo):
+    nucleo = nucleos.abrir()
+    nucleo.publicar('usuario1', 'Post medido pelas métricas')
+    with pytest.raises(ErroDominio):
+        nucleo.publicar('usuario1', 'oi')
+    operacoes = {(c['rotulos']['operacao'], c['rotulos']['resultado']): c['valor']
+                 for c in registro_ativo.para_json()['contadores']['spa_operacoes_total']}
+    assert operacoes[('publicar', 'ok')] == 1 and operacoes[('publicar', 'erro')] == 1
+    assert operacoes[('persistir', 'ok')] >= 1
+    assert 'spa_gravacao_bytes_total{arquivo="dados_posts.json"}' in registro_ativo.prometheus()
+    nucleos.fechar(nucleo)
+    assert 'spa_operacao_segundos_count{operacao="publicar"} 2' in (pasta / 'metricas.prom').read_text()
+
+
+def test_metricas_desligadas_nao_embrulham_o_nucleo(nucleos):
+    nucleo = nucleos.abrir()
+    assert 'publicar' not in vars(nucleo) and not REGISTRO.ativo
@@ -0,0 +1,99 @@
+"""Notificações: agrupamento, caixas limitadas, entrega em segundo plano e eventos do núcleo"""
+
+import pytest
+
+from notificacoes import CaixaNotificacoes, CentralNotificacoes, Notificacao
+
+
+def _nomes(username):
+    return username.capitalize()
+
+
+def test_agrupamento_e_texto():
+    caixa = CaixaNotificacoes(10)
+    for ator in ('ana', 'bia', 'ana', 'caio'):
+        caixa.receber('curtir', 7, ator, 1.0)
+    caixa.receber('comentar', 7, 'bia', 2.0)
+    caixa.receber('post', 9, 'ana', 3.0)
+    caixa.receber('post', 10, 'ana', 4.0)
+    caixa.receber('conectar', None, 'dani', 5.0)
+    textos = [n.texto(_nomes) for n in caixa.recentes()]
+    assert textos == ['Dani se conectou com você', 'Ana publicou 2 posts', 'Bia comentou no seu post #7',
+                      'Caio e mais 2 pessoas curtiram seu post #7']
+    curtidas = caixa.recentes()[-1]
+    assert curtidas.atores == ['caio', 'ana', 'bia'] and curtidas.total == 4 and curtidas.pessoas == 3
+    assert caixa.nao_lidas == 4 and caixa.recentes(2)[1].alvo == 10
+
+
+def test_lidas_comecam_aviso_novo_e_capacidade():
+    caixa = CaixaNotificacoes(3)
+    caixa.receber('curtir', 1, 'ana', 1.0)
+    caixa.marcar_lidas()
+    caixa.receber('curtir', 1, 'bia', 2.0)
+    assert [(n.lida, n.total) for n in caixa.recentes()] == [(False, 1), (True, 1)] and caixa.nao_lidas == 1
+    for alvo in (2, 3, 4):
+        caixa.receber('curtir', alvo, 'caio', 3.0)
+    assert len(caixa) == 3 and caixa.nao_lidas == 3
+    assert [n.alvo for n in caixa.recentes()] == [4, 3, 2]
+    caixa.receber('curtir', 1, 'dani', 4.0)  # o grupo do post 1 saiu da caixa: aviso novo
+    assert caixa.recentes()[0].total == 1 and caixa.nao_lidas == 3
+
+
+def test_atores_guardados_limitados():
+    aviso = Notificacao('curtir', 1, 'u0', 0.0)
+    for i in range(1, 15):
+        aviso.agrupar(f'u{i}', float(i))
+    assert len(aviso.atores) == Notificacao.ATORES_GUARDADOS and aviso.atores[0] == 'u14'
+    assert aviso.pessoas == 15 and aviso.copia().para_json() == aviso.para_json()
+
+
+@pytest.fixture
+def central():
+    central = CentralNotificacoes(capacidade=5, trabalhadores=2)
+    yield central
+    central.fechar()
+
+
+def test_entrega_em_segundo_plano(central, monkeypatch):
+    monkeypatch.setattr(CentralNotificacoes, 'LOTE', 7)
+    with pytest.raises(ValueError):
+        central.enviar('mencionar', 'ana', ['bia'])
+    central.enviar('post', 'ana', [f'u{i}' for i in range(30)] + ['ana'], 1)
+    central.enviar('curtir', 'ana', ['ana'], 1)  # só o próprio ator: nada a fazer
+    central.enviar('curtir', 'bia', ['u1'], 3)
+    central.aguardar(5)
+    assert central.entregues == 31 and central.nao_lidas('ana') == 0
+    assert central.nao_lidas('u1') == 2 and central.nao_lidas('ninguem') == 0
+    avisos = central.ler('u1')
+    assert [n.tipo for n in avisos] == ['curtir', 'post'] and not avisos[0].lida
+    assert central.nao_lidas('u1') == 0 and all(n.lida for n in central.recentes('u1'))
+    assert central.ler('ninguem') == [] and central.recentes('ninguem') == []
+
+
+def test_fechar_entrega_o_que_esta_na_fila():
+    central = CentralNotificacoes(trabalhadores=1)
+    for i in range(50):
+        central.enviar('comentar', f'a{i}', ['dono'], 1)
+    central.fechar()
+    assert central.recentes('dono')[0].pessoas == 50
+    central.fechar()  # de novo, sem efeito
+
+
+def test_eventos_do_nucleo(nucleos):
+    nucleo = nucleos.abrir()
+    nucleo.registrar('carla_dev', 'carla@example.com', 'Segredo1', 'Carla Dias')
+    nucleo.conectar('carla_dev', 'usuario1')
+    post = nucleo.publicar('usuario1', 'Post para receber avisos')
+    nucleo.alternar_curtida('carla_dev', post['id'])
+    nucleo.alternar_curtida('usuario2', post['id'])
+    nucleo.comentar('carla_dev', post['id'], 'Parabéns!')
+    nucleo.alternar_curtida('usuario1', post['id'])  # o próprio autor não é avisado
+    nucleo.notificacoes.aguardar(5)
+
+    assert nucleo.notificacoes_nao_lidas('usuario1') == 3
+    textos = [n.texto(lambda u: nucleo.usuario(u)['nome']) for n in nucleo.ler_notificacoes('usuario1')]
+    assert textos == [f"Carla Dias comentou no seu post #{post['id']}",
+                      f"Maria Santos e mais 1 pessoa curtiram seu post #{post['id']}",
+                      'Carla Dias se conectou com você']
+    assert nucleo.notificacoes_nao_lidas('usuario1') == 0
+    assert [n.tipo for n in nucleo.ler_notificacoes('carla_dev')] == ['post']
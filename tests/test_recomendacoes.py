@@ -0,0 +1,49 @@
+"""Pessoas que talvez você conheça e graus de separação"""
+
+from grafo import GrafoSocial
+from recomendacoes import Recomendador
+
+TITULOS = {'ana': 'Dev', 'bia': 'Dev', 'caio': 'QA', 'duda': 'QA', 'enzo': 'Dev', 'fabi': 'DBA', 'gil': 'Dev'}
+
+
+def montar(*arestas, peso_titulo=0.0):
+    grafo = GrafoSocial()
+    for a, b in arestas:
+        grafo.conectar(a, b)
+    return grafo, Recomendador(grafo.conexoes, TITULOS.get, peso_titulo)
+
+
+def test_sugestoes_por_conexoes_em_comum():
+    _, recomendador = montar(('ana', 'bia'), ('ana', 'caio'), ('bia', 'duda'), ('caio', 'duda'), ('caio', 'enzo'))
+    assert recomendador.sugestoes('ana') == [('duda', 2), ('enzo', 1)]
+    assert recomendador.em_comum('ana', 'duda') == 2
+    assert recomendador.sugestoes('fabi') == []
+
+
+def test_titulo_igual_desempata():
+    _, sem_peso = montar(('ana', 'bia'), ('bia', 'caio'), ('bia', 'enzo'))
+    _, com_peso = montar(('ana', 'bia'), ('bia', 'caio'), ('bia', 'enzo'), peso_titulo=0.5)
+    assert sem_peso.sugestoes('ana') == [('caio', 1), ('enzo', 1)]
+    assert com_peso.sugestoes('ana') == [('enzo', 1), ('caio', 1)]  # enzo também é Dev
+
+
+def test_caminho_mais_curto_e_grau():
+    _, recomendador = montar(('ana', 'bia'), ('bia', 'caio'), ('caio', 'duda'), ('duda', 'enzo'),
+                             ('ana', 'fabi'), ('fabi', 'duda'))
+    assert recomendador.caminho('ana', 'enzo') == ['ana', 'fabi', 'duda', 'enzo']
+    assert recomendador.grau('ana', 'bia') == 1 and recomendador.grau('ana', 'ana') == 0
+    assert recomendador.caminho('ana', 'enzo', max_graus=2) is None
+    assert recomendador.grau('ana', 'gil') is None
+
+
+def test_nova_conexao_invalida_sugestoes_e_caminhos():
+    grafo, recomendador = montar(('ana', 'bia'), ('bia', 'caio'))
+    assert recomendador.sugestoes('ana') == [('caio', 1)] and recomendador.grau('ana', 'duda') is None
+    evento = {'op': 'conectar', 'origem': 'caio', 'alvo': 'duda'}
+    grafo.conectar('caio', 'duda')
+    recomendador.aplicar(evento)
+    assert recomendador.grau('ana', 'duda') == 3
+    evento = {'op': 'conectar', 'origem': 'ana', 'alvo': 'caio'}
+    grafo.conectar('ana', 'caio')
+    recomendador.aplicar(evento)
+    assert recomendador.sugestoes('ana') == [('duda', 1)]
@@ -0,0 +1,103 @@
+"""Reconstrução paralela: os índices mesclados das fatias são iguais aos montados de uma vez"""
+
+import pytest
+
+import reconstrucao
+from busca_posts import IndicePosts
+from gerador import GeradorRede
+from indices import IndiceTrigramas
+from reconstrucao import montar_indice_posts, montar_indice_usuarios, montar_indices
+
+CONSULTAS_USUARIOS = ('ana', 'silva', 'membro1', 'eduardo vargas', 'costa', 'zzz')
+CONSULTAS_POSTS = ('projeto time', 'concordo', 'python dados', 'vaga', 'parabens')
+
+
+@pytest.fixture(scope='module')
+def rede():
+    usuarios, posts, comentarios = [], [], []
+    for tipo, registro in GeradorRede(400, semente=5, agora=1_750_000_000.0).registros():
+        if tipo == 'usuario':
+            usuarios.append((registro['username'], registro['nome']))
+        elif tipo == 'post':
+            posts.append(registro)
+        elif tipo == 'comentario':
+            comentarios.append((registro['post_id'], registro))
+    return usuarios, posts, comentarios
+
+
+@pytest.fixture
+def paralelo(monkeypatch):
+    monkeypatch.setattr(reconstrucao, 'MINIMO_PARALELO', 10)
+
+
+def _estado_trigramas(indice):
+    return (indice._usernames, indice._textos, {g: list(p) for g, p in indice._gramas.items()}, indice._prefixos)
+
+
+def _estado_posts(indice):
+    return indice._documentos, indice._postagens, indice._comprimento_total
+
+
+def test_trigramas_mesclados_iguais_ao_serial(rede):
+    usuarios = rede[0]
+    serial = IndiceTrigramas(usuarios)
+    partes = [IndiceTrigramas(usuarios[a:b], primeiro=a) for a, b in ((0, 150), (150, 151), (151, 400))]
+    mesclado = IndiceTrigramas.mesclar(partes)
+    assert _estado_trigramas(mesclado) == _estado_trigramas(serial)
+    assert all(mesclado.buscar(c) == serial.buscar(c) for c in CONSULTAS_USUARIOS)
+
+
+def test_trigramas_fora_de_ordem(rede):
+    usuarios = rede[0]
+    with pytest.raises(ValueError):
+        IndiceTrigramas.mesclar([IndiceTrigramas(usuarios[100:], primeiro=100), IndiceTrigramas(usuarios[:100])])
+
+
+def test_posts_mesclados_iguais_ao_serial(rede):
+    _, posts, comentarios = rede
+    serial = IndicePosts.montar(posts, comentarios)
+    partes = [IndicePosts.montar(*reconstrucao._dividir_posts(posts, comentarios, i, 3)) for i in range(3)]
+    mesclado = IndicePosts.mesclar(partes)
+    assert _estado_posts(mesclado) == _estado_posts(serial) and mesclado.alterado
+    assert all(mesclado.buscar(c) == serial.buscar(c) for c in CONSULTAS_POSTS)
+
+
+def test_pool_de_processos_igual_ao_serial(rede, paralelo):
+    usuarios, posts, comentarios = rede
+    indice_usuarios = montar_indice_usuarios(usuarios, processos=2)
+    indice_posts = montar_indice_posts(posts, comentarios, processos=2)
+    assert _estado_trigramas(indice_usuarios) == _estado_trigramas(IndiceTrigramas(usuarios))
+    assert _estado_posts(indice_posts) == _estado_posts(IndicePosts.montar(posts, comentarios))
+    ambos = montar_indices(usuarios, posts, comentarios, processos=3)
+    assert _estado_trigramas(ambos[0]) == _estado_trigramas(indice_usuarios)
+    assert _estado_posts(ambos[1]) == _estado_posts(indice_posts)
+    assert not reconstrucao._ENTRADA
+
+
+def test_sem_fork_a_fatia_vai_como_argumento(rede, paralelo, monkeypatch):
+    usuarios, posts, comentarios = rede
+    monkeypatch.setattr(reconstrucao, '_preparar', lambda processos, itens: (2, False))
+    indice_usuarios, indice_posts = montar_indices(usuarios, posts, comentarios, processos=2)
+    assert _estado_trigramas(indice_usuarios) == _estado_trigramas(IndiceTrigramas(usuarios))
+    assert _estado_posts(indice_posts) == _estado_posts(IndicePosts.montar(posts, comentarios))
+
+
+def test_pequeno_ou_um_processo_monta_aqui(rede, monkeypatch):
+    def sem_pool(*_):
+        raise AssertionError('pool usado para poucos itens')
+    monkeypatch.setattr(reconstrucao, '_executar', sem_pool)
+    usuarios, posts, comentarios = rede
+    assert len(montar_indice_usuarios(usuarios, processos=4)._usernames) == len(usuarios)
+    monkeypatch.setattr(reconstrucao, 'MINIMO_PARALELO', 10)
+    assert len(montar_indice_posts(posts, comentarios, processos=1)) == len(posts)
+
+
+def test_reconstruir_indices_do_nucleo(nucleos, paralelo, monkeypatch):
+    nucleo = nucleos.abrir()
+    monkeypatch.setattr(nucleo, 'PROCESSOS_RECONSTRUCAO', 2)
+    for i in range(8):
+        nucleo.publicar(f'usuario{i % 3 + 1}', f'Post reconstruído número {i}')
+    antes = [p['id'] for p, _ in nucleo.buscar_posts('reconstruido')], nucleo.buscar('silva')
+    nucleo.reconstruir_indices()
+    assert ([p['id'] for p, _ in nucleo.buscar_posts('reconstruido')], nucleo.buscar('silva')) == antes
+    assert len(antes[0]) == 8
@@ -0,0 +1,67 @@
+"""Registros compactos: acesso por chave como dict e formato dos arquivos inalterado"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from registros import Comentario, Post, Usuario, data_de, instante_de, para_json, usuarios_de_json
+
+USUARIO = {'nome': 'Ana Costa', 'email': 'ana@example.com', 'senha': 'x', 'titulo': 'Dev', 'bio': 'Oi',
+           'data_criacao': '01/02/2024 10:30', 'timestamp_criacao': 1706794200.0, 'versao': 2}
+
+
+def test_usuario_ida_e_volta_pelo_formato_dos_arquivos():
+    usuario = Usuario.de_json({**USUARIO, 'seguidores': []})  # campos extras são ignorados
+    assert usuario.para_json() == USUARIO and usuario == USUARIO
+    assert dict(usuario) == USUARIO and list(usuario.keys()) == list(USUARIO)
+    assert json.loads(json.dumps(usuario, default=para_json)) == USUARIO
+
+
+def test_acesso_por_chave_e_campos_desconhecidos():
+    usuario = Usuario.de_json(USUARIO)
+    usuario['titulo'] = 'Arquiteta'
+    assert usuario['titulo'] == 'Arquiteta' and usuario.get('inexistente', 7) == 7
+    assert 'bio' in usuario and 'likes' not in usuario
+    with pytest.raises(KeyError):
+        usuario['likes'] = []
+    with pytest.raises(KeyError):
+        usuario['likes']
+    with pytest.raises(TypeError):
+        hash(usuario)
+
+
+def test_nome_do_autor_vem_do_usuario():
+    usuarios = usuarios_de_json({'ana': USUARIO})
+    post = Post.de_json({'id': 1, 'usuario': 'ana', 'autor_nome': 'Nome antigo', 'conteudo': 'Olá',
+                         'data': '01/02/2024 11:00', 'likes': ['bia']}, usuarios)
+    comentario = Comentario.de_json({'usuario': 'ana', 'nome': 'Nome antigo', 'texto': 'Oi',
+                                     'data': '01/02/2024 11:05'}, usuarios)
+    usuarios['ana']['nome'] = 'Ana Souza'
+    assert post['autor_nome'] == 'Ana Souza' and comentario['nome'] == 'Ana Souza'
+    assert post['total_curtidas'] == 0 and 'likes' not in post.para_json()
+    sem_usuario = Post.de_json({'id': 2, 'usuario': 'zeca', 'autor_nome': 'Zeca', 'conteudo': 'Oi',
+                                'data': '01/02/2024 11:00'}, usuarios)
+    assert sem_usuario['autor_nome'] == 'Zeca'
+
+
+def test_posts_e_comentarios_gravados_no_formato_de_antes(nucleos):
+    nucleo = nucleos.abrir()
+    comentario = nucleo.comentar('usuario2', 1, 'Parabéns!')
+    assert isinstance(comentario, Comentario) and isinstance(nucleo.post(1), Post)
+    assert isinstance(nucleo.usuario('usuario1'), Usuario)
+    nucleos.fechar(nucleo)
+    gravados = {p['id']: p for p in json.loads(Path('dados_posts.json').read_text(encoding='utf-8'))}
+    assert set(gravados[1]) == {'id', 'usuario', 'autor_nome', 'conteudo', 'data', 'timestamp', 'versao', 'likes',
+                                'total_curtidas', 'total_comentarios'}
+    comentarios = json.loads(Path('dados_comentarios.json').read_text(encoding='utf-8'))
+    assert comentarios['1'][-1] == {'id': comentario['id'], 'usuario': 'usuario2', 'nome': 'Maria Santos',
+                                    'texto': 'Parabéns!', 'data': comentario['data'],
+                                    'timestamp': comentario['timestamp']}
+
+
+def test_instante_calculado_da_data_em_arquivos_antigos():
+    post = Post.de_json({'id': 1, 'usuario': 'ana', 'autor_nome': 'Ana', 'conteudo': 'Olá',
+                         'data': '01/02/2024 11:00'})
+    assert post['timestamp'] == instante_de('01/02/2024 11:00')
+    assert data_de(post['timestamp']) == '01/02/2024 11:00'
@@ -0,0 +1,120 @@
+"""Repositórios: o estado sobrevive ao reabrir em todos os backends, consultas e migração para o SQLite"""
+
+import pytest
+
+from nucleo import Conflito, FalhaGravacao, NucleoSPA
+from repositorio import migrar_json_para_sqlite
+from tests.auxiliares import (BACKENDS, EVENTOS, abrir_repositorio, aplicados, estado, fotografia, gravar_eventos,
+                               post, povoar)
+from tests.conftest import MODOS
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_estado_sobrevive_ao_reabrir(pasta, backend):
+    repositorio = abrir_repositorio(pasta, backend)
+    assert not repositorio.existe()
+    gravar_eventos(repositorio, backend, EVENTOS)
+    repositorio.fechar()
+
+    repositorio = abrir_repositorio(pasta, backend)
+    try:
+        assert repositorio.existe()
+        assert fotografia(*repositorio.carregar()) == aplicados(EVENTOS)
+    finally:
+        repositorio.fechar()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_consultas(pasta, backend):
+    repositorio = abrir_repositorio(pasta, backend)
+    gravar_eventos(repositorio, backend, EVENTOS + [{'op': 'post', 'post': post(3, 'ana', 'Segundo post')}])
+    repositorio.fechar()
+
+    repositorio = abrir_repositorio(pasta, backend)
+    try:
+        repositorio.carregar()
+        assert repositorio.email_em_uso('ana@example.com') and not repositorio.email_em_uso('zoe@example.com')
+        assert [p['id'] for p in repositorio.posts_do_autor('ana')] == [3, 1]
+        assert not repositorio.posts_do_autor('bia') and repositorio.proximo_id_post() == 4
+    finally:
+        repositorio.fechar()
+
+
+def test_sqlite_rejeita_operacao_ou_campo_desconhecido(pasta):
+    repositorio = abrir_repositorio(pasta, 'sqlite')
+    try:
+        gravar_eventos(repositorio, 'sqlite', EVENTOS[:1])
+        with pytest.raises(ValueError):
+            repositorio.registrar({'op': 'perfil', 'username': 'ana', 'campo': 'senha; DROP', 'valor': 'x'})
+        with pytest.raises(ValueError):
+            repositorio.registrar({'op': 'teletransportar'})
+    finally:
+        repositorio.fechar()
+
+
+@pytest.mark.parametrize('backend', ('completo', 'diario'))
+def test_migracao_json_para_sqlite(pasta, backend):
+    origem = abrir_repositorio(pasta, backend)
+    gravar_eventos(origem, backend, EVENTOS)
+    origem.fechar()
+
+    origem, destino = abrir_repositorio(pasta, backend), abrir_repositorio(pasta, 'sqlite')
+    try:
+        assert migrar_json_para_sqlite(origem, destino) == 2
+    finally:
+        origem.fechar()
+        destino.fechar()
+    destino = abrir_repositorio(pasta, 'sqlite')
+    try:
+        assert fotografia(*destino.carregar()) == aplicados(EVENTOS)
+    finally:
+        destino.fechar()
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_nucleo_mantem_o_estado_ao_reabrir(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    povoar(nucleo)
+    antes = estado(nucleo)
+    assert estado(nucleos.reabrir(nucleo)) == antes
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_primeira_abertura_cria_os_dados_de_demonstracao(nucleos, modo):
+    nucleo = nucleos.abrir(modo)
+    assert len(nucleo.usuarios) == len(NucleoSPA.DADOS_PRECONFIGURADOS['nomes']) + 2  # + usuario1 e usuario2
+    assert nucleo.usuario('usuario1')['nome'] == 'João Silva'
+    assert nucleo.grafo.conectados('usuario1', 'usuario2')
+    assert nucleo.repositorio.email_em_uso(nucleo.usuario('usuario1')['email'])
+
+
+def test_sqlite_migra_os_arquivos_json_existentes(nucleos, pasta):
+    nucleo = nucleos.abrir('completo')
+    povoar(nucleo)
+    antes = estado(nucleo)
+    nucleos.fechar(nucleo)
+    assert estado(nucleos.abrir('sqlite')) == antes
+    assert (pasta / 'dados.sqlite3').exists()
+
+
+def test_sqlite_rejeita_edicao_sobre_versao_antiga(nucleos):
+    nucleo = nucleos.abrir('sqlite')
+    usuario = nucleo.usuario('usuario1')
+    usuario['versao'] -= 1  # como se outra sessão tivesse gravado depois da leitura
+    with pytest.raises(Conflito):
+        nucleo.editar_perfil('usuario1', 'titulo', 'Título perdido')
+    nucleo.editar_perfil('usuario1', 'titulo', 'Título aceito')  # o conflito recarregou o registro
+    assert nucleos.reabrir(nucleo).usuario('usuario1')['titulo'] == 'Título aceito'
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_falha_ao_gravar_chega_a_quem_chamou(nucleos, modo, monkeypatch):
+    nucleo = nucleos.abrir(modo)
+    assert len(nucleo.buscar('joao')) == 1  # monta o índice de busca antes da falha
+
+    def sem_espaco(evento):
+        raise OSError(28, 'No space left on device')
+    monkeypatch.setattr(nucleo.repositorio, 'registrar', sem_espaco)
+    with pytest.raises(FalhaGravacao, match='Erro ao salvar dados'):
+        nucleo.publicar('usuario1', 'Não cabe mais no disco')
+    assert nucleo._indice_busca is None  # derivados descartados junto com a gravação perdida
@@ -0,0 +1,76 @@
+"""Posts segmentados: só os segmentos visitados são lidos do disco"""
+
+import pytest
+
+from segmentos import LinhaSegmentada
+from tests.auxiliares import estado, povoar
+
+
+def posts(n):
+    return [{'id': i, 'usuario': f'autor{i % 3}', 'conteudo': f'post {i}'} for i in range(1, n + 1)]
+
+
+@pytest.fixture
+def gravada(pasta, monkeypatch):
+    monkeypatch.setattr(LinhaSegmentada, 'TAMANHO_SEGMENTO', 10)
+    LinhaSegmentada(pasta / 'dados_posts').importar(posts(45))
+    return pasta / 'dados_posts'
+
+
+def test_abrir_le_so_o_manifesto(gravada):
+    linha = LinhaSegmentada(gravada)
+    assert len(linha) == 45 and linha.maior_id == 45
+    assert linha.segmentos_carregados == 0
+    assert sorted(p.name for p in gravada.iterdir())[0] == 'manifesto.json'
+
+
+def test_paginas_leem_so_os_segmentos_necessarios(gravada):
+    linha = LinhaSegmentada(gravada)
+    assert [p['id'] for p in linha.antes(None, 4)] == [45, 44, 43, 42]
+    assert linha.segmentos_carregados == 1
+    assert [p['id'] for p in linha.antes(42, 4)] == [41, 40, 39, 38]
+    assert linha.segmentos_carregados == 2
+    assert [p['id'] for p in linha.depois(8, 4)] == [12, 11, 10, 9]
+    assert linha.obter(25)['conteudo'] == 'post 25' and linha.segmentos_carregados == 5
+
+
+def test_linha_do_autor_pelos_ids_do_manifesto(gravada):
+    linha = LinhaSegmentada(gravada)
+    autor = linha.do_autor('autor1')
+    assert len(autor) == 15 and linha.segmentos_carregados == 0
+    assert [p['id'] for p in autor.antes(None, 3)] == [43, 40, 37]
+    assert autor.obter(44) is None
+
+
+def test_remocao_e_publicacao_sao_gravadas(gravada):
+    linha = LinhaSegmentada(gravada)
+    linha.remover(44)
+    linha.publicar({'id': 46, 'usuario': 'autor1', 'conteudo': 'post novo'})
+    linha.gravar()
+    relida = LinhaSegmentada(gravada)
+    assert len(relida) == 45 and relida.obter(44) is None and relida.obter(46)['conteudo'] == 'post novo'
+    assert [p['id'] for p in relida.do_autor('autor2')][:2] == [41, 38]
+
+
+def test_alteracao_no_lugar_nao_regrava_o_manifesto(gravada, monkeypatch):
+    linha, escritos = LinhaSegmentada(gravada), []
+    escrever = linha._escrever
+    monkeypatch.setattr(linha, '_escrever', lambda arquivo, dados: (escritos.append(arquivo.name),
+                                                                  escrever(arquivo, dados)))
+    linha.obter(25)['curtidas'] = 1  # curtida ou comentário: só o post muda
+    linha.marcar_sujo(25)
+    linha.gravar()
+    assert escritos == ['segmento_000002.json']
+    linha.publicar({'id': 46, 'usuario': 'autor1', 'conteudo': 'post novo'})
+    linha.gravar()
+    assert escritos[1:] == ['segmento_000004.json', 'manifesto.json']
+    assert [p['id'] for p in LinhaSegmentada(gravada).do_autor('autor1')][0] == 46
+
+
+def test_nucleo_segmentado_comeca_sem_ler_posts(nucleos):
+    nucleo = nucleos.abrir('segmentado')
+    povoar(nucleo)
+    antes = estado(nucleo)
+    reaberto = nucleos.reabrir(nucleo)
+    assert reaberto.repositorio.posts.segmentos_carregados == 0
+    assert estado(reaberto) == antes
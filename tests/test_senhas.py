@@ -0,0 +1,92 @@
+"""Senhas: formato do hash, verificação, custos e atualização no login"""
+
+import asyncio
+
+import pytest
+
+from tests.conftest import MODOS
+from nucleo import ErroDominio, NucleoSPA
+from senhas import ServicoSenhas, _decompor, eh_hash, hash_senha
+
+BARATO = (2 ** 8, 8, 1)
+
+
+@pytest.mark.parametrize('algoritmo, parametros', [('scrypt', BARATO), ('pbkdf2_sha256', (1000,))])
+def test_hash_e_verificacao(algoritmo, parametros):
+    servico = ServicoSenhas(algoritmo, 2, scrypt=BARATO, iteracoes=1000)
+    try:
+        armazenado = servico.gerar('Segredo1')
+        assert armazenado.startswith(f"{algoritmo}${','.join(map(str, parametros))}$") and eh_hash(armazenado)
+        assert servico.verificar('Segredo1', armazenado) and not servico.verificar('segredo1', armazenado)
+        assert servico.gerar('Segredo1') != armazenado  # sal novo a cada hash
+        assert not servico.precisa_atualizar(armazenado)
+        assert all(servico.verificar(s, h) for s, h in zip(['a1', 'b2', 'c3'], servico.gerar_varios(['a1', 'b2', 'c3'])))
+        assert asyncio.run(servico.verificar_async('Segredo1', asyncio.run(servico.gerar_async('Segredo1'))))
+    finally:
+        servico.fechar()
+
+
+def test_sal_fixo_reproduzivel_e_texto_puro():
+    assert hash_senha('x', 'pbkdf2_sha256', (1000,), b'sal') == hash_senha('x', 'pbkdf2_sha256', (1000,), b'sal')
+    servico = ServicoSenhas('scrypt', 1, scrypt=BARATO)
+    try:
+        assert servico.verificar('123456', '123456') and not servico.verificar('1234567', '123456')
+        assert not eh_hash('123456') and not eh_hash('scrypt$x$y$z') and servico.precisa_atualizar('123456')
+        assert servico.precisa_atualizar(hash_senha('x', 'scrypt', (2 ** 9, 8, 1)))
+        assert servico.precisa_atualizar(hash_senha('x', 'pbkdf2_sha256', (1000,)))
+    finally:
+        servico.fechar()
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        ServicoSenhas('md5')
+    with pytest.raises(ValueError):
+        ServicoSenhas(pool='fibras')
+
+
+def test_pool_de_processos():
+    servico = ServicoSenhas('pbkdf2_sha256', 2, pool='processos', iteracoes=1000)
+    try:
+        assert servico.verificar('Segredo1', servico.gerar('Segredo1'))
+    finally:
+        servico.fechar()
+
+
+@pytest.fixture
+def custo_baixo(monkeypatch):
+    monkeypatch.setattr(ServicoSenhas, 'SCRYPT_N', 2 ** 8)
+    monkeypatch.setattr(ServicoSenhas, 'PBKDF2_ITERACOES', 1000)
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_texto_puro_vira_hash_no_login(nucleos, custo_baixo, modo):
+    nucleo = nucleos.abrir(modo)
+    usuario = nucleo.usuario('usuario1')
+    nucleo._regravar_senha('usuario1', usuario, '123456')  # como nos dados antigos
+    nucleo = nucleos.reabrir(nucleo)
+    assert nucleo.usuario('usuario1')['senha'] == '123456'
+    with pytest.raises(ErroDominio):
+        nucleo.autenticar('usuario1', '654321')
+    assert nucleo.usuario('usuario1')['senha'] == '123456'  # senha errada não regrava
+    nucleo.autenticar('usuario1', '123456')
+    assert eh_hash(nucleo.usuario('usuario1')['senha'])
+    nucleo = nucleos.reabrir(nucleo)
+    armazenado = nucleo.usuario('usuario1')['senha']
+    assert eh_hash(armazenado) and nucleo.senhas.verificar('123456', armazenado)
+
+
+def test_custo_alterado_regrava_no_login(nucleos, custo_baixo, monkeypatch):
+    nucleo = nucleos.abrir()
+    antigo = nucleo.usuario('usuario2')['senha']
+    assert _decompor(antigo)[1] == (2 ** 8, 8, 1)
+    monkeypatch.setattr(ServicoSenhas, 'SCRYPT_N', 2 ** 9)
+    nucleo = nucleos.reabrir(nucleo)
+    nucleo.autenticar('usuario2', '123456')
+    assert _decompor(nucleo.usuario('usuario2')['senha'])[1] == (2 ** 9, 8, 1)
+    assert nucleo.usuario('usuario3')['senha'] == antigo  # só quem entrou é atualizado
+    monkeypatch.setattr(NucleoSPA, 'ALGORITMO_SENHA', 'pbkdf2_sha256')
+    nucleo = nucleos.reabrir(nucleo)
+    asyncio.run(nucleo.autenticar_async('usuario2', '123456'))
+    assert nucleo.usuario('usuario2')['senha'].startswith('pbkdf2_sha256$1000$')
+    nucleo.autenticar('usuario2', '123456')
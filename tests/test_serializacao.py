@@ -0,0 +1,77 @@
+"""Codecs dos arquivos: ida e volta, detecção pelo conteúdo e troca de codec sem migração"""
+
+import json
+
+import pytest
+
+import serializacao
+from nucleo import NucleoSPA
+from registros import Comentario
+from serializacao import CODECS, codificar, decodificar, detectar, gravar, ler
+from tests.auxiliares import estado, povoar
+
+DADOS = {'1': [Comentario('usuario1', 'João Silva', 'Olá, ação!', '01/01/2025 10:00', 1735725600.0, 1)],
+         '2': [], 'lista': [1, 2.5, None, True, 'é']}
+ESPERADO = {'1': [{'id': 1, 'usuario': 'usuario1', 'nome': 'João Silva', 'texto': 'Olá, ação!',
+                   'data': '01/01/2025 10:00', 'timestamp': 1735725600.0}], '2': [], 'lista': [1, 2.5, None, True, 'é']}
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_ida_e_volta_com_deteccao(tmp_path, codec):
+    arquivo = tmp_path / 'dados_teste.json'
+    gravar(arquivo, DADOS, codec)
+    assert ler(arquivo) == ESPERADO
+    assert detectar(arquivo.read_bytes()) == ('json' if codec == 'json_compacto' else codec)
+    assert [a.name for a in tmp_path.iterdir()] == ['dados_teste.json']  # sem temporários
+    assert decodificar(codificar([DADOS['1'][0]], codec)) == ESPERADO['1']
+
+
+def test_json_um_registro_por_linha_e_compacto():
+    texto = codificar({'a': [1, 2], 'b': 'ç'}, 'json').decode('utf-8')
+    assert texto == '{\n  "a": [1, 2],\n  "b": "ç"\n}\n'
+    assert codificar([], 'json') == b'[]\n' and codificar({}, 'json') == b'{}\n'
+    assert codificar({'a': [1, 2]}, 'json_compacto') == b'{"a":[1,2]}'
+    assert codificar(DADOS, 'gzip') == codificar(DADOS, 'gzip')  # mtime fixo: mesmo conteúdo, mesmos bytes
+
+
+def test_encoding_alternativo(tmp_path):
+    gravar(tmp_path / 'latin.json', {'nome': 'João'}, 'json', 'latin-1')
+    assert ler(tmp_path / 'latin.json', 'latin-1') == {'nome': 'João'}
+
+
+def test_erros(tmp_path):
+    with pytest.raises(ValueError):
+        codificar({}, 'yaml')
+    with pytest.raises(ValueError):
+        gravar(tmp_path / 'x.json', {}, 'yaml')
+    assert not (tmp_path / 'x.json').exists()
+    for codec in ('gzip', 'lzma', 'pickle', 'json'):
+        with pytest.raises(ValueError):
+            decodificar(codificar(DADOS, codec)[:-5])
+
+
+@pytest.mark.parametrize('modo', ('completo', 'diario', 'segmentado'))
+@pytest.mark.parametrize('codec', CODECS)
+def test_nucleo_grava_no_codec_e_le_qualquer_um(nucleos, pasta, monkeypatch, modo, codec):
+    monkeypatch.setattr(NucleoSPA, 'CODEC_ARQUIVOS', codec)
+    nucleo = nucleos.abrir(modo)
+    povoar(nucleo)
+    nucleo.buscar_posts('post')
+    esperado = estado(nucleo)
+    nucleo = nucleos.reabrir(nucleo)
+    assert estado(nucleo) == esperado
+    if modo == 'completo':
+        assert detectar((pasta / 'dados_usuarios.json').read_bytes()) == ('json' if codec == 'json_compacto' else codec)
+
+    monkeypatch.setattr(NucleoSPA, 'CODEC_ARQUIVOS', 'json' if codec != 'json' else 'marshal')
+    nucleo = nucleos.reabrir(nucleo)  # troca de codec sem migração
+    assert estado(nucleo) == esperado
+    nucleo.publicar('usuario1', 'Gravado já no outro codec')
+    nucleo = nucleos.reabrir(nucleo)
+    assert len(estado(nucleo)['posts']) == len(esperado['posts']) + 1
+
+
+def test_leitura_de_dados_antigos_em_json(pasta):
+    arquivo = pasta / 'dados_antigos.json'
+    arquivo.write_text(json.dumps({'usuario1': {'nome': 'João'}}, indent=2), encoding='utf-8')
+    assert serializacao.ler(arquivo) == {'usuario1': {'nome': 'João'}}
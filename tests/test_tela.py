@@ -0,0 +1,104 @@
+"""Tela da CLI: quadro em uma escrita, redesenho só das linhas alteradas e saída sem terminal"""
+
+import io
+import shutil
+import sys
+
+import pytest
+
+from tela import APAGAR_ABAIXO, APAGAR_LINHA, LIMPAR, Tela, largura
+
+
+class Terminal(io.StringIO):
+    """Saída que se diz terminal e conta as escritas"""
+
+    def __init__(self, tty=True):
+        super().__init__()
+        self.tty, self.escritas = tty, []
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, texto):
+        self.escritas.append(texto)
+        return super().write(texto)
+
+
+@pytest.fixture(autouse=True)
+def terminal_80x24(monkeypatch):
+    monkeypatch.setattr(shutil, 'get_terminal_size', lambda padrao=None: (80, 24))
+
+
+@pytest.fixture
+def teclas(monkeypatch):
+    respostas = []
+    monkeypatch.setattr('builtins.input', lambda prompt='': respostas.pop(0))
+    return respostas
+
+
+def test_largura():
+    assert largura('abc') == 3 and largura('🚀 ok') == 5 and largura('ação') == 4 and largura('é') == 1
+
+
+def test_quadro_vai_em_uma_escrita_e_so_linhas_mudadas_sao_redesenhadas(teclas):
+    saida, desenhos = Terminal(), []
+    teclas.extend(['1', '2'])
+    with Tela(saida, lambda latencia, tamanho: desenhos.append(tamanho)) as tela:
+        assert sys.stdout is tela
+        tela.limpar()
+        print('MENU')
+        print('1. Feed')
+        assert saida.escritas == []
+        assert tela.ler('Opção: ') == '1'
+        assert saida.escritas == [LIMPAR + 'MENU\n1. Feed\nOpção: ']
+        tela.limpar()
+        print('MENU')
+        print('2. Perfil')
+        tela.ler('Opção: ')
+    assert sys.stdout is not tela
+    assert saida.escritas[1] == f'\x1b[2;1H2. Perfil{APAGAR_LINHA}\x1b[3;1H{APAGAR_ABAIXO}Opção: '
+    assert tela.quadros == 2 and len(desenhos) == 1  # só o quadro que veio depois de uma tecla
+
+
+def test_linhas_longas_forcam_redesenho_inteiro(teclas):
+    saida = Terminal()
+    teclas.extend(['', ''])
+    with Tela(saida) as tela:
+        for texto in ('curto', 'x' * 100):
+            tela.limpar()
+            print(texto)
+            tela.ler()
+        tela.limpar()
+        print('curto')
+    assert all(e.startswith(LIMPAR) for e in saida.escritas)
+
+
+def test_rolagem_abaixo_do_quadro_esquece_a_tela(teclas):
+    saida = Terminal()
+    teclas.extend([''] * 30)
+    with Tela(saida) as tela:
+        tela.limpar()
+        print('topo')
+        for _ in range(30):
+            tela.ler('> ')
+        tela.limpar()
+        print('topo')
+    assert saida.escritas[-1].startswith(LIMPAR)
+
+
+def test_sem_terminal_nada_de_ansi(teclas):
+    saida = Terminal(tty=False)
+    teclas.append('ok')
+    with Tela(saida) as tela:
+        print('aviso antes')
+        tela.limpar()
+        print('quadro')
+        tela.ler('> ')
+    assert saida.getvalue() == 'aviso antes\nquadro\n> ' and '\x1b' not in saida.getvalue()
+
+
+def test_fora_do_with(teclas, capsys):
+    tela = Tela(Terminal())
+    teclas.append('resposta')
+    tela.limpar()
+    assert tela.ler('> ') == 'resposta' and capsys.readouterr().out == ''
@@ -0,0 +1,120 @@
+"""
+TRAVAS E ESCRITA ATÔMICA DO LINKEDIN SPA
+Descrição: Trava consultiva entre processos sobre um arquivo (fcntl.flock no
+POSIX, msvcrt.locking no Windows) e escrita atômica por arquivo temporário +
+fsync + rename, para que vários processos compartilhem a mesma pasta de dados
+e uma queda no meio da escrita nunca deixe um arquivo truncado.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Callable, Optional
+
+from metricas import REGISTRO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+class TravaOcupada(RuntimeError):
+    """A trava pertence a outro processo (aquisição sem bloqueio)"""
+
+
+class TravaArquivo:
+    """Trava exclusiva e reentrante sobre ``arquivo``, válida entre processos.
+
+    Usada como context manager nas escritas curtas, ou adquirida uma vez e só
+    liberada em ``liberar`` para uso exclusivo durante toda a execução.
+    """
+
+    def __init__(self, arquivo: Path):
+        self.arquivo = Path(arquivo)
+        self._handle: Optional[IO] = None
+        self._profundidade = 0
+        self._local = threading.RLock()
+
+    @property
+    def adquirida(self) -> bool:
+        return self._profundidade > 0
+
+    def adquirir(self, bloquear: bool = True) -> None:
+        """Adquire a trava; sem ``bloquear`` levanta TravaOcupada se outro processo a tiver"""
+        if not self._local.acquire(blocking=bloquear):
+            raise TravaOcupada(f"{self.arquivo} em uso")
+        if self._profundidade == 0:
+            try:
+                self._handle = open(self.arquivo, 'a+b')
+                self._travar(bloquear)
+            except BaseException:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+                self._local.release()
+                raise
+        self._profundidade += 1
+
+    def _travar(self, bloquear: bool) -> None:
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX | (0 if bloquear else fcntl.LOCK_NB))
+            except BlockingIOError:
+                raise TravaOcupada(f"{self.arquivo} em uso por outro processo") from None
+        elif msvcrt is not None:
+            self._handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._handle.fileno(), msvcrt.LK_NBLCK, 1)
+                    return
+                except OSError:
+                    if not bloquear:
+                        raise TravaOcupada(f"{self.arquivo} em uso por outro processo") from None
+                    threading.Event().wait(0.01)
+
+    def liberar(self) -> None:
+        """Libera um nível da trava (o arquivo é destravado no último)"""
+        self._profundidade -= 1
+        if self._profundidade == 0:
+            if fcntl is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            self._handle.close()
+            self._handle = None
+        self._local.release()
+
+    def __enter__(self) -> 'TravaArquivo':
+        self.adquirir()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.liberar()
+
+
+def escrever_atomico(arquivo: Path, escrever: Callable[[IO], None], encoding: str = 'utf-8',
+                     binario: bool = False) -> None:
+    """Grava via ``escrever(f)`` em um temporário ao lado e o renomeia sobre ``arquivo``
+    (com ``binario``, ``f`` recebe bytes e ``encoding`` é ignorado)"""
+    tmp = Path(f'{arquivo}.{os.getpid()}.tmp')
+    inicio = time.perf_counter()
+    try:
+        with (open(tmp, 'wb') if binario else open(tmp, 'w', encoding=encoding)) as f:
+            escrever(f)
+            f.flush()
+            os.fsync(f.fileno())
+            tamanho = os.fstat(f.fileno()).st_size
+        os.replace(tmp, arquivo)
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+    if REGISTRO.ativo:
+        REGISTRO.registrar_gravacao(arquivo, tamanho, time.perf_counter() - inicio)